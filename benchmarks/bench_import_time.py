@@ -0,0 +1,76 @@
+"""
+`python -X importtime` 으로 CLI 진입 모듈의 import 시간을 측정하고, import_time_budget.json 의 예산을 넘으면 실패합니다.
+
+usage:
+    PYTHONPATH=./src/ python3 benchmarks/bench_import_time.py [--repeat 5] [--report]
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import re
+import statistics
+import subprocess
+import sys
+
+HERE = pathlib.Path(__file__).resolve().parent
+BUDGET_PATH = HERE / "import_time_budget.json"
+
+_line_pattern = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def _import_times(module):
+    """
+    :return: [(module, self_us, cumulative_us, depth), ...] (import 된 순서)
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, env=os.environ.copy(), check=True)
+
+    times = []
+    for line in proc.stderr.splitlines():
+        match = _line_pattern.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            times.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return times
+
+
+def _subtree(times, module):
+    # importtime 출력은 하위 모듈이 상위 모듈보다 먼저 찍히므로, 대상 모듈 줄에서 위로 depth 0 이 나올 때까지가 대상 모듈이 불러온 모듈들
+    end = next(i for i, (name, _, _, depth) in enumerate(times) if name == module and depth == 0)
+    start = end
+    while start > 0 and times[start - 1][3] > 0:
+        start -= 1
+    return times[start : end + 1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--report", action="store_true", help="가장 오래 걸린 모듈 목록을 함께 출력합니다.")
+    args = parser.parse_args()
+
+    budget = json.loads(BUDGET_PATH.read_text(encoding="utf-8"))
+
+    failed = False
+    for module, spec in budget["modules"].items():
+        runs = [_import_times(module) for _ in range(args.repeat)]
+        cumulative_ms = statistics.median(dict((name, cumulative) for name, _, cumulative, _ in times)[module] for times in runs) / 1000
+        imported = {name for name, _, _, _ in runs[0]}
+        forbidden = sorted(name for name in spec["forbidden_imports"] if name in imported)
+
+        ok = cumulative_ms <= spec["budget_ms"] and not forbidden
+        failed = failed or not ok
+        print(f"{'✅' if ok else '❌'} {module}: {cumulative_ms:.1f} ms (budget: {spec['budget_ms']} ms)")
+        if forbidden:
+            print(f"   eagerly imported: {', '.join(forbidden)}")
+
+        if args.report:
+            for name, _, cumulative, depth in sorted(_subtree(runs[0], module), key=lambda t: -t[2])[:15]:
+                print(f"   {cumulative / 1000:>8.1f} ms  {'  ' * depth}{name}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+로컬 stand-in 서버(tests/support/lottery_standin.py)를 상대로 LotteryClient 의 명령어별 지연 시간(p50/p99)과 처리량을 측정합니다.
+
+단일 프로필은 한 클라이언트로 명령어를 순서대로 반복하고, 다중 프로필은 ProfileBatchRunner 로 프로필마다 클라이언트를 만들어 동시에 실행합니다.
+
+usage:
+    PYTHONPATH=./src/ python3 benchmarks/bench_lottery_client.py [--iterations 50] [--profiles 8] [--workers 8] [--latency-ms 20] [--error-rate 0]
+"""
+
+import argparse
+import pathlib
+import sys
+import threading
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from tests.support.lottery_standin import LotteryStandinServer, StandinConfig  # noqa: E402 pylint: disable=wrong-import-position
+
+from dhapi.batch.profile_batch_runner import ProfileBatchRunner  # noqa: E402 pylint: disable=wrong-import-position
+from dhapi.domain.deposit import Deposit  # noqa: E402 pylint: disable=wrong-import-position
+from dhapi.domain.lotto645_ticket import Lotto645Ticket  # noqa: E402 pylint: disable=wrong-import-position
+from dhapi.domain.user import User  # noqa: E402 pylint: disable=wrong-import-position
+from dhapi.port.lottery_client import LotteryClient  # noqa: E402 pylint: disable=wrong-import-position
+from dhapi.port.lottery_client_options import LotteryClientOptions  # noqa: E402 pylint: disable=wrong-import-position
+
+
+class _SilentEndpoint:
+    def print_result_of_buy_lotto645(self, slots):
+        pass
+
+    def print_result_of_show_balance(self, *args):
+        pass
+
+    def print_result_of_assign_virtual_account(self, *args):
+        pass
+
+
+class _Samples:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timings: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def measure(self, command: str, action: Callable):
+        started = time.perf_counter()
+        try:
+            return action()
+        except RuntimeError:
+            with self._lock:
+                self.errors[command] = self.errors.get(command, 0) + 1
+            return None
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.timings.setdefault(command, []).append(elapsed)
+
+
+COMMANDS = [
+    ("buy_lotto645", lambda client: client.buy_lotto645([Lotto645Ticket()] * 5)),
+    ("show_balance", lambda client: client.show_balance()),
+    ("assign_virtual_account", lambda client: client.assign_virtual_account(Deposit(50000))),
+]
+
+
+def _run_profile(server: LotteryStandinServer, samples: _Samples, profile_name: str, iterations: int):
+    user = User(profile_name, "password")
+    client = samples.measure("login", lambda: LotteryClient(user, _SilentEndpoint(), LotteryClientOptions(urls=server.urls())))
+    if client is None:
+        raise RuntimeError(f"{profile_name} 로그인 실패")
+
+    for _ in range(iterations):
+        for command, action in COMMANDS:
+            samples.measure(command, lambda: action(client))  # pylint: disable=cell-var-from-loop
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    index = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _report(title: str, samples: _Samples, wall_seconds: float):
+    print(f"\n[{title}] (wall: {wall_seconds:.2f}s)")
+    print(f"{'command':<26}{'count':>8}{'errors':>8}{'p50 (ms)':>12}{'p99 (ms)':>12}{'ops/s':>10}")
+    for command in ["login"] + [name for name, _ in COMMANDS]:
+        timings = sorted(samples.timings.get(command, []))
+        if not timings:
+            continue
+        print(
+            f"{command:<26}{len(timings):>8}{samples.errors.get(command, 0):>8}"
+            f"{_percentile(timings, 50) * 1e3:>12.2f}{_percentile(timings, 99) * 1e3:>12.2f}{len(timings) / wall_seconds:>10.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=50, help="프로필당 명령어 반복 횟수")
+    parser.add_argument("--profiles", type=int, default=8, help="다중 프로필 실행 시 프로필 수")
+    parser.add_argument("--workers", type=int, default=8, help="다중 프로필 실행 시 동시 작업 수")
+    parser.add_argument("--latency-ms", type=float, default=20, help="stand-in 서버의 응답 지연 시간")
+    parser.add_argument("--error-rate", type=float, default=0, help="stand-in 서버의 오류 응답 비율 (0 ~ 1)")
+    args = parser.parse_args()
+
+    config = StandinConfig(latency_seconds=args.latency_ms / 1e3, error_rate=args.error_rate, seed=0)
+    with LotteryStandinServer(config) as server:
+        samples = _Samples()
+        started = time.perf_counter()
+        _run_profile(server, samples, "bench-single", args.iterations)
+        _report("single profile", samples, time.perf_counter() - started)
+
+        samples = _Samples()
+        profile_names = [f"bench-{i}" for i in range(args.profiles)]
+        started = time.perf_counter()
+        results = ProfileBatchRunner(args.workers).run(profile_names, lambda name: _run_profile(server, samples, name, args.iterations))
+        _report(f"{args.profiles} profiles, {args.workers} workers", samples, time.perf_counter() - started)
+        for result in results:
+            if not result.ok:
+                print(f"{result.profile_name}: {result.error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+저장된 페이지를 추출기별로 파싱하여 페이지당 파싱 시간과 최대 메모리 사용량을 비교합니다.
+
+usage:
+    PYTHONPATH=./src/ python3 benchmarks/bench_page_extractor.py [--repeat 200] [--fixtures tests/dhapi/port/fixtures]
+"""
+
+import argparse
+import pathlib
+import statistics
+import time
+import tracemalloc
+
+from dhapi.port.page_extractor import Html5libPageExtractor, RegexPageExtractor, build_page_extractor
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+PAGES = [
+    ("login_failed.html", "is_login_failed"),
+    ("login_success.html", "is_login_failed"),
+    ("main.html", "parse_round"),
+    ("mypage_with_bank_account.html", "parse_balance"),
+    ("mypage_without_bank_account.html", "parse_balance"),
+    ("nicepay_process.html", "parse_virtual_account"),
+]
+
+EXTRACTORS = [
+    ("html5lib", Html5libPageExtractor()),
+    ("regex", RegexPageExtractor()),
+    ("fallback", build_page_extractor()),
+]
+
+
+def _measure(extract, html, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extract(html)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    extract(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return statistics.median(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--fixtures", type=pathlib.Path, default=ROOT / "tests" / "dhapi" / "port" / "fixtures")
+    args = parser.parse_args()
+
+    print(f"{'page':<36}{'extractor':<12}{'median (us)':>14}{'peak (KiB)':>14}")
+    for page, method in PAGES:
+        html = (args.fixtures / page).read_text(encoding="utf-8")
+        for name, extractor in EXTRACTORS:
+            median, peak = _measure(getattr(extractor, method), html, args.repeat)
+            print(f"{page:<36}{name:<12}{median * 1e6:>14.1f}{peak / 1024:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
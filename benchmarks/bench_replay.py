@@ -0,0 +1,100 @@
+"""
+기록된 요청/응답(cassette)을 네트워크 없이 재생하여 LotteryClient 의 명령어별 처리 시간을 측정합니다.
+
+응답을 기다리는 시간이 없으므로 로그인, 페이지 파싱, 요청 값 생성 등 클라이언트 쪽 CPU 비용만 남습니다.
+--cassette 를 생략하면 로컬 stand-in 서버(tests/support/lottery_standin.py)와 주고받은 내용을 먼저 기록하고,
+`dhapi show-balance --record FILE` 등으로 실제 사이트에서 기록한 파일을 넘기면 실제 페이지로 파서 변경을 비교할 수 있습니다.
+
+usage:
+    PYTHONPATH=./src/ python3 benchmarks/bench_replay.py [--iterations 200] [--cassette FILE] [--base-url URL]
+"""
+
+import argparse
+import pathlib
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from tests.support.lottery_standin import LotteryStandinServer, StandinConfig  # noqa: E402 pylint: disable=wrong-import-position
+
+from dhapi.domain.deposit import Deposit  # noqa: E402 pylint: disable=wrong-import-position
+from dhapi.domain.lotto645_ticket import Lotto645Ticket  # noqa: E402 pylint: disable=wrong-import-position
+from dhapi.domain.user import User  # noqa: E402 pylint: disable=wrong-import-position
+from dhapi.port.cassette import Cassette, RecordingAdapter, ReplayAdapter  # noqa: E402 pylint: disable=wrong-import-position
+from dhapi.port.lottery_client import LotteryClient  # noqa: E402 pylint: disable=wrong-import-position
+from dhapi.port.lottery_client_options import LotteryClientOptions  # noqa: E402 pylint: disable=wrong-import-position
+from dhapi.port.lottery_site import LotteryUrls  # noqa: E402 pylint: disable=wrong-import-position
+
+
+class _SilentEndpoint:
+    def print_result_of_buy_lotto645(self, slots):
+        pass
+
+    def print_result_of_show_balance(self, *args, **kwargs):
+        pass
+
+    def print_result_of_assign_virtual_account(self, *args):
+        pass
+
+
+COMMANDS = [
+    ("buy_lotto645", lambda client: client.buy_lotto645([Lotto645Ticket()] * 5)),
+    ("show_balance", lambda client: client.show_balance()),
+    ("assign_virtual_account", lambda client: client.assign_virtual_account(Deposit(50000))),
+]
+
+USER = User("bench-replay", "password")
+
+
+def _record_standin() -> Tuple[Cassette, LotteryUrls]:
+    cassette = Cassette()
+    with LotteryStandinServer(StandinConfig(seed=0)) as server:
+        client = LotteryClient(USER, _SilentEndpoint(), LotteryClientOptions(urls=server.urls(), transport_adapter=RecordingAdapter(cassette, secrets=[USER.username, USER.password])))
+        for _, action in COMMANDS:
+            action(client)
+        return cassette, server.urls()
+
+
+def _measure(timings: Dict[str, List[float]], command: str, action: Callable):
+    started = time.perf_counter()
+    result = action()
+    timings.setdefault(command, []).append(time.perf_counter() - started)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200, help="명령어 반복 횟수")
+    parser.add_argument("--cassette", type=pathlib.Path, help="재생할 파일. 생략 시 stand-in 서버에서 기록")
+    parser.add_argument("--base-url", help="기록한 파일의 사이트 주소. 생략 시 실제 동행복권 주소 (stand-in 에서 기록한 경우 무시)")
+    args = parser.parse_args()
+
+    if args.cassette is None:
+        cassette, urls = _record_standin()
+        commands = COMMANDS
+    else:
+        cassette = Cassette.load(str(args.cassette))
+        urls = LotteryUrls(base_url=args.base_url, www_base_url=args.base_url, ol_base_url=args.base_url) if args.base_url else LotteryUrls()
+        # 실제 사이트에서 기록한 파일에는 어떤 명령어가 담겨 있는지 알 수 없으므로 예치금 조회만 반복
+        commands = [command for command in COMMANDS if command[0] == "show_balance"]
+
+    adapter = ReplayAdapter(cassette, loop=True)
+    timings: Dict[str, List[float]] = {}
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        client = _measure(timings, "login", lambda: LotteryClient(USER, _SilentEndpoint(), LotteryClientOptions(urls=urls, transport_adapter=adapter)))
+        for command, action in commands:
+            _measure(timings, command, lambda: action(client))  # pylint: disable=cell-var-from-loop
+    wall_seconds = time.perf_counter() - started
+
+    print(f"[replay, {len(cassette.interactions)} recorded interactions] (wall: {wall_seconds:.2f}s)")
+    print(f"{'command':<26}{'count':>8}{'median (us)':>14}{'ops/s':>10}")
+    for command, values in timings.items():
+        print(f"{command:<26}{len(values):>8}{statistics.median(values) * 1e6:>14.1f}{len(values) / wall_seconds:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
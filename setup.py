@@ -45,4 +45,8 @@ setup(
     },
 
     install_requires=_get_dependencies(),
+    extras_require={
+        # AsyncLotteryClient 에서만 사용
+        "async": ["httpx==0.27.0"],
+    },
 )
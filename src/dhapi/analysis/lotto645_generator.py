@@ -0,0 +1,145 @@
+import bisect
+import functools
+import logging
+import random
+from math import comb
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from dhapi.domain.lotto645_combination import TOTAL_COMBINATIONS, rank, unrank
+from dhapi.domain.lotto645_mask import numbers_to_mask
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+
+logger = logging.getLogger(__name__)
+
+
+class Lotto645Generator:
+    """
+    C(45, 6) 개의 조합을 조합 수 체계의 순번(rank)으로 다루어, 조건을 만족하는 조합 중에서 중복 없이 균등하게 뽑습니다.
+
+    합계/홀수 개수 조건은 모든 순번에 대해 미리 계산한 배열로 허용 여부 비트셋을 만들어 적용하므로 다시 뽑는 일이 없습니다.
+    이 배열은 numpy 가 필요하며 프로세스마다 한 번만 만듭니다. 지난 당첨번호 제외만 사용할 때는 numpy 없이도 동작합니다.
+    """
+
+    def __init__(
+        self,
+        sum_range: Optional[Tuple[int, int]] = None,
+        odd_counts: Optional[Iterable[int]] = None,
+        excluded: Iterable[Sequence[int]] = (),
+        seed: Optional[int] = None,
+        use_numpy: Optional[bool] = None,
+    ):
+        """
+        :param sum_range: (최소, 최대) 번호 합 (양 끝 포함)
+        :param odd_counts: 허용할 홀수 번호 개수들 (예: [2, 3, 4])
+        :param excluded: 제외할 번호 조합들 (예: 지난 회차 당첨번호)
+        :param use_numpy: None 이면 numpy 가 설치된 경우에만 사용
+        """
+        self._sum_range = sum_range
+        self._odd_counts = None if odd_counts is None else sorted(set(odd_counts))
+        self._excluded = sorted({rank(numbers) for numbers in excluded})
+        self._np = _load_numpy(use_numpy, required=sum_range is not None or odd_counts is not None)
+        self._seed = seed
+        self._candidates = None
+
+    @property
+    def candidate_count(self) -> int:
+        if self._np is None:
+            return TOTAL_COMBINATIONS - len(self._excluded)
+        return len(self._candidate_ranks())
+
+    def sample_ranks(self, count: int) -> List[int]:
+        """
+        :return: 조건을 만족하는 서로 다른 조합 순번 count 개
+        """
+        available = self.candidate_count
+        if not 0 <= count <= available:
+            raise ValueError(f"조건을 만족하는 조합은 {available:,}개입니다 (입력된 값: {count}).")
+
+        if self._np is None:
+            # 제외할 순번을 건너뛰도록 0 ~ available-1 의 위치를 순번으로 옮김 (위치 p 는 p 보다 작거나 같은 제외 순번 수만큼 밀림)
+            positions = random.Random(self._seed).sample(range(available), count)
+            return [_skip_excluded(p, self._excluded) for p in positions]
+
+        rng = self._np.random.default_rng(self._seed)
+        return self._candidate_ranks()[rng.choice(available, size=count, replace=False)].tolist()
+
+    def generate(self, count: int) -> List[Lotto645Ticket]:
+        """
+        :return: 수동 모드(번호 6개) 티켓 count 장
+        """
+        ranks = self.sample_ranks(count)
+        if self._np is None:
+            return [Lotto645Ticket.from_mask(numbers_to_mask(unrank(r))) for r in ranks]
+
+        np = self._np
+        masks = np.zeros(len(ranks), dtype=np.uint64)
+        for numbers in _np_unrank(np, np.asarray(ranks, dtype=np.int32)):
+            masks |= np.left_shift(np.uint64(1), numbers.astype(np.uint64))
+        return [Lotto645Ticket.from_mask(mask) for mask in masks.tolist()]
+
+    def _candidate_ranks(self):
+        if self._candidates is None:
+            np = self._np
+            allowed = np.ones(TOTAL_COMBINATIONS, dtype=bool)
+            if self._sum_range is not None or self._odd_counts is not None:
+                sums, odds = _combination_table(np)
+                if self._sum_range is not None:
+                    low, high = self._sum_range
+                    allowed &= (sums >= low) & (sums <= high)
+                if self._odd_counts is not None:
+                    allowed &= np.isin(odds, self._odd_counts)
+            allowed[self._excluded] = False
+            self._candidates = np.flatnonzero(allowed).astype(np.int32)
+        return self._candidates
+
+
+def _skip_excluded(position: int, excluded: List[int]) -> int:
+    r = position
+    while True:
+        shifted = position + bisect.bisect_right(excluded, r)
+        if shifted == r:
+            return r
+        r = shifted
+
+
+def _np_unrank(np, ranks):
+    """
+    unrank() 를 배열로 수행합니다. 큰 번호부터 C(c, k) <= r 인 가장 큰 c 를 searchsorted 로 찾습니다.
+
+    :return: 6번째, 5번째, ..., 1번째로 작은 번호 배열을 차례로 내보내는 iterator
+    """
+    r = ranks.copy()
+    for k in range(6, 0, -1):
+        binomials = np.array([comb(c, k) for c in range(45)], dtype=np.int32)
+        c = np.searchsorted(binomials, r, side="right") - 1
+        r -= binomials[c]
+        yield c + 1
+
+
+@functools.lru_cache(maxsize=1)
+def _combination_table(np):
+    """
+    :return: (sums, odds). 순번 r 인 조합의 번호 합과 홀수 개수
+    """
+    sums = np.zeros(TOTAL_COMBINATIONS, dtype=np.uint16)
+    odds = np.zeros(TOTAL_COMBINATIONS, dtype=np.uint8)
+    for numbers in _np_unrank(np, np.arange(TOTAL_COMBINATIONS, dtype=np.int32)):
+        sums += numbers.astype(np.uint16)
+        odds += (numbers & 1).astype(np.uint8)
+    return sums, odds
+
+
+def _load_numpy(use_numpy: Optional[bool], required: bool):
+    if use_numpy is False:
+        if required:
+            raise RuntimeError("번호 합계/홀수 개수 조건을 사용하려면 numpy 가 필요합니다.")
+        return None
+    try:
+        # numpy 는 불러오는 데 시간이 걸리고 필수 의존성도 아니므로 실제로 번호를 만들 때만 불러옴
+        import numpy
+    except ImportError:
+        if use_numpy or required:
+            raise RuntimeError("numpy 가 설치되어 있지 않습니다. 'pip install numpy' 로 설치해주세요.")
+        logger.debug("numpy is not installed, falling back to pure python")
+        return None
+    return numpy
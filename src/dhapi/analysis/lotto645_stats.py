@@ -0,0 +1,227 @@
+import logging
+import os
+from itertools import combinations
+from typing import List, Optional, Tuple
+
+from dhapi.port.draw_history_store import DrawHistoryStore
+from dhapi.port.file_cache import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# 저장 형식을 바꾸면 올려서 이전 캐시를 버리고 다시 계산하도록 함
+_CACHE_VERSION = 1
+
+_PAIRS = list(combinations(range(6), 2))
+_TRIPLES = list(combinations(range(6), 3))
+
+# 캐시 파일에 저장하는 집계값 (모두 int64 배열). 각 값의 의미는 Lotto645Stats._reset() 참고
+_FIELDS = [
+    "frequency",
+    "bonus_frequency",
+    "pairs",
+    "triple_keys",
+    "triple_counts",
+    "last_seen",
+    "last_run",
+    "longest_run",
+    "longest_gap",
+    "gap_histogram",
+]
+
+
+class Lotto645Stats:  # pylint: disable=too-many-instance-attributes  # 집계값마다 배열 하나씩
+    """
+    저장된 당첨번호 전체에 대한 번호별 출현 횟수, 함께 나온 번호 쌍/세 번호, 연속 출현/미출현, 출현 간격 분포를 배열 연산으로 집계합니다.
+
+    집계값은 ~/.dhapi/stats.npz 에 저장해두고, 다음에는 마지막으로 집계한 회차 이후의 당첨번호만 더합니다.
+    조회는 집계해둔 배열을 읽기만 하므로 반복해서 호출해도 다시 계산하지 않습니다.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._np = _load_numpy()
+        self._path = path or os.path.expanduser("~/.dhapi/stats.npz")
+        self._reset()
+
+    def _reset(self):
+        np = self._np
+        self.last_round = 0
+        self.draw_count = 0
+        # 배열 인덱스 i 는 i + 1 번 번호
+        self.frequency = np.zeros(45, dtype=np.int64)  # 당첨번호로 나온 횟수
+        self.bonus_frequency = np.zeros(45, dtype=np.int64)  # 보너스 번호로 나온 횟수
+        self.pairs = np.zeros((45, 45), dtype=np.int64)  # 두 번호가 같은 회차에 함께 나온 횟수 (대칭)
+        self.triple_keys = np.zeros(0, dtype=np.int64)  # 함께 나온 세 번호 (a, b, c) 를 (a*45 + b)*45 + c 로 부호화한 값 (오름차순, 나온 적 있는 것만)
+        self.triple_counts = np.zeros(0, dtype=np.int64)  # triple_keys 별 횟수
+        self.last_seen = np.zeros(45, dtype=np.int64)  # 마지막으로 나온 회차 (없으면 0)
+        self.last_run = np.zeros(45, dtype=np.int64)  # last_seen 회차에서 끝나는 연속 출현 회차 수
+        self.longest_run = np.zeros(45, dtype=np.int64)  # 가장 길게 연속으로 나온 회차 수
+        self.longest_gap = np.zeros(45, dtype=np.int64)  # 다시 나오기까지 가장 오래 걸린 회차 수
+        self.gap_histogram = np.zeros(0, dtype=np.int64)  # gap_histogram[g] = 다시 나오기까지 g 회차가 걸린 횟수 (모든 번호 합산)
+
+    def update(self, store: DrawHistoryStore) -> int:
+        """
+        캐시를 읽고 그 이후 저장된 당첨번호만 더한 뒤, 바뀐 것이 있으면 캐시를 다시 저장합니다.
+
+        캐시에 더한 회차 중 일부가 비어 있다가 나중에 저장된 경우처럼 캐시와 저장소가 맞지 않으면 처음부터 다시 집계합니다.
+
+        :return: 새로 더한 회차 수
+        """
+        np = self._np
+        self._load()
+        rounds, numbers, bonus = store.read_arrays(np)
+        known = rounds <= self.last_round
+        if int(known.sum()) != self.draw_count:
+            logger.debug(f"stats cache is out of sync (cached: {self.draw_count}, stored: {int(known.sum())}), rebuilding")
+            self._reset()
+            known = np.zeros(len(rounds), dtype=bool)
+
+        new = ~known
+        folded = int(new.sum())
+        if folded:
+            self.fold(rounds[new], numbers[new], bonus[new])
+            self._save()
+        return folded
+
+    def fold(self, rounds, numbers, bonus):
+        """
+        last_round 보다 뒤의 회차들을 집계값에 더합니다.
+
+        :param rounds: (n,) 오름차순 회차
+        :param numbers: (n, 6) 당첨번호
+        :param bonus: (n,) 보너스 번호
+        """
+        np = self._np
+        if len(rounds) == 0:
+            return
+        if rounds[0] <= self.last_round:
+            raise ValueError(f"{self.last_round}회 이후의 회차만 더할 수 있습니다 (입력된 값: {int(rounds[0])}).")
+
+        idx = numbers.astype(np.int64) - 1
+        self.frequency += np.bincount(idx.ravel(), minlength=45)
+        self.bonus_frequency += np.bincount(bonus.astype(np.int64) - 1, minlength=45)
+
+        pair_codes = np.concatenate([idx[:, i] * 45 + idx[:, j] for i, j in _PAIRS])
+        pairs = np.reshape(np.bincount(pair_codes, minlength=45 * 45), (45, 45))
+        self.pairs += pairs + pairs.T
+
+        triple_codes = np.concatenate([(idx[:, i] * 45 + idx[:, j]) * 45 + idx[:, k] for i, j, k in _TRIPLES])
+        self.triple_keys, inverse = np.unique(np.concatenate([self.triple_keys, triple_codes]), return_inverse=True)
+        weights = np.concatenate([self.triple_counts, np.ones(len(triple_codes), dtype=np.int64)])
+        self.triple_counts = np.asarray(np.bincount(inverse.ravel(), weights=weights), dtype=np.int64)
+
+        self._fold_runs(rounds, idx)
+        self.last_round = int(rounds[-1])
+        self.draw_count += len(rounds)
+
+    def _fold_runs(self, rounds, idx):
+        np = self._np
+
+        # 번호별 출현 회차를 번호 -> 회차 순으로 늘어놓음. 이전에 나온 적 있는 번호는 마지막 출현 회차를 앞에 붙여서 이어지는 간격/연속 출현을 계산
+        seen_before = np.flatnonzero(self.last_seen)
+        seq_number = np.concatenate([seen_before, idx.ravel()])
+        seq_round = np.concatenate([self.last_seen[seen_before], np.repeat(rounds, 6)])
+        seq_weight = np.concatenate([self.last_run[seen_before], np.ones(idx.size, dtype=np.int64)])
+        order = np.lexsort((seq_round, seq_number))
+        seq_number, seq_round, seq_weight = seq_number[order], seq_round[order], seq_weight[order]
+
+        same_number = seq_number[1:] == seq_number[:-1]
+        self._fold_gaps(seq_number, seq_round, same_number)
+
+        # 다른 번호로 바뀌거나 바로 다음 회차가 아니면 새 연속 구간이 시작됨. 앞에 붙인 회차는 그 회차까지의 연속 출현 수를 가중치로 가짐
+        run_starts = np.flatnonzero(np.concatenate([[True], ~same_number | (seq_round[1:] - seq_round[:-1] != 1)]))
+        run_lengths = np.add.reduceat(seq_weight, run_starts)
+        run_numbers = seq_number[run_starts]
+        np.maximum.at(self.longest_run, run_numbers, run_lengths)
+
+        is_last_run = np.concatenate([run_numbers[1:] != run_numbers[:-1], [True]])
+        self.last_run[run_numbers[is_last_run]] = run_lengths[is_last_run]
+        self.last_seen[run_numbers[is_last_run]] = seq_round[np.concatenate([run_starts[1:], [len(seq_round)]]) - 1][is_last_run]
+
+    def _fold_gaps(self, seq_number, seq_round, same_number):
+        np = self._np
+        gaps = (seq_round[1:] - seq_round[:-1])[same_number]
+        gap_histogram = np.bincount(gaps)
+        if len(gap_histogram) > len(self.gap_histogram):
+            self.gap_histogram = np.concatenate([self.gap_histogram, np.zeros(len(gap_histogram) - len(self.gap_histogram), dtype=np.int64)])
+        self.gap_histogram[: len(gap_histogram)] += gap_histogram
+        np.maximum.at(self.longest_gap, seq_number[1:][same_number], gaps)
+
+    @property
+    def current_runs(self):
+        """
+        :return: (45,) 가장 최근 회차까지 연속으로 나온 회차 수 (최근 회차에 나오지 않았으면 0)
+        """
+        return self._np.where((self.last_seen == self.last_round) & (self.last_seen > 0), self.last_run, 0)
+
+    @property
+    def current_gaps(self):
+        """
+        :return: (45,) 마지막으로 나온 뒤 지난 회차 수 (나온 적 없으면 집계한 마지막 회차)
+        """
+        return self.last_round - self.last_seen
+
+    def pair_count(self, a: int, b: int) -> int:
+        return int(self.pairs[a - 1, b - 1])
+
+    def triple_count(self, a: int, b: int, c: int) -> int:
+        a, b, c = sorted((a, b, c))
+        key = ((a - 1) * 45 + (b - 1)) * 45 + (c - 1)
+        i = int(self._np.searchsorted(self.triple_keys, key))
+        return int(self.triple_counts[i]) if i < len(self.triple_keys) and self.triple_keys[i] == key else 0
+
+    def top_numbers(self, count: int, least: bool = False) -> List[Tuple[int, int]]:
+        """
+        :param least: True 면 적게 나온 번호부터
+        :return: [(번호, 횟수), ...]. 횟수가 같으면 작은 번호부터
+        """
+        np = self._np
+        order = np.lexsort((np.arange(45), self.frequency if least else -self.frequency))[:count]
+        return [(int(i) + 1, int(self.frequency[i])) for i in order]
+
+    def top_pairs(self, count: int) -> List[Tuple[Tuple[int, int], int]]:
+        np = self._np
+        a, b = np.triu_indices(45, 1)
+        counts = self.pairs[a, b]
+        order = np.lexsort((b, a, -counts))[:count]
+        return [((int(a[i]) + 1, int(b[i]) + 1), int(counts[i])) for i in order]
+
+    def top_triples(self, count: int) -> List[Tuple[Tuple[int, int, int], int]]:
+        np = self._np
+        order = np.lexsort((self.triple_keys, -self.triple_counts))[:count]
+        return [(_decode_triple(int(self.triple_keys[i])), int(self.triple_counts[i])) for i in order]
+
+    def _load(self):
+        np = self._np
+        try:
+            with np.load(self._path) as data:
+                if int(data["version"]) != _CACHE_VERSION:
+                    logger.debug("stats cache version changed, rebuilding")
+                    return
+                self.last_round = int(data["last_round"])
+                self.draw_count = int(data["draw_count"])
+                for name in _FIELDS:
+                    setattr(self, name, data[name])
+        except (FileNotFoundError, ValueError, KeyError, OSError) as e:
+            logger.debug(f"stats cache is not available ({e!r}), rebuilding")
+            self._reset()
+
+    def _save(self):
+        np = self._np
+        # 여러 프로세스가 동시에 갱신할 수 있으므로 임시 파일에 쓴 뒤 교체
+        with atomic_write(self._path, binary=True) as f:
+            np.savez(f, version=_CACHE_VERSION, last_round=self.last_round, draw_count=self.draw_count, **{name: getattr(self, name) for name in _FIELDS})
+
+
+def _decode_triple(key: int) -> Tuple[int, int, int]:
+    ab, c = divmod(key, 45)
+    a, b = divmod(ab, 45)
+    return a + 1, b + 1, c + 1
+
+
+def _load_numpy():
+    try:
+        # numpy 는 불러오는 데 시간이 걸리고 필수 의존성도 아니므로 실제로 통계를 계산할 때만 불러옴
+        import numpy
+    except ImportError:
+        raise RuntimeError("통계를 계산하려면 numpy 가 필요합니다. 'pip install numpy' 로 설치해주세요.")
+    return numpy
@@ -0,0 +1,199 @@
+import logging
+from typing import Dict, List, Optional, Sequence, Union
+
+from dhapi.domain.lotto645_draw import Lotto645Draw
+from dhapi.domain.lotto645_mask import numbers_to_mask, popcount
+from dhapi.domain.lotto645_ticket import Lotto645Mode, Lotto645Ticket
+from dhapi.port.draw_history_store import DrawHistoryStore
+
+logger = logging.getLogger(__name__)
+
+NO_PRIZE = 0
+TIER_NAMES = {1: "1등", 2: "2등", 3: "3등", 4: "4등", 5: "5등"}
+
+# 맞힌 번호 개수별 등수 (5개 일치 + 보너스 번호 일치는 2등으로 따로 처리)
+_TIER_BY_MATCHED = [NO_PRIZE, NO_PRIZE, NO_PRIZE, 5, 4, 3, 1]
+
+
+def prize_tier(mask: int, draw_mask: int, bonus_mask: int) -> int:
+    """
+    :param mask: 티켓 번호의 비트마스크 (ticket_mask() 참고)
+    :return: 1 ~ 5 (등수), 낙첨이면 NO_PRIZE
+    """
+    matched = popcount(mask & draw_mask)
+    if matched == 5 and mask & bonus_mask:
+        return 2
+    return _TIER_BY_MATCHED[matched]
+
+
+def ticket_mask(ticket: Union[Lotto645Ticket, Dict, str]) -> int:
+    """
+    :param ticket: Lotto645Ticket, buy_lotto645 결과의 슬롯({"slot": "A", "mode": "자동", "numbers": ["01", ...]}),
+                   또는 arrGameChoiceNum 의 원소("A|01|02|04|27|39|443")
+    """
+    if isinstance(ticket, Lotto645Ticket):
+        if ticket.mode != Lotto645Mode.MANUAL:
+            raise ValueError(f"당첨 여부는 번호 6개가 모두 정해진 티켓만 확인할 수 있습니다 (입력된 값: {ticket.numbers}).")
+        return ticket.mask
+    elif isinstance(ticket, dict):
+        numbers = [int(n) for n in ticket["numbers"]]
+    elif isinstance(ticket, str):
+        numbers = [int(n) for n in ticket[2:-1].split("|")]  # 슬롯|번호1|...|번호6+모드
+    else:
+        raise ValueError(f"지원하지 않는 티켓 형식입니다 (입력된 값: {ticket!r}).")
+
+    if len(numbers) != 6:
+        raise ValueError(f"당첨 여부는 번호 6개가 모두 정해진 티켓만 확인할 수 있습니다 (입력된 값: {numbers}).")
+    return numbers_to_mask(numbers)
+
+
+class Lotto645Win:
+    def __init__(self, ticket_index: int, round_no: int, tier: int):
+        self.ticket_index = ticket_index
+        self.round_no = round_no
+        self.tier = tier
+
+    @property
+    def tier_name(self) -> str:
+        return TIER_NAMES[self.tier]
+
+    def __eq__(self, other):
+        if not isinstance(other, Lotto645Win):
+            return NotImplemented
+        return (self.ticket_index, self.round_no, self.tier) == (other.ticket_index, other.round_no, other.tier)
+
+    def __repr__(self):
+        return f"Lotto645Win(ticket_index={self.ticket_index}, round_no={self.round_no}, tier={self.tier})"
+
+
+class Lotto645WinChecker:
+    """
+    당첨번호를 비트마스크로 한 번 만들어두고, 여러 티켓을 여러 회차와 한꺼번에 비교합니다.
+
+    numpy 가 설치되어 있으면 (티켓 x 회차) 전체를 배열 연산으로 계산하고, 없으면 같은 계산을 정수 비트 연산으로 수행합니다.
+    """
+
+    # numpy 경로에서 한 번에 계산할 (티켓 x 회차) 칸 수. 중간 배열이 수십 MB 를 넘지 않도록 티켓을 나누어 계산
+    _chunk_cells = 1 << 20
+
+    def __init__(self, draws: Sequence[Lotto645Draw], use_numpy: Optional[bool] = None):
+        """
+        :param use_numpy: None 이면 numpy 가 설치된 경우에만 사용
+        """
+        self._np = _load_numpy(use_numpy)
+        self._init_masks(
+            [d.round_no for d in draws],
+            [numbers_to_mask(d.numbers) for d in draws],
+            [1 << d.bonus for d in draws],
+        )
+
+    @classmethod
+    def from_store(cls, store: DrawHistoryStore, use_numpy: Optional[bool] = None) -> "Lotto645WinChecker":
+        np = _load_numpy(use_numpy)
+        if np is None:
+            return cls(store.read_draws(), use_numpy=False)
+
+        # 저장 파일을 그대로 배열로 읽어 Lotto645Draw 객체를 만들지 않고 비트마스크를 계산
+        checker = cls.__new__(cls)
+        checker._np = np
+        rounds, numbers, bonus = store.read_arrays(np)
+        numbers = numbers.astype(np.uint64)
+        bonus = bonus.astype(np.uint64)
+        one = np.uint64(1)
+        checker._rounds = rounds.tolist()
+        checker._draw_masks = np.bitwise_or.reduce(np.left_shift(one, numbers), axis=1) if len(numbers) else np.zeros(0, dtype=np.uint64)
+        checker._bonus_masks = np.left_shift(one, bonus)
+        checker._column_by_round = {round_no: i for i, round_no in enumerate(checker._rounds)}
+        return checker
+
+    def _init_masks(self, rounds: List[int], draw_masks: List[int], bonus_masks: List[int]):
+        self._rounds = rounds
+        if self._np is not None:
+            self._draw_masks = self._np.array(draw_masks, dtype=self._np.uint64)
+            self._bonus_masks = self._np.array(bonus_masks, dtype=self._np.uint64)
+        else:
+            self._draw_masks = draw_masks
+            self._bonus_masks = bonus_masks
+        self._column_by_round = {round_no: i for i, round_no in enumerate(rounds)}
+
+    @property
+    def rounds(self) -> List[int]:
+        return list(self._rounds)
+
+    def tiers(self, ticket_masks: Sequence[int]):
+        """
+        :return: tiers[i][j] = i 번째 티켓의 j 번째 회차(rounds[j]) 등수. numpy 경로에서는 (티켓 수, 회차 수) uint8 배열
+        """
+        if self._np is None:
+            return [[prize_tier(t, d, b) for d, b in zip(self._draw_masks, self._bonus_masks)] for t in ticket_masks]
+
+        np = self._np
+        tickets = np.asarray(ticket_masks, dtype=np.uint64)
+        out = np.empty((len(tickets), len(self._rounds)), dtype=np.uint8)
+        rows = max(1, self._chunk_cells // max(1, len(self._rounds)))
+        for start in range(0, len(tickets), rows):
+            t = tickets[start : start + rows, None]
+            out[start : start + rows] = _np_tiers(np, t, self._draw_masks[None, :], self._bonus_masks[None, :])
+        return out
+
+    def find_wins(self, ticket_masks: Sequence[int], rounds: Optional[Sequence[int]] = None) -> List[Lotto645Win]:
+        """
+        :param rounds: 지정하면 i 번째 티켓은 rounds[i] 회차와만 비교 (구매한 회차 확인용). 생략하면 모든 회차와 비교
+        :return: 당첨된 (티켓, 회차) 목록. 저장되지 않은 회차는 건너뜀
+        """
+        if rounds is None:
+            return self._find_wins_in_all_rounds(ticket_masks)
+
+        indices = [i for i, round_no in enumerate(rounds) if round_no in self._column_by_round]
+        columns = [self._column_by_round[rounds[i]] for i in indices]
+        if self._np is None:
+            tiers = [prize_tier(ticket_masks[i], self._draw_masks[c], self._bonus_masks[c]) for i, c in zip(indices, columns)]
+        else:
+            np = self._np
+            tickets = np.asarray([ticket_masks[i] for i in indices], dtype=np.uint64)
+            columns = np.asarray(columns, dtype=np.intp)
+            tiers = _np_tiers(np, tickets, self._draw_masks[columns], self._bonus_masks[columns]).tolist()
+        return [Lotto645Win(i, rounds[i], tier) for i, tier in zip(indices, tiers) if tier != NO_PRIZE]
+
+    def check_tickets(self, tickets: Sequence[Union[Lotto645Ticket, Dict, str]], rounds: Optional[Sequence[int]] = None) -> List[Lotto645Win]:
+        """
+        find_wins 와 같으나 티켓을 ticket_mask() 가 받는 형식으로 받습니다.
+        """
+        return self.find_wins([ticket_mask(t) for t in tickets], rounds)
+
+    def _find_wins_in_all_rounds(self, ticket_masks: Sequence[int]) -> List[Lotto645Win]:
+        tiers = self.tiers(ticket_masks)
+        if self._np is None:
+            return [Lotto645Win(i, self._rounds[j], tier) for i, row in enumerate(tiers) for j, tier in enumerate(row) if tier != NO_PRIZE]
+
+        ticket_indices, columns = self._np.nonzero(tiers)
+        return [Lotto645Win(int(i), self._rounds[j], int(tiers[i, j])) for i, j in zip(ticket_indices.tolist(), columns.tolist())]
+
+
+def _load_numpy(use_numpy: Optional[bool]):
+    if use_numpy is False:
+        return None
+    try:
+        # numpy 는 불러오는 데 시간이 걸리고 필수 의존성도 아니므로 실제로 당첨 확인을 할 때만 불러옴
+        import numpy
+    except ImportError:
+        if use_numpy:
+            raise RuntimeError("numpy 가 설치되어 있지 않습니다. 'pip install numpy' 로 설치해주세요.")
+        logger.debug("numpy is not installed, falling back to pure python")
+        return None
+    return numpy
+
+
+def _np_popcount(np, masks):
+    if hasattr(np, "bitwise_count"):  # numpy 2.0+
+        return np.bitwise_count(masks)
+    masks = np.ascontiguousarray(masks)
+    byte_popcount = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    return byte_popcount[masks.view(np.uint8).reshape(masks.shape + (8,))].sum(axis=-1, dtype=np.uint8)
+
+
+def _np_tiers(np, tickets, draws, bonuses):
+    matched = _np_popcount(np, tickets & draws)
+    tiers = np.asarray(_TIER_BY_MATCHED, dtype=np.uint8)[matched]
+    tiers[(matched == 5) & ((tickets & bonuses) != 0)] = 2
+    return tiers
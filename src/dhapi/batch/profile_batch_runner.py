@@ -0,0 +1,41 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileResult:
+    def __init__(self, profile_name: str, error: Optional[Exception] = None):
+        self.profile_name = profile_name
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class ProfileBatchRunner:
+    def __init__(self, max_workers: int = 8):
+        if max_workers < 1:
+            raise ValueError(f"동시 작업 수는 1 이상이어야 합니다 (입력된 값: {max_workers}).")
+        self._max_workers = max_workers
+
+    def run(self, profile_names: List[str], task: Callable[[str], None]) -> List[ProfileResult]:
+        """
+        프로필별 작업을 최대 max_workers 개씩 동시에 수행합니다. 일부 프로필이 실패해도 나머지 작업은 계속 진행됩니다.
+
+        :return: profile_names 와 같은 순서의 프로필별 결과
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, max(len(profile_names), 1))) as executor:
+            futures = {executor.submit(task, profile_name): profile_name for profile_name in profile_names}
+            for future in as_completed(futures):
+                profile_name = futures[future]
+                try:
+                    future.result()
+                    results[profile_name] = ProfileResult(profile_name)
+                except Exception as e:
+                    logger.debug(f"'{profile_name}' failed: {e!r}")
+                    results[profile_name] = ProfileResult(profile_name, e)
+        return [results[profile_name] for profile_name in profile_names]
@@ -0,0 +1,41 @@
+from math import comb
+from typing import List, Sequence
+
+# 1 ~ 45 중 6개를 고르는 조합의 수
+TOTAL_COMBINATIONS = comb(45, 6)
+
+# _BINOMIALS[k][c] = C(c, k) (c = 0 ~ 45, k = 0 ~ 6)
+_BINOMIALS = [[comb(c, k) for c in range(46)] for k in range(7)]
+
+
+def rank(numbers: Sequence[int]) -> int:
+    """
+    조합 수 체계(combinatorial number system)의 colex 순서로 6개 번호 조합의 순번을 구합니다.
+
+    정렬한 번호 n1 < n2 < ... < n6 에 대해 C(n1 - 1, 1) + C(n2 - 1, 2) + ... + C(n6 - 1, 6) 이며, 0 ~ TOTAL_COMBINATIONS - 1 의 값입니다.
+    """
+    numbers = sorted(numbers)
+    if len(numbers) != 6 or len(set(numbers)) != 6 or not all(1 <= n <= 45 for n in numbers):
+        raise ValueError(f"서로 다른 1부터 45까지의 숫자 6개를 입력해야 합니다 (입력된 값: {','.join(map(str, numbers))}).")
+    return sum(_BINOMIALS[k][n - 1] for k, n in enumerate(numbers, start=1))
+
+
+def unrank(r: int) -> List[int]:
+    """
+    rank() 의 역함수. 큰 번호부터 C(c, k) <= r 인 가장 큰 c 를 찾으며, 번호가 줄어드는 방향으로만 찾으므로 전체 45번 이내로 비교합니다.
+
+    :return: 정렬된 번호 6개
+    """
+    if not 0 <= r < TOTAL_COMBINATIONS:
+        raise ValueError(f"조합 순번은 0부터 {TOTAL_COMBINATIONS - 1}까지만 사용할 수 있습니다 (입력된 값: {r}).")
+
+    numbers = [0] * 6
+    c = 45
+    for k in range(6, 0, -1):
+        row = _BINOMIALS[k]
+        c -= 1
+        while row[c] > r:
+            c -= 1
+        r -= row[c]
+        numbers[k - 1] = c + 1
+    return numbers
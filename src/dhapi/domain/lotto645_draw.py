@@ -0,0 +1,37 @@
+import datetime
+from typing import List
+
+from dhapi.domain.lotto645_round import get_lotto645_draw_date
+
+
+class Lotto645Draw:
+    """
+    한 회차의 로또6/45 당첨번호 (번호 6개 + 보너스 번호)
+    """
+
+    def __init__(self, round_no: int, numbers: List[int], bonus: int):
+        if round_no < 1:
+            raise ValueError(f"회차는 1 이상이어야 합니다 (입력된 값: {round_no}).")
+        if len(numbers) != 6 or len(set(numbers)) != 6:
+            raise ValueError(f"당첨번호는 중복되지 않는 6개의 숫자여야 합니다 (입력된 값: {numbers}).")
+        for n in [*numbers, bonus]:
+            if not 1 <= n <= 45:
+                raise ValueError(f"각 번호는 1부터 45까지의 숫자만 사용할 수 있습니다 (입력된 값: {n}).")
+        if bonus in numbers:
+            raise ValueError(f"보너스 번호는 당첨번호와 겹칠 수 없습니다 (입력된 값: {bonus}).")
+
+        self.round_no = round_no
+        self.numbers = sorted(numbers)
+        self.bonus = bonus
+
+    @property
+    def draw_date(self) -> datetime.date:
+        return get_lotto645_draw_date(self.round_no)
+
+    def __eq__(self, other):
+        if not isinstance(other, Lotto645Draw):
+            return NotImplemented
+        return (self.round_no, self.numbers, self.bonus) == (other.round_no, other.numbers, other.bonus)
+
+    def __repr__(self):
+        return f"Lotto645Draw(round_no={self.round_no}, numbers={self.numbers}, bonus={self.bonus})"
@@ -0,0 +1,22 @@
+from typing import Iterable, List
+
+# n 번 번호를 n 번째 비트로 표현 (0 번 비트는 사용하지 않음). 45개 번호가 64비트 정수 하나에 들어감
+ALL_NUMBERS_MASK = ((1 << 46) - 1) & ~1
+
+
+def numbers_to_mask(numbers: Iterable[int]) -> int:
+    mask = 0
+    for n in numbers:
+        if not 1 <= n <= 45:
+            raise ValueError(f"각 번호는 1부터 45까지의 숫자만 사용할 수 있습니다 (입력된 값: {n}).")
+        mask |= 1 << n
+    return mask
+
+
+def mask_to_numbers(mask: int) -> List[int]:
+    return [n for n in range(1, 46) if mask >> n & 1]
+
+
+def popcount(mask: int) -> int:
+    # int.bit_count 는 python 3.10 부터 지원
+    return bin(mask).count("1")
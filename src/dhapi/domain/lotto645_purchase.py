@@ -0,0 +1,32 @@
+import datetime
+from typing import List, Optional
+
+
+class Lotto645Purchase:
+    """
+    구매한 로또6/45 티켓 한 장 (구매 내역 한 줄)
+    """
+
+    def __init__(self, profile_name: str, round_no: int, slot: str, mode: str, numbers: List[int], *, purchased_at: Optional[datetime.datetime] = None):
+        self.profile_name = profile_name
+        self.round_no = round_no
+        self.slot = slot
+        self.mode = mode
+        self.numbers = numbers
+        self.purchased_at = purchased_at or datetime.datetime.now(datetime.timezone.utc)
+
+    @staticmethod
+    def from_slots(profile_name: str, round_no: int, slots: List[dict], purchased_at: Optional[datetime.datetime] = None) -> List["Lotto645Purchase"]:
+        """
+        :param slots: buy_lotto645 결과 슬롯 [{"slot": "A", "mode": "자동", "numbers": ["01", ...]}, ...]
+        """
+        purchased_at = purchased_at or datetime.datetime.now(datetime.timezone.utc)
+        return [Lotto645Purchase(profile_name, round_no, s["slot"], s["mode"], [int(n) for n in s["numbers"]], purchased_at=purchased_at) for s in slots]
+
+    def __eq__(self, other):
+        if not isinstance(other, Lotto645Purchase):
+            return NotImplemented
+        return vars(self) == vars(other)
+
+    def __repr__(self):
+        return f"Lotto645Purchase(profile_name={self.profile_name!r}, round_no={self.round_no}, slot={self.slot!r}, mode={self.mode!r}, numbers={self.numbers})"
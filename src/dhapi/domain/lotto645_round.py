@@ -0,0 +1,61 @@
+import datetime
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+
+# 1회차 판매 마감 시각 (2002-12-07 토요일 20시). 이후 매주 같은 시각에 다음 회차로 넘어감
+_FIRST_ROUND_SALES_CLOSE = datetime.datetime(2002, 12, 7, 20, 0, tzinfo=KST)
+_WEEK = datetime.timedelta(weeks=1)
+# 판매 마감 후 다음 회차 판매가 시작되기까지 (토요일 20시 ~ 일요일 6시)
+_ROLLOVER = datetime.timedelta(hours=10)
+
+
+def get_lotto645_round_on_sale(now: datetime.datetime) -> int:
+    """
+    주어진 시각에 판매 중인(혹은 다음으로 판매될) 로또6/45 회차를 계산합니다.
+
+    :param now: timezone 정보가 있는 시각
+    """
+    if now.tzinfo is None:
+        raise ValueError("timezone 정보가 있는 시각을 입력해야 합니다.")
+
+    closed_rounds = (now - _FIRST_ROUND_SALES_CLOSE) // _WEEK + 1
+    return max(closed_rounds, 0) + 1
+
+
+def is_lotto645_round_rollover(now: datetime.datetime) -> bool:
+    """
+    판매 마감(토요일 20시) 후 다음 회차 판매가 시작되기 전(일요일 6시)까지인지 여부. 이 동안에는 계산한 회차는 이미 다음 회차지만 사이트는 아직 이전 회차를 보여줄 수 있음
+
+    :param now: timezone 정보가 있는 시각
+    """
+    if now.tzinfo is None:
+        raise ValueError("timezone 정보가 있는 시각을 입력해야 합니다.")
+
+    since_close = (now - _FIRST_ROUND_SALES_CLOSE) % _WEEK
+    return since_close < _ROLLOVER
+
+
+def get_lotto645_draw_date(round_no: int) -> datetime.date:
+    return (_FIRST_ROUND_SALES_CLOSE + _WEEK * (round_no - 1)).date()
+
+
+def parse_kst_datetime(value: str, now: datetime.datetime) -> datetime.datetime:
+    """
+    "HH:MM[:SS]" 또는 "YYYY-MM-DD HH:MM[:SS]" 형식의 한국 시각을 읽습니다. 날짜를 생략하면 now 의 (한국) 날짜로 봅니다.
+
+    :param now: timezone 정보가 있는 현재 시각
+    :raise ValueError: 형식이 잘못되었거나 now 보다 이전 시각인 경우
+    """
+    value = value.strip()
+    try:
+        if " " in value or "T" in value:
+            at = datetime.datetime.fromisoformat(value)
+        else:
+            at = datetime.datetime.combine(now.astimezone(KST).date(), datetime.time.fromisoformat(value))
+    except ValueError:
+        raise ValueError(f"시각은 'HH:MM[:SS]' 또는 'YYYY-MM-DD HH:MM[:SS]' 형식으로 입력해주세요 (입력된 값: {value}).")
+
+    at = at.replace(tzinfo=KST) if at.tzinfo is None else at.astimezone(KST)
+    if at <= now:
+        raise ValueError(f"이미 지난 시각입니다 (입력된 값: {at:%Y-%m-%d %H:%M:%S} KST).")
+    return at
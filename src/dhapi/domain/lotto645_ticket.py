@@ -1,5 +1,7 @@
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from dhapi.domain.lotto645_mask import ALL_NUMBERS_MASK, mask_to_numbers, popcount
 
 
 class Lotto645Mode(str, Enum):
@@ -9,30 +11,48 @@ class Lotto645Mode(str, Enum):
 
 
 class Lotto645Ticket:
+    # 수십만 장을 만들어도 가볍도록 번호는 비트마스크(n 번 번호 = n 번째 비트) 하나로만 저장
+    __slots__ = ("mask",)
+
     def __init__(self, numbers: Optional[str] = None):
         try:
-            if not numbers:
-                self.numbers = []
-            else:
-                self.numbers = sorted(list(map(int, numbers.split(","))))
+            values = [] if not numbers else list(map(int, numbers.split(",")))
         except ValueError:
             raise ValueError(f"숫자를 입력하세요 (입력된 값: {numbers}).")
 
-        if len(self.numbers) != len(set(self.numbers)):
-            raise ValueError(f"중복되지 않도록 숫자들을 입력하세요 (입력된 값: {numbers}).")
+        self.mask = _validate(values, numbers)
 
-        for n in self.numbers:
-            if not 1 <= n <= 45:
-                raise ValueError(f"각 번호는 1부터 45까지의 숫자만 사용할 수 있습니다 (입력된 값: {n}).")
+    @classmethod
+    def from_mask(cls, mask: int) -> "Lotto645Ticket":
+        invalid = mask & ~ALL_NUMBERS_MASK
+        if invalid:
+            lowest = (invalid & -invalid).bit_length() - 1
+            raise ValueError(f"각 번호는 1부터 45까지의 숫자만 사용할 수 있습니다 (입력된 값: {lowest}).")
+        if popcount(mask) > 6:
+            raise ValueError(f"숫자는 0개 이상 6개 이하의 숫자를 입력해야 합니다 (입력된 값: {','.join(map(str, mask_to_numbers(mask)))}).")
 
-        if len(self.numbers) == 6:
-            self.mode = Lotto645Mode.MANUAL
-        elif 1 <= len(self.numbers) <= 5:
-            self.mode = Lotto645Mode.SEMIAUTO
-        elif len(self.numbers) == 0:
-            self.mode = Lotto645Mode.AUTO
-        else:
-            raise ValueError(f"숫자는 0개 이상 6개 이하의 숫자를 입력해야 합니다 (입력된 값: {numbers}).")
+        ticket = cls.__new__(cls)
+        ticket.mask = mask
+        return ticket
+
+    @classmethod
+    def from_numbers(cls, numbers: Sequence[int]) -> "Lotto645Ticket":
+        ticket = cls.__new__(cls)
+        ticket.mask = _validate(numbers, ",".join(map(str, numbers)))
+        return ticket
+
+    @property
+    def numbers(self) -> List[int]:
+        return mask_to_numbers(self.mask)
+
+    @property
+    def mode(self) -> Lotto645Mode:
+        count = popcount(self.mask)
+        if count == 6:
+            return Lotto645Mode.MANUAL
+        if count == 0:
+            return Lotto645Mode.AUTO
+        return Lotto645Mode.SEMIAUTO
 
     @property
     def mode_kor(self):
@@ -45,6 +65,9 @@ class Lotto645Ticket:
         else:
             raise RuntimeError("지원하지 않는 게임 타입입니다.")
 
+    def __repr__(self):
+        return f"Lotto645Ticket({','.join(map(str, self.numbers))!r})"
+
     @staticmethod
     def create_auto_tickets(count: int):
         return [Lotto645Ticket() for _ in range(count)]
@@ -52,3 +75,156 @@ class Lotto645Ticket:
     @staticmethod
     def create_tickets(numbers_list: List[str]):
         return [Lotto645Ticket(numbers) for numbers in numbers_list]
+
+    @staticmethod
+    def create_tickets_bulk(rows: Iterable[Union[str, Sequence[int], None]]) -> "Lotto645TicketBatch":
+        """
+        여러 줄을 한 번에 검증하여 티켓으로 만듭니다. 잘못된 줄이 있어도 멈추지 않고 줄별 오류로 모아서 돌려줍니다.
+
+        numpy 가 설치되어 있으면 중복/범위/개수 검증을 배열 연산으로 한꺼번에 수행하며, 오류 메시지는 생성자와 같습니다.
+
+        :param rows: 생성자와 같은 쉼표 구분 문자열, 또는 번호 목록
+        """
+        return _create_tickets_bulk(list(rows))
+
+
+class Lotto645TicketBatch:
+    def __init__(self, tickets: List[Optional[Lotto645Ticket]], errors: Dict[int, str]):
+        """
+        :param tickets: 입력 순서대로 만든 티켓. 오류가 난 줄은 None
+        :param errors: {줄 번호(0부터): 오류 메시지}
+        """
+        self.tickets = tickets
+        self.errors = errors
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def valid_tickets(self) -> List[Lotto645Ticket]:
+        return [t for t in self.tickets if t is not None]
+
+
+def _validate(values: Sequence[int], raw) -> int:
+    """
+    생성자와 같은 순서(중복 -> 범위 -> 개수)로 검증하고 비트마스크를 돌려줍니다.
+    """
+    mask = 0
+    out_of_range = None
+    for n in values:
+        if 1 <= n <= 45:
+            mask |= 1 << n
+        elif out_of_range is None or n < out_of_range:
+            out_of_range = n
+
+    if out_of_range is None:
+        # 범위 안의 숫자만 있으면 비트 수가 곧 서로 다른 숫자의 개수
+        if popcount(mask) != len(values):
+            raise ValueError(f"중복되지 않도록 숫자들을 입력하세요 (입력된 값: {raw}).")
+    else:
+        if len(set(values)) != len(values):
+            raise ValueError(f"중복되지 않도록 숫자들을 입력하세요 (입력된 값: {raw}).")
+        raise ValueError(f"각 번호는 1부터 45까지의 숫자만 사용할 수 있습니다 (입력된 값: {out_of_range}).")
+
+    if len(values) > 6:
+        raise ValueError(f"숫자는 0개 이상 6개 이하의 숫자를 입력해야 합니다 (입력된 값: {raw}).")
+    return mask
+
+
+def _parse_row(row):
+    """
+    :return: (번호 목록, 오류 메시지에 표시할 입력값)
+    """
+    if row is None or isinstance(row, str):
+        try:
+            return ([] if not row else list(map(int, row.split(",")))), row
+        except ValueError:
+            raise ValueError(f"숫자를 입력하세요 (입력된 값: {row}).")
+    try:
+        values = [int(n) for n in row]
+    except (TypeError, ValueError):
+        raise ValueError(f"숫자를 입력하세요 (입력된 값: {row}).")
+    return values, ",".join(map(str, values))
+
+
+def _new_ticket(mask: int) -> Lotto645Ticket:
+    ticket = Lotto645Ticket.__new__(Lotto645Ticket)
+    ticket.mask = mask
+    return ticket
+
+
+def _create_tickets_bulk(rows: list) -> Lotto645TicketBatch:
+    masks = _bulk_masks(rows)
+
+    tickets: List[Optional[Lotto645Ticket]] = [None] * len(rows)
+    errors: Dict[int, str] = {}
+    for i, (row, mask) in enumerate(zip(rows, masks)):
+        if mask is None:
+            # 배열 연산으로 검증하지 못했거나 잘못된 줄은 생성자와 같은 경로로 다시 검증하여 같은 오류 메시지를 만듦
+            try:
+                mask = _validate(*_parse_row(row))
+            except ValueError as e:
+                errors[i] = e.args[0]
+                continue
+        tickets[i] = _new_ticket(mask)
+
+    return Lotto645TicketBatch(tickets, errors)
+
+
+def _bulk_masks(rows: list) -> List[Optional[int]]:
+    """
+    :return: 줄별 비트마스크. 검증에 실패했거나 numpy 가 없어 검증하지 않은 줄은 None
+    """
+    try:
+        # 필수 의존성이 아니므로 있을 때만 사용
+        import numpy as np
+    except ImportError:
+        return [None] * len(rows)
+
+    parsed = _np_parse(np, rows)
+    if parsed is None:
+        return [None] * len(rows)
+    flat, lengths = parsed
+
+    # 줄마다 (1 << n) 을 OR 하여 비트마스크를, 범위를 벗어난 숫자의 개수를 함께 구함 (빈 줄은 reduceat 에서 제외)
+    in_range = (flat >= 1) & (flat <= 45)
+    bits = np.where(in_range, np.left_shift(np.uint64(1), np.where(in_range, flat, 0).astype(np.uint64)), np.uint64(0))
+    masks = np.zeros(len(rows), dtype=np.uint64)
+    out_of_range = np.zeros(len(rows), dtype=np.int64)
+    non_empty = np.flatnonzero(lengths)
+    if len(non_empty):
+        starts = (np.cumsum(lengths) - lengths)[non_empty]
+        masks[non_empty] = np.bitwise_or.reduceat(bits, starts)
+        out_of_range[non_empty] = np.add.reduceat((~in_range).astype(np.int64), starts)
+
+    distinct = np.bitwise_count(masks) if hasattr(np, "bitwise_count") else np.fromiter(map(popcount, masks.tolist()), dtype=np.int64, count=len(rows))
+    valid = (out_of_range == 0) & (distinct == lengths) & (lengths <= 6)
+    return [m if ok else None for m, ok in zip(masks.tolist(), valid.tolist())]
+
+
+def _np_parse(np, rows: list):
+    """
+    모든 줄을 쉼표로 나눈 토큰을 한 번에 숫자 배열로 바꿉니다.
+
+    :return: (모든 숫자를 이어 붙인 배열, 줄별 숫자 개수). 숫자가 아닌 값이 섞여 있으면 None
+    """
+    if all(row is None or isinstance(row, str) for row in rows):
+        tokens = [row.split(",") if row else [] for row in rows]
+        lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(rows))
+        try:
+            # 생성자와 같이 int() 로 읽으므로 앞뒤 공백은 허용하고, 빈 값이나 숫자가 아닌 값이 있으면 실패
+            flat = np.array([token for row_tokens in tokens for token in row_tokens], dtype=np.int64)
+        except (ValueError, OverflowError):
+            return None
+    else:
+        try:
+            values = [[] if row is None else [int(n) for n in row] for row in rows]
+        except (TypeError, ValueError):
+            return None
+        lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(rows))
+        flat = np.fromiter((n for row in values for n in row), dtype=np.int64, count=int(lengths.sum()))
+
+    if len(flat) != lengths.sum():
+        return None
+    return flat, lengths
@@ -0,0 +1,115 @@
+import datetime
+import threading
+from typing import Dict, List, Optional
+
+
+class LotteryJsonEndpoint:
+    """
+    LotteryStdoutPrinter 대신 결과를 JSON 으로 보낼 수 있는 dict 로 모아둡니다.
+
+    결과는 호출한 스레드별로 보관하므로, 여러 요청이 같은 LotteryClient 를 동시에 써도 서로의 결과가 섞이지 않습니다.
+
+    usage:
+        client.show_balance()
+        result = endpoint.take_result()
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def take_result(self) -> Optional[Dict]:
+        """
+        :return: 이 스레드에서 마지막으로 받은 결과 (없으면 None). 돌려준 결과는 지움
+        """
+        result = getattr(self._local, "result", None)
+        self._local.result = None
+        return result
+
+    def _put(self, kind: str, result: Dict):
+        self._write({"type": kind, **result})
+
+    def _write(self, record: Dict):
+        """
+        결과를 어디로 보낼지 정하는 hook 입니다. 하위 클래스(LotteryJsonPrinter)는 레코드를 그대로 출력합니다.
+
+        :param record: {"type": 결과 종류 (print_result_of_ 뒤의 이름), ...결과}
+        """
+        self._local.result = {key: value for key, value in record.items() if key != "type"}
+
+    def print_result_of_assign_virtual_account(self, 전용가상계좌, 결제신청금액):
+        self._put("assign_virtual_account", {"account": 전용가상계좌, "amount": 결제신청금액})
+
+    def print_result_of_show_balance(  # pylint: disable=too-many-positional-arguments
+        self, 총예치금, 구매가능금액, 예약구매금액, 출금신청중금액, 구매불가능금액, 이번달누적구매금액, *, fetched_at: Optional[float] = None
+    ):
+        """
+        :param fetched_at: 보관해둔 조회 결과인 경우 조회한 시각 (epoch seconds)
+        """
+        self._put(
+            "show_balance",
+            {
+                "total": 총예치금,
+                "available": 구매가능금액,
+                "reserved": 예약구매금액,
+                "withdrawal_pending": 출금신청중금액,
+                "unavailable": 구매불가능금액,
+                "purchased_this_month": 이번달누적구매금액,
+                "cached": fetched_at is not None,
+                "fetched_at": None if fetched_at is None else datetime.datetime.fromtimestamp(fetched_at, datetime.timezone.utc).isoformat(),
+            },
+        )
+
+    def print_result_of_buy_lotto645(self, slots: List[Dict]):
+        """
+        :param slots: [{"slot": "A", "mode": "자동", "numbers": ["01", ...]}, ...]
+        """
+        self._put("buy_lotto645", {"slots": [{"slot": s["slot"], "mode": s["mode"], "numbers": [int(n) for n in s["numbers"]]} for s in slots]})
+
+    def print_result_of_sync_lotto645_draws(self, synced_count: int, stored_count: int, latest_draw):
+        self._put("sync_lotto645_draws", {"synced": synced_count, "stored": stored_count, "latest_round": latest_draw.round_no if latest_draw is not None else None})
+
+    def print_result_of_check_wins(self, tickets: List[List[int]], checked_rounds: List[int], wins, labels: Optional[List[str]] = None):
+        labels = labels or [str(i + 1) for i in range(len(tickets))]
+        self._put(
+            "check_wins",
+            {
+                "ticket_count": len(tickets),
+                "round_count": len(checked_rounds),
+                "wins": [
+                    {"ticket": labels[w.ticket_index], "numbers": list(tickets[w.ticket_index]), "round": w.round_no, "tier": w.tier, "tier_name": w.tier_name}
+                    for w in sorted(wins, key=lambda w: (w.tier, w.round_no, w.ticket_index))
+                ],
+            },
+        )
+
+    def print_result_of_ticket_import(self, ticket_import, orders):
+        self._put(
+            "ticket_import",
+            {
+                "rows": ticket_import.row_count,
+                "tickets": sum(len(order.tickets) for order in orders),
+                "over_limit": ticket_import.over_limit_count,
+                "rejected": ticket_import.rejected_count,
+                "rejected_rows": [{"line": rejected.line_no, "reason": rejected.reason} for rejected in ticket_import.rejected_rows],
+            },
+        )
+
+    def print_result_of_purchase_intents(self, intents, open_only: bool = True):
+        self._put("purchase_intents", {"open_only": open_only, "intents": [_intent_to_dict(intent) for intent in intents]})
+
+    def print_result_of_resolve_purchase_intent(self, intent):
+        self._put("resolve_purchase_intent", _intent_to_dict(intent))
+
+    def print_result_of_profile_batch(self, results):
+        self._put(
+            "profile_batch",
+            {
+                "succeeded": sum(1 for r in results if r.ok),
+                "failed": sum(1 for r in results if not r.ok),
+                "results": [{"profile": r.profile_name, "ok": r.ok, "error": None if r.ok else str(r.error)} for r in results],
+            },
+        )
+
+
+def _intent_to_dict(intent) -> Dict:
+    return {"id": intent.id, "profile": intent.profile_name, "round": intent.round_no, "amount": intent.amount, "state": intent.state.value, "created_at": intent.created_at}
@@ -0,0 +1,32 @@
+import json
+import sys
+import threading
+from typing import Dict, Optional
+
+from dhapi.endpoint.lottery_json_endpoint import LotteryJsonEndpoint
+
+# 여러 프로필을 동시에 처리할 때 한 레코드가 다른 레코드와 섞여 쓰이지 않도록 함
+_write_lock = threading.Lock()
+
+
+class LotteryJsonPrinter(LotteryJsonEndpoint):
+    """
+    결과가 나올 때마다 {"type": ..., "profile": ..., ...} 형식의 JSON 레코드 하나를 바로 표준 출력에 씁니다.
+
+    한 줄에 한 레코드씩(NDJSON) 쓰므로, 여러 프로필의 결과를 끝날 때까지 기다리지 않고 한 줄씩 json.loads 로 읽어 처리할 수 있습니다.
+    """
+
+    def __init__(self, profile_name: Optional[str] = None, file=None):
+        super().__init__()
+        self._profile_name = profile_name
+        self._file = file
+
+    def _write(self, record: Dict):
+        if self._profile_name is not None:
+            record = {"type": record["type"], "profile": self._profile_name, **record}
+
+        text = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        file = self._file or sys.stdout
+        with _write_lock:
+            file.write(text + "\n")
+            file.flush()
@@ -1,35 +1,61 @@
-from typing import Dict, List
+import datetime
+import threading
+import time
+from typing import Dict, List, Optional
 
 from rich.console import Console
 from rich.table import Table
 
+from dhapi.domain.lotto645_round import KST
+
+# 여러 프로필을 동시에 처리할 때 출력이 서로 섞이지 않도록 함
+_print_lock = threading.Lock()
+
+_INTENT_STATE_NAMES = {"PENDING": "요청 중", "UNKNOWN": "확인 필요", "CONFIRMED": "구매됨", "FAILED": "구매되지 않음"}
+
 
 class LotteryStdoutPrinter:
-    def print_result_of_assign_virtual_account(self, 전용가상계좌, 결제신청금액):
+    def __init__(self, profile_name: Optional[str] = None):
+        self._profile_name = profile_name
+
+    def _new_console(self):
         console = Console()
+        if self._profile_name is not None:
+            console.print(f"[bold]👤 {self._profile_name}[/bold]")
+        return console
 
-        console.print("✅ 가상계좌를 할당했습니다.")
-        console.print("❗️입금 전 계좌주 이름을 꼭 확인하세요.")
-        table = Table("전용가상계좌", "결제신청금액")
-        table.add_row(전용가상계좌, 결제신청금액)
+    def print_result_of_assign_virtual_account(self, 전용가상계좌, 결제신청금액):
+        with _print_lock:
+            console = self._new_console()
 
-        console.print(table)
+            console.print("✅ 가상계좌를 할당했습니다.")
+            console.print("❗️입금 전 계좌주 이름을 꼭 확인하세요.")
+            table = Table("전용가상계좌", "결제신청금액")
+            table.add_row(전용가상계좌, 결제신청금액)
 
-    def print_result_of_show_balance(self, 총예치금, 구매가능금액, 예약구매금액, 출금신청중금액, 구매불가능금액, 이번달누적구매금액):
-        console = Console()
+            console.print(table)
 
-        console.print("✅ 예치금 현황을 조회했습니다.")
-        table = Table("총예치금", "구매가능금액", "예약구매금액", "출금신청중금액", "구매불가능금액", "이번달누적구매금액")
-        table.add_row(
-            self._num_to_money_str(총예치금),
-            self._num_to_money_str(구매가능금액),
-            self._num_to_money_str(예약구매금액),
-            self._num_to_money_str(출금신청중금액),
-            self._num_to_money_str(구매불가능금액),
-            self._num_to_money_str(이번달누적구매금액),
-        )
-        console.print(table)
-        console.print("[dim](구매불가능금액 = 예약구매금액 + 출금신청중금액)[/dim]")
+    def print_result_of_show_balance(self, 총예치금, 구매가능금액, 예약구매금액, 출금신청중금액, 구매불가능금액, 이번달누적구매금액, *, fetched_at: Optional[float] = None):
+        """
+        :param fetched_at: 보관해둔 조회 결과인 경우 조회한 시각 (epoch seconds)
+        """
+        with _print_lock:
+            console = self._new_console()
+
+            console.print("✅ 예치금 현황을 조회했습니다.")
+            table = Table("총예치금", "구매가능금액", "예약구매금액", "출금신청중금액", "구매불가능금액", "이번달누적구매금액")
+            table.add_row(
+                self._num_to_money_str(총예치금),
+                self._num_to_money_str(구매가능금액),
+                self._num_to_money_str(예약구매금액),
+                self._num_to_money_str(출금신청중금액),
+                self._num_to_money_str(구매불가능금액),
+                self._num_to_money_str(이번달누적구매금액),
+            )
+            console.print(table)
+            console.print("[dim](구매불가능금액 = 예약구매금액 + 출금신청중금액)[/dim]")
+            if fetched_at is not None:
+                console.print(f"[dim]({max(int(time.time() - fetched_at), 0)}초 전에 조회한 값입니다. 다시 조회하려면 --fresh 를 지정하세요)[/dim]")
 
     def _num_to_money_str(self, num):
         return f"{num:,} 원"
@@ -39,10 +65,172 @@ class LotteryStdoutPrinter:
         :param slots: [{"slot": "A", "mode": "자동", "numbers": [1, 2, 3, 4, 5, 6]}, ...]
         :return:
         """
-        console = Console()
+        with _print_lock:
+            console = self._new_console()
+
+            console.print("✅ 로또6/45 복권을 구매했습니다.")
+            table = Table("슬롯", "Mode", "번호1", "번호2", "번호3", "번호4", "번호5", "번호6")
+            for slot in slots:
+                table.add_row(slot["slot"], slot["mode"], *slot["numbers"])
+            console.print(table)
+
+    def print_result_of_sync_lotto645_draws(self, synced_count: int, stored_count: int, latest_draw):
+        """
+        :param latest_draw: 저장된 마지막 회차의 Lotto645Draw (없으면 None)
+        """
+        with _print_lock:
+            console = self._new_console()
+
+            console.print(f"✅ 당첨번호를 동기화했습니다. (새로 저장: {synced_count}개 회차, 전체: {stored_count}개 회차)")
+            if latest_draw is None:
+                return
+            table = Table("회차", "추첨일", "번호1", "번호2", "번호3", "번호4", "번호5", "번호6", "보너스")
+            table.add_row(str(latest_draw.round_no), latest_draw.draw_date.isoformat(), *map(str, latest_draw.numbers), str(latest_draw.bonus))
+            console.print(table)
+
+    def print_result_of_check_wins(self, tickets: List[List[int]], checked_rounds: List[int], wins, labels: Optional[List[str]] = None):
+        """
+        :param tickets: 확인한 티켓들의 번호
+        :param wins: [Lotto645Win, ...]
+        :param labels: 티켓별로 표시할 이름. 생략 시 입력한 순서(1, 2, ...)
+        """
+        with _print_lock:
+            console = self._new_console()
+
+            labels = labels or [str(i + 1) for i in range(len(tickets))]
+            rounds_str = f"{checked_rounds[0]}회" if len(checked_rounds) == 1 else f"{len(checked_rounds)}개 회차"
+            console.print(f"✅ {len(tickets)}개 티켓의 당첨 여부를 {rounds_str}와 비교했습니다.")
+            if not wins:
+                console.print("당첨된 티켓이 없습니다.")
+                return
+
+            table = Table("티켓", "번호", "회차", "결과")
+            for win in sorted(wins, key=lambda w: (w.tier, w.round_no, w.ticket_index)):
+                table.add_row(labels[win.ticket_index], ", ".join(map(str, tickets[win.ticket_index])), str(win.round_no), win.tier_name)
+            console.print(table)
+
+    def print_result_of_stats(self, stats, top: int):
+        """
+        :param stats: 집계를 마친 Lotto645Stats
+        :param top: 표마다 보여줄 줄 수
+        """
+        with _print_lock:
+            console = self._new_console()
+
+            console.print(f"✅ 당첨번호 {stats.draw_count}개 회차(~{stats.last_round}회)의 통계입니다.")
+
+            for title, numbers in [("많이 나온 번호", stats.top_numbers(top)), ("적게 나온 번호", stats.top_numbers(top, least=True))]:
+                table = Table("번호", "횟수", "보너스 횟수", title=title)
+                for number, count in numbers:
+                    table.add_row(str(number), str(count), str(int(stats.bonus_frequency[number - 1])))
+                console.print(table)
+
+            table = Table("번호", "횟수", title="함께 많이 나온 번호")
+            for numbers, count in stats.top_pairs(top) + stats.top_triples(top):
+                table.add_row(", ".join(map(str, numbers)), str(count))
+            console.print(table)
+
+            current_runs, current_gaps = stats.current_runs.tolist(), stats.current_gaps.tolist()
+            table = Table("번호", "연속 출현", "최장 연속 출현", title="최근 회차까지 연속으로 나온 번호")
+            for i in sorted((i for i in range(45) if current_runs[i] >= 2), key=lambda i: (-current_runs[i], i))[:top]:
+                table.add_row(str(i + 1), f"{current_runs[i]}회", f"{int(stats.longest_run[i])}회")
+            console.print(table)
+
+            table = Table("번호", "미출현", "최장 미출현", title="오래 나오지 않은 번호")
+            for i in sorted(range(45), key=lambda i: (-current_gaps[i], i))[:top]:
+                table.add_row(str(i + 1), f"{current_gaps[i]}회", f"{int(stats.longest_gap[i])}회")
+            console.print(table)
+
+            histogram = stats.gap_histogram.tolist()
+            table = Table("간격", "횟수", title="재출현 간격")
+            for low, high in [(1, 1), (2, 2), (3, 3), (4, 5), (6, 10), (11, 20), (21, len(histogram))]:
+                if low < len(histogram):
+                    table.add_row(f"{low}회" if low == high else f"{low}~{high}회" if high < len(histogram) else f"{low}회 이상", str(sum(histogram[low : high + 1])))
+            console.print(table)
+
+    def print_result_of_generate_lotto645(self, tickets):
+        """
+        'buy-lotto645 --from -' 로 바로 넘길 수 있도록 한 줄에 한 장씩 쉼표로 구분한 번호만 출력합니다.
+
+        :param tickets: [Lotto645Ticket, ...]
+        """
+        with _print_lock:
+            print("\n".join(",".join(map(str, ticket.numbers)) for ticket in tickets))
+
+    def print_result_of_ticket_import(self, ticket_import, orders):
+        """
+        :param ticket_import: 파일을 모두 읽은 Lotto645TicketImport
+        :param orders: [Lotto645Order, ...]
+        """
+        with _print_lock:
+            console = self._new_console()
+
+            ticket_count = sum(len(order.tickets) for order in orders)
+            console.print(
+                f"✅ {ticket_import.row_count}줄을 읽었습니다. (구매 예정: {ticket_count}장, 잘못된 줄: {ticket_import.rejected_count}개, 구매 한도 초과: {ticket_import.over_limit_count}개)"
+            )
+            if not ticket_import.rejected_rows:
+                return
+
+            table = Table("줄", "사유")
+            for rejected in ticket_import.rejected_rows:
+                table.add_row(str(rejected.line_no), rejected.reason)
+            console.print(table)
+            if ticket_import.rejected_count > len(ticket_import.rejected_rows):
+                console.print(f"[dim](외 {ticket_import.rejected_count - len(ticket_import.rejected_rows)}개)[/dim]")
+
+    def print_result_of_purchase_intents(self, intents, open_only: bool = True):
+        """
+        :param intents: [PurchaseIntent, ...]
+        :param open_only: 결과가 정해지지 않은 구매 요청만 찾은 경우 True
+        """
+        with _print_lock:
+            console = self._new_console()
+
+            if not intents:
+                console.print("✅ 결과가 정해지지 않은 구매 요청이 없습니다." if open_only else "✅ 기록된 구매 요청이 없습니다.")
+                return
+
+            table = Table("번호", "프로필", "회차", "금액", "상태", "기록 시각")
+            for intent in intents:
+                table.add_row(
+                    str(intent.id),
+                    intent.profile_name,
+                    str(intent.round_no),
+                    self._num_to_money_str(intent.amount),
+                    _INTENT_STATE_NAMES[intent.state.value],
+                    _to_kst_str(intent.created_at),
+                )
+            console.print(table)
+            if any(intent.state.is_open for intent in intents):
+                console.print(
+                    "[dim](결과가 정해지지 않은 구매 요청은 같은 티켓의 구매를 막습니다. 동행복권 사이트의 구매 내역을 확인한 뒤 'dhapi journal --resolve <번호> --as confirmed|failed' 로 결과를 기록하세요)[/dim]"
+                )
+
+    def print_result_of_resolve_purchase_intent(self, intent):
+        with _print_lock:
+            console = self._new_console()
+
+            console.print(
+                f"✅ {intent.id}번 구매 요청({intent.profile_name}, {intent.round_no}회, {self._num_to_money_str(intent.amount)})을 '{_INTENT_STATE_NAMES[intent.state.value]}'(으)로 기록했습니다."
+            )
+
+    def print_result_of_profile_batch(self, results):
+        """
+        :param results: [ProfileResult, ...]
+        """
+        with _print_lock:
+            console = Console()
+
+            failed = [r for r in results if not r.ok]
+            table = Table("프로필", "결과", "사유")
+            for result in results:
+                table.add_row(result.profile_name, "✅ 성공" if result.ok else "❌ 실패", "" if result.ok else str(result.error))
+            console.print(table)
+            console.print(f"총 {len(results)}개 프로필 중 {len(results) - len(failed)}개 성공, {len(failed)}개 실패")
+
 
-        console.print("✅ 로또6/45 복권을 구매했습니다.")
-        table = Table("슬롯", "Mode", "번호1", "번호2", "번호3", "번호4", "번호5", "번호6")
-        for slot in slots:
-            table.add_row(slot["slot"], slot["mode"], *slot["numbers"])
-        console.print(table)
+def _to_kst_str(iso: Optional[str]) -> str:
+    if iso is None:
+        return ""
+    return datetime.datetime.fromisoformat(iso).astimezone(KST).strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class OutputFormat(str, Enum):
+    """
+    --output 으로 선택하는 결과 출력 형식
+    """
+
+    TABLE = "table"  # rich 표 (기본값)
+    JSON = "json"  # ndjson 과 같음 (여러 결과를 한 줄에 하나씩 출력해야 그대로 파싱할 수 있음)
+    NDJSON = "ndjson"  # 결과마다 한 줄짜리 JSON 객체
+
+    @property
+    def is_machine_readable(self) -> bool:
+        return self is not OutputFormat.TABLE
@@ -0,0 +1,6 @@
+import json
+
+
+class VersionJsonPrinter:
+    def print_version(self, version):
+        print(json.dumps({"type": "version", "version": version}, separators=(",", ":")), flush=True)
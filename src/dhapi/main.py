@@ -1,9 +1,18 @@
-from dhapi.router.router import entrypoint
+import sys
 
 
 def main():
+    # 스크립트에서 자주 호출되는 'dhapi version' 은 typer 를 불러오지 않고 바로 처리
+    if sys.argv[1:] == ["version"]:
+        from dhapi.router.dependency_factory import build_version_provider
+
+        build_version_provider().show_version()
+        return
+
+    from dhapi.router.router import entrypoint
+
     entrypoint()
 
 
 if __name__ == "__main__":
-    entrypoint()
+    main()
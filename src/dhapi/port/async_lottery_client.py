@@ -0,0 +1,263 @@
+import asyncio
+import functools
+import json
+import logging
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from dhapi.domain.deposit import Deposit
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+from dhapi.domain.user import User
+from dhapi.port import lottery_site
+from dhapi.port.lottery_client_options import LotteryClientOptions
+from dhapi.port.lottery_errors import AuthError, BusinessError, TransientError, reraise_with_context
+from dhapi.port.lottery_site import PinnedSessionCookiePolicy, SiteRequest
+from dhapi.port.purchase_ledger import record_lotto645_purchase_quietly
+from dhapi.port.resilience import async_wait_for_circuit, reporting_to
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncLotteryClient:
+    """
+    LotteryClient 와 같은 기능을 asyncio 코루틴으로 제공합니다.
+
+    하나의 이벤트 루프에서 여러 프로필을 동시에 다룰 수 있도록 HTTP 요청은 httpx 로 비동기 처리하고,
+    HTML 파싱처럼 CPU 를 쓰는 작업은 이벤트 루프를 막지 않도록 executor 에서 수행합니다.
+    httpx 는 필수 의존성이 아니므로 `pip install "dhapi[async]"` 로 함께 설치해야 합니다.
+
+    LotteryClient 와 달리 다음은 지원하지 않습니다.
+    - 예치금 조회 결과 보관(balance_cache)과 구매 후 무효화
+    - 요청 기록/재생(transport_adapter)
+    - 응답을 받지 못한 구매의 확인과 재전송(purchase_journal)
+    - 구매 준비/실행 분리(prepare_lotto645, execute_lotto645), keep_alive, 당첨 결과 동기화
+
+    usage:
+        async with AsyncLotteryClient(user, endpoint) as client:
+            await client.login()
+            await client.show_balance()
+    """
+
+    def __init__(self, user_profile: User, lottery_endpoint, options: Optional[LotteryClientOptions] = None):
+        """
+        :param options: 세션 저장, 다시 시도, 회로 차단 등 선택 기능. 생략 시 모두 쓰지 않음
+        :raise ValueError: options 에 LotteryClient 만 지원하는 항목(balance_cache, transport_adapter, purchase_journal)을 지정한 경우
+        """
+        options = options or LotteryClientOptions()
+        unsupported = [name for name in ("balance_cache", "transport_adapter", "purchase_journal") if getattr(options, name) is not None]
+        if unsupported:
+            raise ValueError(f"AsyncLotteryClient 는 {', '.join(unsupported)} 를 지원하지 않습니다.")
+
+        self._user_id = user_profile.username
+        self._user_pw = user_profile.password
+        self._lottery_endpoint = lottery_endpoint
+        self._options = options
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=options.pool_size, max_keepalive_connections=options.pool_size),
+            follow_redirects=True,
+            timeout=10,
+        )
+        self._client.cookies.jar.set_policy(PinnedSessionCookiePolicy())
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def login(self):
+        with self._options.tracer.span("op.login") as span:
+            restored = await self._restore_session()
+            span.set(restored_session=restored)
+            if restored:
+                return
+            await self._set_default_session()
+            await self._login()
+            self._save_session()
+
+    async def _request(self, request: SiteRequest) -> httpx.Response:
+        """
+        :raise LotteryError: 점검 중이거나, 연결/서버 오류가 다시 시도해도 계속되는 경우
+        """
+        attempts = self._options.retry_policy.attempts_for(request.method, request.idempotent)
+        for attempt in range(1, attempts):
+            try:
+                return await self._request_once(request, attempt)
+            except TransientError as e:
+                delay = self._options.retry_policy.backoff(attempt - 1)
+                logger.debug(f"{request.name} failed ({e.reason}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+        # 마지막 시도는 실패하면 그대로 올려보냄
+        return await self._request_once(request, attempts)
+
+    async def _request_once(self, request: SiteRequest, attempt: int) -> httpx.Response:
+        await async_wait_for_circuit(self._options.circuit_breaker, self._options.retry_policy.max_pause_seconds)
+        attributes = {"attempt": attempt} if attempt > 1 else {}
+        with self._options.tracer.span(f"http.{request.name}", method=request.method, host=urlsplit(request.url).hostname, **attributes) as span, reporting_to(
+            self._options.circuit_breaker
+        ):
+            try:
+                resp = await self._client.request(request.method, request.url, **request.kwargs)
+            except httpx.TransportError as e:
+                raise TransientError(
+                    f"동행복권 사이트에 연결하지 못했습니다 ({type(e).__name__})", request_sent=not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                ) from e
+            span.set(status=resp.status_code, bytes=len(resp.content), redirects=len(resp.history))
+
+            error = lottery_site.classify_response(resp.status_code, str(resp.url), self._options.urls)
+            if error is not None:
+                raise error
+            return resp
+
+    async def _set_default_session(self):
+        resp = await self._request(lottery_site.default_session_request(self._options.urls))
+        logger.debug(f"resp.status_code: {resp.status_code}")
+        logger.debug(f"resp.headers: {resp.headers}")
+
+        jsessionid = resp.cookies.get("JSESSIONID")
+        if jsessionid is None:
+            raise RuntimeError("JSESSIONID 쿠키가 정상적으로 세팅되지 않았습니다.")
+
+        # 세 호스트 모두에 같은 JSESSIONID 를 보내야 하므로 도메인을 지정하지 않음
+        self._client.cookies.set("JSESSIONID", jsessionid)
+
+    async def _login(self):
+        resp = await self._request(lottery_site.login_request(self._options.urls, self._user_id, self._user_pw))
+        if await self._parse("is_login_failed", resp.text):
+            raise AuthError("로그인에 실패했습니다. 아이디 또는 비밀번호를 확인해주세요. (5회 실패했을 수도 있습니다. 이 경우엔 홈페이지에서 비밀번호를 변경해야 합니다)")
+
+    async def _restore_session(self):
+        session_store = self._options.session_store
+        jsessionid = session_store.load(self._user_id) if session_store is not None else None
+        if jsessionid is None:
+            return False
+
+        self._client.cookies.set("JSESSIONID", jsessionid)
+        if await self._is_logged_in():
+            logger.debug("reusing saved session")
+            self._save_session()  # 만료 시각 연장
+            return True
+
+        logger.debug("saved session is no longer valid, logging in again")
+        self._client.cookies.clear()
+        self._options.session_store.clear()
+        return False
+
+    async def _is_logged_in(self):
+        # 로그인이 풀린 세션으로 마이페이지에 접근하면 로그인 페이지로 리다이렉트되므로, 본문은 받지 않고 응답 코드만 확인
+        try:
+            with self._options.tracer.span("http.is_logged_in", method="GET", host=urlsplit(self._options.urls.cash_balance).hostname) as span:
+                async with self._client.stream("GET", self._options.urls.cash_balance, headers=lottery_site.build_headers(), follow_redirects=False, timeout=5) as resp:
+                    size = resp.headers.get("Content-Length")
+                    span.set(status=resp.status_code, bytes=int(size) if size is not None else None, redirects=0)
+                    return resp.status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    def _save_session(self):
+        if self._options.session_store is None:
+            return
+        self._options.session_store.save(self._user_id, self._client.cookies.get("JSESSIONID"))
+
+    async def _parse(self, name: str, html: str):
+        with self._options.tracer.span(f"extract.{name}", bytes=len(html)):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, functools.partial(getattr(self._options.page_extractor, name), html))
+
+    async def get_round(self):
+        resp = await self._request(lottery_site.round_info_request(self._options.urls))
+        return await self._parse("parse_round", resp.text)
+
+    async def _get_current_round(self):
+        """
+        :return: (회차, 사이트에서 방금 확인한 값인지 여부)
+        """
+        if self._options.round_provider is None:
+            return await self.get_round(), True
+
+        round_no = self._options.round_provider.get_round()
+        if round_no is not None:
+            return round_no, False
+
+        round_no = await self.get_round()
+        self._options.round_provider.update(round_no)
+        return round_no, True
+
+    async def buy_lotto645(self, tickets: List[Lotto645Ticket]):
+        with self._options.tracer.span("op.buy_lotto645", tickets=len(tickets)):
+            await self._buy_lotto645(tickets)
+
+    async def _buy_lotto645(self, tickets: List[Lotto645Ticket]):
+        with reraise_with_context("❗ 로또6/45 구매에 실패했습니다.", unknown_reason="알 수 없는 오류"):
+            # ready socket 과 회차 조회는 서로 의존하지 않으므로 동시에 요청하고, 그동안 구매 파라미터를 만들어둠
+            pending = asyncio.gather(self._get_ready_ip(), self._get_current_round())
+            try:
+                param = lottery_site.make_buy_lotto645_param(tickets)
+            except Exception:
+                pending.cancel()
+                raise
+            direct, (round_no, is_site_round) = await pending
+
+            logger.debug(f"direct: {direct}")
+
+            data = lottery_site.build_buy_lotto645_data(round_no, direct, param, len(tickets))
+            logger.debug(f"data: {data}")
+
+            response = await self._exec_buy(data)
+            if not lottery_site.is_purchase_success(response) and not is_site_round:
+                # 계산한 회차가 사이트와 달라서 실패했을 수 있으므로, 사이트에서 회차를 확인하고 다르면 한 번 더 시도
+                site_round = await self.get_round()
+                self._options.round_provider.update(site_round)
+                if site_round != round_no:
+                    logger.debug(f"round mismatch (computed: {round_no}, site: {site_round}), retrying")
+                    data["round"] = str(site_round)
+                    response = await self._exec_buy(data)
+
+            if not lottery_site.is_purchase_success(response):
+                raise BusinessError(response["result"]["resultMsg"])
+
+            slots = lottery_site.format_lotto_numbers(response["result"]["arrGameChoiceNum"])
+            record_lotto645_purchase_quietly(self._options.purchase_recorder, int(data["round"]), slots)
+            self._lottery_endpoint.print_result_of_buy_lotto645(slots)
+
+    async def _get_ready_ip(self):
+        res = await self._request(lottery_site.ready_socket_request(self._options.urls))
+        return json.loads(res.text)["ready_ip"]
+
+    async def _exec_buy(self, data):
+        resp = await self._request(lottery_site.exec_buy_request(self._options.urls, data))
+
+        response_text = resp.text
+        logger.debug(f"response: {response_text}")
+
+        return json.loads(response_text)
+
+    async def show_balance(self):
+        with self._options.tracer.span("op.show_balance"):
+            await self._show_balance()
+
+    async def _show_balance(self):
+        with reraise_with_context("❗ 예치금 현황을 조회하지 못했습니다."):
+            resp = await self._request(lottery_site.cash_balance_request(self._options.urls))
+            balance = await self._parse("parse_balance", resp.text)
+
+            self._lottery_endpoint.print_result_of_show_balance(*balance)
+
+    async def assign_virtual_account(self, deposit: Deposit):
+        with self._options.tracer.span("op.assign_virtual_account", amount=deposit.amount):
+            await self._assign_virtual_account(deposit)
+
+    async def _assign_virtual_account(self, deposit: Deposit):
+        with reraise_with_context("❗ 가상계좌를 할당하지 못했습니다."):
+            resp = await self._request(lottery_site.assign_virtual_account_init_request(self._options.urls, deposit))
+            # 할당 요청에 보낼 값(구매자 이름, 계좌번호 등)은 첫 요청의 응답에 담겨 옴
+            resp = await self._request(lottery_site.assign_virtual_account_process_request(self._options.urls, resp.json()))
+
+            전용가상계좌, 결제신청금액 = await self._parse("parse_virtual_account", resp.text)
+
+            self._lottery_endpoint.print_result_of_assign_virtual_account(전용가상계좌, 결제신청금액)
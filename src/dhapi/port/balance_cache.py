@@ -0,0 +1,105 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from dhapi.port.file_cache import atomic_write, file_lock, file_signature
+
+logger = logging.getLogger(__name__)
+
+
+class CachedBalance:
+    def __init__(self, values: Tuple[int, int, int, int, int, int], fetched_at: float):
+        """
+        :param values: (총예치금, 구매가능금액, 예약구매금액, 출금신청중금액, 구매불가능금액, 이번달누적구매금액)
+        :param fetched_at: 사이트에서 조회한 시각 (epoch seconds)
+        """
+        self.values = values
+        self.fetched_at = fetched_at
+
+
+class BalanceCache:
+    """
+    아이디별 예치금 조회 결과를 ~/.dhapi/balances.json 에 ttl_seconds 동안 보관합니다.
+
+    읽어둔 내용은 파일이 다시 쓰일 때까지 재사용하므로, 여러 프로필을 조회해도 파일은 한 번만 읽습니다.
+    구매나 가상계좌 할당처럼 예치금이 바뀌는 작업 뒤에는 invalidate() 로 해당 아이디의 값을 지웁니다.
+    파일을 고칠 때는 잠금 파일(balances.json.lock)을 잡으므로, 여러 프로세스가 동시에 써도 서로 쓴 값을 잃지 않습니다.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: float = 60.0, clock=time.time):
+        self._path = path or os.path.expanduser("~/.dhapi/balances.json")
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._signature = None
+        self._entries: Dict[str, dict] = {}
+
+    def get(self, username: str) -> Optional[CachedBalance]:
+        """
+        :return: ttl_seconds 안에 조회한 값. 없으면 None
+        """
+        return self.get_many([username]).get(username)
+
+    def get_many(self, usernames: Iterable[str]) -> Dict[str, CachedBalance]:
+        """
+        :return: 캐시에 있는 아이디만 담은 {아이디: CachedBalance}
+        """
+        if self._ttl_seconds <= 0:
+            return {}
+        with self._lock:
+            entries = self._load_locked()
+
+        now = self._clock()
+        found = {}
+        for username in usernames:
+            entry = entries.get(username)
+            if entry is None or not 0 <= now - entry["fetched_at"] < self._ttl_seconds:
+                continue
+            found[username] = CachedBalance(tuple(entry["values"]), entry["fetched_at"])
+        return found
+
+    def put(self, username: str, values: Sequence[int]):
+        if self._ttl_seconds <= 0:
+            return
+        self._update(username, {"values": [int(v) for v in values], "fetched_at": self._clock()})
+
+    def invalidate(self, username: str):
+        self._update(username, None)
+
+    def _update(self, username: str, entry: Optional[dict]):
+        # 다른 프로세스가 읽은 뒤 쓰기 전에 끼어들어 쓴 값을 덮어쓰지 않도록 파일을 잠근 채로 읽고 씀
+        with self._lock, file_lock(self._path):
+            entries = dict(self._load_locked())
+            if entry is None:
+                if username not in entries:
+                    return
+                del entries[username]
+            else:
+                entries[username] = entry
+
+            with atomic_write(self._path) as f:
+                json.dump(entries, f)
+
+            self._entries = entries
+            self._signature = file_signature(self._path)
+
+    def _load_locked(self) -> Dict[str, dict]:
+        try:
+            signature = file_signature(self._path)
+        except FileNotFoundError:
+            self._signature = None
+            self._entries = {}
+            return self._entries
+
+        if signature != self._signature:
+            try:
+                with open(self._path, "r", encoding="UTF-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.debug(f"balance cache is not readable ({e!r}), ignoring it")
+                self._entries = {}
+            self._signature = signature
+        return self._entries
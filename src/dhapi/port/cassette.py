@@ -0,0 +1,230 @@
+import base64
+import io
+import json
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from dhapi.port.file_cache import atomic_write
+
+REDACTED = "REDACTED"
+
+# 로그인 요청(build_login_data)에서 아이디/비밀번호를 담는 필드
+_SECRET_FIELDS = {"userId", "password"}
+
+# requests 가 본문을 이미 풀어서 돌려주므로 재생할 때 다시 풀지 않도록 저장하지 않는 헤더
+_DROPPED_HEADERS = {"set-cookie", "content-encoding", "transfer-encoding", "content-length", "connection", "keep-alive"}
+
+_VERSION = 1
+
+# 너무 짧은 값은 페이지 곳곳의 일반 문자열까지 바꿔버리므로 본문에서는 찾아 바꾸지 않음 (로그인 요청의 필드는 항상 가림)
+_MIN_SECRET_LENGTH = 4
+
+
+class CassetteMissError(RuntimeError):
+    pass
+
+
+class Cassette:
+    """
+    LotteryClient 가 주고받은 요청/응답 목록입니다. 리다이렉트는 한 번 이동할 때마다 따로 기록됩니다.
+
+    파일은 사람이 읽고 비교하기 쉽도록 들여쓴 JSON 으로 저장하며, 쿠키 값과 로그인 정보는 기록하지 않습니다.
+    응답 본문(예: 마이페이지)에는 이름이나 계좌번호 같은 개인정보가 남을 수 있으므로 공유하기 전에 확인해주세요.
+    """
+
+    def __init__(self, interactions: Optional[List[Dict]] = None):
+        self.interactions = interactions if interactions is not None else []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        try:
+            with open(path, "r", encoding="UTF-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            raise RuntimeError(f"❗ 재생할 파일을 찾을 수 없습니다: {path}") from None
+        except ValueError:
+            raise RuntimeError(f"❗ 재생할 파일의 형식이 올바르지 않습니다: {path}") from None
+
+        if not isinstance(saved, dict) or saved.get("version") != _VERSION:
+            raise RuntimeError(f"❗ 지원하지 않는 형식의 파일입니다: {path}")
+        return cls(saved["interactions"])
+
+    def save(self, path: str):
+        with self._lock:
+            saved = {"version": _VERSION, "interactions": list(self.interactions)}
+
+        with atomic_write(path) as f:
+            json.dump(saved, f, ensure_ascii=False, indent=2)
+
+    def append(self, interaction: Dict):
+        with self._lock:
+            self.interactions.append(interaction)
+
+
+class RecordingAdapter(BaseAdapter):
+    """
+    실제로 요청을 보내면서 주고받은 내용을 Cassette 에 기록하는 transport adapter 입니다.
+    """
+
+    def __init__(self, cassette: Cassette, secrets: Iterable[str] = (), inner: Optional[BaseAdapter] = None):
+        """
+        :param secrets: 기록하기 전에 REDACTED 로 바꿀 문자열 (예: 아이디, 비밀번호)
+        :param inner: 실제로 요청을 보낼 adapter. 생략 시 HTTPAdapter
+        """
+        super().__init__()
+        self.cassette = cassette
+        self._secrets = [secret for secret in secrets if secret and len(secret) >= _MIN_SECRET_LENGTH]
+        self._inner = inner or HTTPAdapter()
+
+    def send(  # pylint: disable=too-many-positional-arguments  # requests 의 BaseAdapter.send 와 같은 시그니처
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        response = self._inner.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        # stream=True 인 요청도 재생할 수 있도록 본문까지 받아서 기록
+        content = response.content
+        self.cassette.append(
+            {
+                "request": {
+                    "method": request.method,
+                    "url": self._redact(request.url),
+                    "body": self._redact_body(request.body),
+                },
+                "response": {
+                    "status": response.status_code,
+                    "reason": response.reason,
+                    "headers": {name: self._redact(value) for name, value in response.headers.items() if name.lower() not in _DROPPED_HEADERS},
+                    "cookies": [[cookie.name, REDACTED] for cookie in response.cookies],
+                    **_encode_body(self._redact_bytes(content)),
+                },
+            }
+        )
+        return response
+
+    def close(self):
+        self._inner.close()
+
+    def _redact(self, text: str) -> str:
+        for secret in self._secrets:
+            text = text.replace(secret, REDACTED)
+        return text
+
+    def _redact_bytes(self, content: bytes) -> bytes:
+        for secret in self._secrets:
+            content = content.replace(secret.encode("UTF-8"), REDACTED.encode("UTF-8"))
+        return content
+
+    def _redact_body(self, body) -> Optional[str]:
+        if body is None:
+            return None
+        if isinstance(body, bytes):
+            body = body.decode("UTF-8", errors="replace")
+        fields = parse_qsl(body, keep_blank_values=True)
+        if any(name in _SECRET_FIELDS for name, _ in fields):
+            body = urlencode([(name, REDACTED if name in _SECRET_FIELDS else value) for name, value in fields])
+        return self._redact(body)
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Cassette 에 기록된 응답을 네트워크 없이 돌려주는 transport adapter 입니다.
+
+    같은 메서드와 URL 의 요청에는 기록된 순서대로 응답하며, 요청 본문은 비교하지 않습니다.
+    """
+
+    def __init__(self, cassette: Cassette, loop: bool = False):
+        """
+        :param loop: 기록된 응답을 모두 돌려준 요청에 처음부터 다시 응답할지 여부. False 면 CassetteMissError
+        """
+        super().__init__()
+        self._loop = loop
+        self._lock = threading.Lock()
+        self._recorded: Dict[Tuple[str, str], List[Dict]] = {}
+        for interaction in cassette.interactions:
+            request = interaction["request"]
+            self._recorded.setdefault((request["method"], request["url"]), []).append(interaction["response"])
+        self._remaining = {key: deque(responses) for key, responses in self._recorded.items()}
+
+    def send(  # pylint: disable=too-many-positional-arguments  # requests 의 BaseAdapter.send 와 같은 시그니처
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        key = (request.method, request.url)
+        with self._lock:
+            remaining = self._remaining.get(key)
+            if not remaining and self._loop and key in self._recorded:
+                remaining = self._remaining[key] = deque(self._recorded[key])
+            if not remaining:
+                raise CassetteMissError(f"기록되지 않은 요청입니다: {request.method} {request.url}")
+            recorded = remaining.popleft()
+        return self._build_response(request, recorded)
+
+    def close(self):
+        pass
+
+    def _build_response(self, request, recorded: Dict) -> requests.Response:
+        content = _decode_body(recorded)
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded.get("reason")
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response.headers["Content-Length"] = str(len(content))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.raw = io.BytesIO(content)
+        response._content = content  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        for name, value in recorded["cookies"]:
+            response.cookies.set(name, value)
+        return response
+
+
+def _encode_body(content: bytes) -> Dict[str, str]:
+    try:
+        return {"body": content.decode("UTF-8")}
+    except UnicodeDecodeError:
+        return {"body_base64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(recorded: Dict) -> bytes:
+    if "body_base64" in recorded:
+        return base64.b64decode(recorded["body_base64"])
+    return recorded["body"].encode("UTF-8")
+
+
+class CassetteTransport:
+    """
+    명령어 하나에서 만드는 모든 클라이언트가 함께 쓰는 기록/재생 설정입니다.
+
+    기록할 때는 클라이언트마다 그 계정의 아이디/비밀번호를 가리는 RecordingAdapter 를 만들어 한 Cassette 에 모으고,
+    재생할 때는 모든 클라이언트가 하나의 ReplayAdapter 를 함께 씁니다.
+    """
+
+    def __init__(self, record_path: Optional[str] = None, replay_path: Optional[str] = None):
+        if record_path is not None and replay_path is not None:
+            raise RuntimeError("❗ --record 와 --replay 는 함께 지정할 수 없습니다.")
+        self._record_path = record_path
+        self._cassette = Cassette() if record_path is not None else None
+        self._replay_adapter = ReplayAdapter(Cassette.load(replay_path)) if replay_path is not None else None
+
+    def adapter_for(self, username: str, password: str) -> Optional[BaseAdapter]:
+        """
+        :return: 기록/재생하지 않으면 None
+        """
+        if self._replay_adapter is not None:
+            return self._replay_adapter
+        if self._cassette is not None:
+            return RecordingAdapter(self._cassette, secrets=[username, password])
+        return None
+
+    def save(self):
+        if self._cassette is not None:
+            self._cassette.save(self._record_path)
@@ -1,19 +1,42 @@
+import fnmatch
 import logging
-import os
-
-import tomli
-import tomli_w
+from typing import List, Optional
 
 from dhapi.domain.user import User
+from dhapi.port.credentials_store import CredentialsStore
 
 logger = logging.getLogger(__name__)
 
 
 class CredentialsProvider:
-    def __init__(self, profile_name):
-        self._path = os.path.expanduser("~/.dhapi/credentials")
+    def __init__(self, profile_name, store: Optional[CredentialsStore] = None):
+        self._store = store or CredentialsStore.default()
+        self._path = self._store.path
         self._credentials = self._get_credentials(profile_name)
 
+    @staticmethod
+    def list_profile_names() -> List[str]:
+        return CredentialsStore.default().profile_names()
+
+    @staticmethod
+    def match_profile_names(patterns: List[str]) -> List[str]:
+        """
+        :param patterns: 프로필 이름 또는 glob 패턴 (예: ["default", "team-*"]). 쉼표로 구분된 값도 허용합니다.
+        :return: 패턴 순서대로 매칭된 프로필 이름 (중복 제거)
+        """
+        available = CredentialsProvider.list_profile_names()
+
+        matched = []
+        for pattern in [p.strip() for patterns_str in patterns for p in patterns_str.split(",") if p.strip()]:
+            if pattern in available:
+                names = [pattern]
+            else:
+                names = fnmatch.filter(available, pattern)
+            if not names:
+                raise ValueError(f"'{pattern}' 에 해당하는 프로필을 찾지 못했습니다.")
+            matched.extend(name for name in names if name not in matched)
+        return matched
+
     def _get(self, key):
         if key in self._credentials:
             return self._credentials[key]
@@ -23,9 +46,7 @@ class CredentialsProvider:
         return User(self._get("username"), self._get("password"))
 
     def _get_credentials(self, profile_name):
-        try:
-            _ = self._read_credentials_file(profile_name)
-        except FileNotFoundError:
+        if not self._store.exists():
             print(f"❌ {self._path} 파일을 찾을 수 없습니다. 파일을 생성하고 프로필을 추가하시겠습니까? [Y/n] ", end="")
             answer = input().strip().lower()
             if answer in ["y", "yes", ""]:
@@ -40,40 +61,22 @@ class CredentialsProvider:
             else:
                 raise FileNotFoundError(f"{self._path} 파일을 찾을 수 없습니다.")
 
-        credentials = self._read_credentials_file(profile_name)
+        credentials = self._store.get(profile_name)
 
         if credentials is None:
             print(f"❌'{profile_name}' 프로필을 찾지 못했습니다. 추가하시겠습니까? [Y/n] ", end="")
             answer = input().strip().lower()
             if answer in ["y", "yes", ""]:
                 self._add_credentials(profile_name)
-                credentials = self._read_credentials_file(profile_name)
-                return credentials
+                return self._store.get(profile_name)
             raise ValueError(f"{self._path} 파일에서 '{profile_name}' 프로필을 찾지 못했습니다.")
 
         return credentials
 
-    def _read_credentials_file(self, profile_name):
-        with open(self._path, "r", encoding="UTF-8") as f:
-            file = f.read()
-        config = tomli.loads(file)
-        credentials = config.get(profile_name)
-        return credentials
-
     def _add_credentials(self, profile_name):
         print("📝 사용자 ID를 입력하세요: ", end="")
         user_id = input().strip()
         print("📝 사용자 비밀번호를 입력하세요: ", end="")
         user_pw = input().strip()
 
-        doc = {profile_name: {"username": user_id, "password": user_pw}}
-
-        with open(self._path, "r", encoding="UTF-8") as f:
-            file = f.read()
-        config = tomli.loads(file)
-
-        doc.update(config)
-
-        with open(self._path, "wb") as f:
-            tomli_w.dump(doc, f)
-            f.close()
+        self._store.put(profile_name, user_id, user_pw)
@@ -0,0 +1,99 @@
+import logging
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import tomli
+import tomli_w
+
+from dhapi.port.file_cache import atomic_write, file_signature
+
+logger = logging.getLogger(__name__)
+
+
+class CredentialsStore:
+    """
+    ~/.dhapi/credentials (TOML) 를 읽어 프로필 이름으로 색인해둡니다.
+
+    파일이 바뀌지 않았으면(mtime, 크기, inode 가 같으면) 다시 읽지 않으므로, 여러 프로필을 동시에 처리해도 프로세스당 한 번만 파싱합니다.
+    파일은 그대로 TOML 형식을 유지하며, 수정할 때는 임시 파일에 전체를 쓴 뒤 교체합니다.
+    """
+
+    _instances: Dict[str, "CredentialsStore"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path or os.path.expanduser("~/.dhapi/credentials")
+        self._lock = threading.Lock()
+        self._signature = None
+        self._profiles: Dict[str, dict] = {}
+
+    @classmethod
+    def default(cls, path: Optional[str] = None) -> "CredentialsStore":
+        """
+        :return: 경로별로 프로세스 안에서 공유하는 인스턴스
+        """
+        path = path or os.path.expanduser("~/.dhapi/credentials")
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def exists(self) -> bool:
+        return os.path.exists(self._path)
+
+    def get(self, profile_name: str) -> Optional[dict]:
+        """
+        :raise FileNotFoundError: 파일이 없는 경우
+        """
+        return self._load().get(profile_name)
+
+    def profile_names(self) -> List[str]:
+        """
+        :return: 파일에 적힌 순서대로의 프로필 이름
+        :raise FileNotFoundError: 파일이 없는 경우
+        """
+        return list(self._load())
+
+    def __iter__(self) -> Iterator[Tuple[str, dict]]:
+        return iter(list(self._load().items()))
+
+    def put(self, profile_name: str, username: str, password: str):
+        """
+        프로필을 추가하거나 바꿉니다. 파일이 없으면 새로 만듭니다.
+        """
+        with self._lock:
+            try:
+                profiles = dict(self._load_locked())
+            except FileNotFoundError:
+                profiles = {}
+            profiles[profile_name] = {**profiles.get(profile_name, {}), "username": username, "password": password}
+
+            with atomic_write(self._path, binary=True) as f:
+                tomli_w.dump(profiles, f)
+
+            self._profiles = profiles
+            self._signature = file_signature(self._path)
+
+    def _load(self) -> Dict[str, dict]:
+        with self._lock:
+            return self._load_locked()
+
+    def _load_locked(self) -> Dict[str, dict]:
+        try:
+            signature = file_signature(self._path)
+        except FileNotFoundError:
+            self._signature = None
+            self._profiles = {}
+            raise FileNotFoundError(f"{self._path} 파일을 찾을 수 없습니다.")
+
+        if signature != self._signature:
+            logger.debug(f"parsing {self._path}")
+            with open(self._path, "r", encoding="UTF-8") as f:
+                self._profiles = tomli.loads(f.read())
+            self._signature = signature
+        return self._profiles
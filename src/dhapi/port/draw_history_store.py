@@ -0,0 +1,119 @@
+import logging
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
+
+from dhapi.domain.lotto645_draw import Lotto645Draw
+
+logger = logging.getLogger(__name__)
+
+# 회차당 8바이트: 당첨번호 6개(오름차순), 보너스 번호, 저장 여부(1)
+RECORD_SIZE = 8
+_PRESENT = 1
+
+
+class DrawHistoryStore:
+    """
+    회차별 당첨번호를 ~/.dhapi/draws.bin 에 고정 길이 레코드로 저장합니다.
+
+    n 회차의 레코드는 (n - 1) * RECORD_SIZE 위치에 있으므로 파일 전체를 mmap 으로 열어 파싱 없이 바로 읽을 수 있습니다.
+    아직 받지 않은 회차의 레코드는 0 으로 채워져 있습니다.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path or os.path.expanduser("~/.dhapi/draws.bin")
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @contextmanager
+    def open_buffer(self) -> Iterator[memoryview]:
+        """
+        파일 전체를 읽기 전용 mmap 으로 엽니다. 저장된 회차가 없으면 빈 버퍼를 돌려줍니다.
+        """
+        try:
+            f = open(self._path, "rb")
+        except FileNotFoundError:
+            yield memoryview(b"")
+            return
+
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def get(self, round_no: int) -> Optional[Lotto645Draw]:
+        with self.open_buffer() as buf:
+            offset = (round_no - 1) * RECORD_SIZE
+            if round_no < 1 or offset + RECORD_SIZE > len(buf):
+                return None
+            return _decode(round_no, buf[offset : offset + RECORD_SIZE])
+
+    def read_draws(self) -> List[Lotto645Draw]:
+        """
+        저장된 회차를 모두 읽습니다. 호출하는 쪽이 중간에 멈추더라도 mmap 이 열린 채로 남지 않도록 목록으로 만들어 돌려줍니다.
+        """
+        with self.open_buffer() as buf:
+            draws = (_decode(offset // RECORD_SIZE + 1, buf[offset : offset + RECORD_SIZE]) for offset in range(0, len(buf) - len(buf) % RECORD_SIZE, RECORD_SIZE))
+            return [draw for draw in draws if draw is not None]
+
+    def read_arrays(self, np, after_round: int = 0):
+        """
+        파일을 그대로 numpy 배열로 읽어 Lotto645Draw 객체를 만들지 않고 돌려줍니다. numpy 는 필수 의존성이 아니므로 호출하는 쪽에서 넘겨받습니다.
+
+        :param after_round: 이 회차 다음부터 읽음
+        :return: (rounds, numbers, bonus). 저장된 회차만 담은 (n,) int64, (n, 6) uint8, (n,) uint8 배열
+        """
+        with self.open_buffer() as buf:
+            start = min(after_round * RECORD_SIZE, len(buf))
+            records = np.frombuffer(buf, dtype=np.uint8, offset=start, count=(len(buf) - start) // RECORD_SIZE * RECORD_SIZE).reshape(-1, RECORD_SIZE)
+            present = records[:, RECORD_SIZE - 1] == _PRESENT
+            rounds = np.flatnonzero(present).astype(np.int64) + after_round + 1
+            numbers = records[present, :6].copy()
+            bonus = records[present, 6].copy()
+            del records, present  # mmap 을 닫기 전에 버퍼를 참조하는 배열을 정리
+        return rounds, numbers, bonus
+
+    def stored_rounds(self) -> List[int]:
+        with self.open_buffer() as buf:
+            return [offset // RECORD_SIZE + 1 for offset in range(RECORD_SIZE - 1, len(buf), RECORD_SIZE) if buf[offset] == _PRESENT]
+
+    def missing_rounds(self, latest_round: int) -> List[int]:
+        stored = set(self.stored_rounds())
+        return [n for n in range(1, latest_round + 1) if n not in stored]
+
+    def put_many(self, draws: Iterable[Lotto645Draw]):
+        records = sorted(draws, key=lambda d: d.round_no)
+        if not records:
+            return
+
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(fd, "r+b") as f:
+            size = os.fstat(f.fileno()).st_size
+            end = records[-1].round_no * RECORD_SIZE
+            if size < end:
+                # 중간에 비는 회차가 있어도 위치로 바로 찾을 수 있도록 파일 길이를 먼저 늘려둠 (늘어난 부분은 0)
+                f.truncate(end)
+            for draw in records:
+                f.seek((draw.round_no - 1) * RECORD_SIZE)
+                f.write(_encode(draw))
+        logger.debug(f"stored {len(records)} draws into {self._path}")
+
+
+def _encode(draw: Lotto645Draw) -> bytes:
+    return bytes([*draw.numbers, draw.bonus, _PRESENT])
+
+
+def _decode(round_no: int, record) -> Optional[Lotto645Draw]:
+    if record[RECORD_SIZE - 1] != _PRESENT:
+        return None
+    return Lotto645Draw(round_no, list(record[:6]), record[6])
@@ -0,0 +1,69 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator, Tuple
+
+
+def file_signature(path: str) -> Tuple[int, int, int]:
+    """
+    파일 내용을 읽지 않고 바뀌었는지 비교할 수 있는 값입니다. 읽어둔 내용을 다시 쓸지 판단할 때 사용합니다.
+
+    :return: (mtime, 크기, inode)
+    :raise FileNotFoundError: 파일이 없는 경우
+    """
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+@contextmanager
+def atomic_write(path: str, binary: bool = False) -> Iterator[IO]:
+    """
+    같은 디렉토리의 임시 파일(권한 600)에 쓰고, 블록이 끝나면 path 로 교체합니다.
+
+    여러 프로세스가 동시에 읽거나 써도 절반만 쓰인 파일을 보지 않으며, 쓰는 도중 실패하면 임시 파일을 지우고 path 는 그대로 둡니다.
+
+    usage:
+        with atomic_write(path) as f:
+            json.dump(data, f)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") if binary else os.fdopen(fd, "w", encoding="UTF-8") as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    path 옆의 잠금 파일(.lock)로 다른 프로세스와 함께 쓰는 파일의 읽고-고쳐-쓰기를 한 번에 하나씩만 하도록 막습니다.
+
+    같은 프로세스의 스레드끼리는 막지 않으므로 threading.Lock 과 함께 사용합니다.
+
+    usage:
+        with file_lock(path):
+            data = load(path)
+            with atomic_write(path) as f:
+                ...
+    """
+    lock_path = f"{path}.lock"
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if os.name == "nt":
+            import msvcrt  # pylint: disable=import-error  # Windows 에만 있음
+
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # 잠금은 파일을 닫으면 풀림
+        os.close(fd)
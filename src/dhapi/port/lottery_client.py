@@ -1,285 +1,495 @@
-import datetime
 import json
 import logging
-from typing import List, Dict
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
 
-import pytz
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ChunkedEncodingError
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
 
 from dhapi.domain.deposit import Deposit
-from dhapi.domain.lotto645_ticket import Lotto645Ticket, Lotto645Mode
+from dhapi.domain.lotto645_draw import Lotto645Draw
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
 from dhapi.domain.user import User
+from dhapi.port import lottery_site
+from dhapi.port.draw_history_store import DrawHistoryStore
+from dhapi.port.lottery_client_options import LotteryClientOptions
+from dhapi.port.lottery_errors import AuthError, BusinessError, TransientError, reraise_with_context
+from dhapi.port.lottery_site import PinnedSessionCookiePolicy, SiteRequest
+from dhapi.port.purchase_journal import PurchaseIntent, PurchaseState
+from dhapi.port.purchase_ledger import record_lotto645_purchase_quietly
+from dhapi.port.resilience import reporting_to, wait_for_circuit
 
 logger = logging.getLogger(__name__)
 
+# 구매 여부를 확인하지 못한 구매 요청은 같은 티켓을 다시 구매하지 못하도록 막으므로, 사용자가 직접 결과를 정할 수 있게 안내
+_RESOLVE_HINT = "동행복권 사이트의 구매 내역을 확인한 뒤 'dhapi journal --resolve <번호> --as confirmed|failed' 로 결과를 기록해주세요."
+
+# 구매 요청 값(prepare_lotto645 의 결과)에 함께 담지만 사이트로는 보내지 않는 값
+# 회차를 사이트에서 확인했는지 여부. 확인하지 않은 회차로 구매에 실패하면 사이트의 회차로 한 번 더 시도
+_SITE_ROUND_FIELD = "_site_round"
+# 구매 전에 확인한 이번달 누적 구매금액
+_BASELINE_FIELD = "_baseline"
+
 
 class LotteryClient:
-    _default_session_url = "https://dhlottery.co.kr/gameResult.do?method=byWin&wiselog=H_C_1_1"
-    _system_under_check_url = "https://dhlottery.co.kr/index_check.html"
-    _main_url = "https://dhlottery.co.kr/common.do?method=main"
-    _login_request_url = "https://www.dhlottery.co.kr/userSsl.do?method=login"
-    _buy_lotto645_url = "https://ol.dhlottery.co.kr/olotto/game/execBuy.do"
-    _round_info_url = "https://www.dhlottery.co.kr/common.do?method=main"
-    _ready_socket = "https://ol.dhlottery.co.kr/olotto/game/egovUserReadySocket.json"
-    _cash_balance = "https://dhlottery.co.kr/userSsl.do?method=myPage"
-    _assign_virtual_account_1 = "https://dhlottery.co.kr/nicePay.do?method=nicePayInit"
-    _assign_virtual_account_2 = "https://dhlottery.co.kr/nicePay.do?method=nicePayProcess"
-
-    def __init__(self, user_profile: User, lottery_endpoint):
+    # dhlottery.co.kr, www.dhlottery.co.kr, ol.dhlottery.co.kr
+    _pool_connections = 3
+
+    def __init__(self, user_profile: User, lottery_endpoint, options: Optional[LotteryClientOptions] = None):
+        """
+        :param options: 세션 저장, 다시 시도, 회로 차단, 조회 결과 보관 등 선택 기능. 생략 시 모두 쓰지 않음
+        """
         self._user_id = user_profile.username
         self._user_pw = user_profile.password
         self._lottery_endpoint = lottery_endpoint
-        self._headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.77 Safari/537.36",
-            "Connection": "keep-alive",
-            "Cache-Control": "max-age=0",
-            "sec-ch-ua": '" Not;A Brand";v="99", "Google Chrome";v="91", "Chromium";v="91"',
-            "sec-ch-ua-mobile": "?0",
-            "Upgrade-Insecure-Requests": "1",
-            "Origin": "https://dhlottery.co.kr",
-            "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9",
-            "Referer": "https://dhlottery.co.kr",
-            "Sec-Fetch-Site": "same-site",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-User": "?1",
-            "Sec-Fetch-Dest": "document",
-            "Accept-Language": "ko,en-US;q=0.9,en;q=0.8,ko-KR;q=0.7",
-            "X-Requested-With": "XMLHttpRequest",
-        }
-        self._set_default_session()
-        self._login()
-
-    # 로그인을 시도하면 새로운 JSESSIONID 값이 내려오는데,
-    #  이 값으로 갱신하면 로그인이 풀리는 듯하여 헤더를 갱신하지 않음
+        self._options = options or LotteryClientOptions()
+        self._session = self._build_session(self._options.pool_size, self._options.transport_adapter)
+        with self._options.tracer.span("op.login") as span:
+            restored = self._restore_session()
+            span.set(restored_session=restored)
+            if not restored:
+                self._set_default_session()
+                self._login()
+                self._save_session()
+
+    def _build_session(self, pool_size: int, adapter=None) -> requests.Session:
+        session = requests.Session()
+        session.cookies.set_policy(PinnedSessionCookiePolicy())
+
+        # 호스트별로 keep-alive 커넥션 풀을 유지하여 요청마다 TCP/TLS 핸드셰이크가 반복되지 않도록 함
+        adapter = adapter or HTTPAdapter(pool_connections=LotteryClient._pool_connections, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _request(self, request: SiteRequest) -> requests.Response:
+        """
+        :raise LotteryError: 점검 중이거나, 연결/서버 오류가 다시 시도해도 계속되는 경우
+        """
+        attempts = self._options.retry_policy.attempts_for(request.method, request.idempotent)
+        for attempt in range(1, attempts):
+            try:
+                return self._request_once(request, attempt)
+            except TransientError as e:
+                delay = self._options.retry_policy.backoff(attempt - 1)
+                logger.debug(f"{request.name} failed ({e.reason}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+        # 마지막 시도는 실패하면 그대로 올려보냄
+        return self._request_once(request, attempts)
+
+    def _request_once(self, request: SiteRequest, attempt: int) -> requests.Response:
+        wait_for_circuit(self._options.circuit_breaker, self._options.retry_policy.max_pause_seconds)
+        attributes = {"attempt": attempt} if attempt > 1 else {}
+        with self._options.tracer.span(f"http.{request.name}", method=request.method, host=urlsplit(request.url).hostname, **attributes) as span, reporting_to(
+            self._options.circuit_breaker
+        ):
+            try:
+                resp = self._session.request(request.method, request.url, **request.kwargs)
+            except (requests.ConnectionError, requests.Timeout, ChunkedEncodingError) as e:
+                raise TransientError(f"동행복권 사이트에 연결하지 못했습니다 ({type(e).__name__})", request_sent=not _is_connect_failure(e)) from e
+            # stream=True 인 경우 본문을 읽지 않았으므로 헤더에 적힌 길이를 기록
+            size = resp.headers.get("Content-Length") if request.kwargs.get("stream") else len(resp.content)
+            span.set(status=resp.status_code, bytes=int(size) if size is not None else None, redirects=len(resp.history))
+
+            error = lottery_site.classify_response(resp.status_code, resp.url, self._options.urls)
+            if error is not None:
+                resp.close()
+                raise error
+            return resp
+
+    def _parse(self, name: str, html: str):
+        with self._options.tracer.span(f"extract.{name}", bytes=len(html)):
+            return getattr(self._options.page_extractor, name)(html)
+
     def _set_default_session(self):
-        resp = requests.get(LotteryClient._default_session_url, timeout=10)
+        resp = self._request(lottery_site.default_session_request(self._options.urls))
         logger.debug(f"resp.status_code: {resp.status_code}")
         logger.debug(f"resp.headers: {resp.headers}")
 
-        if resp.url == LotteryClient._system_under_check_url:
-            raise RuntimeError("동행복권 사이트가 현재 시스템 점검중입니다.")
-
         for cookie in resp.cookies:
             if cookie.name == "JSESSIONID":
-                self._headers["Cookie"] = f"JSESSIONID={cookie.value}"
+                # 세 호스트 모두에 같은 JSESSIONID 를 보내야 하므로 도메인을 지정하지 않음
+                self._session.cookies.set("JSESSIONID", cookie.value)
                 break
         else:
             raise RuntimeError("JSESSIONID 쿠키가 정상적으로 세팅되지 않았습니다.")
 
     def _login(self):
-        resp = requests.post(
-            LotteryClient._login_request_url,
-            headers=self._headers,
-            data={
-                "returnUrl": LotteryClient._main_url,
-                "userId": self._user_id,
-                "password": self._user_pw,
-                "checkSave": "off",
-                "newsEventYn": "",
-            },
-            timeout=10,
-        )
-        soup = BeautifulSoup(resp.text, "html5lib")
-        if soup.find("a", {"class": "btn_common"}) is not None:
-            raise RuntimeError(
+        resp = self._request(lottery_site.login_request(self._options.urls, self._user_id, self._user_pw))
+        if self._parse("is_login_failed", resp.text):
+            raise AuthError(
                 "로그인에 실패했습니다. 아이디 또는 비밀번호를 확인해주세요. (5회 실패했을 수도 있습니다. 이 경우엔 홈페이지에서 비밀번호를 변경해야 합니다)"
             )  # TODO(roeniss): 명확히 구분해서 알려주기
 
+    def _restore_session(self):
+        session_store = self._options.session_store
+        jsessionid = session_store.load(self._user_id) if session_store is not None else None
+        if jsessionid is None:
+            return False
+
+        self._session.cookies.set("JSESSIONID", jsessionid)
+        if self._is_logged_in():
+            logger.debug("reusing saved session")
+            self._save_session()  # 만료 시각 연장
+            return True
+
+        logger.debug("saved session is no longer valid, logging in again")
+        self._session.cookies.clear()
+        self._options.session_store.clear()
+        return False
+
+    def _is_logged_in(self):
+        # 로그인이 풀린 세션으로 마이페이지에 접근하면 로그인 페이지로 리다이렉트되므로, 본문은 받지 않고 응답 코드만 확인
+        try:
+            request = SiteRequest(
+                "is_logged_in", "GET", self._options.urls.cash_balance, idempotent=False, headers=lottery_site.build_headers(), allow_redirects=False, stream=True, timeout=5
+            )
+            resp = self._request(request)
+            resp.close()
+        except (requests.RequestException, TransientError):
+            return False
+        return resp.status_code == 200
+
+    def keep_alive(self) -> bool:
+        """
+        로그인 세션이 만료되지 않도록 요청을 보내고, 이미 만료되었으면 다시 로그인합니다.
+
+        :return: 다시 로그인했는지 여부
+        """
+        with self._options.tracer.span("op.keep_alive") as span:
+            if self._is_logged_in():
+                span.set(relogin=False)
+                return False
+
+            logger.debug("session expired, logging in again")
+            self._session.cookies.clear()
+            self._set_default_session()
+            self._login()
+            self._save_session()
+            span.set(relogin=True)
+            return True
+
+    def _save_session(self):
+        if self._options.session_store is None:
+            return
+        self._options.session_store.save(self._user_id, self._session.cookies.get("JSESSIONID"))
+
     def _get_round(self):
-        resp = requests.get(self._round_info_url, timeout=10)
-        soup = BeautifulSoup(resp.text, "html5lib")  # 'html5lib' : in case that the html don't have clean tag pairs
+        resp = self._request(lottery_site.round_info_request(self._options.urls))
+        return self._parse("parse_round", resp.text)
 
-        elem = soup.find("strong", {"id": "lottoDrwNo"})
-        if not elem:
-            raise RuntimeError("현재 회차 정보를 가져올 수 없습니다.")
+    def _get_current_round(self):
+        """
+        :return: (회차, 사이트에서 방금 확인한 값인지 여부)
+        """
+        if self._options.round_provider is None:
+            return self._get_round(), True
 
-        return int(elem.text) + 1
+        round_no = self._options.round_provider.get_round()
+        if round_no is not None:
+            return round_no, False
+
+        round_no = self._get_round()
+        self._options.round_provider.update(round_no)
+        return round_no, True
 
     def buy_lotto645(self, tickets: List[Lotto645Ticket]):
-        try:
-            res = requests.post(url=self._ready_socket, headers=self._headers, timeout=5)
-            direct = json.loads(res.text)["ready_ip"]
-
-            logger.debug(f"direct: {direct}")
-
-            data = {
-                "round": str(self._get_round()),
-                "direct": direct,
-                "nBuyAmount": str(1000 * len(tickets)),
-                "param": self._make_buy_loyyo645_param(tickets),
-                "gameCnt": len(tickets),
-            }
-            logger.debug(f"data: {data}")
-
-            resp = requests.post(
-                self._buy_lotto645_url,
-                headers=self._headers,
-                data=data,
-                timeout=10,
-            )
+        with self._options.tracer.span("op.buy_lotto645", tickets=len(tickets)):
+            self._buy_lotto645(tickets)
 
-            response_text = resp.text
-            logger.debug(f"response: {response_text}")
-
-            response = json.loads(response_text)
-            if not self._is_purchase_success(response):
-                raise RuntimeError(f"❗ 로또6/45 구매에 실패했습니다. (사유: {response['result']['resultMsg']})")
-
-            slots = self._format_lotto_numbers(response["result"]["arrGameChoiceNum"])
-            self._lottery_endpoint.print_result_of_buy_lotto645(slots)
-        except RuntimeError as e:
-            raise e
-        except Exception:
-            raise RuntimeError("❗ 로또6/45 구매에 실패했습니다. (사유: 알 수 없는 오류)")
-
-    def _is_purchase_success(self, response):
-        return response["result"]["resultCode"] == "100"
-
-    def _make_buy_loyyo645_param(self, tickets: List[Lotto645Ticket]):
-        params = []
-        for i, t in enumerate(tickets):
-            if t.mode == Lotto645Mode.AUTO:
-                gen_type = "0"
-            elif t.mode == Lotto645Mode.MANUAL:
-                gen_type = "1"
-            elif t.mode == Lotto645Mode.SEMIAUTO:
-                gen_type = "2"
-            else:
-                raise RuntimeError(f"올바르지 않은 모드입니다. (mode: {t.mode})")
-            arr_game_choice_num = None if t.mode == Lotto645Mode.AUTO else ",".join(map(str, t.numbers))
-            alpabet = "ABCDE"[i]  # XXX: 오타 아님
-            slot = {
-                "genType": gen_type,
-                "arrGameChoiceNum": arr_game_choice_num,
-                "alpabet": alpabet,
-            }
-            params.append(slot)
-        return json.dumps(params)
-
-    def _format_lotto_numbers(self, lines: list) -> List[Dict]:
+    def _buy_lotto645(self, tickets: List[Lotto645Ticket]):
+        with reraise_with_context("❗ 로또6/45 구매에 실패했습니다.", unknown_reason="알 수 없는 오류"):
+            self._execute_lotto645(self._prepare_lotto645(tickets))
+
+    def prepare_lotto645(self, tickets: List[Lotto645Ticket], round_no: Optional[int] = None) -> Dict:
         """
-        example: ["A|01|02|04|27|39|443", "B|11|23|25|27|28|452"]
+        구매 요청(execBuy)에 보낼 값을 미리 만들어둡니다. execute_lotto645() 로 구매할 때는 구매 요청 하나만 보냅니다.
+
+        :param round_no: 구매할 회차. 지정하면 사이트의 회차와 다르더라도 다시 시도하지 않음. 생략 시 지금 판매 중인 회차 (사이트에서 확인하지 않고 계산한 회차로 실패하면 사이트의 회차로 한 번 더 시도)
         """
+        with self._options.tracer.span("op.prepare_lotto645", tickets=len(tickets)), reraise_with_context(
+            "❗ 로또6/45 구매를 준비하지 못했습니다.", unknown_reason="알 수 없는 오류"
+        ):
+            return self._prepare_lotto645(tickets, round_no)
 
-        mode_dict = {
-            "1": "수동",
-            "2": "반자동",
-            "3": "자동",
-        }
-
-        slots = []
-        for line in lines:
-            slot = {
-                "mode": mode_dict[line[-1]],
-                "slot": line[0],
-                "numbers": line[2:-1].split("|"),
-            }
-            slots.append(slot)
-        return slots
-
-    def show_balance(self):
+    def execute_lotto645(self, data: Dict):
+        """
+        :param data: prepare_lotto645() 의 결과
+        """
+        with self._options.tracer.span("op.execute_lotto645", tickets=data["gameCnt"]), reraise_with_context("❗ 로또6/45 구매에 실패했습니다.", unknown_reason="알 수 없는 오류"):
+            self._execute_lotto645(data)
+
+    def _prepare_lotto645(self, tickets: List[Lotto645Ticket], round_no: Optional[int] = None) -> Dict:
+        """
+        :return: 구매 요청 값. 사이트로 보내지 않는 값으로 회차를 사이트에서 방금 확인했는지 여부(_SITE_ROUND_FIELD)와,
+            저널을 쓰면 구매 전 누적 구매금액(_BASELINE_FIELD)이 함께 담김
+        """
+        baseline = None
+        if round_no is not None:
+            direct = self._get_ready_ip()
+            param = lottery_site.make_buy_lotto645_param(tickets)
+            is_site_round = True
+            if self._options.purchase_journal is not None:
+                baseline = self._get_purchased_this_month()
+        else:
+            # ready socket, 회차 조회, (저널을 쓰는 경우) 구매 전 누적 구매금액 조회는 서로 의존하지 않으므로 동시에 요청하고, 그동안 구매 파라미터를 만들어둠
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                direct_future = executor.submit(self._get_ready_ip)
+                round_future = executor.submit(self._get_current_round)
+                baseline_future = executor.submit(self._get_purchased_this_month) if self._options.purchase_journal is not None else None
+                param = lottery_site.make_buy_lotto645_param(tickets)
+
+                direct = direct_future.result()
+                round_no, is_site_round = round_future.result()
+                if baseline_future is not None:
+                    baseline = baseline_future.result()
+
+        logger.debug(f"direct: {direct}")
+
+        data = lottery_site.build_buy_lotto645_data(round_no, direct, param, len(tickets))
+        data[_SITE_ROUND_FIELD] = is_site_round
+        if self._options.purchase_journal is not None:
+            # 같은 클라이언트로 여러 구매를 동시에 해도 서로의 기준 금액을 덮어쓰지 않도록 구매 요청 값과 함께 넘김
+            data[_BASELINE_FIELD] = baseline
+        logger.debug(f"data: {data}")
+        return data
+
+    def _execute_lotto645(self, data: Dict):
+        response = self._exec_buy_journaled(data)
+        if response is None:
+            self._complete_unanswered_lotto645(data)
+            return
+        if not lottery_site.is_purchase_success(response) and not data[_SITE_ROUND_FIELD]:
+            # 계산한 회차가 사이트와 달라서 실패했을 수 있으므로, 사이트에서 회차를 확인하고 다르면 한 번 더 시도
+            site_round = self._get_round()
+            self._options.round_provider.update(site_round)
+            if site_round != int(data["round"]):
+                logger.debug(f"round mismatch (computed: {data['round']}, site: {site_round}), retrying")
+                data["round"] = str(site_round)
+                response = self._exec_buy_journaled(data)
+                if response is None:
+                    self._complete_unanswered_lotto645(data)
+                    return
+
+        self._complete_lotto645(data, response)
+
+    def _complete_lotto645(self, data: Dict, response):
+        if not lottery_site.is_purchase_success(response):
+            raise BusinessError(response["result"]["resultMsg"])
+
+        slots = lottery_site.format_lotto_numbers(response["result"]["arrGameChoiceNum"])
+        self._invalidate_balance()
+        record_lotto645_purchase_quietly(self._options.purchase_recorder, int(data["round"]), slots)
+        self._lottery_endpoint.print_result_of_buy_lotto645(slots)
+
+    def _complete_unanswered_lotto645(self, data: Dict):
+        # 구매된 것은 확인했지만 응답을 받지 못했으므로, 자동으로 고른 번호는 비워둔 채로 장부에 기록함
+        logger.warning("구매 요청의 응답을 받지 못했으나 구매된 것을 확인했습니다. 자동으로 고른 번호는 동행복권 사이트의 구매 내역에서 확인해주세요.")
+        slots = lottery_site.slots_from_lotto645_param(data["param"])
+        self._invalidate_balance()
+        record_lotto645_purchase_quietly(self._options.purchase_recorder, int(data["round"]), slots)
+        self._lottery_endpoint.print_result_of_buy_lotto645(slots)
+
+    def _invalidate_balance(self):
+        if self._options.balance_cache is None:
+            return
         try:
-            resp = requests.get(self._cash_balance, headers=self._headers, timeout=10)
-            soup = BeautifulSoup(resp.text, "html5lib")
-
-            has_bank_account = soup.select_one(".tbl_total_account_number_top tbody tr td").contents != []
-            elem = soup.select("div.box.money")
-            elem = elem[0]
-
-            if has_bank_account is True:
-                # 간편충전 계좌번호가 있는 경우
-                총예치금 = self._parse_digit(elem.select("p.total_new > strong")[0].contents[0])
-                구매가능금액 = self._parse_digit(elem.select("td.ta_right")[3].contents[0])
-                예약구매금액 = self._parse_digit(elem.select("td.ta_right")[4].contents[0])
-                출금신청중금액 = self._parse_digit(elem.select("td.ta_right")[5].contents[0])
-                구매불가능금액 = self._parse_digit(elem.select("td.ta_right")[6].contents[0])  # (예약구매금액 + 출금신청중금액)
-                이번달누적구매금액 = self._parse_digit(elem.select("td.ta_right")[7].contents[0])
+            self._options.balance_cache.invalidate(self._user_id)
+        except Exception as e:
+            # 작업은 이미 끝났으므로 캐시를 지우지 못했다고 해서 실패로 처리하지 않음 (남은 값은 TTL 이 지나면 버려짐)
+            logger.warning(f"저장된 예치금 조회 결과를 지우지 못했습니다. (사유: {e!r})")
+
+    def _exec_buy_journaled(self, data: Dict):
+        """
+        구매 의도를 저널에 먼저 기록한 뒤 구매 요청을 보냅니다. 응답을 받지 못하면 한 번의 조회로 구매 여부를 확인하고, 구매되지 않은 경우에만 다시 보냅니다.
+
+        :return: 구매 응답. 응답을 받지 못했지만 구매된 것을 확인했으면 None
+        :raise BusinessError: 같은 구매가 진행 중이거나, 이전 시도의 구매 여부를 확인하지 못한 경우
+        """
+        if self._options.purchase_journal is None:
+            return self._exec_buy(data)
+
+        round_no, amount = int(data["round"]), int(data["nBuyAmount"])
+        tickets_hash = lottery_site.hash_lotto645_param(data["param"])
+
+        # 이전 실행이 응답을 받지 못하고 끝났다면, 다시 보내기 전에 그 구매가 처리되었는지 먼저 확인
+        previous = self._options.purchase_journal.find_open(round_no, tickets_hash)
+        if previous is not None:
+            state = self._reconcile_purchase(previous)
+            if state == PurchaseState.CONFIRMED:
+                return None
+            if state != PurchaseState.FAILED:
+                raise BusinessError(f"같은 티켓의 이전 구매 요청(#{previous.id})이 처리되었는지 확인하지 못했습니다. {_RESOLVE_HINT}")
+
+        attempts = self._options.retry_policy.max_attempts
+        for attempt in range(1, attempts + 1):
+            intent = self._options.purchase_journal.begin(round_no, tickets_hash, amount, data.get(_BASELINE_FIELD))
+            if intent is None:
+                raise BusinessError("같은 티켓의 구매 요청이 이미 진행 중입니다.")
+
+            try:
+                response = self._exec_buy(data)
+            except Exception as e:
+                state = self._settle_failed_purchase(intent, e)
+                if state == PurchaseState.CONFIRMED:
+                    return None
+                if state == PurchaseState.FAILED and attempt < attempts:
+                    delay = self._options.retry_policy.backoff(attempt - 1)
+                    logger.debug(f"exec_buy was not processed ({e!r}), retrying in {delay:.2f}s")
+                    time.sleep(delay)
+                    continue
+                if state == PurchaseState.FAILED:
+                    raise
+                raise TransientError(f"구매 요청의 응답을 받지 못했고, 구매되었는지도 확인하지 못했습니다. {_RESOLVE_HINT}") from e
+            except BaseException:
+                # Ctrl+C 등으로 중단되면 요청이 나갔는지 알 수 없으므로, 다음 실행에서 구매 여부를 확인하도록 남겨둠
+                self._options.purchase_journal.mark(intent, PurchaseState.UNKNOWN)
+                raise
+
+            self._options.purchase_journal.mark(intent, PurchaseState.CONFIRMED if lottery_site.is_purchase_success(response) else PurchaseState.FAILED)
+            return response
+
+    def _settle_failed_purchase(self, intent: PurchaseIntent, error: Exception) -> PurchaseState:
+        """
+        구매 요청이 실패했을 때 구매되었는지 정해 저널에 기록합니다.
+        """
+        if not getattr(error, "request_sent", True):
+            # 연결하기 전이나 회로 차단기가 막아 요청을 보내지 않았으므로 구매되지 않은 것이 확실함
+            self._options.purchase_journal.mark(intent, PurchaseState.FAILED)
+            return PurchaseState.FAILED
+        self._options.purchase_journal.mark(intent, PurchaseState.UNKNOWN)
+        return self._reconcile_purchase(intent)
+
+    def _reconcile_purchase(self, intent: PurchaseIntent) -> PurchaseState:
+        """
+        이번달 누적 구매금액이 구매 전보다 구매 금액만큼 늘었으면 구매된 것으로, 그대로면 구매되지 않은 것으로 봅니다.
+        그 밖의 경우(다른 구매가 섞였거나 달이 바뀐 경우 등)에는 판단하지 않고 UNKNOWN 으로 남겨둡니다.
+        """
+        with self._options.tracer.span("op.reconcile_lotto645", intent=intent.id) as span:
+            current = self._get_purchased_this_month() if intent.baseline is not None else None
+            if current is None:
+                state = PurchaseState.UNKNOWN
+            elif current - intent.baseline == intent.amount:
+                state = PurchaseState.CONFIRMED
+            elif current == intent.baseline:
+                state = PurchaseState.FAILED
             else:
-                # 간편충전 계좌번호가 없는 경우
-                총예치금 = self._parse_digit(elem.select("p.total_new > strong")[0].contents[0])
-                구매가능금액 = self._parse_digit(elem.select("td.ta_right")[1].contents[0])
-                예약구매금액 = self._parse_digit(elem.select("td.ta_right")[2].contents[0])
-                출금신청중금액 = self._parse_digit(elem.select("td.ta_right")[3].contents[0])
-                구매불가능금액 = self._parse_digit(elem.select("td.ta_right")[4].contents[0])  # (예약구매금액 + 출금신청중금액)
-                이번달누적구매금액 = self._parse_digit(elem.select("td.ta_right")[5].contents[0])
+                state = PurchaseState.UNKNOWN
+            span.set(state=state.value)
 
-            self._lottery_endpoint.print_result_of_show_balance(총예치금, 구매가능금액, 예약구매금액, 출금신청중금액, 구매불가능금액, 이번달누적구매금액)
+            self._options.purchase_journal.mark(intent, state)
+            return state
 
-        except Exception:
-            raise RuntimeError("❗ 예치금 현황을 조회하지 못했습니다.")
+    def _get_purchased_this_month(self) -> Optional[int]:
+        """
+        :return: 이번달 누적 구매금액. 조회하지 못하면 None
+        """
+        try:
+            resp = self._request(lottery_site.cash_balance_request(self._options.urls, name="purchase_check"))
+            return self._parse("parse_balance", resp.text)[5]
+        except Exception as e:
+            logger.debug(f"failed to check purchased amount: {e!r}")
+            return None
 
-    def _parse_digit(self, text):
-        return int("".join(filter(str.isdigit, text)))
+    def _get_ready_ip(self):
+        res = self._request(lottery_site.ready_socket_request(self._options.urls))
+        return json.loads(res.text)["ready_ip"]
 
-    def assign_virtual_account(self, deposit: Deposit):
+    def _exec_buy(self, data):
+        resp = self._request(lottery_site.exec_buy_request(self._options.urls, {k: v for k, v in data.items() if k not in (_SITE_ROUND_FIELD, _BASELINE_FIELD)}))
+
+        response_text = resp.text
+        logger.debug(f"response: {response_text}")
+
+        return json.loads(response_text)
+
+    def get_lotto645_draws(self, round_nos: List[int], max_workers: int = 4) -> List[Lotto645Draw]:
+        """
+        :return: 아직 추첨하지 않은 회차를 제외한 당첨번호 목록 (round_nos 순서)
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return [draw for draw in executor.map(self._get_lotto645_draw, round_nos) if draw is not None]
+
+    def _get_lotto645_draw(self, round_no: int) -> Optional[Lotto645Draw]:
+        resp = self._request(lottery_site.draw_result_request(self._options.urls, round_no))
+        return lottery_site.parse_lotto645_draw(resp.json())
+
+    def sync_lotto645_draws(self, store: DrawHistoryStore, max_workers: int = 4, chunk_size: int = 100):
+        with self._options.tracer.span("op.sync_lotto645_draws") as span:
+            synced = self._sync_lotto645_draws(store, max_workers, chunk_size)
+            span.set(synced=synced)
+
+    def _sync_lotto645_draws(self, store: DrawHistoryStore, max_workers: int, chunk_size: int) -> int:
+        with reraise_with_context("❗ 당첨번호를 가져오지 못했습니다.", unknown_reason="알 수 없는 오류"):
+            latest_round = self._get_current_round()[0] - 1
+            missing = store.missing_rounds(latest_round)
+            logger.debug(f"latest round: {latest_round}, missing: {len(missing)}")
+
+            synced = 0
+            for i in range(0, len(missing), chunk_size):
+                # 도중에 실패하더라도 이미 받은 회차는 다시 받지 않도록 나누어 저장
+                draws = self.get_lotto645_draws(missing[i : i + chunk_size], max_workers)
+                store.put_many(draws)
+                synced += len(draws)
+
+            stored_rounds = store.stored_rounds()
+            latest_draw = store.get(stored_rounds[-1]) if stored_rounds else None
+            self._lottery_endpoint.print_result_of_sync_lotto645_draws(synced, len(stored_rounds), latest_draw)
+            return synced
+
+    def show_balance(self, fresh: bool = False):
+        """
+        :param fresh: True 면 보관된 조회 결과가 있어도 사이트에서 다시 조회
+        """
+        with self._options.tracer.span("op.show_balance") as span:
+            cached = None if fresh or self._options.balance_cache is None else self._options.balance_cache.get(self._user_id)
+            span.set(cached=cached is not None)
+            if cached is not None:
+                self._lottery_endpoint.print_result_of_show_balance(*cached.values, fetched_at=cached.fetched_at)
+                return
+            self._show_balance()
+
+    def _show_balance(self):
+        with reraise_with_context("❗ 예치금 현황을 조회하지 못했습니다."):
+            resp = self._request(lottery_site.cash_balance_request(self._options.urls))
+            balance = self._parse("parse_balance", resp.text)
+            self._cache_balance(balance)
+
+            self._lottery_endpoint.print_result_of_show_balance(*balance)
+
+    def _cache_balance(self, values):
+        if self._options.balance_cache is None:
+            return
         try:
-            resp = requests.post(
-                self._assign_virtual_account_1,
-                headers=self._headers,
-                data={
-                    "PayMethod": "VBANKFVB01",
-                    "VbankBankCode": "089",  # 가상계좌 채번가능 케이뱅크 코드
-                    "price": str(deposit.amount),
-                    "goodsName": "복권예치금",
-                    "vExp": self._get_tomorrow(),
-                },
-                timeout=10,
-            )
-            logger.debug(f"status_code: {resp.status_code}")
-
-            data = resp.json()
-            logger.debug(f"data: {data}")
-
-            body = {
-                "PayMethod": data["PayMethod"],
-                "GoodsName": data["GoodsName"],
-                "GoodsCnt": data["GoodsCnt"],
-                "BuyerTel": data["BuyerTel"],
-                "Moid": data["Moid"],
-                "MID": data["MID"],
-                "UserIP": data["UserIP"],
-                "MallIP": data["MallIP"],
-                "MallUserID": data["MallUserID"],
-                "VbankExpDate": data["VbankExpDate"],
-                "BuyerEmail": data["BuyerEmail"],
-                "SocketYN": data["SocketYN"],
-                "GoodsCl": data["GoodsCl"],
-                "EncodeParameters": data["EncodeParameters"],
-                "EdiDate": data["EdiDate"],
-                "EncryptData": data["EncryptData"],
-                "Amt": data["amt"],
-                "BuyerName": data["BuyerName"],
-                "VbankBankCode": data["VbankBankCode"],
-                "VbankNum": data["FxVrAccountNo"],
-                "FxVrAccountNo": data["FxVrAccountNo"],
-                "VBankAccountName": data["BuyerName"],
-                "svcInfoPgMsgYn": "N",
-                "OptionList": "no_receipt",
-                "TransType": "0",  # 일반(0), 에스크로(1)
-                "TrKey": None,
-            }
-            logger.debug(f"body: {body}")
-
-            resp = requests.post(self._assign_virtual_account_2, headers=self._headers, data=body, timeout=10)
-            logger.debug(f"resp: {resp}")
-
-            soup = BeautifulSoup(resp.text, "html5lib")
-
-            elem = soup.select("#contents")
-
-            logger.debug(f"elem: {elem}")
-
-            전용가상계좌 = elem[0].select("span")[0].contents[0]
-            결제신청금액 = elem[0].select(".color_key1")[0].contents[0]
+            self._options.balance_cache.put(self._user_id, values)
+        except Exception as e:
+            logger.warning(f"예치금 조회 결과를 저장하지 못했습니다. (사유: {e!r})")
+
+    def assign_virtual_account(self, deposit: Deposit):
+        with self._options.tracer.span("op.assign_virtual_account", amount=deposit.amount):
+            self._assign_virtual_account(deposit)
+
+    def _assign_virtual_account(self, deposit: Deposit):
+        with reraise_with_context("❗ 가상계좌를 할당하지 못했습니다."):
+            resp = self._request(lottery_site.assign_virtual_account_init_request(self._options.urls, deposit))
+            # 할당 요청에 보낼 값(구매자 이름, 계좌번호 등)은 첫 요청의 응답에 담겨 옴
+            resp = self._request(lottery_site.assign_virtual_account_process_request(self._options.urls, resp.json()))
 
+            전용가상계좌, 결제신청금액 = self._parse("parse_virtual_account", resp.text)
+
+            self._invalidate_balance()
             self._lottery_endpoint.print_result_of_assign_virtual_account(전용가상계좌, 결제신청금액)
-        except Exception:
-            raise RuntimeError("❗ 가상계좌를 할당하지 못했습니다.")
-
-    def _get_tomorrow(self):
-        korea_tz = pytz.timezone("Asia/Seoul")
-        now = datetime.datetime.now(korea_tz)
-        tomorrow = now + datetime.timedelta(days=1)
-        return tomorrow.strftime("%Y%m%d")
+
+
+def _is_connect_failure(e: requests.RequestException) -> bool:
+    """
+    :return: 서버에 연결하지 못해 요청을 보내지 않은 것이 확실한지 여부
+    """
+    if isinstance(e, requests.ConnectTimeout):
+        return True
+    reason = getattr(e.args[0], "reason", None) if e.args else None
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
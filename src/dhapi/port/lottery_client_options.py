@@ -0,0 +1,58 @@
+from typing import Optional
+
+from dhapi.port.lottery_site import LotteryUrls
+from dhapi.port.page_extractor import build_page_extractor
+from dhapi.port.resilience import NullCircuitBreaker, RetryPolicy
+from dhapi.port.round_provider import RoundProvider
+from dhapi.port.session_store import SessionStore
+from dhapi.trace.tracer import NullTracer
+
+
+class LotteryClientOptions:  # pylint: disable=too-many-instance-attributes  # 선택 항목을 모아두는 값 객체
+    """
+    LotteryClient, AsyncLotteryClient 에 선택적으로 붙이는 협력 객체들입니다. 생략한 항목은 기본값을 쓰거나 그 기능을 쓰지 않습니다.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        pool_size: int = 10,
+        session_store: Optional[SessionStore] = None,
+        page_extractor=None,
+        round_provider: Optional[RoundProvider] = None,
+        urls: Optional[LotteryUrls] = None,
+        tracer=None,
+        purchase_recorder=None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker=None,
+        balance_cache=None,
+        transport_adapter=None,
+        purchase_journal=None,
+    ):
+        """
+        :param pool_size: 호스트별로 유지할 keep-alive 커넥션 수
+        :param session_store: 로그인 세션을 저장해 다음 실행에서 재사용할 SessionStore. 생략 시 매번 로그인
+        :param page_extractor: 페이지에서 값을 꺼낼 extractor. 생략 시 build_page_extractor()
+        :param round_provider: 판매 중인 회차를 계산해 알려주는 RoundProvider. 생략 시 매번 사이트에서 조회
+        :param urls: 요청을 보낼 주소. 생략 시 동행복권 사이트
+        :param tracer: 단계별 소요 시간을 기록할 Tracer. 생략 시 기록하지 않음
+        :param purchase_recorder: 구매한 티켓을 기록할 PurchaseRecorder. 생략 시 기록하지 않음
+        :param retry_policy: 생략 시 다시 시도하지 않음
+        :param circuit_breaker: 여러 프로필이 함께 쓰는 CircuitBreaker. 생략 시 차단하지 않음
+        :param balance_cache: 예치금 조회 결과를 보관할 BalanceCache. 생략 시 매번 조회 (LotteryClient 만 지원)
+        :param transport_adapter: 요청을 보낼 requests adapter (예: 기록/재생용 RecordingAdapter, ReplayAdapter). 생략 시 커넥션 풀을 쓰는 HTTPAdapter (LotteryClient 만 지원)
+        :param purchase_journal: 구매 요청 전에 구매 의도를 기록할 ProfilePurchaseJournal. 지정하면 응답을 받지 못한 구매는 이번달 누적 구매금액으로 구매 여부를 확인한 뒤,
+            구매되지 않았을 때만 retry_policy 에 따라 다시 보냄. 생략 시 다시 보내지 않음 (LotteryClient 만 지원)
+        """
+        self.pool_size = pool_size
+        self.session_store = session_store
+        self.page_extractor = page_extractor or build_page_extractor()
+        self.round_provider = round_provider
+        self.urls = urls or LotteryUrls()
+        self.tracer = tracer or NullTracer()
+        self.purchase_recorder = purchase_recorder
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=1)
+        self.circuit_breaker = circuit_breaker or NullCircuitBreaker()
+        self.balance_cache = balance_cache
+        self.transport_adapter = transport_adapter
+        self.purchase_journal = purchase_journal
@@ -0,0 +1,71 @@
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class LotteryError(RuntimeError):
+    """
+    동행복권 사이트와 통신하다 생긴 오류. 종류에 따라 다시 시도할지, 다른 프로필 작업도 멈출지를 정합니다.
+    """
+
+    def __init__(self, message: str, reason: Optional[str] = None, request_sent: bool = True):
+        """
+        :param reason: 작업 이름을 붙이기 전의 원래 사유. 생략 시 message
+        :param request_sent: 요청이 사이트로 나갔을 수도 있는지 여부. 연결하기 전이나 회로 차단기가 막아 보내지 않은 것이 확실할 때만 False
+        """
+        super().__init__(message)
+        self.reason = reason or message
+        self.request_sent = request_sent
+
+    def with_context(self, message: str) -> "LotteryError":
+        """
+        :return: 같은 종류의 오류로, "{message} (사유: {reason})" 형식의 메시지를 가짐
+        """
+        return type(self)(f"{message} (사유: {self.reason})", self.reason, self.request_sent)
+
+
+class MaintenanceError(LotteryError):
+    """
+    사이트가 시스템 점검 중입니다. 점검이 끝날 때까지 모든 프로필의 요청을 멈춥니다.
+    """
+
+
+class AuthError(LotteryError):
+    """
+    로그인에 실패했습니다. 다시 시도하면 비밀번호 오류 횟수만 늘어나므로 다시 시도하지 않습니다.
+    """
+
+
+class TransientError(LotteryError):
+    """
+    연결이 끊기거나 서버 오류(5xx) 처럼 잠시 뒤 다시 시도하면 성공할 수 있는 오류입니다.
+    """
+
+
+class BusinessError(LotteryError):
+    """
+    사이트가 요청을 처리하고 거절했습니다 (예: 구매 한도 초과, 예치금 부족). 다시 시도해도 같은 결과이므로 다시 시도하지 않습니다.
+    """
+
+
+@contextmanager
+def reraise_with_context(message: str, unknown_reason: Optional[str] = None) -> Iterator[None]:
+    """
+    블록에서 생긴 오류에 작업 이름(message)을 붙여 다시 올려보냅니다.
+
+    LotteryError 는 같은 종류로 "{message} (사유: ...)" 를 붙이고, 그 밖의 오류는 RuntimeError(message) 로 바꿉니다.
+    unknown_reason 을 지정하면 이미 사용자에게 보여줄 메시지를 담은 RuntimeError 는 그대로 두고, 나머지 오류에는 이 사유를 붙입니다.
+
+    usage:
+        with reraise_with_context("❗ 예치금 현황을 조회하지 못했습니다."):
+            ...
+    """
+    try:
+        yield
+    except LotteryError as e:
+        raise e.with_context(message) from None
+    except RuntimeError:
+        if unknown_reason is None:
+            raise RuntimeError(message)
+        raise
+    except Exception:
+        raise RuntimeError(message if unknown_reason is None else f"{message} (사유: {unknown_reason})")
@@ -0,0 +1,294 @@
+import datetime
+import hashlib
+import json
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, List, Optional
+
+import pytz
+
+from dhapi.domain.deposit import Deposit
+from dhapi.domain.lotto645_draw import Lotto645Draw
+from dhapi.domain.lotto645_ticket import Lotto645Mode, Lotto645Ticket
+from dhapi.port.lottery_errors import LotteryError, MaintenanceError, TransientError
+
+
+class LotteryUrls:  # pylint: disable=too-many-instance-attributes  # 요청마다 주소 하나씩
+    def __init__(
+        self,
+        base_url: str = "https://dhlottery.co.kr",
+        www_base_url: str = "https://www.dhlottery.co.kr",
+        ol_base_url: str = "https://ol.dhlottery.co.kr",
+    ):
+        self.default_session = f"{base_url}/gameResult.do?method=byWin&wiselog=H_C_1_1"
+        self.system_under_check = f"{base_url}/index_check.html"
+        self.main = f"{base_url}/common.do?method=main"
+        self.login_request = f"{www_base_url}/userSsl.do?method=login"
+        self.buy_lotto645 = f"{ol_base_url}/olotto/game/execBuy.do"
+        self.round_info = f"{www_base_url}/common.do?method=main"
+        self.draw_result = f"{www_base_url}/common.do?method=getLottoNumber"
+        self.ready_socket = f"{ol_base_url}/olotto/game/egovUserReadySocket.json"
+        self.cash_balance = f"{base_url}/userSsl.do?method=myPage"
+        self.assign_virtual_account_1 = f"{base_url}/nicePay.do?method=nicePayInit"
+        self.assign_virtual_account_2 = f"{base_url}/nicePay.do?method=nicePayProcess"
+
+
+class PinnedSessionCookiePolicy(DefaultCookiePolicy):
+    # 로그인을 시도하면 새로운 JSESSIONID 값이 내려오는데,
+    #  이 값으로 갱신하면 로그인이 풀리는 듯하여 응답으로 내려오는 쿠키는 세션에 저장하지 않음
+    def set_ok(self, cookie, request):
+        return False
+
+
+def build_headers() -> Dict[str, str]:
+    return {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.77 Safari/537.36",
+        "Connection": "keep-alive",
+        "Cache-Control": "max-age=0",
+        "sec-ch-ua": '" Not;A Brand";v="99", "Google Chrome";v="91", "Chromium";v="91"',
+        "sec-ch-ua-mobile": "?0",
+        "Upgrade-Insecure-Requests": "1",
+        "Origin": "https://dhlottery.co.kr",
+        "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9",
+        "Referer": "https://dhlottery.co.kr",
+        "Sec-Fetch-Site": "same-site",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-User": "?1",
+        "Sec-Fetch-Dest": "document",
+        "Accept-Language": "ko,en-US;q=0.9,en;q=0.8,ko-KR;q=0.7",
+        "X-Requested-With": "XMLHttpRequest",
+    }
+
+
+class SiteRequest:
+    """
+    동행복권 사이트에 보낼 요청 하나입니다. LotteryClient(requests)와 AsyncLotteryClient(httpx)가 같은 주소와 본문으로 요청하도록 여기서 만듭니다.
+
+    :param name: trace 에 남길 요청 이름
+    :param idempotent: 실패했을 때 다시 보내도 되는 요청인지 여부. 생략 시 GET 요청만 다시 보냄
+    :param kwargs: headers, data, params, timeout 처럼 두 HTTP 라이브러리가 같은 이름으로 받는 값
+    """
+
+    def __init__(self, name: str, method: str, url: str, idempotent: Optional[bool] = None, **kwargs):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.idempotent = idempotent
+        self.kwargs = kwargs
+
+
+def default_session_request(urls: LotteryUrls) -> SiteRequest:
+    return SiteRequest("default_session", "GET", urls.default_session, timeout=10)
+
+
+def login_request(urls: LotteryUrls, user_id: str, user_pw: str) -> SiteRequest:
+    return SiteRequest("login", "POST", urls.login_request, idempotent=True, headers=build_headers(), data=build_login_data(user_id, user_pw, urls.main), timeout=10)
+
+
+def round_info_request(urls: LotteryUrls) -> SiteRequest:
+    return SiteRequest("round_info", "GET", urls.round_info, timeout=10)
+
+
+def ready_socket_request(urls: LotteryUrls) -> SiteRequest:
+    return SiteRequest("ready_socket", "POST", urls.ready_socket, idempotent=True, headers=build_headers(), timeout=5)
+
+
+def exec_buy_request(urls: LotteryUrls, data: Dict) -> SiteRequest:
+    """
+    :param data: build_buy_lotto645_data() 의 결과
+    """
+    return SiteRequest("exec_buy", "POST", urls.buy_lotto645, headers=build_headers(), data=data, timeout=10)
+
+
+def cash_balance_request(urls: LotteryUrls, name: str = "cash_balance") -> SiteRequest:
+    return SiteRequest(name, "GET", urls.cash_balance, headers=build_headers(), timeout=10)
+
+
+def draw_result_request(urls: LotteryUrls, round_no: int) -> SiteRequest:
+    return SiteRequest("draw_result", "GET", urls.draw_result, params={"drwNo": round_no}, timeout=10)
+
+
+def assign_virtual_account_init_request(urls: LotteryUrls, deposit: Deposit) -> SiteRequest:
+    return SiteRequest(
+        "assign_virtual_account_init", "POST", urls.assign_virtual_account_1, headers=build_headers(), data=build_assign_virtual_account_init_data(deposit), timeout=10
+    )
+
+
+def assign_virtual_account_process_request(urls: LotteryUrls, init_response) -> SiteRequest:
+    """
+    :param init_response: assign_virtual_account_init 요청의 JSON 응답
+    """
+    # requests 는 값이 None 인 필드를 보내지 않으므로, httpx 로 보낼 때도 같도록 미리 뺌
+    body = {k: v for k, v in build_assign_virtual_account_process_data(init_response).items() if v is not None}
+    return SiteRequest("assign_virtual_account_process", "POST", urls.assign_virtual_account_2, headers=build_headers(), data=body, timeout=10)
+
+
+def build_login_data(user_id: str, user_pw: str, return_url: str) -> Dict[str, str]:
+    return {
+        "returnUrl": return_url,
+        "userId": user_id,
+        "password": user_pw,
+        "checkSave": "off",
+        "newsEventYn": "",
+    }
+
+
+def make_buy_lotto645_param(tickets: List[Lotto645Ticket]) -> str:
+    params = []
+    for i, t in enumerate(tickets):
+        if t.mode == Lotto645Mode.AUTO:
+            gen_type = "0"
+        elif t.mode == Lotto645Mode.MANUAL:
+            gen_type = "1"
+        elif t.mode == Lotto645Mode.SEMIAUTO:
+            gen_type = "2"
+        else:
+            raise RuntimeError(f"올바르지 않은 모드입니다. (mode: {t.mode})")
+        arr_game_choice_num = None if t.mode == Lotto645Mode.AUTO else ",".join(map(str, t.numbers))
+        alpabet = "ABCDE"[i]  # XXX: 오타 아님
+        slot = {
+            "genType": gen_type,
+            "arrGameChoiceNum": arr_game_choice_num,
+            "alpabet": alpabet,
+        }
+        params.append(slot)
+    return json.dumps(params)
+
+
+_GEN_TYPE_MODES = {"0": "자동", "1": "수동", "2": "반자동"}
+
+
+def build_buy_lotto645_data(round_no: int, direct: str, param: str, ticket_count: int) -> Dict:
+    """
+    :param direct: ready socket 요청으로 받은 ready_ip
+    :param param: make_buy_lotto645_param() 의 결과
+    """
+    return {
+        "round": str(round_no),
+        "direct": direct,
+        "nBuyAmount": str(1000 * ticket_count),
+        "param": param,
+        "gameCnt": ticket_count,
+    }
+
+
+def hash_lotto645_param(param: str) -> str:
+    """
+    같은 티켓 묶음이면 슬롯 순서와 관계없이 같은 값이 나오도록 모드와 고른 번호만으로 만든 해시
+
+    :param param: make_buy_lotto645_param() 의 결과
+    """
+    tickets = sorted((slot["genType"], sorted(int(n) for n in (slot["arrGameChoiceNum"] or "").split(",") if n)) for slot in json.loads(param))
+    return hashlib.sha256(json.dumps(tickets).encode("UTF-8")).hexdigest()[:16]
+
+
+def slots_from_lotto645_param(param: str) -> List[Dict]:
+    """
+    구매 응답을 받지 못해 번호를 알 수 없을 때 출력할 슬롯. 자동으로 고른 번호는 비어 있음
+
+    :param param: make_buy_lotto645_param() 의 결과
+    """
+    return [
+        {"mode": _GEN_TYPE_MODES[slot["genType"]], "slot": slot["alpabet"], "numbers": [f"{int(n):02d}" for n in (slot["arrGameChoiceNum"] or "").split(",") if n]}
+        for slot in json.loads(param)
+    ]
+
+
+def classify_response(status_code: int, url: str, urls: LotteryUrls) -> Optional[LotteryError]:
+    """
+    :return: 응답이 실패를 뜻하면 그 종류에 맞는 오류, 아니면 None
+    """
+    if url == urls.system_under_check:
+        return MaintenanceError("동행복권 사이트가 현재 시스템 점검중입니다.")
+    if status_code >= 500 or status_code == 429:
+        return TransientError(f"서버에서 알 수 없는 오류가 발생했습니다 (HTTP {status_code})")
+    return None
+
+
+def is_purchase_success(response) -> bool:
+    return response["result"]["resultCode"] == "100"
+
+
+def format_lotto_numbers(lines: list) -> List[Dict]:
+    """
+    example: ["A|01|02|04|27|39|443", "B|11|23|25|27|28|452"]
+    """
+
+    mode_dict = {
+        "1": "수동",
+        "2": "반자동",
+        "3": "자동",
+    }
+
+    slots = []
+    for line in lines:
+        slot = {
+            "mode": mode_dict[line[-1]],
+            "slot": line[0],
+            "numbers": line[2:-1].split("|"),
+        }
+        slots.append(slot)
+    return slots
+
+
+def parse_lotto645_draw(response) -> Optional[Lotto645Draw]:
+    """
+    example: {"returnValue": "success", "drwNo": 1141, "drwtNo1": 7, ..., "drwtNo6": 45, "bnusNo": 12, "drwNoDate": "2024-10-05", ...}
+
+    :return: 아직 추첨하지 않은 회차라면 None
+    """
+    if response.get("returnValue") != "success":
+        return None
+    return Lotto645Draw(
+        round_no=int(response["drwNo"]),
+        numbers=[int(response[f"drwtNo{i}"]) for i in range(1, 7)],
+        bonus=int(response["bnusNo"]),
+    )
+
+
+def build_assign_virtual_account_init_data(deposit: Deposit) -> Dict[str, str]:
+    return {
+        "PayMethod": "VBANKFVB01",
+        "VbankBankCode": "089",  # 가상계좌 채번가능 케이뱅크 코드
+        "price": str(deposit.amount),
+        "goodsName": "복권예치금",
+        "vExp": get_tomorrow(),
+    }
+
+
+def build_assign_virtual_account_process_data(data) -> Dict:
+    return {
+        "PayMethod": data["PayMethod"],
+        "GoodsName": data["GoodsName"],
+        "GoodsCnt": data["GoodsCnt"],
+        "BuyerTel": data["BuyerTel"],
+        "Moid": data["Moid"],
+        "MID": data["MID"],
+        "UserIP": data["UserIP"],
+        "MallIP": data["MallIP"],
+        "MallUserID": data["MallUserID"],
+        "VbankExpDate": data["VbankExpDate"],
+        "BuyerEmail": data["BuyerEmail"],
+        "SocketYN": data["SocketYN"],
+        "GoodsCl": data["GoodsCl"],
+        "EncodeParameters": data["EncodeParameters"],
+        "EdiDate": data["EdiDate"],
+        "EncryptData": data["EncryptData"],
+        "Amt": data["amt"],
+        "BuyerName": data["BuyerName"],
+        "VbankBankCode": data["VbankBankCode"],
+        "VbankNum": data["FxVrAccountNo"],
+        "FxVrAccountNo": data["FxVrAccountNo"],
+        "VBankAccountName": data["BuyerName"],
+        "svcInfoPgMsgYn": "N",
+        "OptionList": "no_receipt",
+        "TransType": "0",  # 일반(0), 에스크로(1)
+        "TrKey": None,
+    }
+
+
+def get_tomorrow():
+    korea_tz = pytz.timezone("Asia/Seoul")
+    now = datetime.datetime.now(korea_tz)
+    tomorrow = now + datetime.timedelta(days=1)
+    return tomorrow.strftime("%Y%m%d")
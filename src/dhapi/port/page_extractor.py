@@ -0,0 +1,200 @@
+import logging
+import re
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PageExtractionError(Exception):
+    pass
+
+
+class Html5libPageExtractor:
+    """
+    html5lib 로 페이지 전체를 파싱합니다. 느리지만 태그 짝이 맞지 않는 페이지도 브라우저와 같은 방식으로 해석합니다.
+    """
+
+    def __init__(self):
+        # bs4, html5lib 는 불러오는 데만 수백 ms 가 걸리므로 빠른 경로가 실패해 실제로 필요해질 때 불러옴
+        from bs4 import BeautifulSoup
+
+        self._beautiful_soup = BeautifulSoup
+
+    def _soup(self, html: str):
+        return self._beautiful_soup(html, "html5lib")
+
+    def is_login_failed(self, html: str) -> bool:
+        soup = self._soup(html)
+        return soup.find("a", {"class": "btn_common"}) is not None
+
+    def parse_round(self, html: str) -> int:
+        soup = self._soup(html)  # 'html5lib' : in case that the html don't have clean tag pairs
+
+        elem = soup.find("strong", {"id": "lottoDrwNo"})
+        if not elem:
+            raise RuntimeError("현재 회차 정보를 가져올 수 없습니다.")
+
+        return int(elem.text) + 1
+
+    def parse_balance(self, html: str) -> Tuple[int, int, int, int, int, int]:
+        """
+        :return: (총예치금, 구매가능금액, 예약구매금액, 출금신청중금액, 구매불가능금액, 이번달누적구매금액)
+        """
+        soup = self._soup(html)
+
+        has_bank_account = soup.select_one(".tbl_total_account_number_top tbody tr td").contents != []
+        elem = soup.select("div.box.money")
+        elem = elem[0]
+
+        if has_bank_account is True:
+            # 간편충전 계좌번호가 있는 경우
+            총예치금 = _parse_digit(elem.select("p.total_new > strong")[0].contents[0])
+            구매가능금액 = _parse_digit(elem.select("td.ta_right")[3].contents[0])
+            예약구매금액 = _parse_digit(elem.select("td.ta_right")[4].contents[0])
+            출금신청중금액 = _parse_digit(elem.select("td.ta_right")[5].contents[0])
+            구매불가능금액 = _parse_digit(elem.select("td.ta_right")[6].contents[0])  # (예약구매금액 + 출금신청중금액)
+            이번달누적구매금액 = _parse_digit(elem.select("td.ta_right")[7].contents[0])
+        else:
+            # 간편충전 계좌번호가 없는 경우
+            총예치금 = _parse_digit(elem.select("p.total_new > strong")[0].contents[0])
+            구매가능금액 = _parse_digit(elem.select("td.ta_right")[1].contents[0])
+            예약구매금액 = _parse_digit(elem.select("td.ta_right")[2].contents[0])
+            출금신청중금액 = _parse_digit(elem.select("td.ta_right")[3].contents[0])
+            구매불가능금액 = _parse_digit(elem.select("td.ta_right")[4].contents[0])  # (예약구매금액 + 출금신청중금액)
+            이번달누적구매금액 = _parse_digit(elem.select("td.ta_right")[5].contents[0])
+
+        return 총예치금, 구매가능금액, 예약구매금액, 출금신청중금액, 구매불가능금액, 이번달누적구매금액
+
+    def parse_virtual_account(self, html: str) -> Tuple[str, str]:
+        """
+        :return: (전용가상계좌, 결제신청금액)
+        """
+        soup = self._soup(html)
+
+        elem = soup.select("#contents")
+
+        전용가상계좌 = elem[0].select("span")[0].contents[0]
+        결제신청금액 = elem[0].select(".color_key1")[0].contents[0]
+
+        return str(전용가상계좌), str(결제신청금액)
+
+
+class RegexPageExtractor:
+    """
+    필요한 값 주변만 미리 컴파일한 정규식으로 찾습니다. 페이지 구조가 예상과 다르면 PageExtractionError 를 발생시킵니다.
+    """
+
+    _login_failed_pattern = re.compile(r"<a\b[^>]*\bclass\s*=\s*[\"'](?:[^\"']*\s)?btn_common(?:\s[^\"']*)?[\"']", re.IGNORECASE)
+    _login_failed_marker_pattern = re.compile(r"btn_common", re.IGNORECASE)
+    _round_pattern = re.compile(r"<strong\b[^>]*\bid\s*=\s*[\"']?lottoDrwNo[\"']?[^>]*>\s*(\d+)\s*</strong>", re.IGNORECASE)
+    _account_number_table_pattern = re.compile(r"class\s*=\s*[\"'][^\"']*\btbl_total_account_number_top\b", re.IGNORECASE)
+    _first_td_pattern = re.compile(r"<td\b[^>]*>(.*?)</td>", re.IGNORECASE | re.DOTALL)
+    _box_money_pattern = re.compile(r"<div\b[^>]*\bclass\s*=\s*[\"'](?=[^\"']*\bbox\b)(?=[^\"']*\bmoney\b)[^\"']*[\"'][^>]*>", re.IGNORECASE)
+    _box_end_pattern = re.compile(r"<div\b[^>]*\bclass\s*=\s*[\"'][^\"']*\bbox\b", re.IGNORECASE)
+    _total_pattern = re.compile(r"<p\b[^>]*\bclass\s*=\s*[\"'][^\"']*\btotal_new\b[^\"']*[\"'][^>]*>\s*<strong\b[^>]*>([^<]*)<", re.IGNORECASE)
+    _ta_right_pattern = re.compile(r"<td\b[^>]*\bclass\s*=\s*[\"'][^\"']*\bta_right\b[^\"']*[\"'][^>]*>([^<]*)<", re.IGNORECASE)
+    _contents_pattern = re.compile(r"\bid\s*=\s*[\"']?contents[\"']?[^>]*>", re.IGNORECASE)
+    _span_pattern = re.compile(r"<span\b[^>]*>([^<]+)<", re.IGNORECASE)
+    _color_key1_pattern = re.compile(r"<\w+\b[^>]*\bclass\s*=\s*[\"'][^\"']*\bcolor_key1\b[^\"']*[\"'][^>]*>([^<]+)<", re.IGNORECASE)
+
+    def is_login_failed(self, html: str) -> bool:
+        if self._login_failed_pattern.search(html):
+            return True
+        if self._login_failed_marker_pattern.search(html):
+            # 따옴표 없는 class 속성처럼 정규식이 모르는 형태로 버튼이 있을 수 있으므로 로그인 성공으로 단정하지 않음
+            raise PageExtractionError("a.btn_common")
+        return False
+
+    def parse_round(self, html: str) -> int:
+        match = self._round_pattern.search(html)
+        if not match:
+            raise PageExtractionError("lottoDrwNo")
+        return int(match.group(1)) + 1
+
+    def parse_balance(self, html: str) -> Tuple[int, int, int, int, int, int]:
+        has_bank_account = self._has_bank_account(html)
+        box_html = self._money_box(html)
+
+        total = self._total_pattern.search(box_html)
+        if not total:
+            raise PageExtractionError("p.total_new > strong")
+        cells = self._ta_right_pattern.findall(box_html)
+
+        offset = 3 if has_bank_account else 1
+        if len(cells) < offset + 5:
+            raise PageExtractionError("td.ta_right")
+
+        총예치금 = _parse_digit(total.group(1))
+        구매가능금액, 예약구매금액, 출금신청중금액, 구매불가능금액, 이번달누적구매금액 = [_parse_digit(cell) for cell in cells[offset : offset + 5]]
+        return 총예치금, 구매가능금액, 예약구매금액, 출금신청중금액, 구매불가능금액, 이번달누적구매금액
+
+    def _has_bank_account(self, html: str) -> bool:
+        table = self._account_number_table_pattern.search(html)
+        if not table:
+            raise PageExtractionError("tbl_total_account_number_top")
+        first_td = self._first_td_pattern.search(html, table.end())
+        if not first_td:
+            raise PageExtractionError("tbl_total_account_number_top td")
+        return first_td.group(1) != ""
+
+    def _money_box(self, html: str) -> str:
+        box = self._box_money_pattern.search(html)
+        if not box:
+            raise PageExtractionError("div.box.money")
+        box_end = self._box_end_pattern.search(html, box.end())
+        return html[box.end() : box_end.start() if box_end else len(html)]
+
+    def parse_virtual_account(self, html: str) -> Tuple[str, str]:
+        contents = self._contents_pattern.search(html)
+        if not contents:
+            raise PageExtractionError("#contents")
+
+        span = self._span_pattern.search(html, contents.end())
+        amount = self._color_key1_pattern.search(html, contents.end())
+        if not span or not amount:
+            raise PageExtractionError("#contents span, .color_key1")
+
+        return span.group(1), amount.group(1)
+
+
+class FallbackPageExtractor:
+    """
+    빠른 추출기를 먼저 시도하고, 실패하면 느리지만 확실한 추출기로 다시 파싱합니다.
+    """
+
+    def __init__(self, fast_extractor, slow_extractor_factory):
+        self._fast_extractor = fast_extractor
+        self._slow_extractor_factory = slow_extractor_factory
+        self._slow_extractor = None
+
+    def _slow(self):
+        if self._slow_extractor is None:
+            self._slow_extractor = self._slow_extractor_factory()
+        return self._slow_extractor
+
+    def _extract(self, name, html):
+        try:
+            return getattr(self._fast_extractor, name)(html)
+        except Exception as e:
+            logger.debug(f"fast path of {name} failed ({e!r}), falling back")
+            return getattr(self._slow(), name)(html)
+
+    def is_login_failed(self, html: str) -> bool:
+        return self._extract("is_login_failed", html)
+
+    def parse_round(self, html: str) -> int:
+        return self._extract("parse_round", html)
+
+    def parse_balance(self, html: str) -> Tuple[int, int, int, int, int, int]:
+        return self._extract("parse_balance", html)
+
+    def parse_virtual_account(self, html: str) -> Tuple[str, str]:
+        return self._extract("parse_virtual_account", html)
+
+
+def build_page_extractor():
+    return FallbackPageExtractor(RegexPageExtractor(), Html5libPageExtractor)
+
+
+def _parse_digit(text):
+    return int("".join(filter(str.isdigit, text)))
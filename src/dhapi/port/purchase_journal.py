@@ -0,0 +1,179 @@
+import datetime
+import logging
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+from enum import Enum
+from typing import Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lotto645_purchase_intents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    profile TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    tickets_hash TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    baseline INTEGER,
+    state TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_lotto645_purchase_intents_open ON lotto645_purchase_intents (profile, round, tickets_hash) WHERE state IN ('PENDING', 'UNKNOWN');
+"""
+
+
+class PurchaseState(str, Enum):
+    PENDING = "PENDING"  # 구매 요청을 보내기 직전에 기록
+    CONFIRMED = "CONFIRMED"
+    FAILED = "FAILED"
+    UNKNOWN = "UNKNOWN"  # 응답을 받지 못했고 구매 여부도 아직 확인하지 못함
+
+    @property
+    def is_open(self) -> bool:
+        return self in (PurchaseState.PENDING, PurchaseState.UNKNOWN)
+
+
+class PurchaseIntent:  # pylint: disable=too-many-instance-attributes  # 저널 테이블의 한 행
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self, intent_id: int, profile_name: str, round_no: int, tickets_hash: str, amount: int, baseline: Optional[int], state: PurchaseState, created_at: Optional[str] = None
+    ):
+        """
+        :param amount: 구매 금액 (원)
+        :param baseline: 구매 요청 전에 확인한 이번달 누적 구매금액. 모르면 None (이 경우 구매 여부를 확인할 수 없음)
+        :param created_at: 기록한 시각 (UTC, ISO 8601)
+        """
+        self.id = intent_id
+        self.profile_name = profile_name
+        self.round_no = round_no
+        self.tickets_hash = tickets_hash
+        self.amount = amount
+        self.baseline = baseline
+        self.state = state
+        self.created_at = created_at
+
+    def __repr__(self):
+        return f"PurchaseIntent(id={self.id}, profile_name={self.profile_name!r}, round_no={self.round_no}, tickets_hash={self.tickets_hash!r}, state={self.state.value})"
+
+
+class PurchaseJournal:
+    """
+    구매 요청을 보내기 전에 구매 의도(intent)를 ~/.dhapi/journal.sqlite3 에 먼저 기록하는 write-ahead 저널입니다.
+
+    (프로필, 회차, 티켓 묶음) 마다 결과가 정해지지 않은(PENDING, UNKNOWN) 의도는 하나만 둘 수 있으므로,
+    응답을 받지 못한 구매를 다시 시도하거나 여러 프로세스가 같은 구매를 동시에 시도해도 결과를 확인하기 전에는 다시 보내지 않습니다.
+    자동으로 구매 여부를 확인하지 못한 의도는 사용자가 사이트의 구매 내역을 보고 resolve() ('dhapi journal --resolve') 로 결과를 정합니다.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path or os.path.expanduser("~/.dhapi/journal.sqlite3")
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self._path, timeout=30)
+        # 여러 프로필이 동시에 기록해도 서로 막지 않도록 WAL 모드 사용
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        연결을 열고, 블록이 끝나면 커밋(예외가 나면 롤백)한 뒤 닫습니다.
+        """
+        with closing(self._connect()) as conn:
+            with conn:
+                yield conn
+
+    def begin(self, profile_name: str, round_no: int, tickets_hash: str, amount: int, baseline: Optional[int]) -> Optional[PurchaseIntent]:
+        """
+        :return: 새로 기록한 PENDING 의도. 같은 구매의 결과가 정해지지 않은 의도가 이미 있으면 None
+        """
+        now = _now()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO lotto645_purchase_intents (profile, round, tickets_hash, amount, baseline, state, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (profile_name, round_no, tickets_hash, amount, baseline, PurchaseState.PENDING.value, now, now),
+            )
+            if cursor.rowcount == 0:
+                return None
+        return PurchaseIntent(cursor.lastrowid, profile_name, round_no, tickets_hash, amount, baseline, PurchaseState.PENDING, now)
+
+    def mark(self, intent: PurchaseIntent, state: PurchaseState):
+        with self._transaction() as conn:
+            conn.execute("UPDATE lotto645_purchase_intents SET state = ?, updated_at = ? WHERE id = ?", (state.value, _now(), intent.id))
+        logger.debug(f"purchase intent {intent.id}: {intent.state.value} -> {state.value}")
+        intent.state = state
+
+    def find_open(self, profile_name: str, round_no: int, tickets_hash: str) -> Optional[PurchaseIntent]:
+        intents = self._find("WHERE profile = ? AND round = ? AND tickets_hash = ? AND state IN ('PENDING', 'UNKNOWN')", (profile_name, round_no, tickets_hash))
+        return intents[0] if intents else None
+
+    def find_intents(self, profile_name: Optional[str] = None, open_only: bool = False) -> List[PurchaseIntent]:
+        """
+        :param open_only: 결과가 정해지지 않은(PENDING, UNKNOWN) 의도만 찾을지 여부
+        """
+        conditions, params = [], []
+        if profile_name is not None:
+            conditions.append("profile = ?")
+            params.append(profile_name)
+        if open_only:
+            conditions.append("state IN ('PENDING', 'UNKNOWN')")
+        return self._find(f"WHERE {' AND '.join(conditions)}" if conditions else "", tuple(params))
+
+    def resolve(self, intent_id: int, purchased: bool) -> PurchaseIntent:
+        """
+        구매 여부를 확인하지 못한 의도의 결과를 사용자가 정합니다. 결과가 정해지면 같은 티켓을 다시 구매할 수 있습니다.
+
+        :param purchased: 사이트의 구매 내역에 있으면 True (CONFIRMED), 없으면 False (FAILED)
+        :raise ValueError: 의도가 없거나 이미 결과가 정해진 경우
+        """
+        state = PurchaseState.CONFIRMED if purchased else PurchaseState.FAILED
+        with self._transaction() as conn:
+            # 그 사이 다른 실행이 결과를 정했을 수 있으므로 아직 정해지지 않은 경우에만 바꿈
+            cursor = conn.execute(
+                "UPDATE lotto645_purchase_intents SET state = ?, updated_at = ? WHERE id = ? AND state IN ('PENDING', 'UNKNOWN')", (state.value, _now(), intent_id)
+            )
+        intents = self._find("WHERE id = ?", (intent_id,))
+        if not intents:
+            raise ValueError(f"{intent_id}번 구매 요청을 찾지 못했습니다.")
+        if cursor.rowcount == 0:
+            raise ValueError(f"{intent_id}번 구매 요청은 이미 {intents[0].state.value} 로 정해졌습니다.")
+        logger.debug(f"purchase intent {intent_id}: resolved as {state.value}")
+        return intents[0]
+
+    def _find(self, where: str, params) -> List[PurchaseIntent]:
+        if not os.path.exists(self._path):
+            return []
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT id, profile, round, tickets_hash, amount, baseline, state, created_at FROM lotto645_purchase_intents {where} ORDER BY id", params
+            ).fetchall()
+        return [PurchaseIntent(*row[:6], PurchaseState(row[6]), row[7]) for row in rows]
+
+    def for_profile(self, profile_name: str) -> "ProfilePurchaseJournal":
+        return ProfilePurchaseJournal(self, profile_name)
+
+
+class ProfilePurchaseJournal:
+    """
+    LotteryClient 가 사용하며, 어느 프로필의 구매인지 기억해 저널에 넘깁니다.
+    """
+
+    def __init__(self, journal: PurchaseJournal, profile_name: str):
+        self._journal = journal
+        self._profile_name = profile_name
+
+    def begin(self, round_no: int, tickets_hash: str, amount: int, baseline: Optional[int]) -> Optional[PurchaseIntent]:
+        return self._journal.begin(self._profile_name, round_no, tickets_hash, amount, baseline)
+
+    def mark(self, intent: PurchaseIntent, state: PurchaseState):
+        self._journal.mark(intent, state)
+
+    def find_open(self, round_no: int, tickets_hash: str) -> Optional[PurchaseIntent]:
+        return self._journal.find_open(self._profile_name, round_no, tickets_hash)
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
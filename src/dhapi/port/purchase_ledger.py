@@ -0,0 +1,154 @@
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+from typing import Iterator, List, Optional
+
+from dhapi.domain.lotto645_mask import numbers_to_mask
+from dhapi.domain.lotto645_purchase import Lotto645Purchase
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lotto645_purchases (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    profile TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    slot TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    numbers TEXT NOT NULL,
+    mask INTEGER NOT NULL,
+    purchased_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lotto645_purchases_round_profile ON lotto645_purchases (round, profile);
+CREATE INDEX IF NOT EXISTS idx_lotto645_purchases_profile_round ON lotto645_purchases (profile, round);
+CREATE TRIGGER IF NOT EXISTS lotto645_purchases_no_update BEFORE UPDATE ON lotto645_purchases
+BEGIN
+    SELECT RAISE(ABORT, 'lotto645_purchases is append-only');
+END;
+CREATE TRIGGER IF NOT EXISTS lotto645_purchases_no_delete BEFORE DELETE ON lotto645_purchases
+BEGIN
+    SELECT RAISE(ABORT, 'lotto645_purchases is append-only');
+END;
+"""
+
+
+class PurchaseLedger:
+    """
+    구매한 티켓을 ~/.dhapi/ledger.sqlite3 에 쌓아두는 추가 전용(append-only) 장부입니다.
+
+    스레드마다 연결을 따로 쓰도록 작업할 때마다 연결을 새로 엽니다. 파일은 처음 기록할 때 만들어집니다.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path or os.path.expanduser("~/.dhapi/ledger.sqlite3")
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self._path, timeout=30)
+        # 여러 프로필이 동시에 기록하거나 읽어도 서로 막지 않도록 WAL 모드 사용
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        연결을 열고, 블록이 끝나면 커밋(예외가 나면 롤백)한 뒤 닫습니다.
+        """
+        with closing(self._connect()) as conn:
+            with conn:
+                yield conn
+
+    def add(self, purchases: List[Lotto645Purchase]):
+        if not purchases:
+            return
+        rows = [(p.profile_name, p.round_no, p.slot, p.mode, ",".join(map(str, p.numbers)), numbers_to_mask(p.numbers), p.purchased_at.isoformat()) for p in purchases]
+        with self._transaction() as conn:
+            conn.executemany("INSERT INTO lotto645_purchases (profile, round, slot, mode, numbers, mask, purchased_at) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        logger.debug(f"recorded {len(rows)} purchases into {self._path}")
+
+    def find_lotto645_purchases(self, round_no: Optional[int] = None, profile_name: Optional[str] = None) -> List[Lotto645Purchase]:
+        if not os.path.exists(self._path):
+            return []
+
+        conditions, params = [], []
+        if round_no is not None:
+            conditions.append("round = ?")
+            params.append(round_no)
+        if profile_name is not None:
+            conditions.append("profile = ?")
+            params.append(profile_name)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(f"SELECT profile, round, slot, mode, numbers, purchased_at FROM lotto645_purchases {where} ORDER BY id", params).fetchall()
+        return [
+            Lotto645Purchase(profile, round_no, slot, mode, [int(n) for n in numbers.split(",") if n], purchased_at=datetime.datetime.fromisoformat(purchased_at))
+            for profile, round_no, slot, mode, numbers, purchased_at in rows
+        ]
+
+    def count_lotto645_tickets(self, profile_name: str, round_no: int) -> int:
+        if not os.path.exists(self._path):
+            return 0
+        with closing(self._connect()) as conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM lotto645_purchases WHERE profile = ? AND round = ?", (profile_name, round_no)).fetchone()
+        return count
+
+    def recorder(self, profile_name: str) -> "PurchaseRecorder":
+        return PurchaseRecorder(self, profile_name)
+
+    def buffered(self) -> "BufferedPurchaseLedger":
+        return BufferedPurchaseLedger(self)
+
+
+class BufferedPurchaseLedger:
+    """
+    여러 프로필을 동시에 구매할 때 기록을 모아두었다가 flush() 에서 한 트랜잭션으로 저장합니다.
+    """
+
+    def __init__(self, ledger: PurchaseLedger):
+        self._ledger = ledger
+        self._lock = threading.Lock()
+        self._pending: List[Lotto645Purchase] = []
+
+    def add(self, purchases: List[Lotto645Purchase]):
+        with self._lock:
+            self._pending.extend(purchases)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        self._ledger.add(pending)
+
+    def recorder(self, profile_name: str) -> "PurchaseRecorder":
+        return PurchaseRecorder(self, profile_name)
+
+
+class PurchaseRecorder:
+    """
+    LotteryClient 가 구매에 성공했을 때 호출하며, 어느 프로필의 구매인지 기억해 장부에 넘깁니다.
+    """
+
+    def __init__(self, sink, profile_name: str):
+        self._sink = sink
+        self._profile_name = profile_name
+
+    def record_lotto645_purchase(self, round_no: int, slots: List[dict]):
+        self._sink.add(Lotto645Purchase.from_slots(self._profile_name, round_no, slots))
+
+
+def record_lotto645_purchase_quietly(recorder: Optional[PurchaseRecorder], round_no: int, slots: List[dict]):
+    """
+    구매는 이미 끝났으므로 장부 기록에 실패했다고 해서 구매 실패로 처리하지 않고 경고만 남깁니다.
+
+    :param recorder: 생략(None) 시 기록하지 않음
+    """
+    if recorder is None:
+        return
+    try:
+        recorder.record_lotto645_purchase(round_no, slots)
+    except Exception as e:
+        logger.warning(f"구매 내역을 저장하지 못했습니다. (사유: {e!r})")
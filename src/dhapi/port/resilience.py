@@ -0,0 +1,212 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from dhapi.port.lottery_errors import LotteryError, MaintenanceError, TransientError
+
+logger = logging.getLogger(__name__)
+
+_MAINTENANCE_MESSAGE = "동행복권 사이트가 현재 시스템 점검중입니다."
+
+
+class RetryPolicy:
+    """
+    멱등(idempotent)한 요청이 TransientError 로 실패했을 때 다시 시도하는 정책입니다.
+
+    n 번째 재시도 전에는 0 ~ min(max_delay, base_delay * 2^n) 초 사이의 임의 시간(full jitter)만큼 기다려, 여러 프로필이 같은 순간에 다시 요청하지 않도록 합니다.
+    """
+
+    def __init__(
+        self, max_attempts: int = 3, base_delay_seconds: float = 0.2, max_delay_seconds: float = 2.0, max_pause_seconds: float = 60.0, rng: Optional[random.Random] = None
+    ):
+        """
+        :param max_attempts: 처음 요청을 포함한 최대 시도 횟수
+        :param max_pause_seconds: 회로 차단기가 열려 있을 때 요청을 보내지 않고 기다릴 최대 시간. 넘으면 차단 사유로 실패
+        """
+        if max_attempts < 1:
+            raise ValueError(f"최대 시도 횟수는 1 이상이어야 합니다 (입력된 값: {max_attempts}).")
+        self.max_attempts = max_attempts
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.max_pause_seconds = max_pause_seconds
+        self._rng = rng or random.Random()
+
+    def backoff(self, retry: int) -> float:
+        """
+        :param retry: 0 부터 시작하는 재시도 번호
+        """
+        return self._rng.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2**retry))
+
+    def attempts_for(self, method: str, idempotent: Optional[bool] = None) -> int:
+        """
+        :param idempotent: 실패했을 때 다시 보내도 되는 요청인지 여부. 생략 시 GET 요청만 다시 보냄
+        :return: 이 요청을 보낼 최대 시도 횟수
+        """
+        if idempotent is None:
+            idempotent = method == "GET"
+        return self.max_attempts if idempotent else 1
+
+
+class CircuitBreaker:  # pylint: disable=too-many-instance-attributes
+    """
+    모든 프로필의 요청이 함께 쓰는 회로 차단기입니다.
+
+    - 시스템 점검 페이지를 받으면 maintenance_cooldown_seconds 동안 열림
+    - TransientError 가 failure_threshold 번 잇달아 나면 cooldown_seconds 동안 열림
+    - 열려 있는 동안에는 요청을 보내지 않고 기다리며, 시간이 지나면 한 요청만 먼저 보내보고(half-open) 성공하면 닫힘
+    """
+
+    # half-open 상태에서 먼저 보낸 요청의 결과를 기다리는 다른 요청들이 다시 확인하는 간격
+    _probe_poll_seconds = 0.1
+
+    _shared: Optional["CircuitBreaker"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, failure_threshold: int = 5, cooldown_seconds: float = 10.0, maintenance_cooldown_seconds: float = 60.0, clock=time.monotonic):
+        self._failure_threshold = failure_threshold
+        self._cooldown_seconds = cooldown_seconds
+        self._maintenance_cooldown_seconds = maintenance_cooldown_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until: Optional[float] = None
+        self._open_reason: Optional[LotteryError] = None
+        self._probing = False
+
+    @classmethod
+    def shared(cls) -> "CircuitBreaker":
+        """
+        :return: 프로세스 안의 모든 클라이언트가 함께 쓰는 인스턴스
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._open_until is not None
+
+    def wait_time(self) -> float:
+        """
+        :return: 요청을 보내기 전에 기다려야 할 시간. 0 이면 바로 보내도 됨 (half-open 상태에서는 이 호출자가 먼저 보내보는 요청이 됨)
+        """
+        with self._lock:
+            if self._open_until is None:
+                return 0
+            remaining = self._open_until - self._clock()
+            if remaining > 0:
+                return remaining
+            if self._probing:
+                return self._probe_poll_seconds
+            self._probing = True
+            return 0
+
+    def record_success(self):
+        with self._lock:
+            if self._open_until is not None:
+                logger.debug("circuit closed")
+            self._failures = 0
+            self._open_until = None
+            self._open_reason = None
+            self._probing = False
+
+    def record_failure(self, error: LotteryError):
+        with self._lock:
+            if isinstance(error, MaintenanceError):
+                self._open(error, self._maintenance_cooldown_seconds)
+                return
+
+            self._failures += 1
+            if self._probing or self._failures >= self._failure_threshold:
+                self._open(error, self._cooldown_seconds)
+
+    def release(self):
+        """
+        먼저 보내본 요청이 성공/실패를 판단하지 못하고 끝났을 때 다른 요청이 다시 보내볼 수 있도록 합니다.
+        """
+        with self._lock:
+            self._probing = False
+
+    def open_error(self) -> LotteryError:
+        with self._lock:
+            if isinstance(self._open_reason, MaintenanceError):
+                return MaintenanceError(_MAINTENANCE_MESSAGE, request_sent=False)
+            return TransientError("동행복권 사이트 요청이 잇달아 실패하여 잠시 요청을 멈췄습니다.", request_sent=False)
+
+    def _open(self, error: LotteryError, seconds: float):
+        logger.debug(f"circuit opened for {seconds}s ({error.reason})")
+        self._open_until = self._clock() + seconds
+        self._open_reason = error
+        self._probing = False
+
+
+class NullCircuitBreaker:
+    is_open = False
+
+    def wait_time(self) -> float:
+        return 0
+
+    def record_success(self):
+        pass
+
+    def record_failure(self, error: LotteryError):
+        pass
+
+    def release(self):
+        pass
+
+
+@contextmanager
+def reporting_to(breaker) -> Iterator[None]:
+    """
+    블록에서 보낸 요청 하나의 결과를 회로 차단기에 알립니다.
+
+    LotteryError 는 실패로, 그 밖의 예외(Ctrl+C 등)는 성공인지 실패인지 알 수 없으므로 release() 로 알립니다.
+    """
+    try:
+        yield
+    except LotteryError as e:
+        breaker.record_failure(e)
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record_success()
+
+
+def wait_for_circuit(breaker, max_pause_seconds: float, sleep=time.sleep):
+    """
+    회로 차단기가 닫힐 때까지(또는 half-open 상태에서 요청을 보내볼 차례가 될 때까지) 기다립니다.
+
+    :raise LotteryError: max_pause_seconds 안에 닫히지 않는 경우 (점검 중이면 MaintenanceError)
+    """
+    waited = 0.0
+    while True:
+        delay = breaker.wait_time()
+        if delay <= 0:
+            return
+        if waited + delay > max_pause_seconds:
+            raise breaker.open_error()
+        sleep(delay)
+        waited += delay
+
+
+async def async_wait_for_circuit(breaker, max_pause_seconds: float):
+    """
+    wait_for_circuit 와 같으나 이벤트 루프를 막지 않고 기다립니다.
+    """
+    waited = 0.0
+    while True:
+        delay = breaker.wait_time()
+        if delay <= 0:
+            return
+        if waited + delay > max_pause_seconds:
+            raise breaker.open_error()
+        await asyncio.sleep(delay)
+        waited += delay
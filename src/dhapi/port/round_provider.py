@@ -0,0 +1,84 @@
+import datetime
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+import pytz
+
+from dhapi.domain.lotto645_round import get_lotto645_round_on_sale, is_lotto645_round_rollover
+from dhapi.port.file_cache import atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+class RoundProvider:
+    """
+    로또6/45 회차를 KST 시각으로 계산합니다.
+
+    계산값과 사이트의 회차 정보 사이의 차이(offset)를 ~/.dhapi/round.json 에 저장해두고,
+    마지막 확인 후 verify_interval_seconds 가 지나면 사이트에서 다시 확인하도록 None 을 반환합니다.
+    판매 마감 직후(토요일 20시 ~ 일요일 6시)에는 사이트가 아직 이전 회차를 보여줄 수 있으므로, 이 때 확인한 0 이 아닌 offset 은 저장하지 않습니다.
+    """
+
+    def __init__(self, verify_interval_seconds: int = 7 * 24 * 60 * 60):
+        self._path = os.path.expanduser("~/.dhapi/round.json")
+        self._verify_interval_seconds = verify_interval_seconds
+
+    def get_round(self) -> Optional[int]:
+        """
+        :return: 판매 중인 회차. 사이트에서 확인이 필요하면 None
+        """
+        saved = self._load()
+        if saved is None:
+            return None
+
+        if saved.get("verified_at", 0) + self._verify_interval_seconds <= time.time():
+            logger.debug("round verification is due")
+            return None
+        return self._compute_round() + saved.get("offset", 0)
+
+    def estimate_round(self) -> int:
+        """
+        :return: 사이트에서 확인하지 않고 알 수 있는 판매 중인 회차. 확인할 때가 지났더라도 마지막으로 저장한 offset 을 적용
+        """
+        saved = self._load() or {}
+        return self._compute_round() + saved.get("offset", 0)
+
+    def _load(self) -> Optional[dict]:
+        try:
+            with open(self._path, "r", encoding="UTF-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def update(self, site_round: int):
+        """
+        사이트에서 확인한 회차를 저장합니다.
+        """
+        now = self._now()
+        offset = site_round - get_lotto645_round_on_sale(now)
+        if offset != 0:
+            logger.debug(f"computed round differs from site round by {offset}")
+            if is_lotto645_round_rollover(now):
+                # 사이트가 다음 회차로 넘어가기 전이라 생긴 차이일 수 있으므로, 일주일 동안 쓰지 않도록 저장하지 않음
+                logger.debug("ignoring the offset measured during the round rollover")
+                return
+
+        # 여러 프로필이 동시에 갱신할 수 있으므로 임시 파일에 쓴 뒤 교체
+        with atomic_write(self._path) as f:
+            json.dump({"offset": offset, "verified_at": time.time()}, f)
+
+    def invalidate(self):
+        try:
+            os.remove(self._path)
+        except FileNotFoundError:
+            pass
+
+    def _compute_round(self):
+        return get_lotto645_round_on_sale(self._now())
+
+    def _now(self) -> datetime.datetime:
+        korea_tz = pytz.timezone("Asia/Seoul")
+        return datetime.datetime.now(korea_tz)
@@ -0,0 +1,53 @@
+import json
+import logging
+import os
+import time
+from typing import Optional
+from urllib.parse import quote
+
+from dhapi.port.file_cache import atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore:
+    """
+    로그인된 JSESSIONID 를 프로필별로 ~/.dhapi/sessions/ 아래에 저장합니다.
+    """
+
+    def __init__(self, profile_name: str, ttl_seconds: int = 30 * 60):
+        # 프로필 이름에 경로 구분자가 있어도 sessions 디렉토리 밖에 쓰지 않도록 파일 이름으로 쓸 수 없는 문자는 escape
+        self._path = os.path.expanduser(f"~/.dhapi/sessions/{quote(profile_name, safe='')}.json")
+        self._ttl_seconds = ttl_seconds
+
+    def load(self, username: str) -> Optional[str]:
+        try:
+            with open(self._path, "r", encoding="UTF-8") as f:
+                saved = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if saved.get("username") != username:
+            logger.debug("saved session belongs to another user, ignoring it")
+            return None
+        if saved.get("expires_at", 0) <= time.time():
+            logger.debug("saved session is expired")
+            return None
+        return saved.get("jsessionid")
+
+    def save(self, username: str, jsessionid: str):
+        saved = {
+            "username": username,
+            "jsessionid": jsessionid,
+            "expires_at": time.time() + self._ttl_seconds,
+        }
+
+        # 세션 값은 비밀번호와 다름없으므로 본인만 읽을 수 있도록(권한 600) 저장하고, 읽는 쪽이 절반만 쓰인 파일을 보지 않도록 교체
+        with atomic_write(self._path) as f:
+            json.dump(saved, f)
+
+    def clear(self):
+        try:
+            os.remove(self._path)
+        except FileNotFoundError:
+            pass
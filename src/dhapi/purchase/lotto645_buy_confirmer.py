@@ -1,4 +1,5 @@
 import logging
+import sys
 from typing import List
 
 from rich.console import Console
@@ -10,23 +11,46 @@ logger = logging.getLogger(__name__)
 
 
 class Lotto645BuyConfirmer:
+    def __init__(self, file=None):
+        """
+        :param file: 구매 미리보기와 확인 질문을 쓸 곳. 결과를 JSON 으로 출력할 때는 결과와 섞이지 않도록 sys.stderr 를 넘김 (기본값: 표준 출력)
+        """
+        self._file = file
+
+    @property
+    def _out(self):
+        return self._file or sys.stdout
+
     def confirm(self, tickets: List[Lotto645Ticket], always_yes: bool = False):
         self._show_buy_preview(tickets)
-        print("❓ 위와 같이 구매하시겠습니까? [Y/n] ", end="")
+        return self._ask(always_yes)
+
+    def confirm_orders(self, orders, always_yes: bool = False):
+        """
+        :param orders: [Lotto645Order, ...] 프로필별 구매 묶음
+        """
+        for order in orders:
+            print(f"👤 {order.profile_name}", file=self._out)
+            self._show_buy_preview(order.tickets)
+        print(f"총 {len(orders)}건, {sum(len(order.tickets) for order in orders)}장", file=self._out)
+        return self._ask(always_yes)
+
+    def _ask(self, always_yes: bool):
+        print("❓ 위와 같이 구매하시겠습니까? [Y/n] ", end="", file=self._out, flush=True)
 
         if always_yes:
-            print("\n✅ --yes 플래그가 주어져 자동으로 구매를 진행합니다.")
+            print("\n✅ --yes 플래그가 주어져 자동으로 구매를 진행합니다.", file=self._out)
             return True
         elif input().strip().lower() in ["y", "yes", ""]:
             return True
 
-        print("❗️구매를 취소했습니다.")
+        print("❗️구매를 취소했습니다.", file=self._out)
         return False
 
     def _show_buy_preview(self, tickets):
         slots = "ABCDE"
 
-        console = Console()
+        console = Console(file=self._out)
         table = Table("슬롯", "Mode", "번호1", "번호2", "번호3", "번호4", "번호5", "번호6")
         for i, ticket in enumerate(tickets):
             table.add_row(slots[i], ticket.mode_kor, *self._numbers_formatted(ticket.numbers))
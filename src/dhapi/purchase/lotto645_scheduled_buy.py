@@ -0,0 +1,96 @@
+import datetime
+import logging
+import time
+from typing import Callable, Dict, List
+
+from dhapi.batch.profile_batch_runner import ProfileBatchRunner, ProfileResult
+from dhapi.domain.lotto645_round import get_lotto645_round_on_sale
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+
+logger = logging.getLogger(__name__)
+
+
+class Lotto645ScheduledBuy:
+    """
+    정해진 시각에 여러 프로필의 로또6/45 구매 요청을 한꺼번에 보냅니다.
+
+    1. 모든 프로필로 미리 로그인하고, 구매 시각까지 keepalive_seconds 마다 세션이 만료되지 않도록 요청을 보냄
+    2. 구매 시각 prepare_lead_seconds 전에 프로필별 구매 요청 값(ready socket, 회차, 번호)을 만들어둠.
+       회차는 일반 구매와 같이 RoundProvider 로 정하므로, 확인하지 않은 회차가 틀려 구매에 실패하면 사이트의 회차로 한 번 더 시도함
+    3. 구매 시각이 되면 프로필마다 구매 요청(execBuy) 하나만 최대 max_workers 개씩 동시에 보냄
+
+    한 단계에서 실패한 프로필은 다음 단계를 진행하지 않으며, 나머지 프로필은 계속 진행됩니다.
+    """
+
+    def __init__(
+        self, at: datetime.datetime, runner: ProfileBatchRunner, *, keepalive_seconds: float = 300.0, prepare_lead_seconds: float = 60.0, clock=time.time, sleep=time.sleep
+    ):
+        """
+        :param at: timezone 정보가 있는 구매 시각
+        """
+        if at.tzinfo is None:
+            raise ValueError("timezone 정보가 있는 시각을 입력해야 합니다.")
+        self.at = at
+        # 안내용으로 구매 시각의 회차를 계산한 값. 실제 구매할 회차는 구매 요청 값을 만들 때 정함
+        self.round_no = get_lotto645_round_on_sale(at)
+        self._runner = runner
+        self._keepalive_seconds = keepalive_seconds
+        self._prepare_lead_seconds = prepare_lead_seconds
+        self._clock = clock
+        self._sleep = sleep
+
+    def run(self, profile_names: List[str], connect: Callable[[str], object], tickets: List[Lotto645Ticket]) -> List[ProfileResult]:
+        """
+        :param connect: 프로필 이름으로 로그인한 LotteryClient 를 만드는 함수
+        :return: profile_names 와 같은 순서의 프로필별 결과
+        """
+        failures: Dict[str, Exception] = {}
+        clients = {}
+        payloads = {}
+
+        def login(profile_name):
+            clients[profile_name] = connect(profile_name)
+
+        def prepare(profile_name):
+            payloads[profile_name] = clients[profile_name].prepare_lotto645(tickets)
+
+        def execute(profile_name):
+            clients[profile_name].execute_lotto645(payloads[profile_name])
+
+        fire_at = self.at.timestamp()
+        self._run_phase(profile_names, login, failures)
+        self._wait_until(fire_at - self._prepare_lead_seconds, clients, failures)
+        self._run_phase(profile_names, prepare, failures)
+        self._wait_until(fire_at, clients, failures)
+        logger.debug(f"firing {len(payloads)} purchases (late by {self._clock() - fire_at:.3f}s)")
+        self._run_phase(profile_names, execute, failures)
+
+        return [ProfileResult(profile_name, failures.get(profile_name)) for profile_name in profile_names]
+
+    def _run_phase(self, profile_names: List[str], task, failures: Dict[str, Exception]):
+        for result in self._runner.run([name for name in profile_names if name not in failures], task):
+            if not result.ok:
+                failures[result.profile_name] = result.error
+
+    def _wait_until(self, deadline: float, clients: Dict, failures: Dict[str, Exception]):
+        last_keepalive = self._clock()
+        while True:
+            now = self._clock()
+            remaining = deadline - now
+            if remaining <= 0:
+                return
+
+            # 다음 keepalive 시각 전에 기다림이 끝나면 세션이 그때까지는 유지되므로 요청을 보내지 않음 (구매 직전에 요청이 몰리지 않도록)
+            until_keepalive = last_keepalive + self._keepalive_seconds - now
+            if until_keepalive >= remaining:
+                self._sleep(remaining)
+                continue
+            if until_keepalive > 0:
+                self._sleep(until_keepalive)
+                continue
+
+            for result in self._runner.run([name for name in clients if name not in failures], lambda name: clients[name].keep_alive()):
+                if not result.ok:
+                    # 일시적인 오류일 수 있으므로 다음 keepalive 에서 다시 시도하고, 구매 요청이 실패하면 그때 실패로 처리
+                    logger.warning(f"'{result.profile_name}' 세션을 유지하지 못했습니다. (사유: {result.error})")
+            last_keepalive = self._clock()
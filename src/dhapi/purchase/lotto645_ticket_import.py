@@ -0,0 +1,191 @@
+import json
+import logging
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+
+logger = logging.getLogger(__name__)
+
+# 한 프로필이 한 회차(일주일)에 온라인으로 구매할 수 있는 최대 장수
+WEEKLY_TICKET_LIMIT = 5
+
+# 한 번의 구매 요청에 담을 수 있는 장수 (슬롯 A ~ E)
+GAME_SIZE = 5
+
+
+class TicketRow:
+    def __init__(self, line_no: int, numbers: Optional[str], profile_name: Optional[str] = None, error: Optional[str] = None):
+        """
+        :param line_no: 파일에서의 줄 번호 (1부터)
+        :param numbers: Lotto645Ticket 생성자가 받는 쉼표 구분 문자열
+        :param profile_name: 구매할 프로필. 생략 시 구매 가능한 프로필에 차례로 배정
+        :param error: 줄을 읽는 중 발생한 오류
+        """
+        self.line_no = line_no
+        self.numbers = numbers
+        self.profile_name = profile_name
+        self.error = error
+
+
+class Lotto645Order:
+    """
+    한 프로필이 한 번에 구매할 티켓 묶음 (최대 GAME_SIZE 장)
+    """
+
+    def __init__(self, profile_name: str, tickets: List[Lotto645Ticket], line_nos: List[int]):
+        self.profile_name = profile_name
+        self.tickets = tickets
+        self.line_nos = line_nos
+
+
+class RejectedRow:
+    def __init__(self, line_no: int, reason: str):
+        self.line_no = line_no
+        self.reason = reason
+
+    def __repr__(self):
+        return f"RejectedRow(line_no={self.line_no}, reason={self.reason!r})"
+
+
+def read_ticket_rows(lines: Iterable[str]) -> Iterator[TicketRow]:
+    """
+    파일을 한 줄씩 읽어 티켓 행으로 바꿉니다. 빈 줄과 '#' 로 시작하는 줄은 건너뜁니다.
+
+    - CSV: 1,2,3,4,5,6 (자동은 "")
+    - JSON lines: {"numbers": [1, 2, 3, 4, 5, 6], "profile": "team-a"} (numbers 생략 시 자동, profile 은 생략 가능)
+    """
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        if not line.startswith("{"):
+            yield TicketRow(line_no, "" if line == '""' else line)
+            continue
+
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield TicketRow(line_no, None, error="JSON 형식이 올바르지 않습니다.")
+            continue
+
+        numbers = row.get("numbers")
+        if isinstance(numbers, list):
+            numbers = ",".join(map(str, numbers))
+        elif numbers is not None and not isinstance(numbers, str):
+            yield TicketRow(line_no, None, error=f"numbers 는 번호 목록이나 쉼표로 구분한 문자열이어야 합니다 (입력된 값: {numbers}).")
+            continue
+        profile_name = row.get("profile")
+        yield TicketRow(line_no, numbers, None if profile_name is None else str(profile_name))
+
+
+def validate_ticket_rows(rows: Iterable[TicketRow], chunk_size: int = 1024) -> Iterator:
+    """
+    chunk_size 줄씩 모아 Lotto645Ticket.create_tickets_bulk 로 검증합니다.
+
+    :return: (TicketRow, Lotto645Ticket) 또는 RejectedRow 를 입력 순서대로 내보내는 iterator
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+
+        readable = [row for row in chunk if row.error is None]
+        batch = Lotto645Ticket.create_tickets_bulk(row.numbers for row in readable)
+        tickets = {row.line_no: ticket for row, ticket in zip(readable, batch.tickets)}
+        errors = {readable[i].line_no: message for i, message in batch.errors.items()}
+        for row in chunk:
+            if row.error is not None:
+                yield RejectedRow(row.line_no, row.error)
+                continue
+            ticket = tickets[row.line_no]
+            yield RejectedRow(row.line_no, errors[row.line_no]) if ticket is None else (row, ticket)
+
+
+class _RemainingTickets(dict):
+    """
+    프로필별로 더 구매할 수 있는 장수. 처음 찾는 프로필만 remaining_tickets 로 조회함
+    """
+
+    def __init__(self, remaining_tickets: Callable[[str], int]):
+        super().__init__()
+        self._remaining_tickets = remaining_tickets
+
+    def __missing__(self, profile_name: str) -> int:
+        self[profile_name] = max(0, self._remaining_tickets(profile_name))
+        return self[profile_name]
+
+
+class Lotto645TicketImport:
+    """
+    파일의 티켓 행을 읽기 -> 검증 -> 프로필 배정 -> 구매 단위(GAME_SIZE 장)로 묶기 순서로 흘려보냅니다.
+
+    단계마다 generator 로 이어져 있어 파일 크기와 관계없이 (프로필 수 x GAME_SIZE) 장만 메모리에 둡니다.
+    프로필마다 남은 구매 가능 장수를 넘는 행은 구매하지 않고 건너뛴 행으로 셉니다.
+    """
+
+    # 화면에 보여주기 위해 보관할 잘못된 행의 최대 개수 (개수는 모두 셈)
+    _max_kept_rejections = 20
+
+    def __init__(self, profile_names: List[str], remaining_tickets: Callable[[str], int], chunk_size: int = 1024):
+        """
+        :param profile_names: 구매할 프로필. 프로필이 지정되지 않은 행은 이 순서대로 채움
+        :param remaining_tickets: 프로필별로 이번 회차에 더 구매할 수 있는 장수. 프로필마다 처음 한 번만 호출
+        """
+        self._profile_names = profile_names
+        self._chunk_size = chunk_size
+        self._remaining = _RemainingTickets(remaining_tickets)
+
+        self.row_count = 0
+        self.rejected_count = 0
+        self.rejected_rows: List[RejectedRow] = []
+        self.over_limit_count = 0
+
+    def orders(self, lines: Iterable[str]) -> Iterator[Lotto645Order]:
+        pending: Dict[str, Lotto645Order] = {}
+        for profile_name, line_no, ticket in self._assign(validate_ticket_rows(read_ticket_rows(lines), self._chunk_size)):
+            order = pending.setdefault(profile_name, Lotto645Order(profile_name, [], []))
+            order.tickets.append(ticket)
+            order.line_nos.append(line_no)
+            if len(order.tickets) == GAME_SIZE or self._remaining[profile_name] == 0:
+                yield pending.pop(profile_name)
+
+        # 다 채우지 못한 묶음은 프로필 순서대로 내보냄
+        for profile_name in self._profile_names:
+            if profile_name in pending:
+                yield pending.pop(profile_name)
+
+    def _assign(self, validated) -> Iterator:
+        available = iter(self._profile_names)
+        current = next(available, None)
+        for item in validated:
+            self.row_count += 1
+            if isinstance(item, RejectedRow):
+                self._reject(item)
+                continue
+
+            row, ticket = item
+            if row.profile_name is not None:
+                if row.profile_name not in self._profile_names:
+                    self._reject(RejectedRow(row.line_no, f"구매 대상 프로필이 아닙니다 (입력된 값: {row.profile_name})."))
+                    continue
+                profile_name = row.profile_name
+            else:
+                while current is not None and self._remaining[current] == 0:
+                    current = next(available, None)
+                profile_name = current
+
+            if profile_name is None or self._remaining[profile_name] == 0:
+                self.over_limit_count += 1
+                continue
+
+            self._remaining[profile_name] -= 1
+            yield profile_name, row.line_no, ticket
+
+    def _reject(self, rejected: RejectedRow):
+        self.rejected_count += 1
+        if len(self.rejected_rows) < self._max_kept_rejections:
+            self.rejected_rows.append(rejected)
+        logger.debug(f"rejected line {rejected.line_no}: {rejected.reason}")
@@ -1,28 +1,222 @@
+# CLI 시작 시간을 줄이기 위해 requests, bs4 등 무거운 모듈은 실제로 필요한 명령어에서만 불러옴 (benchmarks/bench_import_time.py 참고)
+from typing import List, Optional
+
 from dhapi.domain.user import User
-from dhapi.endpoint.lottery_stdout_printer import LotteryStdoutPrinter
-from dhapi.endpoint.version_stdout_printer import VersionStdoutPrinter
-from dhapi.meta.version_provider import VersionProvider
-from dhapi.port.lottery_client import LotteryClient
-from dhapi.purchase.lotto645_buy_confirmer import Lotto645BuyConfirmer
 
 
-def build_lottery_client(user_profile: User):
-    lottery_endpoint = build_lottery_endpoint()
-    return LotteryClient(user_profile, lottery_endpoint)
+class LotteryClientSettings:
+    """
+    명령어 하나에서 만드는 LotteryClient 들이 함께 쓰는 설정입니다. 생략한 항목은 build_lottery_client 가 기본값을 만듭니다.
+
+    :param output: 결과 출력 형식 (table, json, ndjson). JSON 형식이면 항상 레코드에 프로필 이름을 넣음
+    :param tracer: 단계별 소요 시간을 기록할 Tracer. 프로필마다 bind 하여 사용
+    :param purchase_ledger: 여러 프로필을 한꺼번에 구매할 때 모아서 저장하려면 PurchaseLedger.buffered() 를 넘김
+    :param lottery_endpoint: 결과를 화면에 출력하는 대신 받을 endpoint (예: LotteryJsonEndpoint)
+    :param balance_cache: 조회 TTL 을 바꾸려면 build_balance_cache(ttl) 를 넘김. 구매/가상계좌 할당 후에는 항상 지워짐
+    :param cassette_transport: 요청/응답을 기록하거나 재생하려면 build_cassette_transport() 를 넘김. 이 때는 저장된 세션, 예치금 조회 결과, 구매 저널을 쓰지 않음
+    """
+
+    def __init__(self, *, output: str = "table", tracer=None, purchase_ledger=None, lottery_endpoint=None, balance_cache=None, cassette_transport=None):
+        self.output = output
+        self.tracer = tracer
+        self.purchase_ledger = purchase_ledger
+        self.lottery_endpoint = lottery_endpoint
+        self.balance_cache = balance_cache
+        self.cassette_transport = cassette_transport
+
+
+def build_lottery_client(user_profile: User, profile_name: str, label_profile: bool = False, settings: Optional[LotteryClientSettings] = None):
+    """
+    :param label_profile: 여러 프로필을 처리할 때 결과에 프로필 이름을 붙여 출력
+    """
+    from dhapi.port.lottery_client import LotteryClient
+    from dhapi.port.lottery_client_options import LotteryClientOptions
+    from dhapi.port.resilience import CircuitBreaker, RetryPolicy
+
+    settings = settings or LotteryClientSettings()
+    lottery_endpoint = settings.lottery_endpoint or build_lottery_endpoint(profile_name if label_profile or settings.output != "table" else None, settings.output)
+    session_store = build_session_store(profile_name)
+    purchase_ledger = settings.purchase_ledger or build_purchase_ledger()
+    cassette_transport = settings.cassette_transport
+    transport_adapter = cassette_transport.adapter_for(user_profile.username, user_profile.password) if cassette_transport else None
+    if transport_adapter is not None:
+        # 기록/재생한 요청만으로 로그인부터 조회까지 다시 만들 수 있도록 로컬에 보관된 값을 쓰지 않음
+        session_store = None
+        balance_cache = None
+        purchase_journal = None
+    else:
+        balance_cache = settings.balance_cache or build_balance_cache()
+        purchase_journal = build_purchase_journal().for_profile(profile_name)
+    return LotteryClient(
+        user_profile,
+        lottery_endpoint,
+        LotteryClientOptions(
+            session_store=session_store,
+            round_provider=build_round_provider(),
+            tracer=settings.tracer.bind(profile=profile_name) if settings.tracer else None,
+            purchase_recorder=purchase_ledger.recorder(profile_name),
+            retry_policy=RetryPolicy(),
+            circuit_breaker=CircuitBreaker.shared(),
+            balance_cache=balance_cache,
+            transport_adapter=transport_adapter,
+            purchase_journal=purchase_journal,
+        ),
+    )
+
+
+def build_balance_cache(ttl_seconds: float = 60):
+    from dhapi.port.balance_cache import BalanceCache
+
+    return BalanceCache(ttl_seconds=ttl_seconds)
+
+
+def build_cassette_transport(record: Optional[str] = None, replay: Optional[str] = None):
+    from dhapi.port.cassette import CassetteTransport
+
+    return CassetteTransport(record, replay)
+
+
+def build_session_store(profile_name: str):
+    from dhapi.port.session_store import SessionStore
+
+    return SessionStore(profile_name)
+
+
+def build_round_provider():
+    from dhapi.port.round_provider import RoundProvider
+
+    return RoundProvider()
+
+
+def build_purchase_ledger():
+    from dhapi.port.purchase_ledger import PurchaseLedger
+
+    return PurchaseLedger()
+
+
+def build_purchase_journal():
+    from dhapi.port.purchase_journal import PurchaseJournal
+
+    return PurchaseJournal()
+
+
+def build_lotto645_ticket_import(profile_names: List[str]):
+    from dhapi.purchase.lotto645_ticket_import import WEEKLY_TICKET_LIMIT, Lotto645TicketImport
+
+    # 로그인 전에 구매 한도를 계산하므로 사이트에 묻지 않고 회차를 추정하고, 장부에 기록된 이번 회차 구매 장수를 뺌
+    purchase_ledger = build_purchase_ledger()
+    round_no = build_round_provider().estimate_round()
+    return Lotto645TicketImport(profile_names, lambda profile_name: WEEKLY_TICKET_LIMIT - purchase_ledger.count_lotto645_tickets(profile_name, round_no))
+
+
+def build_draw_history_store():
+    from dhapi.port.draw_history_store import DrawHistoryStore
+
+    return DrawHistoryStore()
+
+
+def build_lotto645_win_checker():
+    from dhapi.analysis.lotto645_win_checker import Lotto645WinChecker
+
+    return Lotto645WinChecker.from_store(build_draw_history_store())
 
 
-def build_lotto645_buy_confirmer():
-    return Lotto645BuyConfirmer()
+def build_lotto645_stats():
+    from dhapi.analysis.lotto645_stats import Lotto645Stats
 
+    stats = Lotto645Stats()
+    stats.update(build_draw_history_store())
+    return stats
 
-def build_lottery_endpoint():
-    return LotteryStdoutPrinter()
 
+def build_lotto645_generator(sum_range=None, odd_counts=None, exclude_past_winners: bool = False, seed: Optional[int] = None):
+    from dhapi.analysis.lotto645_generator import Lotto645Generator
 
-def build_version_provider():
-    version_endpoint = build_version_endpoint()
+    excluded = [draw.numbers for draw in build_draw_history_store().read_draws()] if exclude_past_winners else []
+    return Lotto645Generator(sum_range=sum_range, odd_counts=odd_counts, excluded=excluded, seed=seed)
+
+
+def build_tracer(enabled: bool):
+    from dhapi.trace.tracer import NullTracer, Tracer
+
+    return Tracer() if enabled else NullTracer()
+
+
+def build_lotto645_buy_confirmer(output: str = "table"):
+    import sys
+
+    from dhapi.purchase.lotto645_buy_confirmer import Lotto645BuyConfirmer
+
+    # JSON 결과만 표준 출력으로 내보내도록 미리보기와 확인 질문은 표준 에러로 보냄
+    return Lotto645BuyConfirmer(sys.stderr if output != "table" else None)
+
+
+def build_lottery_endpoint(profile_name: Optional[str] = None, output: str = "table"):
+    if output != "table":
+        from dhapi.endpoint.lottery_json_printer import LotteryJsonPrinter
+
+        return LotteryJsonPrinter(profile_name)
+
+    from dhapi.endpoint.lottery_stdout_printer import LotteryStdoutPrinter
+
+    return LotteryStdoutPrinter(profile_name)
+
+
+def build_lottery_json_endpoint():
+    from dhapi.endpoint.lottery_json_endpoint import LotteryJsonEndpoint
+
+    return LotteryJsonEndpoint()
+
+
+def build_lottery_api_server(host: str, port: int, max_concurrency_per_profile: int):
+    from dhapi.port.credentials_store import CredentialsStore
+    from dhapi.server.lottery_api_server import LotteryApiServer
+    from dhapi.server.lottery_client_pool import LotteryClientPool, ProfileNotFoundError
+
+    credentials_store = CredentialsStore.default()
+    lottery_endpoint = build_lottery_json_endpoint()
+    settings = LotteryClientSettings(purchase_ledger=build_purchase_ledger(), lottery_endpoint=lottery_endpoint)
+
+    def connect(profile_name: str):
+        # 서버에서는 입력을 받을 수 없으므로 CredentialsProvider 처럼 프로필을 만들지 않고, 없으면 실패로 처리
+        try:
+            credentials = credentials_store.get(profile_name)
+        except FileNotFoundError as e:
+            raise ProfileNotFoundError(str(e))
+        if credentials is None:
+            raise ProfileNotFoundError(f"'{profile_name}' 프로필을 찾지 못했습니다.")
+        user = User(credentials["username"], credentials["password"])
+        return build_lottery_client(user, profile_name, settings=settings)
+
+    pool = LotteryClientPool(connect, max_concurrency_per_profile)
+    return LotteryApiServer(pool, lottery_endpoint, host, port)
+
+
+def build_profile_batch_runner(max_workers: int):
+    from dhapi.batch.profile_batch_runner import ProfileBatchRunner
+
+    return ProfileBatchRunner(max_workers)
+
+
+def build_lotto645_scheduled_buy(at, max_workers: int):
+    from dhapi.purchase.lotto645_scheduled_buy import Lotto645ScheduledBuy
+
+    return Lotto645ScheduledBuy(at, build_profile_batch_runner(max_workers))
+
+
+def build_version_provider(output: str = "table"):
+    from dhapi.meta.version_provider import VersionProvider
+
+    version_endpoint = build_version_endpoint(output)
     return VersionProvider(version_endpoint)
 
 
-def build_version_endpoint():
+def build_version_endpoint(output: str = "table"):
+    if output != "table":
+        from dhapi.endpoint.version_json_printer import VersionJsonPrinter
+
+        return VersionJsonPrinter()
+
+    from dhapi.endpoint.version_stdout_printer import VersionStdoutPrinter
+
     return VersionStdoutPrinter()
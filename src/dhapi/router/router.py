@@ -1,12 +1,39 @@
-from typing import Annotated, Optional, List
+import datetime
+import sys
+from contextlib import contextmanager, nullcontext
+from enum import Enum
+from pathlib import Path
+from typing import Annotated, Dict, Optional, List
 
 import typer
 
 from dhapi.config.logger import set_logger
 from dhapi.domain.deposit import Deposit
+from dhapi.domain.lotto645_mask import numbers_to_mask
+from dhapi.domain.lotto645_round import KST, parse_kst_datetime
 from dhapi.domain.lotto645_ticket import Lotto645Ticket
+from dhapi.endpoint.output_format import OutputFormat
 from dhapi.port.credentials_provider import CredentialsProvider
-from dhapi.router.dependency_factory import build_lottery_client, build_version_provider, build_lotto645_buy_confirmer
+from dhapi.router.dependency_factory import (
+    LotteryClientSettings,
+    build_lottery_client,
+    build_draw_history_store,
+    build_lotto645_win_checker,
+    build_lotto645_ticket_import,
+    build_lotto645_generator,
+    build_lotto645_stats,
+    build_lotto645_scheduled_buy,
+    build_purchase_ledger,
+    build_version_provider,
+    build_lotto645_buy_confirmer,
+    build_lottery_endpoint,
+    build_profile_batch_runner,
+    build_tracer,
+    build_lottery_api_server,
+    build_balance_cache,
+    build_cassette_transport,
+    build_purchase_journal,
+)
 
 app = typer.Typer(
     help="동행복권 비공식 API\n\n각 명령어에 대한 자세한 도움말은 'dhapi [명령어] -h'를 입력하세요.",
@@ -18,18 +45,99 @@ app = typer.Typer(
 )
 
 
+class PurchaseResolution(str, Enum):
+    """
+    journal --resolve 에 --as 로 지정하는, 사이트의 구매 내역을 보고 정한 결과
+    """
+
+    CONFIRMED = "confirmed"  # 구매 내역에 있음
+    FAILED = "failed"  # 구매 내역에 없음
+
+
 def logger_callback(is_debug: bool):
     app.pretty_exceptions_enable = is_debug
     set_logger(is_debug)
 
 
-def version_callback(show_version: Optional[bool]):
+def version_callback(show_version: Optional[bool], output: OutputFormat = OutputFormat.TABLE):
     if show_version:
-        version_provider = build_version_provider()
+        version_provider = build_version_provider(output)
         version_provider.show_version()
         raise typer.Exit()
 
 
+def _is_single_profile(profiles: List[str], all_profiles: bool):
+    return not all_profiles and len(profiles) == 1 and not any(c in profiles[0] for c in ",*?[")
+
+
+def _resolve_profile_names(profiles: List[str], all_profiles: bool) -> List[str]:
+    if all_profiles:
+        return CredentialsProvider.list_profile_names()
+    return CredentialsProvider.match_profile_names(profiles)
+
+
+def _echo(output: OutputFormat, message: str):
+    # JSON 으로 출력할 때는 결과만 표준 출력으로 내보내고, 진행 상황 안내는 표준 에러로 보냄
+    print(message, file=sys.stderr if output.is_machine_readable else sys.stdout)
+
+
+@contextmanager
+def _tracing(trace_file: Optional[Path]):
+    tracer = build_tracer(trace_file is not None)
+    try:
+        yield tracer
+    finally:
+        # 실패한 경우에도 어느 단계에서 멈췄는지 알 수 있도록 기록한 만큼은 저장
+        if trace_file is not None:
+            with open(trace_file, "w", encoding="UTF-8") as f:
+                tracer.export_jsonl(f)
+
+
+@contextmanager
+def _recording(record_file: Optional[Path], replay_file: Optional[Path]):
+    if record_file is None and replay_file is None:
+        yield None
+        return
+
+    transport = build_cassette_transport(str(record_file) if record_file else None, str(replay_file) if replay_file else None)
+    try:
+        yield transport
+    finally:
+        # 실패한 경우에도 실패하기까지 주고받은 요청은 저장
+        transport.save()
+
+
+@contextmanager
+def _client_settings(
+        output: OutputFormat, trace_file: Optional[Path], *, record_file: Optional[Path] = None, replay_file: Optional[Path] = None, balance_cache=None, purchase_ledger=None
+):
+    """
+    :param purchase_ledger: 여러 프로필의 구매 내역을 모아 명령어가 끝날 때 한 번에 저장하려면 PurchaseLedger.buffered() 를 넘김
+    """
+    with _tracing(trace_file) as tracer, _recording(record_file, replay_file) as cassette_transport:
+        try:
+            yield LotteryClientSettings(output=output, tracer=tracer, purchase_ledger=purchase_ledger, balance_cache=balance_cache, cassette_transport=cassette_transport)
+        finally:
+            if purchase_ledger is not None:
+                # 실패한 경우에도 그 전까지 구매한 내역은 저장
+                purchase_ledger.flush()
+
+
+def _connect(profile_name: str, settings: LotteryClientSettings, label_profile: bool = True):
+    return build_lottery_client(CredentialsProvider(profile_name).get_user(), profile_name, label_profile, settings)
+
+
+def _run_for_profiles(profile_names: List[str], workers: int, task, output: OutputFormat = OutputFormat.TABLE):
+    runner = build_profile_batch_runner(workers)
+    _print_profile_batch(runner.run(profile_names, task), output)
+
+
+def _print_profile_batch(results, output: OutputFormat):
+    build_lottery_endpoint(output=output).print_result_of_profile_batch(results)
+    if any(not result.ok for result in results):
+        raise typer.Exit(code=1)
+
+
 @app.command(
     help="""
 예치금 충전용 가상계좌를 세팅합니다.
@@ -37,33 +145,89 @@ def version_callback(show_version: Optional[bool]):
 dhapi에서는 본인 전용 계좌를 발급받는 것까지만 가능합니다. 출력되는 계좌로 직접 입금해주세요.
 """,
 )
-def assign_virtual_account(
+def assign_virtual_account(  # pylint: disable=too-many-arguments  # typer 는 CLI 옵션마다 인자를 받음
+        *,
         amount: Annotated[
             int, typer.Argument(help="입금할 금액을 지정합니다 (5천원, 1만원, 2만원, 3만원, 5만원, 10만원, 20만원, 30만원, 50만원, 70만원, 100만원 중 하나)", metavar="amount")
         ] = 50000,
-        profile: Annotated[str, typer.Option("-p", "--profile", help="프로필을 지정합니다", metavar="")] = "default",
+        profile: Annotated[
+            List[str], typer.Option("-p", "--profile", help="프로필을 지정합니다. 여러 번 지정하거나 쉼표로 구분하거나 glob 패턴(예: 'team-*')을 사용할 수 있습니다", metavar="", show_default="default")
+        ] = None,
+        all_profiles: Annotated[bool, typer.Option("--all-profiles", help="설정된 모든 프로필에 대해 실행합니다.")] = False,
+        workers: Annotated[int, typer.Option("--workers", help="여러 프로필을 처리할 때 동시에 작업할 프로필 수를 지정합니다.", min=1)] = 8,
+        trace: Annotated[Optional[Path], typer.Option("--trace", help="요청/파싱 단계별 소요 시간을 JSON lines 형식으로 지정한 파일에 기록합니다.", metavar="FILE", dir_okay=False)] = None,
+        record: Annotated[Optional[Path], typer.Option("--record", help="주고받은 요청/응답을 지정한 파일에 기록합니다. 쿠키와 아이디/비밀번호는 기록하지 않습니다.", metavar="FILE", dir_okay=False)] = None,
+        replay: Annotated[Optional[Path], typer.Option("--replay", help="--record 로 기록한 응답을 사이트에 접속하지 않고 재생합니다.", metavar="FILE", dir_okay=False, exists=True)] = None,
+        output: Annotated[OutputFormat, typer.Option("--output", help="결과 출력 형식을 지정합니다. json/ndjson 은 결과가 나올 때마다 JSON 레코드를 바로 출력합니다.", case_sensitive=False)] = OutputFormat.TABLE,
         _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
 ):
-    user = CredentialsProvider(profile).get_user()
+    profile = profile or ["default"]
     deposit = Deposit(amount)
 
-    client = build_lottery_client(user)
-    client.assign_virtual_account(deposit)
+    with _client_settings(output, trace, record_file=record, replay_file=replay) as settings:
+        if _is_single_profile(profile, all_profiles):
+            _connect(profile[0], settings, label_profile=False).assign_virtual_account(deposit)
+            return
+
+        def task(profile_name):
+            _connect(profile_name, settings).assign_virtual_account(deposit)
+
+        _run_for_profiles(_resolve_profile_names(profile, all_profiles), workers, task, output)
 
 
 @app.command(
     help="""
 예치금 현황을 조회합니다.
+
+조회 결과는 ~/.dhapi/balances.json 에 --cache-ttl 초 동안 보관하며, 그동안은 로그인하지 않고 보관된 값을 보여줍니다.
+구매하거나 가상계좌를 할당한 뒤에는 보관된 값을 지우므로 다음 조회 때 다시 조회합니다.
+
+--record 로 사이트와 주고받은 요청/응답을 파일에 기록해두면, --replay 로 사이트에 접속하지 않고 같은 결과를 다시 만들 수 있습니다.
 """
 )
-def show_balance(
-        profile: Annotated[str, typer.Option("-p", "--profile", help="프로필을 지정합니다", metavar="")] = "default",
+def show_balance(  # pylint: disable=too-many-arguments  # typer 는 CLI 옵션마다 인자를 받음
+        *,
+        fresh: Annotated[bool, typer.Option("--fresh", help="보관된 조회 결과를 사용하지 않고 사이트에서 다시 조회합니다.")] = False,
+        cache_ttl: Annotated[int, typer.Option("--cache-ttl", help="조회 결과를 보관할 시간(초)을 지정합니다. 0 이면 보관하지 않습니다.", min=0)] = 60,
+        profile: Annotated[
+            List[str], typer.Option("-p", "--profile", help="프로필을 지정합니다. 여러 번 지정하거나 쉼표로 구분하거나 glob 패턴(예: 'team-*')을 사용할 수 있습니다", metavar="", show_default="default")
+        ] = None,
+        all_profiles: Annotated[bool, typer.Option("--all-profiles", help="설정된 모든 프로필에 대해 실행합니다.")] = False,
+        workers: Annotated[int, typer.Option("--workers", help="여러 프로필을 처리할 때 동시에 작업할 프로필 수를 지정합니다.", min=1)] = 8,
+        trace: Annotated[Optional[Path], typer.Option("--trace", help="요청/파싱 단계별 소요 시간을 JSON lines 형식으로 지정한 파일에 기록합니다.", metavar="FILE", dir_okay=False)] = None,
+        record: Annotated[Optional[Path], typer.Option("--record", help="주고받은 요청/응답을 지정한 파일에 기록합니다. 쿠키와 아이디/비밀번호는 기록하지 않습니다.", metavar="FILE", dir_okay=False)] = None,
+        replay: Annotated[Optional[Path], typer.Option("--replay", help="--record 로 기록한 응답을 사이트에 접속하지 않고 재생합니다.", metavar="FILE", dir_okay=False, exists=True)] = None,
+        output: Annotated[OutputFormat, typer.Option("--output", help="결과 출력 형식을 지정합니다. json/ndjson 은 결과가 나올 때마다 JSON 레코드를 바로 출력합니다.", case_sensitive=False)] = OutputFormat.TABLE,
         _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
 ):
-    user = CredentialsProvider(profile).get_user()
+    profile = profile or ["default"]
 
-    client = build_lottery_client(user)
-    client.show_balance()
+    with _client_settings(output, trace, record_file=record, replay_file=replay, balance_cache=build_balance_cache(cache_ttl)) as settings:
+        # 기록/재생할 때는 보관된 조회 결과 대신 항상 요청을 보냄
+        fresh = fresh or settings.cassette_transport is not None
+        if _is_single_profile(profile, all_profiles):
+            user = CredentialsProvider(profile[0]).get_user()
+            _show_balance(profile[0], user, None if fresh else settings.balance_cache.get(user.username), settings, label_profile=False)
+            return
+
+        users = {profile_name: CredentialsProvider(profile_name).get_user() for profile_name in _resolve_profile_names(profile, all_profiles)}
+        # 보관된 결과는 한 번에 읽어두고, 없는 프로필만 로그인하여 조회
+        cached = {} if fresh else settings.balance_cache.get_many(user.username for user in users.values())
+
+        def task(profile_name):
+            user = users[profile_name]
+            _show_balance(profile_name, user, cached.get(user.username), settings)
+
+        _run_for_profiles(list(users), workers, task, output)
+
+
+def _show_balance(profile_name: str, user, cached_balance, settings: LotteryClientSettings, label_profile: bool = True):
+    if cached_balance is not None:
+        # 보관된 결과가 있으면 로그인하지 않고 바로 출력
+        lottery_endpoint = build_lottery_endpoint(profile_name if label_profile or settings.output.is_machine_readable else None, settings.output)
+        lottery_endpoint.print_result_of_show_balance(*cached_balance.values, fetched_at=cached_balance.fetched_at)
+        return
+    build_lottery_client(user, profile_name, label_profile, settings).show_balance(fresh=True)
 
 
 @app.command(
@@ -85,26 +249,359 @@ dhapi buy-lotto645 '1,2,3' : 반자동모드 1장 (고정번호: 1,2,3)
 dhapi buy-lotto645 '1,2,3,4,5,6' '7,8,9' : 수동모드 1장 (고정번호: 1,2,3,4,5,6), 반자동모드 1장 (고정번호: 7,8,9)
 
 dhapi buy-lotto645 '' '' '' '1' : 자동모드 3장, 반자동모드 1장 (고정번호: 1)
+
+dhapi buy-lotto645 --from tickets.csv --all-profiles : 파일의 번호를 프로필마다 최대 5장씩 나누어 구매
+
+[--from 파일 형식]
+
+한 줄에 한 장씩 CSV(1,2,3,4,5,6 / 자동은 "") 또는 JSON lines({"numbers": [1, 2, 3], "profile": "team-a"}) 로 작성합니다.
+profile 을 생략한 줄은 대상 프로필에 순서대로 채워지며, 이번 회차에 이미 구매한 장수(구매 내역 기준)를 빼고 프로필마다 최대 5장까지만 구매합니다.
 """
 )
-def buy_lotto645(
+def buy_lotto645(  # pylint: disable=too-many-arguments  # typer 는 CLI 옵션마다 인자를 받음
+        *,
         tickets: Annotated[List[str], typer.Argument(help="구매할 번호를 입력합니다. 생략 시 자동모드로 5장 구매합니다.", metavar="tickets", show_default=False)] = None,
+        source: Annotated[Optional[str], typer.Option("--from", help="구매할 번호를 파일에서 읽습니다. '-' 를 지정하면 표준 입력에서 읽습니다.", metavar="FILE|-", show_default=False)] = None,
         always_yes: Annotated[bool, typer.Option("-y", "--yes", help="구매 전 확인 절차를 스킵합니다.")] = False,
-        profile: Annotated[str, typer.Option("-p", "--profile", help="프로필을 지정합니다", metavar="")] = "default",
+        profile: Annotated[
+            List[str], typer.Option("-p", "--profile", help="프로필을 지정합니다. 여러 번 지정하거나 쉼표로 구분하거나 glob 패턴(예: 'team-*')을 사용할 수 있습니다", metavar="", show_default="default")
+        ] = None,
+        all_profiles: Annotated[bool, typer.Option("--all-profiles", help="설정된 모든 프로필에 대해 실행합니다.")] = False,
+        workers: Annotated[int, typer.Option("--workers", help="여러 프로필을 처리할 때 동시에 작업할 프로필 수를 지정합니다.", min=1)] = 8,
+        trace: Annotated[Optional[Path], typer.Option("--trace", help="요청/파싱 단계별 소요 시간을 JSON lines 형식으로 지정한 파일에 기록합니다.", metavar="FILE", dir_okay=False)] = None,
+        output: Annotated[OutputFormat, typer.Option("--output", help="결과 출력 형식을 지정합니다. json/ndjson 은 결과가 나올 때마다 JSON 레코드를 바로 출력합니다.", case_sensitive=False)] = OutputFormat.TABLE,
         _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
 ):
-    cred = CredentialsProvider(profile)
-    user = cred.get_user()
+    profile = profile or ["default"]
+    if source is not None:
+        if tickets:
+            raise RuntimeError("❗ 번호와 --from 은 함께 지정할 수 없습니다.")
+        with _client_settings(output, trace, purchase_ledger=build_purchase_ledger().buffered()) as settings:
+            _buy_lotto645_from(source, settings, profile=profile, all_profiles=all_profiles, always_yes=always_yes, workers=workers)
+        return
+
     tickets = Lotto645Ticket.create_tickets(tickets) if tickets else Lotto645Ticket.create_auto_tickets(count=5)
+    confirmer = build_lotto645_buy_confirmer(output)
 
-    client = build_lottery_client(user)
-    confirmer = build_lotto645_buy_confirmer()
+    if _is_single_profile(profile, all_profiles):
+        with _client_settings(output, trace) as settings:
+            client = _connect(profile[0], settings, label_profile=False)
 
+            ok = confirmer.confirm(tickets, always_yes)
+            if not ok:
+                raise typer.Exit()
+
+            client.buy_lotto645(tickets)
+            return
+
+    profile_names = _resolve_profile_names(profile, all_profiles)
+    _echo(output, f"👤 대상 프로필 ({len(profile_names)}개): {', '.join(profile_names)}")
     ok = confirmer.confirm(tickets, always_yes)
     if not ok:
         raise typer.Exit()
 
-    client.buy_lotto645(tickets)
+    # 프로필별 구매 내역을 모아 한 번에 저장
+    with _client_settings(output, trace, purchase_ledger=build_purchase_ledger().buffered()) as settings:
+        _buy_lotto645_for_profiles({profile_name: [tickets] for profile_name in profile_names}, workers, settings)
+
+
+def _buy_lotto645_for_profiles(tickets_by_profile: Dict[str, List[List[Lotto645Ticket]]], workers: int, settings: LotteryClientSettings):
+    def task(profile_name):
+        client = _connect(profile_name, settings)
+        for tickets in tickets_by_profile[profile_name]:
+            client.buy_lotto645(tickets)
+
+    _run_for_profiles(list(tickets_by_profile), workers, task, settings.output)
+
+
+def _buy_lotto645_from(source: str, settings: LotteryClientSettings, *, profile: List[str], all_profiles: bool, always_yes: bool, workers: int):
+    output = settings.output
+    if source == "-" and not always_yes:
+        # 표준 입력은 티켓을 읽는 데 쓰이므로 구매 확인 응답을 받을 수 없음
+        raise RuntimeError("❗ 표준 입력에서 번호를 읽을 때는 --yes 플래그를 함께 지정해야 합니다.")
+
+    profile_names = [profile[0]] if _is_single_profile(profile, all_profiles) else _resolve_profile_names(profile, all_profiles)
+    ticket_import = build_lotto645_ticket_import(profile_names)
+    with nullcontext(sys.stdin) if source == "-" else open(source, "r", encoding="UTF-8") as f:
+        orders = list(ticket_import.orders(f))
+
+    build_lottery_endpoint(output=output).print_result_of_ticket_import(ticket_import, orders)
+    if ticket_import.rejected_count:
+        raise RuntimeError(f"❗ 잘못된 줄이 {ticket_import.rejected_count}개 있어 구매하지 않았습니다.")
+    if not orders:
+        raise RuntimeError("❗ 구매할 수 있는 티켓이 없습니다. (이번 회차 구매 한도를 모두 사용했거나 파일이 비어 있습니다)")
+
+    if not build_lotto645_buy_confirmer(output).confirm_orders(orders, always_yes):
+        raise typer.Exit()
+
+    tickets_by_profile = {}
+    for order in orders:
+        tickets_by_profile.setdefault(order.profile_name, []).append(order.tickets)
+    _buy_lotto645_for_profiles(tickets_by_profile, workers, settings)
+
+
+@app.command(
+    help="""
+정해진 시각에 여러 프로필로 로또6/45 복권을 한꺼번에 구매합니다.
+
+판매 마감(토요일 20시) 직전처럼 구매가 몰리는 시각에 맞춰 구매할 때 사용합니다.
+미리 모든 프로필로 로그인해 세션을 유지하고, 구매 1분 전에 구매 요청 값을 만들어둔 뒤 지정한 시각에 프로필마다 구매 요청 하나만 보냅니다.
+구매 시각까지 명령어가 계속 실행되어 있어야 합니다.
+
+[예시]
+
+dhapi schedule-buy --at 19:55 --all-profiles : 오늘 19시 55분(한국 시각)에 모든 프로필로 자동모드 5장씩 구매
+
+dhapi schedule-buy --at '2026-10-17 19:55' '1,2,3,4,5,6' -p 'team-*' : 지정한 날짜/시각에 수동모드 1장씩 구매
+"""
+)
+def schedule_buy(  # pylint: disable=too-many-arguments  # typer 는 CLI 옵션마다 인자를 받음
+        *,
+        at: Annotated[str, typer.Option("--at", help="구매할 한국 시각을 'HH:MM[:SS]' 또는 'YYYY-MM-DD HH:MM[:SS]' 형식으로 지정합니다.", metavar="TIME", show_default=False)],
+        tickets: Annotated[List[str], typer.Argument(help="구매할 번호를 입력합니다. 생략 시 자동모드로 5장 구매합니다.", metavar="tickets", show_default=False)] = None,
+        always_yes: Annotated[bool, typer.Option("-y", "--yes", help="구매 전 확인 절차를 스킵합니다.")] = False,
+        profile: Annotated[
+            List[str], typer.Option("-p", "--profile", help="프로필을 지정합니다. 여러 번 지정하거나 쉼표로 구분하거나 glob 패턴(예: 'team-*')을 사용할 수 있습니다", metavar="", show_default="default")
+        ] = None,
+        all_profiles: Annotated[bool, typer.Option("--all-profiles", help="설정된 모든 프로필에 대해 실행합니다.")] = False,
+        workers: Annotated[int, typer.Option("--workers", help="구매 시각에 동시에 보낼 구매 요청 수를 지정합니다.", min=1)] = 8,
+        trace: Annotated[Optional[Path], typer.Option("--trace", help="요청/파싱 단계별 소요 시간을 JSON lines 형식으로 지정한 파일에 기록합니다.", metavar="FILE", dir_okay=False)] = None,
+        output: Annotated[OutputFormat, typer.Option("--output", help="결과 출력 형식을 지정합니다. json/ndjson 은 결과가 나올 때마다 JSON 레코드를 바로 출력합니다.", case_sensitive=False)] = OutputFormat.TABLE,
+        _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+):
+    profile = profile or ["default"]
+    try:
+        at_kst = parse_kst_datetime(at, datetime.datetime.now(KST))
+    except ValueError as e:
+        raise RuntimeError(f"❗ {e}")
+    tickets = Lotto645Ticket.create_tickets(tickets) if tickets else Lotto645Ticket.create_auto_tickets(count=5)
+    profile_names = [profile[0]] if _is_single_profile(profile, all_profiles) else _resolve_profile_names(profile, all_profiles)
+    scheduled_buy = build_lotto645_scheduled_buy(at_kst, workers)
+
+    _echo(output, f"👤 대상 프로필 ({len(profile_names)}개): {', '.join(profile_names)}")
+    _echo(output, f"⏰ {at_kst:%Y-%m-%d %H:%M:%S} (한국 시각)에 {scheduled_buy.round_no}회를 구매합니다.")
+    if not build_lotto645_buy_confirmer(output).confirm(tickets, always_yes):
+        raise typer.Exit()
+
+    with _client_settings(output, trace, purchase_ledger=build_purchase_ledger().buffered()) as settings:
+        results = scheduled_buy.run(profile_names, lambda profile_name: _connect(profile_name, settings), tickets)
+    _print_profile_batch(results, output)
+
+
+@app.command(
+    help="""
+로컬 HTTP/JSON API 서버를 실행합니다.
+
+프로필별로 로그인한 세션을 유지하므로, 다른 프로그램에서 요청할 때마다 dhapi 를 실행하고 로그인하지 않아도 됩니다.
+구매 요청도 확인 절차 없이 바로 처리하므로 외부에서 접근할 수 없는 주소에서만 실행해주세요.
+
+[API]
+
+GET  /profiles/{profile}/balance : 예치금 현황 조회 (?fresh=1 을 붙이면 보관된 조회 결과를 사용하지 않음)
+
+POST /profiles/{profile}/lotto645 {"tickets": ["1,2,3,4,5,6", ""]} : 로또6/45 구매 (tickets 생략 시 자동 5장)
+
+POST /profiles/{profile}/virtual-account {"amount": 50000} : 가상계좌 할당
+
+GET  /health : 서버 상태와 로그인된 프로필 목록
+"""
+)
+def serve(
+        host: Annotated[str, typer.Option("--host", help="요청을 받을 주소를 지정합니다.")] = "127.0.0.1",
+        port: Annotated[int, typer.Option("--port", help="요청을 받을 포트를 지정합니다.", min=0, max=65535)] = 8645,
+        max_concurrency_per_profile: Annotated[int, typer.Option("--max-concurrency-per-profile", help="프로필마다 동시에 처리할 요청 수를 지정합니다.", min=1)] = 1,
+        _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+):
+    server = build_lottery_api_server(host, port, max_concurrency_per_profile)
+    _echo(OutputFormat.TABLE, f"🚀 {server.url} 에서 요청을 기다립니다. (종료: Ctrl+C)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+@app.command(
+    help="""
+지난 회차들의 로또6/45 당첨번호를 내려받아 저장합니다.
+
+이미 저장된 회차는 건너뛰고 새로 추첨된 회차만 가져옵니다. 저장된 당첨번호는 ~/.dhapi/draws.bin 에 보관됩니다.
+"""
+)
+def sync_draws(
+        profile: Annotated[str, typer.Option("-p", "--profile", help="프로필을 지정합니다", metavar="")] = "default",
+        workers: Annotated[int, typer.Option("--workers", help="동시에 요청할 회차 수를 지정합니다.", min=1, max=10)] = 4,
+        trace: Annotated[Optional[Path], typer.Option("--trace", help="요청/파싱 단계별 소요 시간을 JSON lines 형식으로 지정한 파일에 기록합니다.", metavar="FILE", dir_okay=False)] = None,
+        output: Annotated[OutputFormat, typer.Option("--output", help="결과 출력 형식을 지정합니다. json/ndjson 은 결과가 나올 때마다 JSON 레코드를 바로 출력합니다.", case_sensitive=False)] = OutputFormat.TABLE,
+        _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+):
+    with _client_settings(output, trace) as settings:
+        client = _connect(profile, settings, label_profile=False)
+        client.sync_lotto645_draws(build_draw_history_store(), max_workers=workers)
+
+
+@app.command(
+    help="""
+입력한 번호들, 혹은 구매 내역의 당첨 여부를 저장된 당첨번호와 비교합니다.
+
+번호를 입력하지 않으면 구매 내역(~/.dhapi/ledger.sqlite3)의 티켓을 각각 구매한 회차와 비교합니다.
+번호를 입력했는데 회차를 지정하지 않으면 저장된 모든 회차와 비교합니다. 먼저 'dhapi sync-draws' 로 당첨번호를 내려받아야 합니다.
+
+[예시]
+
+dhapi check-wins : 구매 내역 전체 확인
+
+dhapi check-wins -p default --round 1141 : default 프로필이 1141회에 구매한 티켓 확인
+
+dhapi check-wins '1,2,3,4,5,6' : 모든 회차와 비교
+
+dhapi check-wins '1,2,3,4,5,6' '7,8,9,10,11,12' --round 1141 : 1141회와 비교
+"""
+)
+def check_wins(
+        tickets: Annotated[List[str], typer.Argument(help="확인할 번호 6개를 쉼표로 구분하여 입력합니다. 생략 시 구매 내역을 확인합니다.", metavar="tickets", show_default=False)] = None,
+        round_no: Annotated[Optional[int], typer.Option("-r", "--round", help="비교할 회차를 지정합니다. 생략 시 저장된 모든 회차와 비교합니다.", min=1)] = None,
+        profile: Annotated[Optional[str], typer.Option("-p", "--profile", help="구매 내역을 확인할 때 프로필을 지정합니다. 생략 시 모든 프로필의 구매 내역을 확인합니다.", metavar="")] = None,
+        output: Annotated[OutputFormat, typer.Option("--output", help="결과 출력 형식을 지정합니다. json/ndjson 은 결과가 나올 때마다 JSON 레코드를 바로 출력합니다.", case_sensitive=False)] = OutputFormat.TABLE,
+        _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+):
+    checker = build_lotto645_win_checker()
+    if not checker.rounds:
+        raise RuntimeError("❗ 저장된 당첨번호가 없습니다. 'dhapi sync-draws' 로 먼저 당첨번호를 내려받아주세요.")
+    if round_no is not None and round_no not in checker.rounds:
+        raise RuntimeError(f"❗ {round_no}회 당첨번호가 저장되어 있지 않습니다. 'dhapi sync-draws' 로 당첨번호를 갱신해주세요.")
+
+    if not tickets:
+        purchases = build_purchase_ledger().find_lotto645_purchases(round_no, profile)
+        if not purchases:
+            raise RuntimeError("❗ 확인할 구매 내역이 없습니다.")
+        rounds = [p.round_no for p in purchases]
+        wins = checker.find_wins([numbers_to_mask(p.numbers) for p in purchases], rounds)
+
+        checked_rounds = sorted(set(rounds) & set(checker.rounds))
+        labels = [f"{p.profile_name} {p.round_no}회 {p.slot}" for p in purchases]
+        build_lottery_endpoint(output=output).print_result_of_check_wins([p.numbers for p in purchases], checked_rounds, wins, labels)
+        return
+
+    tickets = Lotto645Ticket.create_tickets(tickets)
+    rounds = None if round_no is None else [round_no] * len(tickets)
+    wins = checker.check_tickets(tickets, rounds)
+
+    checked_rounds = checker.rounds if round_no is None else [round_no]
+    build_lottery_endpoint(output=output).print_result_of_check_wins([t.numbers for t in tickets], checked_rounds, wins)
+
+
+@app.command(
+    help="""
+저장된 당첨번호로 번호별 통계를 보여줍니다.
+
+번호별 출현 횟수, 함께 많이 나온 번호, 연속 출현/미출현 현황, 출현 간격 분포를 보여줍니다. 먼저 'dhapi sync-draws' 로 당첨번호를 내려받아야 하며, numpy 가 필요합니다.
+집계 결과는 ~/.dhapi/stats.npz 에 저장해두고 다음부터는 새로 저장된 회차만 더합니다.
+"""
+)
+def stats(
+        top: Annotated[int, typer.Option("--top", help="표마다 보여줄 줄 수를 지정합니다.", min=1, max=45)] = 10,
+        _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+):
+    lotto645_stats = build_lotto645_stats()
+    if lotto645_stats.draw_count == 0:
+        raise RuntimeError("❗ 저장된 당첨번호가 없습니다. 'dhapi sync-draws' 로 먼저 당첨번호를 내려받아주세요.")
+    build_lottery_endpoint().print_result_of_stats(lotto645_stats, top)
+
+
+def _parse_sum_range(value: str):
+    low, sep, high = value.partition("-")
+    try:
+        if not sep:
+            raise ValueError
+        return int(low), int(high)
+    except ValueError:
+        raise ValueError(f"번호 합계는 '최소-최대' 형식으로 입력해야 합니다 (입력된 값: {value}).")
+
+
+def _parse_odd_counts(value: str):
+    try:
+        odd_counts = [int(n) for n in value.split(",")]
+    except ValueError:
+        raise ValueError(f"홀수 개수는 쉼표로 구분한 숫자로 입력해야 합니다 (입력된 값: {value}).")
+    if not all(0 <= n <= 6 for n in odd_counts):
+        raise ValueError(f"홀수 개수는 0부터 6까지만 사용할 수 있습니다 (입력된 값: {value}).")
+    return odd_counts
+
+
+@app.command(
+    help="""
+구매 요청 저널(~/.dhapi/journal.sqlite3)에 남은 구매 요청을 보여주거나, 결과를 직접 기록합니다.
+
+구매 요청의 응답을 받지 못했는데 구매되었는지도 확인하지 못하면, 같은 티켓을 두 번 구매하지 않도록 그 요청의 결과가 정해질 때까지 같은 티켓의 구매를 막습니다.
+동행복권 사이트의 구매 내역을 확인한 뒤 --resolve 로 결과를 기록하면 다시 구매할 수 있습니다.
+
+[예시]
+
+dhapi journal : 결과가 정해지지 않은 구매 요청 보기
+
+dhapi journal --all -p default : default 프로필의 모든 구매 요청 보기
+
+dhapi journal --resolve 12 --as failed : 12번 구매 요청이 구매 내역에 없음을 기록
+"""
+)
+def journal(
+        profile: Annotated[Optional[str], typer.Option("-p", "--profile", help="프로필을 지정합니다. 생략 시 모든 프로필의 구매 요청을 보여줍니다.", metavar="")] = None,
+        show_all: Annotated[bool, typer.Option("--all", help="결과가 정해진 구매 요청도 보여줍니다.")] = False,
+        resolve: Annotated[Optional[int], typer.Option("--resolve", help="결과를 기록할 구매 요청 번호를 지정합니다.", metavar="ID", show_default=False)] = None,
+        resolution: Annotated[Optional[PurchaseResolution], typer.Option("--as", help="--resolve 로 지정한 구매 요청의 결과를 지정합니다.", case_sensitive=False, show_default=False)] = None,
+        output: Annotated[OutputFormat, typer.Option("--output", help="결과 출력 형식을 지정합니다.", case_sensitive=False)] = OutputFormat.TABLE,
+        _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+):
+    purchase_journal = build_purchase_journal()
+    if resolve is None:
+        if resolution is not None:
+            raise RuntimeError("❗ --as 는 --resolve 와 함께 지정해야 합니다.")
+        intents = purchase_journal.find_intents(profile, open_only=not show_all)
+        build_lottery_endpoint(output=output).print_result_of_purchase_intents(intents, open_only=not show_all)
+        return
+
+    if resolution is None:
+        raise RuntimeError("❗ --resolve 로 결과를 기록하려면 --as confirmed 또는 --as failed 를 지정해야 합니다.")
+    try:
+        intent = purchase_journal.resolve(resolve, resolution == PurchaseResolution.CONFIRMED)
+    except ValueError as e:
+        raise RuntimeError(f"❗ {e}") from e
+    build_lottery_endpoint(output=output).print_result_of_resolve_purchase_intent(intent)
+
+
+@app.command(
+    help="""
+로또6/45 번호를 직접 만듭니다.
+
+8,145,060개 조합 중 조건을 만족하는 조합에서 서로 다른 번호를 균등하게 뽑아 한 줄에 한 장씩 출력합니다.
+번호 합계/홀수 개수 조건을 사용하려면 numpy 가 필요합니다.
+
+[예시]
+
+dhapi generate-lotto645 -n 5 : 5장
+
+dhapi generate-lotto645 -n 5 --sum 100-170 --odd 2,3,4 --exclude-past-winners : 합계 100~170, 홀수 2~4개, 지난 당첨번호 제외
+
+dhapi generate-lotto645 -n 25 | dhapi buy-lotto645 --from - --all-profiles -y : 만든 번호를 여러 프로필로 구매
+"""
+)
+def generate_lotto645(
+        count: Annotated[int, typer.Option("-n", "--count", help="만들 장수를 지정합니다.", min=1)] = 5,
+        sum_range: Annotated[Optional[str], typer.Option("--sum", help="번호 6개의 합계 범위를 지정합니다 (예: 100-170).", metavar="MIN-MAX", show_default=False)] = None,
+        odd_counts: Annotated[Optional[str], typer.Option("--odd", help="허용할 홀수 번호 개수를 쉼표로 구분하여 지정합니다 (예: 2,3,4).", metavar="N,...", show_default=False)] = None,
+        exclude_past_winners: Annotated[bool, typer.Option("--exclude-past-winners", help="저장된 지난 회차 당첨번호(1등 조합)를 제외합니다. 'dhapi sync-draws' 로 먼저 내려받아야 합니다.")] = False,
+        seed: Annotated[Optional[int], typer.Option("--seed", help="같은 번호를 다시 만들 수 있도록 난수 시드를 지정합니다.", show_default=False)] = None,
+        _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+):
+    generator = build_lotto645_generator(
+        sum_range=None if sum_range is None else _parse_sum_range(sum_range),
+        odd_counts=None if odd_counts is None else _parse_odd_counts(odd_counts),
+        exclude_past_winners=exclude_past_winners,
+        seed=seed,
+    )
+    build_lottery_endpoint().print_result_of_generate_lotto645(generator.generate(count))
 
 
 @app.command(
@@ -112,8 +609,10 @@ def buy_lotto645(
 dhapi 버전을 출력합니다.
 """
 )
-def version():
-    version_callback(True)
+def version(
+        output: Annotated[OutputFormat, typer.Option("--output", help="결과 출력 형식을 지정합니다.", case_sensitive=False)] = OutputFormat.TABLE,
+):
+    version_callback(True, output)
 
 
 def entrypoint():
@@ -0,0 +1,178 @@
+import json
+import logging
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from dhapi.domain.deposit import Deposit
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+from dhapi.endpoint.lottery_json_endpoint import LotteryJsonEndpoint
+from dhapi.port.lottery_errors import AuthError, BusinessError, MaintenanceError, TransientError
+from dhapi.server.lottery_client_pool import LotteryClientPool, ProfileNotFoundError
+
+logger = logging.getLogger(__name__)
+
+_PROFILE_ROUTE = re.compile(r"^/profiles/([^/]+)/(balance|lotto645|virtual-account)$")
+
+# 한 번에 구매할 수 있는 최대 장수
+_MAX_TICKETS = 5
+
+
+class LotteryApiServer:
+    """
+    예치금 조회, 로또6/45 구매, 가상계좌 할당을 로컬 HTTP/JSON API 로 제공합니다.
+
+    프로필별 세션은 LotteryClientPool 에 유지되므로, 요청마다 프로세스를 띄우고 로그인하지 않아도 됩니다.
+
+    - GET  /health
+    - GET  /profiles/{profile}/balance?fresh=1                   (fresh 생략 시 보관된 조회 결과가 있으면 사용)
+    - POST /profiles/{profile}/lotto645          {"tickets": ["1,2,3,4,5,6", "1,2,3", ""]}  (생략 시 자동 5장)
+    - POST /profiles/{profile}/virtual-account   {"amount": 50000}
+
+    성공하면 200 과 {"profile": ..., "result": {...}}, 실패하면 오류 종류에 맞는 상태 코드와 {"error": {"type": ..., "message": ...}} 를 보냅니다.
+    """
+
+    def __init__(self, pool: LotteryClientPool, endpoint: LotteryJsonEndpoint, host: str = "127.0.0.1", port: int = 8645):
+        self._pool = pool
+        self._endpoint = endpoint
+        self._httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="lottery-api-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self.close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def close(self):
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def handle(self, method: str, path: str, body: Optional[Dict], query: Optional[Dict[str, str]] = None) -> Tuple[int, Dict]:
+        """
+        :return: (상태 코드, 응답 본문)
+        """
+        try:
+            if path == "/health":
+                if method != "GET":
+                    return 405, _error("MethodNotAllowed", f"{method} {path} 는 지원하지 않습니다.")
+                return 200, {"status": "ok", "profiles": self._pool.connected_profile_names}
+
+            match = _PROFILE_ROUTE.match(path)
+            if match is None:
+                return 404, _error("NotFound", f"{path} 를 찾을 수 없습니다.")
+            profile_name, operation = unquote(match.group(1)), match.group(2)
+            if method != ("GET" if operation == "balance" else "POST"):
+                return 405, _error("MethodNotAllowed", f"{method} {path} 는 지원하지 않습니다.")
+
+            run = self._operation(operation, body or {}, query or {})
+            with self._pool.acquire(profile_name) as client:
+                self._endpoint.take_result()  # 이전 요청에서 남은 결과를 비움
+                run(client)
+                return 200, {"profile": profile_name, "result": self._endpoint.take_result()}
+        except Exception as e:
+            logger.debug(f"{method} {path} failed: {e!r}")
+            return _status_of(e), _error(type(e).__name__, str(e))
+
+    @staticmethod
+    def _operation(operation: str, body: Dict, query: Dict[str, str]):
+        """
+        요청 본문은 로그인 전에 검증하여, 잘못된 요청으로 세션을 만들지 않도록 합니다.
+        """
+        if operation == "balance":
+            fresh = query.get("fresh", "").lower() in ("1", "true", "yes")
+            return lambda client: client.show_balance(fresh=fresh)
+
+        if operation == "virtual-account":
+            deposit = Deposit(body.get("amount", 50000))
+            return lambda client: client.assign_virtual_account(deposit)
+
+        numbers_list = body.get("tickets")
+        if numbers_list is None:
+            tickets = Lotto645Ticket.create_auto_tickets(count=_MAX_TICKETS)
+        else:
+            if not isinstance(numbers_list, list) or not all(isinstance(n, str) for n in numbers_list):
+                raise ValueError('tickets 는 문자열 목록이어야 합니다 (예: ["1,2,3,4,5,6", ""]).')
+            if not 1 <= len(numbers_list) <= _MAX_TICKETS:
+                raise ValueError(f"한 번에 1장 이상 {_MAX_TICKETS}장 이하로 구매할 수 있습니다 (입력된 값: {len(numbers_list)}).")
+            tickets = Lotto645Ticket.create_tickets(numbers_list)
+        return lambda client: client.buy_lotto645(tickets)
+
+
+def _error(error_type: str, message: str) -> Dict:
+    return {"error": {"type": error_type, "message": message}}
+
+
+def _status_of(error: Exception) -> int:
+    if isinstance(error, ValueError):
+        return 400
+    if isinstance(error, ProfileNotFoundError):
+        return 404
+    if isinstance(error, AuthError):
+        return 401
+    if isinstance(error, BusinessError):
+        return 409
+    if isinstance(error, (MaintenanceError, TransientError)):
+        return 503
+    return 500
+
+
+def _handler_for(server: LotteryApiServer):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            logger.debug(format, *args)
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            self._dispatch("GET")
+
+        def do_POST(self):  # pylint: disable=invalid-name
+            self._dispatch("POST")
+
+        def _dispatch(self, method):
+            try:
+                body = self._read_json()
+            except ValueError as e:
+                self._send(400, _error("ValueError", f"요청 본문이 올바른 JSON 객체가 아닙니다. ({e})"))
+                return
+            split = urlsplit(self.path)
+            self._send(*server.handle(method, split.path, body, {k: v[-1] for k, v in parse_qs(split.query).items()}))
+
+        def _read_json(self) -> Optional[Dict]:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length == 0:
+                return None
+            body = json.loads(self.rfile.read(length))
+            if not isinstance(body, dict):
+                raise ValueError(type(body).__name__)
+            return body
+
+        def _send(self, status: int, body: Dict):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
@@ -0,0 +1,106 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from dhapi.port.lottery_errors import AuthError, TransientError
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileNotFoundError(LookupError):
+    pass
+
+
+class _PoolEntry:
+    def __init__(self, max_concurrency: int):
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.lock = threading.Lock()
+        self.client = None
+        self.last_used = 0.0
+
+
+class LotteryClientPool:
+    """
+    프로필별로 로그인한 LotteryClient 하나를 만들어두고 여러 요청이 함께 씁니다.
+
+    - 프로필마다 동시에 처리하는 요청을 max_concurrency_per_profile 개로 제한하고, 나머지 요청은 acquire_timeout_seconds 동안 기다림
+    - revalidate_seconds 넘게 쓰지 않은 세션은 쓰기 전에 keep_alive() 로 확인하여, 만료되었으면 다시 로그인
+    - 로그인에 실패한 프로필은 클라이언트를 버려 다음 요청에서 다시 로그인
+    """
+
+    def __init__(
+        self, connect: Callable[[str], object], max_concurrency_per_profile: int = 1, revalidate_seconds: float = 300.0, acquire_timeout_seconds: float = 30.0, clock=time.monotonic
+    ):
+        """
+        :param connect: 프로필 이름으로 로그인한 LotteryClient 를 만드는 함수. 없는 프로필이면 ProfileNotFoundError
+        """
+        if max_concurrency_per_profile < 1:
+            raise ValueError(f"프로필별 동시 요청 수는 1 이상이어야 합니다 (입력된 값: {max_concurrency_per_profile}).")
+        self._connect = connect
+        self._max_concurrency = max_concurrency_per_profile
+        self._revalidate_seconds = revalidate_seconds
+        self._acquire_timeout_seconds = acquire_timeout_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _PoolEntry] = {}
+
+    @property
+    def connected_profile_names(self) -> List[str]:
+        with self._lock:
+            return [name for name, entry in self._entries.items() if entry.client is not None]
+
+    @contextmanager
+    def acquire(self, profile_name: str):
+        """
+        :raise TransientError: acquire_timeout_seconds 안에 차례가 오지 않는 경우
+        """
+        entry = self._entry(profile_name)
+        if not entry.semaphore.acquire(timeout=self._acquire_timeout_seconds):
+            raise TransientError(f"'{profile_name}' 프로필에 대한 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요.")
+        try:
+            client = self._client(entry, profile_name)
+            try:
+                yield client
+            except AuthError:
+                self._discard(entry, client)
+                raise
+            entry.last_used = self._clock()
+        finally:
+            entry.semaphore.release()
+
+    def invalidate(self, profile_name: str):
+        with self._lock:
+            entry = self._entries.get(profile_name)
+        if entry is not None:
+            with entry.lock:
+                entry.client = None
+
+    def _entry(self, profile_name: str) -> _PoolEntry:
+        with self._lock:
+            if profile_name not in self._entries:
+                self._entries[profile_name] = _PoolEntry(self._max_concurrency)
+            return self._entries[profile_name]
+
+    def _client(self, entry: _PoolEntry, profile_name: str):
+        # 같은 프로필로 동시에 여러 번 로그인하지 않도록 프로필별로 잠금
+        with entry.lock:
+            if entry.client is not None and self._clock() - entry.last_used > self._revalidate_seconds:
+                try:
+                    entry.client.keep_alive()
+                except Exception as e:
+                    logger.debug(f"'{profile_name}' session could not be revalidated ({e!r}), logging in again")
+                    entry.client = None
+                entry.last_used = self._clock()
+
+            if entry.client is None:
+                logger.debug(f"logging in '{profile_name}'")
+                entry.client = self._connect(profile_name)
+                entry.last_used = self._clock()
+            return entry.client
+
+    def _discard(self, entry: _PoolEntry, client: Optional[object]):
+        with entry.lock:
+            if entry.client is client:
+                entry.client = None
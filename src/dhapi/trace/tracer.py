@@ -0,0 +1,98 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, TextIO
+
+
+class Span:
+    """
+    네트워크 요청이나 페이지 파싱처럼 시간을 재고 싶은 단계 하나를 나타냅니다.
+    """
+
+    def __init__(self, name: str, attributes: Dict):
+        self.name = name
+        self.started_at = time.time()
+        self.duration_ms = None
+        self.attributes = attributes
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "started_at": self.started_at, "duration_ms": self.duration_ms, **self.attributes}
+
+
+class Tracer:
+    """
+    LotteryClient 의 각 단계를 Span 으로 기록하고 JSON lines 로 내보냅니다.
+
+    bind() 로 만든 Tracer 는 기록을 공유하므로, 여러 프로필을 동시에 실행해도 하나의 파일로 내보낼 수 있습니다.
+
+    usage:
+        with tracer.span("http.exec_buy", host="ol.dhlottery.co.kr") as span:
+            resp = session.post(...)
+            span.set(status=resp.status_code, bytes=len(resp.content))
+    """
+
+    def __init__(self, attributes: Optional[Dict] = None, _shared: Optional["Tracer"] = None):
+        """
+        :param attributes: 모든 Span 에 붙일 값
+        :param _shared: 기록을 함께 쓸 Tracer. bind() 에서만 사용
+        """
+        self._attributes = attributes or {}
+        self._lock = _shared._lock if _shared is not None else threading.Lock()
+        self._spans: List[Span] = _shared._spans if _shared is not None else []
+
+    def bind(self, **attributes) -> "Tracer":
+        return Tracer({**self._attributes, **attributes}, _shared=self)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        span = Span(name, {**self._attributes, **attributes})
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=type(e).__name__)
+            raise
+        finally:
+            span.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+            with self._lock:
+                self._spans.append(span)
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def export_jsonl(self, fp: TextIO):
+        for span in sorted(self.spans, key=lambda s: s.started_at):
+            fp.write(json.dumps(span.to_dict(), ensure_ascii=False))
+            fp.write("\n")
+
+
+class NullTracer:
+    """
+    --trace 옵션을 주지 않았을 때 사용하며, 아무것도 기록하지 않습니다.
+    """
+
+    class _NullSpan:
+        def set(self, **attributes):
+            pass
+
+    _null_span = _NullSpan()
+
+    def bind(self, **attributes) -> "NullTracer":  # pylint: disable=unused-argument
+        return self
+
+    @contextmanager
+    def span(self, name: str, **attributes):  # pylint: disable=unused-argument
+        yield NullTracer._null_span
+
+    @property
+    def spans(self) -> List[Span]:
+        return []
+
+    def export_jsonl(self, fp: TextIO):
+        pass
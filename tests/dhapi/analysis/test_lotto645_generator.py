@@ -0,0 +1,70 @@
+import importlib.util
+
+import pytest
+
+from dhapi.analysis import lotto645_generator
+from dhapi.analysis.lotto645_generator import Lotto645Generator
+from dhapi.domain.lotto645_combination import TOTAL_COMBINATIONS, rank
+from dhapi.domain.lotto645_ticket import Lotto645Mode
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+USE_NUMPY = [False, pytest.param(True, marks=pytest.mark.skipif(not HAS_NUMPY, reason="numpy is not installed"))]
+requires_numpy = pytest.mark.skipif(not HAS_NUMPY, reason="numpy is not installed")
+
+
+@pytest.mark.parametrize("use_numpy", USE_NUMPY)
+def test_generate_makes_distinct_manual_tickets(use_numpy):
+    tickets = Lotto645Generator(seed=1, use_numpy=use_numpy).generate(1000)
+
+    assert len({t.mask for t in tickets}) == 1000
+    assert all(t.mode == Lotto645Mode.MANUAL for t in tickets)
+
+
+@pytest.mark.parametrize("use_numpy", USE_NUMPY)
+def test_same_seed_makes_same_tickets(use_numpy):
+    first = Lotto645Generator(seed=7, use_numpy=use_numpy).generate(10)
+    second = Lotto645Generator(seed=7, use_numpy=use_numpy).generate(10)
+
+    assert [t.numbers for t in first] == [t.numbers for t in second]
+
+
+@pytest.mark.parametrize("use_numpy", USE_NUMPY)
+def test_excluded_combinations_are_never_sampled(use_numpy, monkeypatch):
+    # 조합 수 전체를 뽑는 대신 앞쪽 순번 몇 개만 남도록 줄여서 확인
+    excluded = [[1, 2, 3, 4, 5, 6], [1, 2, 3, 4, 5, 8], [2, 3, 4, 5, 6, 7]]
+    monkeypatch.setattr(lotto645_generator, "TOTAL_COMBINATIONS", 10)
+    generator = Lotto645Generator(excluded=excluded, seed=1, use_numpy=use_numpy)
+
+    ranks = generator.sample_ranks(7)
+
+    assert generator.candidate_count == 7
+    assert sorted(ranks) == sorted(set(range(10)) - {rank(numbers) for numbers in excluded})
+
+
+def test_sample_more_than_candidates_fails():
+    generator = Lotto645Generator(excluded=[[1, 2, 3, 4, 5, 6]], use_numpy=False)
+
+    with pytest.raises(ValueError) as e:
+        generator.sample_ranks(TOTAL_COMBINATIONS)
+
+    assert e.value.args[0] == f"조건을 만족하는 조합은 8,145,059개입니다 (입력된 값: {TOTAL_COMBINATIONS})."
+
+
+@requires_numpy
+def test_sum_and_odd_filters():
+    tickets = Lotto645Generator(sum_range=(100, 120), odd_counts=[2, 4], seed=3).generate(500)
+
+    assert all(100 <= sum(t.numbers) <= 120 for t in tickets)
+    assert all(sum(n % 2 for n in t.numbers) in (2, 4) for t in tickets)
+
+
+@requires_numpy
+def test_filters_count_every_matching_combination():
+    # 합계가 21 이 되는 조합은 1,2,3,4,5,6 하나뿐이고, 홀수가 6개인 조합은 23개의 홀수 중 6개를 고르는 경우의 수
+    assert Lotto645Generator(sum_range=(21, 21)).candidate_count == 1
+    assert Lotto645Generator(odd_counts=[6]).candidate_count == 100947
+
+
+def test_filters_require_numpy():
+    with pytest.raises(RuntimeError):
+        Lotto645Generator(sum_range=(100, 170), use_numpy=False)
@@ -0,0 +1,112 @@
+import random
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+from dhapi.analysis.lotto645_stats import Lotto645Stats
+from dhapi.domain.lotto645_draw import Lotto645Draw
+from dhapi.port.draw_history_store import DrawHistoryStore
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DrawHistoryStore(str(tmp_path / "draws.bin"))
+
+
+@pytest.fixture
+def stats_path(tmp_path):
+    return str(tmp_path / "stats.npz")
+
+
+def _random_draws(rounds, pool=12, seed=1):
+    # 번호 범위를 좁혀 연속 출현과 짧은 간격이 자주 생기도록 함
+    rng = random.Random(seed)
+    return [Lotto645Draw(r, rng.sample(range(1, pool + 1), 6), 45) for r in rounds]
+
+
+def test_counts_numbers_pairs_and_triples(store, stats_path):
+    draws = _random_draws(range(1, 101))
+    store.put_many(draws)
+
+    stats = Lotto645Stats(stats_path)
+    stats.update(store)
+
+    frequency = Counter(n for d in draws for n in d.numbers)
+    pairs = Counter(p for d in draws for p in combinations(d.numbers, 2))
+    triples = Counter(t for d in draws for t in combinations(d.numbers, 3))
+    assert stats.draw_count == 100
+    assert stats.frequency.tolist() == [frequency[n] for n in range(1, 46)]
+    assert stats.bonus_frequency[44] == 100
+    assert all(stats.pair_count(a, b) == stats.pair_count(b, a) == pairs[(a, b)] for a, b in combinations(range(1, 46), 2))
+    assert all(stats.triple_count(*t) == count for t, count in triples.items())
+    assert len(stats.triple_keys) == len(triples)
+    assert stats.top_pairs(1)[0][1] == max(pairs.values())
+    assert stats.top_triples(1)[0][1] == max(triples.values())
+
+
+def test_runs_and_gaps():
+    stats = Lotto645Stats("unused.npz")
+    draws = [
+        Lotto645Draw(1, [1, 2, 3, 4, 5, 6], 7),
+        Lotto645Draw(2, [1, 2, 3, 4, 5, 7], 8),
+        Lotto645Draw(3, [1, 2, 3, 4, 8, 9], 10),
+        Lotto645Draw(6, [1, 10, 11, 12, 13, 14], 15),
+    ]
+    for d in draws:
+        # 한 회차씩 더해도 한꺼번에 더한 것과 같아야 함
+        stats.fold(*_arrays(stats, [d]))
+
+    assert stats.current_runs[0] == 1  # 1번: 1, 2, 3회 연속 후 6회
+    assert stats.longest_run[0] == 3
+    assert stats.longest_run[4] == 2  # 5번: 1, 2회
+    assert stats.current_gaps[4] == 4
+    assert stats.longest_gap[0] == 3
+    assert stats.gap_histogram.tolist() == [0, 9, 0, 1]
+
+
+def test_update_folds_only_new_draws_and_reuses_cache(store, stats_path):
+    draws = _random_draws(range(1, 301), seed=2)
+    store.put_many(draws[:200])
+    assert Lotto645Stats(stats_path).update(store) == 200
+
+    store.put_many(draws[200:])
+    incremental = Lotto645Stats(stats_path)
+    assert incremental.update(store) == 100
+    assert Lotto645Stats(stats_path).update(store) == 0
+
+    full = Lotto645Stats(stats_path + ".full.npz")
+    full.update(store)
+    for name in ["frequency", "pairs", "triple_keys", "triple_counts", "last_seen", "last_run", "longest_run", "longest_gap", "gap_histogram"]:
+        assert getattr(incremental, name).tolist() == getattr(full, name).tolist(), name
+
+
+def test_update_rebuilds_when_missing_round_is_filled(store, stats_path):
+    draws = _random_draws(range(1, 11), seed=3)
+    store.put_many(draws[:4] + draws[5:])
+    Lotto645Stats(stats_path).update(store)
+
+    store.put_many([draws[4]])
+    stats = Lotto645Stats(stats_path)
+
+    assert stats.update(store) == 10
+    assert stats.draw_count == 10
+
+
+def test_fold_rejects_old_rounds(store, stats_path):
+    stats = Lotto645Stats(stats_path)
+    stats.fold(*_arrays(stats, _random_draws([5])))
+
+    with pytest.raises(ValueError):
+        stats.fold(*_arrays(stats, _random_draws([5])))
+
+
+def _arrays(stats, draws):
+    np = stats._np
+    return (
+        np.array([d.round_no for d in draws], dtype=np.int64),
+        np.array([d.numbers for d in draws], dtype=np.uint8),
+        np.array([d.bonus for d in draws], dtype=np.uint8),
+    )
@@ -0,0 +1,109 @@
+import importlib.util
+import random
+
+import pytest
+
+from dhapi.analysis.lotto645_win_checker import NO_PRIZE, Lotto645Win, Lotto645WinChecker, prize_tier, ticket_mask
+from dhapi.domain.lotto645_draw import Lotto645Draw
+from dhapi.domain.lotto645_mask import numbers_to_mask
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+from dhapi.port.draw_history_store import DrawHistoryStore
+
+DRAW = Lotto645Draw(1141, [7, 11, 25, 32, 41, 45], 12)
+
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+USE_NUMPY = [False, pytest.param(True, marks=pytest.mark.skipif(not HAS_NUMPY, reason="numpy is not installed"))]
+
+
+@pytest.mark.parametrize(
+    "numbers, tier",
+    [
+        ("7,11,25,32,41,45", 1),
+        ("7,11,25,32,41,12", 2),
+        ("7,11,25,32,41,1", 3),
+        ("7,11,25,32,1,12", 4),
+        ("7,11,25,1,2,12", 5),
+        ("7,11,1,2,3,12", NO_PRIZE),
+    ],
+)
+def test_prize_tier(numbers, tier):
+    mask = ticket_mask(Lotto645Ticket(numbers))
+
+    assert prize_tier(mask, numbers_to_mask(DRAW.numbers), 1 << DRAW.bonus) == tier
+
+
+def test_ticket_mask_accepts_slots_and_raw_lines():
+    expected = numbers_to_mask([1, 2, 4, 27, 39, 44])
+
+    assert ticket_mask({"mode": "자동", "slot": "A", "numbers": ["01", "02", "04", "27", "39", "44"]}) == expected
+    assert ticket_mask("A|01|02|04|27|39|443") == expected
+
+
+def test_ticket_mask_requires_six_numbers():
+    with pytest.raises(ValueError) as e:
+        ticket_mask(Lotto645Ticket("1,2,3"))
+
+    assert e.value.args[0] == "당첨 여부는 번호 6개가 모두 정해진 티켓만 확인할 수 있습니다 (입력된 값: [1, 2, 3])."
+
+
+@pytest.mark.parametrize("use_numpy", USE_NUMPY)
+def test_find_wins_in_all_rounds(use_numpy):
+    draws = [DRAW, Lotto645Draw(1142, [1, 2, 3, 4, 5, 6], 7)]
+    checker = Lotto645WinChecker(draws, use_numpy=use_numpy)
+
+    wins = checker.check_tickets([Lotto645Ticket("1,2,3,4,5,7"), Lotto645Ticket("20,21,22,23,24,26"), Lotto645Ticket("7,11,25,1,2,3")])
+
+    assert wins == [Lotto645Win(0, 1142, 2), Lotto645Win(2, 1141, 5), Lotto645Win(2, 1142, 5)]
+
+
+@pytest.mark.parametrize("use_numpy", USE_NUMPY)
+def test_find_wins_for_purchased_rounds(use_numpy):
+    draws = [DRAW, Lotto645Draw(1142, [1, 2, 3, 4, 5, 6], 7)]
+    checker = Lotto645WinChecker(draws, use_numpy=use_numpy)
+    tickets = [Lotto645Ticket("7,11,25,1,2,3"), Lotto645Ticket("7,11,25,1,2,3"), Lotto645Ticket("1,2,3,4,5,6")]
+
+    wins = checker.check_tickets(tickets, rounds=[1141, 1143, 1142])
+
+    assert wins == [Lotto645Win(0, 1141, 5), Lotto645Win(2, 1142, 1)]
+
+
+@pytest.mark.parametrize("use_numpy", USE_NUMPY)
+def test_from_store(tmp_path, use_numpy):
+    store = DrawHistoryStore(str(tmp_path / "draws.bin"))
+    store.put_many([DRAW, Lotto645Draw(3, [1, 2, 3, 4, 5, 6], 7)])
+
+    checker = Lotto645WinChecker.from_store(store, use_numpy=use_numpy)
+
+    assert checker.rounds == [3, 1141]
+    assert checker.check_tickets([Lotto645Ticket("1,2,3,4,5,6")]) == [Lotto645Win(0, 3, 1)]
+
+
+@pytest.mark.parametrize("use_numpy", USE_NUMPY)
+def test_from_empty_store(tmp_path, use_numpy):
+    checker = Lotto645WinChecker.from_store(DrawHistoryStore(str(tmp_path / "draws.bin")), use_numpy=use_numpy)
+
+    assert checker.rounds == []
+    assert checker.check_tickets([Lotto645Ticket("1,2,3,4,5,6")]) == []
+
+
+def test_numpy_and_pure_python_agree():
+    pytest.importorskip("numpy")
+    rnd = random.Random(0)
+    draws = [Lotto645Draw(n, *_pick(rnd)) for n in range(1, 301)]
+    tickets = [numbers_to_mask(rnd.sample(range(1, 46), 6)) for _ in range(200)]
+    # 2등을 확인할 수 있도록 5개 + 보너스가 맞는 티켓을 추가
+    tickets.append(numbers_to_mask(draws[10].numbers[:5] + [draws[10].bonus]))
+
+    python_checker = Lotto645WinChecker(draws, use_numpy=False)
+    numpy_checker = Lotto645WinChecker(draws, use_numpy=True)
+    numpy_checker._chunk_cells = 1000  # 나누어 계산하는 경로도 확인
+
+    assert numpy_checker.tiers(tickets).tolist() == python_checker.tiers(tickets)
+    assert numpy_checker.find_wins(tickets) == python_checker.find_wins(tickets)
+    assert Lotto645Win(len(tickets) - 1, 11, 2) in numpy_checker.find_wins(tickets)
+
+
+def _pick(rnd):
+    picked = rnd.sample(range(1, 46), 7)
+    return picked[:6], picked[6]
@@ -0,0 +1,32 @@
+import pytest
+
+from dhapi.batch.profile_batch_runner import ProfileBatchRunner
+
+
+def test_run_returns_results_in_profile_order():
+    runner = ProfileBatchRunner(max_workers=2)
+
+    results = runner.run(["a", "b", "c"], lambda profile_name: None)
+
+    assert [r.profile_name for r in results] == ["a", "b", "c"]
+    assert all(r.ok for r in results)
+
+
+def test_run_continues_after_partial_failure():
+    def task(profile_name):
+        if profile_name == "b":
+            raise RuntimeError("실패")
+
+    runner = ProfileBatchRunner(max_workers=2)
+
+    results = runner.run(["a", "b", "c"], task)
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert str(results[1].error) == "실패"
+
+
+def test_fail_on_non_positive_max_workers():
+    with pytest.raises(ValueError) as e:
+        ProfileBatchRunner(max_workers=0)
+
+    assert e.value.args[0] == "동시 작업 수는 1 이상이어야 합니다 (입력된 값: 0)."
@@ -0,0 +1,41 @@
+from itertools import combinations
+
+import pytest
+
+from dhapi.domain.lotto645_combination import TOTAL_COMBINATIONS, rank, unrank
+
+
+def test_total_combinations():
+    assert TOTAL_COMBINATIONS == 8145060
+
+
+def test_first_and_last_rank():
+    assert rank([1, 2, 3, 4, 5, 6]) == 0
+    assert rank([40, 41, 42, 43, 44, 45]) == TOTAL_COMBINATIONS - 1
+    assert unrank(0) == [1, 2, 3, 4, 5, 6]
+    assert unrank(TOTAL_COMBINATIONS - 1) == [40, 41, 42, 43, 44, 45]
+
+
+def test_rank_is_colex_order():
+    # colex 순서에서는 1 ~ n 만 사용하는 조합들이 0 ~ C(n, 6)-1 순번을 차지함
+    ranks = sorted(rank(c) for c in combinations(range(1, 13), 6))
+
+    assert ranks == list(range(924))
+
+
+@pytest.mark.parametrize("numbers", [[7, 11, 25, 32, 41, 45], [1, 10, 20, 30, 40, 45], [39, 40, 41, 42, 43, 44]])
+def test_unrank_reverses_rank(numbers):
+    assert unrank(rank(numbers)) == numbers
+    assert rank(list(reversed(numbers))) == rank(numbers)
+
+
+@pytest.mark.parametrize("numbers", [[1, 2, 3, 4, 5], [1, 1, 2, 3, 4, 5], [0, 1, 2, 3, 4, 5], [1, 2, 3, 4, 5, 46]])
+def test_rank_fails_on_invalid_numbers(numbers):
+    with pytest.raises(ValueError):
+        rank(numbers)
+
+
+@pytest.mark.parametrize("r", [-1, TOTAL_COMBINATIONS])
+def test_unrank_fails_out_of_range(r):
+    with pytest.raises(ValueError):
+        unrank(r)
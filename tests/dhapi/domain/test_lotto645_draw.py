@@ -0,0 +1,36 @@
+import datetime
+
+import pytest
+
+from dhapi.domain.lotto645_draw import Lotto645Draw
+
+
+def test_numbers_are_sorted():
+    draw = Lotto645Draw(1141, [45, 7, 11, 32, 25, 41], 12)
+
+    assert draw.numbers == [7, 11, 25, 32, 41, 45]
+    assert draw.draw_date == datetime.date(2024, 10, 12)
+
+
+@pytest.mark.parametrize(
+    "numbers, bonus, message",
+    [
+        ([1, 2, 3, 4, 5], 6, "당첨번호는 중복되지 않는 6개의 숫자여야 합니다 (입력된 값: [1, 2, 3, 4, 5])."),
+        ([1, 1, 2, 3, 4, 5], 6, "당첨번호는 중복되지 않는 6개의 숫자여야 합니다 (입력된 값: [1, 1, 2, 3, 4, 5])."),
+        ([1, 2, 3, 4, 5, 46], 6, "각 번호는 1부터 45까지의 숫자만 사용할 수 있습니다 (입력된 값: 46)."),
+        ([1, 2, 3, 4, 5, 6], 0, "각 번호는 1부터 45까지의 숫자만 사용할 수 있습니다 (입력된 값: 0)."),
+        ([1, 2, 3, 4, 5, 6], 6, "보너스 번호는 당첨번호와 겹칠 수 없습니다 (입력된 값: 6)."),
+    ],
+)
+def test_fail_on_invalid_numbers(numbers, bonus, message):
+    with pytest.raises(ValueError) as e:
+        Lotto645Draw(1, numbers, bonus)
+
+    assert e.value.args[0] == message
+
+
+def test_fail_on_invalid_round():
+    with pytest.raises(ValueError) as e:
+        Lotto645Draw(0, [1, 2, 3, 4, 5, 6], 7)
+
+    assert e.value.args[0] == "회차는 1 이상이어야 합니다 (입력된 값: 0)."
@@ -0,0 +1,24 @@
+import pytest
+
+from dhapi.domain.lotto645_mask import ALL_NUMBERS_MASK, mask_to_numbers, numbers_to_mask, popcount
+
+
+def test_number_n_is_bit_n():
+    assert numbers_to_mask([1, 2, 45]) == (1 << 1) | (1 << 2) | (1 << 45)
+
+
+def test_round_trip():
+    assert mask_to_numbers(numbers_to_mask([45, 3, 17])) == [3, 17, 45]
+
+
+def test_all_numbers_mask():
+    assert mask_to_numbers(ALL_NUMBERS_MASK) == list(range(1, 46))
+    assert popcount(ALL_NUMBERS_MASK) == 45
+
+
+@pytest.mark.parametrize("n", [0, 46])
+def test_fail_on_out_of_range(n):
+    with pytest.raises(ValueError) as e:
+        numbers_to_mask([1, n])
+
+    assert e.value.args[0] == f"각 번호는 1부터 45까지의 숫자만 사용할 수 있습니다 (입력된 값: {n})."
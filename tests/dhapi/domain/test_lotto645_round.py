@@ -0,0 +1,78 @@
+import datetime
+
+import pytest
+
+from dhapi.domain.lotto645_round import KST, get_lotto645_draw_date, get_lotto645_round_on_sale, is_lotto645_round_rollover, parse_kst_datetime
+
+
+@pytest.mark.parametrize(
+    "now, expected",
+    [
+        (datetime.datetime(2002, 12, 1, 12, 0, tzinfo=KST), 1),
+        (datetime.datetime(2002, 12, 7, 19, 59, tzinfo=KST), 1),
+        (datetime.datetime(2002, 12, 7, 20, 0, tzinfo=KST), 2),
+        (datetime.datetime(2022, 1, 29, 19, 59, tzinfo=KST), 1000),
+        (datetime.datetime(2022, 1, 30, 6, 0, tzinfo=KST), 1001),
+        (datetime.datetime(2024, 10, 13, 9, 0, tzinfo=KST), 1142),
+    ],
+)
+def test_get_lotto645_round_on_sale(now, expected):
+    assert get_lotto645_round_on_sale(now) == expected
+
+
+def test_get_lotto645_round_on_sale_handles_other_timezones():
+    now = datetime.datetime(2022, 1, 29, 11, 0, tzinfo=datetime.timezone.utc)  # 20:00 KST
+
+    assert get_lotto645_round_on_sale(now) == 1001
+
+
+def test_get_lotto645_round_on_sale_fails_on_naive_datetime():
+    with pytest.raises(ValueError):
+        get_lotto645_round_on_sale(datetime.datetime(2022, 1, 29))
+
+
+@pytest.mark.parametrize(
+    "now, expected",
+    [
+        (datetime.datetime(2022, 1, 29, 19, 59, tzinfo=KST), False),
+        (datetime.datetime(2022, 1, 29, 20, 0, tzinfo=KST), True),
+        (datetime.datetime(2022, 1, 30, 5, 59, tzinfo=KST), True),
+        (datetime.datetime(2022, 1, 30, 6, 0, tzinfo=KST), False),
+        (datetime.datetime(2022, 1, 29, 11, 30, tzinfo=datetime.timezone.utc), True),
+    ],
+)
+def test_is_lotto645_round_rollover(now, expected):
+    assert is_lotto645_round_rollover(now) == expected
+
+
+def test_get_lotto645_draw_date():
+    assert get_lotto645_draw_date(1) == datetime.date(2002, 12, 7)
+    assert get_lotto645_draw_date(1000) == datetime.date(2022, 1, 29)
+
+
+NOW = datetime.datetime(2024, 10, 19, 10, 0, tzinfo=KST)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("19:55", datetime.datetime(2024, 10, 19, 19, 55, tzinfo=KST)),
+        ("19:55:30", datetime.datetime(2024, 10, 19, 19, 55, 30, tzinfo=KST)),
+        ("2024-10-26 19:55", datetime.datetime(2024, 10, 26, 19, 55, tzinfo=KST)),
+        ("2024-10-19T10:00:01+00:00", datetime.datetime(2024, 10, 19, 19, 0, 1, tzinfo=KST)),
+    ],
+)
+def test_parse_kst_datetime(value, expected):
+    assert parse_kst_datetime(value, NOW) == expected
+
+
+def test_parse_kst_datetime_uses_korean_date():
+    # UTC 기준으로는 아직 18일이지만 한국은 19일
+    now = datetime.datetime(2024, 10, 18, 16, 0, tzinfo=datetime.timezone.utc)
+    assert parse_kst_datetime("19:55", now) == datetime.datetime(2024, 10, 19, 19, 55, tzinfo=KST)
+
+
+@pytest.mark.parametrize("value", ["7pm", "25:00", "09:59", "2024-10-18 19:55"])
+def test_parse_kst_datetime_rejects_invalid_or_past_time(value):
+    with pytest.raises(ValueError):
+        parse_kst_datetime(value, NOW)
@@ -1,5 +1,6 @@
 import pytest
 
+from dhapi.domain import lotto645_ticket
 from dhapi.domain.lotto645_ticket import Lotto645Ticket, Lotto645Mode
 
 
@@ -136,3 +137,82 @@ def test_mode_kor_formatted_return_수동_for_manual():
 
     assert len(tickets) == 1
     assert tickets[0].mode_kor == "수동"
+
+
+def test_ticket_stores_numbers_as_mask_only():
+    ticket = Lotto645Ticket('3,1,2')
+
+    assert ticket.mask == (1 << 1) | (1 << 2) | (1 << 3)
+    assert ticket.numbers == [1, 2, 3]
+    assert not hasattr(ticket, "__dict__")
+
+
+def test_from_mask_and_from_numbers_make_same_ticket():
+    ticket = Lotto645Ticket('1,2,3,4,5,45')
+
+    assert Lotto645Ticket.from_mask(ticket.mask).numbers == [1, 2, 3, 4, 5, 45]
+    assert Lotto645Ticket.from_numbers([45, 5, 4, 3, 2, 1]).mask == ticket.mask
+
+
+@pytest.mark.parametrize(
+    "mask, message",
+    [
+        (1 << 0, '각 번호는 1부터 45까지의 숫자만 사용할 수 있습니다 (입력된 값: 0).'),
+        (1 << 46, '각 번호는 1부터 45까지의 숫자만 사용할 수 있습니다 (입력된 값: 46).'),
+        (sum(1 << n for n in range(1, 8)), '숫자는 0개 이상 6개 이하의 숫자를 입력해야 합니다 (입력된 값: 1,2,3,4,5,6,7).'),
+    ],
+)
+def test_from_mask_failed_with_invalid_mask(mask, message):
+    with pytest.raises(ValueError) as e:
+        Lotto645Ticket.from_mask(mask)
+
+    assert e.value.args[0] == message
+
+
+_BULK_ROWS = ['', None, '1,2,3', '1,2,3,4,5,6', 'a,b,c', '1,1', '0', '46', '1,2,3,4,5,6,7', '1,46,46', ' 7, 8']
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def bulk_path(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(lotto645_ticket, "_bulk_masks", lambda rows: [None] * len(rows))
+
+
+def test_create_tickets_bulk_reports_same_errors_as_constructor(bulk_path):
+    batch = Lotto645Ticket.create_tickets_bulk(_BULK_ROWS)
+
+    assert not batch.ok
+    for i, row in enumerate(_BULK_ROWS):
+        try:
+            expected = Lotto645Ticket(row)
+        except ValueError as e:
+            assert batch.tickets[i] is None
+            assert batch.errors[i] == e.args[0]
+        else:
+            assert i not in batch.errors
+            assert batch.tickets[i].mask == expected.mask
+            assert batch.tickets[i].mode == expected.mode
+
+
+def test_create_tickets_bulk_accepts_number_lists(bulk_path):
+    batch = Lotto645Ticket.create_tickets_bulk([[1, 2, 3, 4, 5, 6], [], [7], [1, 1]])
+
+    assert [t.mode if t else None for t in batch.tickets] == [Lotto645Mode.MANUAL, Lotto645Mode.AUTO, Lotto645Mode.SEMIAUTO, None]
+    assert batch.errors == {3: '중복되지 않도록 숫자들을 입력하세요 (입력된 값: 1,1).'}
+    assert len(batch.valid_tickets) == 3
+
+
+def test_create_tickets_bulk_reports_non_numbers_in_number_lists(bulk_path):
+    batch = Lotto645Ticket.create_tickets_bulk([[1, None, 3], [1, 2, 3]])
+
+    assert batch.errors == {0: "숫자를 입력하세요 (입력된 값: [1, None, 3])."}
+    assert [t.numbers for t in batch.valid_tickets] == [[1, 2, 3]]
+
+
+def test_create_tickets_bulk_with_all_valid_rows(bulk_path):
+    batch = Lotto645Ticket.create_tickets_bulk(['1,2,3,4,5,6', '', '10,20'])
+
+    assert batch.ok
+    assert [t.numbers for t in batch.tickets] == [[1, 2, 3, 4, 5, 6], [], [10, 20]]
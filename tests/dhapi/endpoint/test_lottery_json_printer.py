@@ -0,0 +1,88 @@
+import io
+import json
+import threading
+
+from dhapi.batch.profile_batch_runner import ProfileResult
+from dhapi.endpoint.lottery_json_printer import LotteryJsonPrinter
+from dhapi.endpoint.version_json_printer import VersionJsonPrinter
+from dhapi.router.dependency_factory import build_lottery_endpoint
+
+
+def _records(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_writes_one_compact_line_per_result():
+    out = io.StringIO()
+    printer = LotteryJsonPrinter("team-a", file=out)
+
+    printer.print_result_of_buy_lotto645([{"slot": "A", "mode": "자동", "numbers": ["01", "02", "03", "04", "05", "45"]}])
+    printer.print_result_of_show_balance(10000, 5000, 0, 0, 0, 3000)
+
+    lines = out.getvalue().splitlines()
+    assert lines[0] == '{"type":"buy_lotto645","profile":"team-a","slots":[{"slot":"A","mode":"자동","numbers":[1,2,3,4,5,45]}]}'
+    assert json.loads(lines[1]) == {
+        "type": "show_balance",
+        "profile": "team-a",
+        "total": 10000,
+        "available": 5000,
+        "reserved": 0,
+        "withdrawal_pending": 0,
+        "unavailable": 0,
+        "purchased_this_month": 3000,
+        "cached": False,
+        "fetched_at": None,
+    }
+
+
+def test_cached_balance_carries_fetch_time():
+    out = io.StringIO()
+    LotteryJsonPrinter("team-a", file=out).print_result_of_show_balance(1, 2, 3, 4, 5, 6, fetched_at=0)
+
+    record = json.loads(out.getvalue())
+    assert record["cached"] is True
+    assert record["fetched_at"] == "1970-01-01T00:00:00+00:00"
+
+
+def test_json_output_of_several_profiles_parses_line_by_line(capsys):
+    for output in ["json", "ndjson"]:
+        build_lottery_endpoint("team-a", output).print_result_of_assign_virtual_account("농협 123-456", "50,000원")
+        build_lottery_endpoint("team-b", output).print_result_of_show_balance(1, 2, 3, 4, 5, 6)
+        build_lottery_endpoint(output=output).print_result_of_profile_batch([ProfileResult("team-a"), ProfileResult("team-b")])
+
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [(r["type"], r.get("profile")) for r in records] == [("assign_virtual_account", "team-a"), ("show_balance", "team-b"), ("profile_batch", None)]
+
+
+def test_profile_batch_record():
+    out = io.StringIO()
+    LotteryJsonPrinter(file=out).print_result_of_profile_batch([ProfileResult("a"), ProfileResult("b", RuntimeError("❗ 실패"))])
+
+    assert _records(out.getvalue()) == [
+        {"type": "profile_batch", "succeeded": 1, "failed": 1, "results": [{"profile": "a", "ok": True, "error": None}, {"profile": "b", "ok": False, "error": "❗ 실패"}]}
+    ]
+
+
+def test_records_from_concurrent_profiles_are_not_interleaved():
+    out = io.StringIO()
+
+    def work(profile_name):
+        printer = LotteryJsonPrinter(profile_name, file=out)
+        for _ in range(200):
+            printer.print_result_of_show_balance(1, 2, 3, 4, 5, 6)
+
+    threads = [threading.Thread(target=work, args=(f"p{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    records = _records(out.getvalue())
+    assert len(records) == 800
+    assert {r["profile"] for r in records} == {"p0", "p1", "p2", "p3"}
+
+
+def test_version_record(capsys):
+    VersionJsonPrinter().print_version("1.2.3")
+
+    assert capsys.readouterr().out == '{"type":"version","version":"1.2.3"}\n'
@@ -0,0 +1,168 @@
+import asyncio
+
+import pytest
+
+from dhapi.domain.deposit import Deposit
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+from dhapi.domain.user import User
+from dhapi.port.lottery_client import LotteryClient
+from dhapi.port.lottery_client_options import LotteryClientOptions
+from dhapi.port.lottery_errors import AuthError, MaintenanceError, TransientError
+from dhapi.port.purchase_journal import PurchaseJournal
+from dhapi.port.resilience import CircuitBreaker, RetryPolicy
+from dhapi.trace.tracer import Tracer
+from tests.support.lottery_standin import ROUND_ON_SALE, LotteryStandinServer, StandinConfig
+
+pytest.importorskip("httpx")
+
+from dhapi.port.async_lottery_client import AsyncLotteryClient  # noqa: E402 pylint: disable=wrong-import-position
+
+
+class RecordingEndpoint:
+    def __init__(self):
+        self.calls = []
+
+    def print_result_of_buy_lotto645(self, slots):
+        self.calls.append(("buy_lotto645", slots))
+
+    def print_result_of_show_balance(self, *args):
+        self.calls.append(("show_balance", args))
+
+    def print_result_of_assign_virtual_account(self, *args):
+        self.calls.append(("assign_virtual_account", args))
+
+
+@pytest.fixture
+def server():
+    with LotteryStandinServer(StandinConfig(accounts={"tester": "secret"}, seed=0)) as s:
+        yield s
+
+
+def _run(server, endpoint, call, password="secret", **kwargs):
+    async def main():
+        async with AsyncLotteryClient(User("tester", password), endpoint, LotteryClientOptions(urls=server.urls(), **kwargs)) as client:
+            await client.login()
+            return await call(client)
+
+    return asyncio.run(main())
+
+
+def test_get_round(server):
+    assert _run(server, RecordingEndpoint(), lambda client: client.get_round()) == ROUND_ON_SALE
+
+
+def test_show_balance(server):
+    endpoint = RecordingEndpoint()
+    _run(server, endpoint, lambda client: client.show_balance())
+
+    assert endpoint.calls == [("show_balance", (55000, 50000, 3000, 2000, 5000, 12000))]
+
+
+def test_buy_lotto645(server):
+    endpoint = RecordingEndpoint()
+    _run(server, endpoint, lambda client: client.buy_lotto645([Lotto645Ticket("1,2,3,4,5,6"), Lotto645Ticket("7,8")]))
+
+    [(name, slots)] = endpoint.calls
+    assert name == "buy_lotto645"
+    assert slots[0] == {"mode": "수동", "slot": "A", "numbers": ["01", "02", "03", "04", "05", "06"]}
+    assert slots[1]["mode"] == "반자동"
+    assert {"07", "08"} <= set(slots[1]["numbers"])
+    assert server.purchased_amount("tester") == 2000
+
+
+def test_assign_virtual_account(server):
+    endpoint = RecordingEndpoint()
+    _run(server, endpoint, lambda client: client.assign_virtual_account(Deposit(50000)))
+
+    assert endpoint.calls == [("assign_virtual_account", ("케이뱅크 70012345678901", "50,000원"))]
+
+
+def test_login_failure(server):
+    with pytest.raises(AuthError, match="로그인에 실패했습니다"):
+        _run(server, RecordingEndpoint(), lambda client: client.get_round(), password="wrong")
+
+
+def test_idempotent_request_is_retried_until_it_succeeds():
+    tracer = Tracer()
+    with LotteryStandinServer(StandinConfig(seed=3)) as s:
+
+        async def show_balance(client):
+            s.config.error_rate = 0.5
+            await client.show_balance()
+
+        _run(s, RecordingEndpoint(), show_balance, tracer=tracer, retry_policy=RetryPolicy(max_attempts=20, base_delay_seconds=0))
+
+    attempts = [span.attributes.get("attempt", 1) for span in tracer.spans if span.name == "http.cash_balance"]
+    assert attempts == list(range(1, len(attempts) + 1))
+    assert [span.attributes["status"] for span in tracer.spans if span.name == "http.cash_balance"][-1] == 200
+
+
+def test_post_is_not_retried():
+    tracer = Tracer()
+    with LotteryStandinServer(StandinConfig(seed=0)) as s:
+
+        async def assign_virtual_account(client):
+            s.config.error_rate = 1
+            await client.assign_virtual_account(Deposit(5000))
+
+        with pytest.raises(TransientError, match="가상계좌를 할당하지 못했습니다"):
+            _run(s, RecordingEndpoint(), assign_virtual_account, tracer=tracer, retry_policy=RetryPolicy(max_attempts=5, base_delay_seconds=0))
+
+    assert [span.name for span in tracer.spans].count("http.assign_virtual_account_init") == 1
+
+
+def test_maintenance_pauses_every_client_sharing_the_breaker():
+    breaker = CircuitBreaker(maintenance_cooldown_seconds=60)
+    with LotteryStandinServer(StandinConfig(under_maintenance=True)) as s:
+        with pytest.raises(MaintenanceError):
+            _run(s, RecordingEndpoint(), lambda client: client.get_round(), circuit_breaker=breaker)
+        assert breaker.is_open
+
+        # 점검이 끝나길 기다리지 않도록 대기 시간을 0 으로 두면 요청을 보내지 않고 바로 실패
+        tracer = Tracer()
+        with pytest.raises(MaintenanceError, match="시스템 점검중"):
+            _run(s, RecordingEndpoint(), lambda client: client.get_round(), tracer=tracer, retry_policy=RetryPolicy(max_pause_seconds=0), circuit_breaker=breaker)
+    assert not [span for span in tracer.spans if span.name.startswith("http.")]
+
+
+def test_rejects_options_only_the_sync_client_supports(tmp_path):
+    options = LotteryClientOptions(purchase_journal=PurchaseJournal(str(tmp_path / "journal.sqlite3")).for_profile("default"))
+    with pytest.raises(ValueError, match="purchase_journal"):
+        AsyncLotteryClient(User("tester", "secret"), RecordingEndpoint(), options)
+
+
+_ROUTES = [
+    "GET /gameResult.do?method=byWin",
+    "POST /userSsl.do?method=login",
+    "GET /common.do?method=main",
+    "GET /userSsl.do?method=myPage",
+    "POST /olotto/game/egovUserReadySocket.json",
+    "POST /olotto/game/execBuy.do",
+    "POST /nicePay.do?method=nicePayInit",
+    "POST /nicePay.do?method=nicePayProcess",
+]
+
+
+def test_behaves_like_the_sync_client():
+    tickets = [Lotto645Ticket("1,2,3,4,5,6"), Lotto645Ticket("7,8"), Lotto645Ticket()]
+
+    sync_endpoint = RecordingEndpoint()
+    with LotteryStandinServer(StandinConfig(accounts={"tester": "secret"}, seed=0)) as s:
+        client = LotteryClient(User("tester", "secret"), sync_endpoint, LotteryClientOptions(urls=s.urls()))
+        client.show_balance()
+        client.buy_lotto645(tickets)
+        client.assign_virtual_account(Deposit(5000))
+        sync_counts = [s.request_count(route) for route in _ROUTES]
+
+    async def run(client):
+        await client.show_balance()
+        await client.buy_lotto645(tickets)
+        await client.assign_virtual_account(Deposit(5000))
+
+    async_endpoint = RecordingEndpoint()
+    with LotteryStandinServer(StandinConfig(accounts={"tester": "secret"}, seed=0)) as s:
+        _run(s, async_endpoint, run)
+        async_counts = [s.request_count(route) for route in _ROUTES]
+
+    assert async_endpoint.calls == sync_endpoint.calls
+    assert async_counts == sync_counts
@@ -0,0 +1,89 @@
+import multiprocessing
+
+from dhapi.port.balance_cache import BalanceCache
+
+BALANCE = (10000, 5000, 0, 0, 0, 3000)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_returns_value_within_ttl(tmp_path):
+    clock = FakeClock()
+    cache = BalanceCache(str(tmp_path / "balances.json"), ttl_seconds=60, clock=clock)
+
+    assert cache.get("tester") is None
+    cache.put("tester", BALANCE)
+
+    clock.now += 59
+    cached = cache.get("tester")
+    assert cached.values == BALANCE
+    assert cached.fetched_at == 1000.0
+
+    clock.now += 1
+    assert cache.get("tester") is None
+
+
+def test_is_shared_across_instances(tmp_path):
+    path = str(tmp_path / "balances.json")
+    clock = FakeClock()
+    BalanceCache(path, clock=clock).put("a", BALANCE)
+    BalanceCache(path, clock=clock).put("b", (1, 2, 3, 4, 5, 6))
+
+    found = BalanceCache(path, clock=clock).get_many(["a", "b", "c"])
+    assert {username: cached.values for username, cached in found.items()} == {"a": BALANCE, "b": (1, 2, 3, 4, 5, 6)}
+
+
+def _put_many(path, prefix):
+    cache = BalanceCache(path)
+    for i in range(20):
+        cache.put(f"{prefix}{i}", BALANCE)
+
+
+def test_concurrent_processes_do_not_drop_each_others_entries(tmp_path):
+    path = str(tmp_path / "balances.json")
+    processes = [multiprocessing.get_context("fork").Process(target=_put_many, args=(path, prefix)) for prefix in "abcd"]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    usernames = [f"{prefix}{i}" for prefix in "abcd" for i in range(20)]
+    assert set(BalanceCache(path).get_many(usernames)) == set(usernames)
+
+
+def test_invalidate(tmp_path):
+    path = str(tmp_path / "balances.json")
+    cache = BalanceCache(path)
+    cache.put("a", BALANCE)
+    cache.put("b", BALANCE)
+
+    # 다른 프로세스에서 지운 경우도 반영됨
+    BalanceCache(path).invalidate("a")
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    cache.invalidate("missing")
+
+
+def test_zero_ttl_disables_cache(tmp_path):
+    cache = BalanceCache(str(tmp_path / "balances.json"), ttl_seconds=0)
+    cache.put("a", BALANCE)
+
+    assert cache.get("a") is None
+    assert not (tmp_path / "balances.json").exists()
+
+
+def test_ignores_unreadable_file(tmp_path):
+    path = tmp_path / "balances.json"
+    path.write_text("{not json", encoding="UTF-8")
+    cache = BalanceCache(str(path))
+
+    assert cache.get("a") is None
+    cache.put("a", BALANCE)
+    assert cache.get("a").values == BALANCE
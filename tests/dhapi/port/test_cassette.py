@@ -0,0 +1,105 @@
+import pytest
+
+from tests.support.lottery_standin import LotteryStandinServer, StandinConfig
+from dhapi.domain.deposit import Deposit
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+from dhapi.domain.user import User
+from dhapi.port.cassette import Cassette, CassetteMissError, CassetteTransport, RecordingAdapter, ReplayAdapter
+from dhapi.port.lottery_client import LotteryClient
+from dhapi.port.lottery_client_options import LotteryClientOptions
+
+
+class RecordingEndpoint:
+    def __init__(self):
+        self.calls = []
+
+    def print_result_of_buy_lotto645(self, slots):
+        self.calls.append(("buy_lotto645", slots))
+
+    def print_result_of_show_balance(self, *args, fetched_at=None):
+        self.calls.append(("show_balance", args))
+
+    def print_result_of_assign_virtual_account(self, *args):
+        self.calls.append(("assign_virtual_account", args))
+
+
+def _run_commands(client):
+    client.show_balance()
+    client.assign_virtual_account(Deposit(50000))
+    client.buy_lotto645([Lotto645Ticket("1,2,3,4,5,6")])
+
+
+@pytest.fixture(name="recorded")
+def fixture_recorded(tmp_path):
+    """
+    :return: (기록한 파일 경로, 기록할 때 받은 결과, stand-in 서버 주소). 서버는 이미 종료된 상태
+    """
+    cassette = Cassette()
+    endpoint = RecordingEndpoint()
+    with LotteryStandinServer(StandinConfig(accounts={"tester": "secret-pw"}, seed=0)) as server:
+        urls = server.urls()
+        adapter = RecordingAdapter(cassette, secrets=["tester", "secret-pw"])
+        _run_commands(LotteryClient(User("tester", "secret-pw"), endpoint, LotteryClientOptions(urls=urls, transport_adapter=adapter)))
+
+    path = tmp_path / "cassette.json"
+    cassette.save(str(path))
+    return path, endpoint.calls, urls
+
+
+def test_redacts_credentials_and_cookies(recorded):
+    path, _, _ = recorded
+    text = path.read_text(encoding="UTF-8")
+
+    assert "secret-pw" not in text
+    assert "tester" not in text
+    assert "userId=REDACTED&password=REDACTED" in text
+    for interaction in Cassette.load(str(path)).interactions:
+        assert all(value == "REDACTED" for _, value in interaction["response"]["cookies"])
+        assert "Set-Cookie" not in interaction["response"]["headers"]
+
+
+def test_replays_without_network(recorded):
+    path, recorded_calls, urls = recorded
+    endpoint = RecordingEndpoint()
+
+    adapter = ReplayAdapter(Cassette.load(str(path)))
+    _run_commands(LotteryClient(User("someone", "else"), endpoint, LotteryClientOptions(urls=urls, transport_adapter=adapter)))
+
+    assert endpoint.calls == recorded_calls
+
+
+def test_raises_on_unrecorded_request(recorded):
+    path, _, urls = recorded
+    client = LotteryClient(User("tester", "pw"), RecordingEndpoint(), LotteryClientOptions(urls=urls, transport_adapter=ReplayAdapter(Cassette.load(str(path)))))
+    client.show_balance()
+
+    with pytest.raises(RuntimeError):
+        client.show_balance()
+    with pytest.raises(CassetteMissError):
+        client._session.get(urls.draw_result)  # pylint: disable=protected-access
+
+
+def test_loop_replays_from_start(recorded):
+    path, recorded_calls, urls = recorded
+    endpoint = RecordingEndpoint()
+    adapter = ReplayAdapter(Cassette.load(str(path)), loop=True)
+
+    for _ in range(3):
+        _run_commands(LotteryClient(User("tester", "pw"), endpoint, LotteryClientOptions(urls=urls, transport_adapter=adapter)))
+
+    assert endpoint.calls == recorded_calls * 3
+
+
+def test_transport_rejects_record_with_replay(tmp_path):
+    with pytest.raises(RuntimeError):
+        CassetteTransport(str(tmp_path / "a.json"), str(tmp_path / "b.json"))
+
+
+def test_load_rejects_unknown_file(tmp_path):
+    path = tmp_path / "cassette.json"
+    path.write_text('{"interactions": []}', encoding="UTF-8")
+
+    with pytest.raises(RuntimeError):
+        Cassette.load(str(path))
+    with pytest.raises(RuntimeError):
+        Cassette.load(str(tmp_path / "missing.json"))
@@ -0,0 +1,104 @@
+import os
+
+import pytest
+import tomli
+
+from dhapi.port import credentials_store
+from dhapi.port.credentials_provider import CredentialsProvider
+from dhapi.port.credentials_store import CredentialsStore
+
+CREDENTIALS = """
+[default]
+username = "user"
+password = "pw"
+
+[team-a]
+username = "a"
+password = "pa"
+"""
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "credentials"
+    path.write_text(CREDENTIALS, encoding="UTF-8")
+    return str(path)
+
+
+@pytest.fixture
+def parse_count(monkeypatch):
+    count = []
+    loads = tomli.loads
+    monkeypatch.setattr(credentials_store.tomli, "loads", lambda s: count.append(1) or loads(s))
+    return count
+
+
+def test_parses_file_once_while_unchanged(path, parse_count):
+    store = CredentialsStore(path)
+
+    for _ in range(100):
+        store.get("team-a")
+    store.profile_names()
+    list(store)
+
+    assert len(parse_count) == 1
+
+
+def test_reloads_when_file_changes(path, parse_count):
+    store = CredentialsStore(path)
+    assert store.profile_names() == ["default", "team-a"]
+
+    with open(path, "a", encoding="UTF-8") as f:
+        f.write('\n[team-b]\nusername = "b"\npassword = "pb"\n')
+
+    assert store.profile_names() == ["default", "team-a", "team-b"]
+    assert len(parse_count) == 2
+
+
+def test_put_keeps_other_profiles_and_replaces_file(path):
+    store = CredentialsStore(path)
+
+    store.put("team-a", "a2", "pa2")
+    store.put("team-c", "c", "pc")
+
+    with open(path, "rb") as f:
+        saved = tomli.load(f)
+    assert saved == {"default": {"username": "user", "password": "pw"}, "team-a": {"username": "a2", "password": "pa2"}, "team-c": {"username": "c", "password": "pc"}}
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.startswith(".credentials.")]
+
+
+def test_put_creates_missing_file(tmp_path):
+    store = CredentialsStore(str(tmp_path / "new" / "credentials"))
+    assert not store.exists()
+
+    store.put("default", "user", "pw")
+
+    assert store.get("default") == {"username": "user", "password": "pw"}
+
+
+def test_missing_file_raises(tmp_path):
+    store = CredentialsStore(str(tmp_path / "credentials"))
+
+    with pytest.raises(FileNotFoundError):
+        store.profile_names()
+
+
+def test_default_instance_is_shared_per_path(path):
+    assert CredentialsStore.default(path) is CredentialsStore.default(path)
+
+
+def test_credentials_provider_reads_from_store(path):
+    store = CredentialsStore(path)
+
+    user = CredentialsProvider("team-a", store=store).get_user()
+
+    assert (user.username, user.password) == ("a", "pa")
+
+
+def test_match_profile_names_uses_home_credentials(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    os.makedirs(tmp_path / ".dhapi")
+    (tmp_path / ".dhapi" / "credentials").write_text(CREDENTIALS, encoding="UTF-8")
+
+    assert CredentialsProvider.match_profile_names(["team-*", "default"]) == ["team-a", "default"]
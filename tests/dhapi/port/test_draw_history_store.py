@@ -0,0 +1,59 @@
+import os
+
+from dhapi.domain.lotto645_draw import Lotto645Draw
+from dhapi.port.draw_history_store import RECORD_SIZE, DrawHistoryStore
+
+
+def _draw(round_no):
+    return Lotto645Draw(round_no, [1, 2, 3, 4, 5, round_no % 39 + 6], 45)
+
+
+def test_empty_store(tmp_path):
+    store = DrawHistoryStore(str(tmp_path / "draws.bin"))
+
+    assert store.get(1) is None
+    assert store.stored_rounds() == []
+    assert store.missing_rounds(3) == [1, 2, 3]
+    assert store.read_draws() == []
+
+
+def test_put_and_get(tmp_path):
+    store = DrawHistoryStore(str(tmp_path / "draws.bin"))
+
+    store.put_many([_draw(3), _draw(1)])
+
+    assert store.get(1) == _draw(1)
+    assert store.get(2) is None
+    assert store.get(3) == _draw(3)
+    assert store.get(4) is None
+    assert store.stored_rounds() == [1, 3]
+    assert store.missing_rounds(5) == [2, 4, 5]
+
+
+def test_records_are_fixed_width_and_indexed_by_round(tmp_path):
+    path = tmp_path / "draws.bin"
+    store = DrawHistoryStore(str(path))
+
+    store.put_many([_draw(10)])
+    store.put_many([_draw(2)])
+
+    assert os.path.getsize(path) == 10 * RECORD_SIZE
+    data = path.read_bytes()
+    assert data[RECORD_SIZE : 2 * RECORD_SIZE] == bytes([1, 2, 3, 4, 5, 8, 45, 1])
+    assert data[2 * RECORD_SIZE : 9 * RECORD_SIZE] == bytes(7 * RECORD_SIZE)
+
+
+def test_read_draws_in_round_order(tmp_path):
+    store = DrawHistoryStore(str(tmp_path / "draws.bin"))
+    store.put_many([_draw(n) for n in [5, 1, 3]])
+
+    assert [d.round_no for d in store.read_draws()] == [1, 3, 5]
+
+
+def test_overwrite_existing_round(tmp_path):
+    store = DrawHistoryStore(str(tmp_path / "draws.bin"))
+    store.put_many([_draw(1)])
+
+    store.put_many([Lotto645Draw(1, [10, 20, 30, 40, 41, 42], 43)])
+
+    assert store.get(1).numbers == [10, 20, 30, 40, 41, 42]
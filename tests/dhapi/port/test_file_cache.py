@@ -0,0 +1,47 @@
+import os
+import stat
+
+import pytest
+
+from dhapi.port.file_cache import atomic_write, file_signature
+
+
+def test_atomic_write_replaces_file(tmp_path):
+    path = tmp_path / "nested" / "data.json"
+
+    with atomic_write(str(path)) as f:
+        f.write("첫 번째")
+    with atomic_write(str(path)) as f:
+        f.write("두 번째")
+
+    assert path.read_text(encoding="UTF-8") == "두 번째"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert os.listdir(path.parent) == ["data.json"]
+
+
+def test_atomic_write_keeps_file_and_removes_temp_file_on_error(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"before")
+
+    with pytest.raises(ValueError):
+        with atomic_write(str(path), binary=True) as f:
+            f.write(b"half")
+            raise ValueError("boom")
+
+    assert path.read_bytes() == b"before"
+    assert os.listdir(tmp_path) == ["data.bin"]
+
+
+def test_file_signature_changes_when_file_is_rewritten(tmp_path):
+    path = tmp_path / "data.json"
+    with atomic_write(str(path)) as f:
+        f.write("a")
+    before = file_signature(str(path))
+
+    assert file_signature(str(path)) == before
+    with atomic_write(str(path)) as f:
+        f.write("ab")
+    assert file_signature(str(path)) != before
+
+    with pytest.raises(FileNotFoundError):
+        file_signature(str(tmp_path / "missing.json"))
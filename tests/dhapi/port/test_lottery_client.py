@@ -0,0 +1,344 @@
+import pytest
+
+from tests.support.lottery_standin import ROUND_ON_SALE, LotteryStandinServer, StandinConfig, draw_numbers
+from dhapi.domain.deposit import Deposit
+from dhapi.domain.lotto645_draw import Lotto645Draw
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+from dhapi.domain.user import User
+from dhapi.port.balance_cache import BalanceCache
+from dhapi.port.draw_history_store import DrawHistoryStore
+from dhapi.port import lottery_site
+from dhapi.port.lottery_client import LotteryClient
+from dhapi.port.lottery_client_options import LotteryClientOptions
+from dhapi.port.lottery_errors import MaintenanceError, TransientError
+from dhapi.port.purchase_journal import PurchaseJournal, PurchaseState
+from dhapi.port.purchase_ledger import PurchaseLedger
+from dhapi.port.resilience import CircuitBreaker, RetryPolicy
+from dhapi.trace.tracer import Tracer
+
+
+class RecordingEndpoint:
+    def __init__(self):
+        self.calls = []
+
+    def print_result_of_buy_lotto645(self, slots):
+        self.calls.append(("buy_lotto645", slots))
+
+    def print_result_of_show_balance(self, *args, fetched_at=None):
+        self.calls.append(("show_balance", args))
+
+    def print_result_of_assign_virtual_account(self, *args):
+        self.calls.append(("assign_virtual_account", args))
+
+    def print_result_of_sync_lotto645_draws(self, *args):
+        self.calls.append(("sync_lotto645_draws", args))
+
+
+@pytest.fixture
+def server():
+    with LotteryStandinServer(StandinConfig(accounts={"tester": "secret"}, seed=0)) as s:
+        yield s
+
+
+def _client(server, endpoint, password="secret", tracer=None):
+    return LotteryClient(User("tester", password), endpoint, LotteryClientOptions(urls=server.urls(), tracer=tracer))
+
+
+def test_show_balance(server):
+    endpoint = RecordingEndpoint()
+    _client(server, endpoint).show_balance()
+
+    assert endpoint.calls == [("show_balance", (55000, 50000, 3000, 2000, 5000, 12000))]
+
+
+def test_buy_lotto645(server):
+    endpoint = RecordingEndpoint()
+    _client(server, endpoint).buy_lotto645([Lotto645Ticket("1,2,3,4,5,6"), Lotto645Ticket("7,8")])
+
+    [(name, slots)] = endpoint.calls
+    assert name == "buy_lotto645"
+    assert slots[0] == {"mode": "수동", "slot": "A", "numbers": ["01", "02", "03", "04", "05", "06"]}
+    assert slots[1]["mode"] == "반자동"
+    assert {"07", "08"} <= set(slots[1]["numbers"])
+    assert server.request_count("POST /olotto/game/egovUserReadySocket.json") == 1
+    assert server.request_count("GET /common.do?method=main") == 1
+
+
+def test_buy_lotto645_records_purchase(server, tmp_path):
+    ledger = PurchaseLedger(str(tmp_path / "ledger.sqlite3"))
+    endpoint = RecordingEndpoint()
+    client = LotteryClient(User("tester", "secret"), endpoint, LotteryClientOptions(urls=server.urls(), purchase_recorder=ledger.recorder("default")))
+
+    client.buy_lotto645([Lotto645Ticket("1,2,3,4,5,6"), Lotto645Ticket()])
+
+    [(_, slots)] = endpoint.calls
+    purchases = ledger.find_lotto645_purchases(round_no=ROUND_ON_SALE, profile_name="default")
+    assert [(p.slot, p.mode, p.numbers) for p in purchases] == [(s["slot"], s["mode"], [int(n) for n in s["numbers"]]) for s in slots]
+
+
+def test_assign_virtual_account(server):
+    endpoint = RecordingEndpoint()
+    _client(server, endpoint).assign_virtual_account(Deposit(50000))
+
+    assert endpoint.calls == [("assign_virtual_account", ("케이뱅크 70012345678901", "50,000원"))]
+
+
+def test_get_lotto645_draws_skips_rounds_not_drawn_yet(server):
+    draws = _client(server, RecordingEndpoint()).get_lotto645_draws([1, ROUND_ON_SALE - 1, ROUND_ON_SALE])
+
+    assert [d.round_no for d in draws] == [1, ROUND_ON_SALE - 1]
+    assert (draws[0].numbers, draws[0].bonus) == draw_numbers(1)
+
+
+def test_sync_lotto645_draws_fetches_only_missing_rounds(server, tmp_path):
+    latest = ROUND_ON_SALE - 1
+    store = DrawHistoryStore(str(tmp_path / "draws.bin"))
+    store.put_many([Lotto645Draw(n, *draw_numbers(n)) for n in range(1, latest + 1) if n not in (3, latest - 1, latest)])
+    endpoint = RecordingEndpoint()
+    client = _client(server, endpoint)
+
+    client.sync_lotto645_draws(store, max_workers=2, chunk_size=2)
+    client.sync_lotto645_draws(store, max_workers=2, chunk_size=2)
+
+    assert server.request_count("GET /common.do?method=getLottoNumber") == 3
+    assert store.stored_rounds() == list(range(1, latest + 1))
+    assert (store.get(3).numbers, store.get(3).bonus) == draw_numbers(3)
+    assert endpoint.calls[0] == ("sync_lotto645_draws", (3, latest, store.get(latest)))
+    assert endpoint.calls[1] == ("sync_lotto645_draws", (0, latest, store.get(latest)))
+
+
+def test_login_failure(server):
+    with pytest.raises(RuntimeError, match="로그인에 실패했습니다"):
+        _client(server, RecordingEndpoint(), password="wrong")
+
+
+def test_under_maintenance():
+    with LotteryStandinServer(StandinConfig(under_maintenance=True)) as s:
+        with pytest.raises(RuntimeError, match="시스템 점검중"):
+            _client(s, RecordingEndpoint())
+
+
+def test_server_error_is_reported_as_failure():
+    with LotteryStandinServer(StandinConfig(seed=0)) as s:
+        client = _client(s, RecordingEndpoint())
+        s.config.error_rate = 1
+
+        with pytest.raises(RuntimeError, match="예치금 현황을 조회하지 못했습니다"):
+            client.show_balance()
+        with pytest.raises(RuntimeError, match="알 수 없는 오류"):
+            client.buy_lotto645([Lotto645Ticket()])
+
+
+def test_trace_covers_every_phase(server):
+    tracer = Tracer()
+    _client(server, RecordingEndpoint(), tracer=tracer).buy_lotto645([Lotto645Ticket()])
+
+    spans = {span.name: span for span in tracer.spans}
+    assert set(spans) == {
+        "op.login",
+        "http.default_session",
+        "http.login",
+        "extract.is_login_failed",
+        "op.buy_lotto645",
+        "http.ready_socket",
+        "http.round_info",
+        "extract.parse_round",
+        "http.exec_buy",
+    }
+    assert spans["http.exec_buy"].attributes["status"] == 200
+    assert spans["http.exec_buy"].attributes["host"] == "127.0.0.1"
+    assert spans["http.exec_buy"].attributes["bytes"] > 0
+    assert spans["op.buy_lotto645"].attributes["tickets"] == 1
+
+
+def test_idempotent_request_is_retried_until_it_succeeds():
+    with LotteryStandinServer(StandinConfig(seed=3)) as s:
+        tracer = Tracer()
+        client = LotteryClient(User("tester", "secret"), RecordingEndpoint(), LotteryClientOptions(urls=s.urls(), tracer=tracer, retry_policy=RetryPolicy(max_attempts=20, base_delay_seconds=0)))
+        s.config.error_rate = 0.5
+
+        client.show_balance()
+
+    attempts = [span.attributes.get("attempt", 1) for span in tracer.spans if span.name == "http.cash_balance"]
+    assert attempts == list(range(1, len(attempts) + 1))
+    assert [span.attributes["status"] for span in tracer.spans if span.name == "http.cash_balance"][-1] == 200
+
+
+def test_post_is_not_retried():
+    with LotteryStandinServer(StandinConfig(seed=0)) as s:
+        tracer = Tracer()
+        client = LotteryClient(User("tester", "secret"), RecordingEndpoint(), LotteryClientOptions(urls=s.urls(), tracer=tracer, retry_policy=RetryPolicy(max_attempts=5, base_delay_seconds=0)))
+        s.config.error_rate = 1
+
+        with pytest.raises(TransientError, match="가상계좌를 할당하지 못했습니다"):
+            client.assign_virtual_account(Deposit(5000))
+
+    assert [span.name for span in tracer.spans].count("http.assign_virtual_account_init") == 1
+
+
+def test_maintenance_pauses_every_client_sharing_the_breaker():
+    breaker = CircuitBreaker(maintenance_cooldown_seconds=60)
+    with LotteryStandinServer(StandinConfig(under_maintenance=True)) as s:
+        with pytest.raises(MaintenanceError):
+            LotteryClient(User("tester", "secret"), RecordingEndpoint(), LotteryClientOptions(urls=s.urls(), circuit_breaker=breaker))
+        assert breaker.is_open
+
+        # 점검이 끝나길 기다리지 않도록 대기 시간을 0 으로 두면 요청을 보내지 않고 바로 실패
+        tracer = Tracer()
+        with pytest.raises(MaintenanceError, match="시스템 점검중"):
+            LotteryClient(User("tester", "secret"), RecordingEndpoint(), LotteryClientOptions(urls=s.urls(), tracer=tracer, retry_policy=RetryPolicy(max_pause_seconds=0), circuit_breaker=breaker))
+    assert not [span for span in tracer.spans if span.name.startswith("http.")]
+
+
+def test_show_balance_uses_cache_until_purchase(server, tmp_path):
+    endpoint = RecordingEndpoint()
+    client = LotteryClient(User("tester", "secret"), endpoint, LotteryClientOptions(urls=server.urls(), balance_cache=BalanceCache(str(tmp_path / "balances.json"))))
+
+    client.show_balance()
+    client.show_balance()
+    assert server.request_count("GET /userSsl.do?method=myPage") == 1
+    assert endpoint.calls[0] == endpoint.calls[1]
+
+    client.show_balance(fresh=True)
+    assert server.request_count("GET /userSsl.do?method=myPage") == 2
+
+    client.buy_lotto645([Lotto645Ticket()])
+    client.show_balance()
+    assert server.request_count("GET /userSsl.do?method=myPage") == 3
+
+
+def _journaled_client(server, endpoint, journal, retry_policy=None):
+    return LotteryClient(User("tester", "secret"), endpoint, LotteryClientOptions(urls=server.urls(), purchase_journal=journal.for_profile("default"), retry_policy=retry_policy))
+
+
+def test_journal_confirms_purchase(tmp_path, server):
+    journal = PurchaseJournal(str(tmp_path / "journal.sqlite3"))
+    _journaled_client(server, RecordingEndpoint(), journal).buy_lotto645([Lotto645Ticket()] * 2)
+
+    [intent] = journal.find_intents()
+    assert (intent.round_no, intent.amount, intent.baseline, intent.state) == (ROUND_ON_SALE, 2000, 12000, PurchaseState.CONFIRMED)
+
+
+def test_each_purchase_records_its_own_baseline(tmp_path, server):
+    journal = PurchaseJournal(str(tmp_path / "journal.sqlite3"))
+    client = _journaled_client(server, RecordingEndpoint(), journal)
+    client.buy_lotto645([Lotto645Ticket("1,2,3,4,5,6")])
+    client.buy_lotto645([Lotto645Ticket("7,8,9,10,11,12")] * 2)
+
+    assert [(intent.amount, intent.baseline) for intent in journal.find_intents()] == [(1000, 12000), (2000, 13000)]
+
+
+def test_lost_response_is_reconciled_without_buying_again(tmp_path):
+    journal = PurchaseJournal(str(tmp_path / "journal.sqlite3"))
+    endpoint = RecordingEndpoint()
+    with LotteryStandinServer(StandinConfig(accounts={"tester": "secret"}, seed=0, dropped_exec_buys=1)) as s:
+        client = _journaled_client(s, endpoint, journal, RetryPolicy(base_delay_seconds=0))
+        client.buy_lotto645([Lotto645Ticket("1,2,3,4,5,6"), Lotto645Ticket()])
+
+        assert s.request_count("POST /olotto/game/execBuy.do") == 1
+        assert s.purchased_amount("tester") == 2000
+
+    assert endpoint.calls == [("buy_lotto645", [{"mode": "수동", "slot": "A", "numbers": ["01", "02", "03", "04", "05", "06"]}, {"mode": "자동", "slot": "B", "numbers": []}])]
+    assert [intent.state for intent in journal.find_intents()] == [PurchaseState.CONFIRMED]
+
+
+def test_lost_response_purchase_is_recorded_in_ledger(tmp_path):
+    journal = PurchaseJournal(str(tmp_path / "journal.sqlite3"))
+    ledger = PurchaseLedger(str(tmp_path / "ledger.sqlite3"))
+    with LotteryStandinServer(StandinConfig(accounts={"tester": "secret"}, seed=0, dropped_exec_buys=1)) as s:
+        options = LotteryClientOptions(
+            urls=s.urls(), purchase_recorder=ledger.recorder("default"), purchase_journal=journal.for_profile("default"), retry_policy=RetryPolicy(base_delay_seconds=0)
+        )
+        client = LotteryClient(User("tester", "secret"), RecordingEndpoint(), options)
+        client.buy_lotto645([Lotto645Ticket("1,2,3,4,5,6"), Lotto645Ticket()])
+
+    # 자동으로 고른 번호는 응답을 받지 못해 알 수 없으므로 비어 있음
+    purchases = ledger.find_lotto645_purchases(round_no=ROUND_ON_SALE, profile_name="default")
+    assert [(p.slot, p.mode, p.numbers) for p in purchases] == [("A", "수동", [1, 2, 3, 4, 5, 6]), ("B", "자동", [])]
+
+
+def test_unprocessed_purchase_is_retried(tmp_path):
+    journal = PurchaseJournal(str(tmp_path / "journal.sqlite3"))
+    endpoint = RecordingEndpoint()
+    with LotteryStandinServer(StandinConfig(accounts={"tester": "secret"}, seed=0, dropped_exec_buys=1, process_dropped_exec_buys=False)) as s:
+        _journaled_client(s, endpoint, journal, RetryPolicy(base_delay_seconds=0)).buy_lotto645([Lotto645Ticket()])
+
+        assert s.request_count("POST /olotto/game/execBuy.do") == 2
+        assert s.purchased_amount("tester") == 1000
+
+    assert [name for name, _ in endpoint.calls] == ["buy_lotto645"]
+    assert [intent.state for intent in journal.find_intents()] == [PurchaseState.FAILED, PurchaseState.CONFIRMED]
+
+
+def test_open_intent_from_previous_run_is_reconciled_first(tmp_path, server):
+    journal = PurchaseJournal(str(tmp_path / "journal.sqlite3"))
+    tickets = [Lotto645Ticket()]
+    tickets_hash = lottery_site.hash_lotto645_param(lottery_site.make_buy_lotto645_param(tickets))
+    # 이전 실행이 구매 요청을 보낸 직후에 종료되어, 사이트의 누적 구매금액(12,000 원)에는 이미 반영된 상황
+    journal.begin("default", ROUND_ON_SALE, tickets_hash, 1000, 11000)
+
+    endpoint = RecordingEndpoint()
+    _journaled_client(server, endpoint, journal).buy_lotto645(tickets)
+
+    assert server.request_count("POST /olotto/game/execBuy.do") == 0
+    assert endpoint.calls == [("buy_lotto645", [{"mode": "자동", "slot": "A", "numbers": []}])]
+    assert [intent.state for intent in journal.find_intents()] == [PurchaseState.CONFIRMED]
+
+
+def test_ambiguous_open_intent_blocks_same_purchase(tmp_path, server):
+    journal = PurchaseJournal(str(tmp_path / "journal.sqlite3"))
+    tickets = [Lotto645Ticket()]
+    tickets_hash = lottery_site.hash_lotto645_param(lottery_site.make_buy_lotto645_param(tickets))
+    journal.begin("default", ROUND_ON_SALE, tickets_hash, 1000, 5000)
+
+    with pytest.raises(RuntimeError, match="확인하지 못했습니다.*dhapi journal --resolve"):
+        _journaled_client(server, RecordingEndpoint(), journal).buy_lotto645(tickets)
+
+    assert server.request_count("POST /olotto/game/execBuy.do") == 0
+    assert [intent.state for intent in journal.find_intents()] == [PurchaseState.UNKNOWN]
+
+
+def test_resolved_intent_no_longer_blocks_same_purchase(tmp_path, server):
+    journal = PurchaseJournal(str(tmp_path / "journal.sqlite3"))
+    tickets = [Lotto645Ticket()]
+    tickets_hash = lottery_site.hash_lotto645_param(lottery_site.make_buy_lotto645_param(tickets))
+    stuck = journal.begin("default", ROUND_ON_SALE, tickets_hash, 1000, None)
+    journal.mark(stuck, PurchaseState.UNKNOWN)
+
+    # 사용자가 사이트의 구매 내역을 확인하고 구매되지 않았다고 기록
+    journal.resolve(stuck.id, purchased=False)
+    _journaled_client(server, RecordingEndpoint(), journal).buy_lotto645(tickets)
+
+    assert server.request_count("POST /olotto/game/execBuy.do") == 1
+    assert [intent.state for intent in journal.find_intents()] == [PurchaseState.FAILED, PurchaseState.CONFIRMED]
+
+
+def test_purchase_that_never_connected_is_marked_failed(tmp_path, server):
+    journal = PurchaseJournal(str(tmp_path / "journal.sqlite3"))
+    tracer = Tracer()
+    urls = server.urls()
+    # 연결을 받지 않는 포트로 보내 구매 요청이 나가지 못하게 함
+    urls.buy_lotto645 = "http://127.0.0.1:1/olotto/game/execBuy.do"
+    options = LotteryClientOptions(urls=urls, tracer=tracer, retry_policy=RetryPolicy(max_attempts=2, base_delay_seconds=0), purchase_journal=journal.for_profile("default"))
+    client = LotteryClient(User("tester", "secret"), RecordingEndpoint(), options)
+
+    with pytest.raises(TransientError, match="연결하지 못했습니다"):
+        client.buy_lotto645([Lotto645Ticket()])
+
+    # 보내지 않은 것이 확실하므로 구매 여부를 확인하지 않고 FAILED 로 남겨, 같은 티켓을 막지 않음
+    assert [intent.state for intent in journal.find_intents()] == [PurchaseState.FAILED, PurchaseState.FAILED]
+    assert not [span for span in tracer.spans if span.name == "op.reconcile_lotto645"]
+
+
+def test_interrupted_purchase_is_left_for_next_run(tmp_path, server, monkeypatch):
+    journal = PurchaseJournal(str(tmp_path / "journal.sqlite3"))
+    client = _journaled_client(server, RecordingEndpoint(), journal)
+
+    def interrupt(data):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(client, "_exec_buy", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        client.buy_lotto645([Lotto645Ticket()])
+
+    assert [intent.state for intent in journal.find_intents()] == [PurchaseState.UNKNOWN]
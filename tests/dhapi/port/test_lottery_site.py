@@ -0,0 +1,75 @@
+import json
+
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+from dhapi.port import lottery_site
+
+
+def test_make_buy_lotto645_param_maps_modes_to_gen_types():
+    tickets = Lotto645Ticket.create_tickets(["", "1,2,3,4,5,6", "7,8"])
+
+    params = json.loads(lottery_site.make_buy_lotto645_param(tickets))
+
+    assert params == [
+        {"genType": "0", "arrGameChoiceNum": None, "alpabet": "A"},
+        {"genType": "1", "arrGameChoiceNum": "1,2,3,4,5,6", "alpabet": "B"},
+        {"genType": "2", "arrGameChoiceNum": "7,8", "alpabet": "C"},
+    ]
+
+
+def test_hash_lotto645_param_ignores_slot_order():
+    a = lottery_site.make_buy_lotto645_param(Lotto645Ticket.create_tickets(["", "1,2,3,4,5,6", "8,7"]))
+    b = lottery_site.make_buy_lotto645_param(Lotto645Ticket.create_tickets(["7,8", "", "6,5,4,3,2,1"]))
+    c = lottery_site.make_buy_lotto645_param(Lotto645Ticket.create_tickets(["", "1,2,3,4,5,6", "7,9"]))
+
+    assert lottery_site.hash_lotto645_param(a) == lottery_site.hash_lotto645_param(b)
+    assert lottery_site.hash_lotto645_param(a) != lottery_site.hash_lotto645_param(c)
+
+
+def test_slots_from_lotto645_param_keeps_chosen_numbers():
+    param = lottery_site.make_buy_lotto645_param(Lotto645Ticket.create_tickets(["", "1,2,3,4,5,6"]))
+
+    assert lottery_site.slots_from_lotto645_param(param) == [
+        {"mode": "자동", "slot": "A", "numbers": []},
+        {"mode": "수동", "slot": "B", "numbers": ["01", "02", "03", "04", "05", "06"]},
+    ]
+
+
+def test_format_lotto_numbers_parses_slots():
+    slots = lottery_site.format_lotto_numbers(["A|01|02|04|27|39|443", "B|11|23|25|27|28|452"])
+
+    assert slots == [
+        {"mode": "자동", "slot": "A", "numbers": ["01", "02", "04", "27", "39", "44"]},
+        {"mode": "반자동", "slot": "B", "numbers": ["11", "23", "25", "27", "28", "45"]},
+    ]
+
+
+def test_parse_lotto645_draw():
+    response = {"returnValue": "success", "drwNo": 1141, "drwNoDate": "2024-10-05", "drwtNo1": 7, "drwtNo2": 11, "drwtNo3": 25, "drwtNo4": 32, "drwtNo5": 41, "drwtNo6": 45, "bnusNo": 12}
+
+    draw = lottery_site.parse_lotto645_draw(response)
+
+    assert (draw.round_no, draw.numbers, draw.bonus) == (1141, [7, 11, 25, 32, 41, 45], 12)
+
+
+def test_parse_lotto645_draw_not_drawn_yet():
+    assert lottery_site.parse_lotto645_draw({"returnValue": "fail"}) is None
+
+
+def test_build_buy_lotto645_data_charges_1000_won_per_ticket():
+    data = lottery_site.build_buy_lotto645_data(1100, "10.0.0.1", "[]", 3)
+
+    assert data == {"round": "1100", "direct": "10.0.0.1", "nBuyAmount": "3000", "param": "[]", "gameCnt": 3}
+
+
+def test_assign_virtual_account_process_request_drops_empty_fields():
+    keys = ["PayMethod", "GoodsName", "GoodsCnt", "BuyerTel", "Moid", "MID", "UserIP", "MallIP", "MallUserID", "VbankExpDate", "BuyerEmail", "SocketYN"]
+    keys += ["GoodsCl", "EncodeParameters", "EdiDate", "EncryptData", "amt", "BuyerName", "VbankBankCode", "FxVrAccountNo"]
+    init_response = {key: key for key in keys}
+    init_response["BuyerTel"] = None
+
+    request = lottery_site.assign_virtual_account_process_request(lottery_site.LotteryUrls(), init_response)
+
+    assert request.method == "POST"
+    assert "BuyerTel" not in request.kwargs["data"]
+    assert "TrKey" not in request.kwargs["data"]
+    assert request.kwargs["data"]["Amt"] == "amt"
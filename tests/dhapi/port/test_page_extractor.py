@@ -0,0 +1,71 @@
+import pathlib
+
+import pytest
+
+from dhapi.port.page_extractor import FallbackPageExtractor, Html5libPageExtractor, PageExtractionError, RegexPageExtractor, build_page_extractor
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+
+EXTRACTORS = [Html5libPageExtractor(), RegexPageExtractor(), build_page_extractor()]
+
+
+def _page(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("extractor", EXTRACTORS)
+def test_is_login_failed(extractor):
+    assert extractor.is_login_failed(_page("login_failed.html")) is True
+    assert extractor.is_login_failed(_page("login_success.html")) is False
+
+
+@pytest.mark.parametrize("markup", ["class=btn_common", "class='lrg btn_common'"])
+def test_is_login_failed_with_unusual_markup(markup):
+    html = _page("login_failed.html").replace('class="btn_common lrg blu"', markup)
+
+    assert Html5libPageExtractor().is_login_failed(html) is True
+    assert build_page_extractor().is_login_failed(html) is True
+
+
+def test_regex_is_login_failed_defers_unrecognized_button():
+    html = _page("login_failed.html").replace('class="btn_common lrg blu"', "class=btn_common")
+
+    with pytest.raises(PageExtractionError):
+        RegexPageExtractor().is_login_failed(html)
+
+
+def test_is_login_failed_with_class_on_nested_tag():
+    html = _page("login_failed.html").replace('<a href="javascript:history.back();" class="btn_common lrg blu">확인</a>', '<a href="javascript:history.back();"><span class="btn_common">확인</span></a>')
+
+    assert build_page_extractor().is_login_failed(html) is Html5libPageExtractor().is_login_failed(html)
+
+
+@pytest.mark.parametrize("extractor", EXTRACTORS)
+def test_parse_round_returns_next_round(extractor):
+    assert extractor.parse_round(_page("main.html")) == 1142
+
+
+@pytest.mark.parametrize("extractor", EXTRACTORS)
+def test_parse_balance_with_bank_account(extractor):
+    assert extractor.parse_balance(_page("mypage_with_bank_account.html")) == (55000, 50000, 3000, 2000, 5000, 12000)
+
+
+@pytest.mark.parametrize("extractor", EXTRACTORS)
+def test_parse_balance_without_bank_account(extractor):
+    assert extractor.parse_balance(_page("mypage_without_bank_account.html")) == (7000, 7000, 0, 0, 0, 5000)
+
+
+@pytest.mark.parametrize("extractor", EXTRACTORS)
+def test_parse_virtual_account(extractor):
+    assert extractor.parse_virtual_account(_page("nicepay_process.html")) == ("케이뱅크 70012345678901", "50,000원")
+
+
+def test_regex_extractor_fails_on_unexpected_page():
+    with pytest.raises(PageExtractionError):
+        RegexPageExtractor().parse_round("<strong id='lottoDrwNo'><em>1141</em></strong>")
+
+
+def test_fallback_extractor_uses_slow_path_when_fast_path_fails():
+    extractor = FallbackPageExtractor(RegexPageExtractor(), Html5libPageExtractor)
+
+    assert extractor.parse_round("<strong id='lottoDrwNo'><em>1141</em></strong>") == 1142
@@ -0,0 +1,75 @@
+import pytest
+
+from dhapi.port.purchase_journal import PurchaseJournal, PurchaseState
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return PurchaseJournal(str(tmp_path / "journal.sqlite3"))
+
+
+def test_empty_journal(journal):
+    assert journal.find_intents() == []
+    assert journal.find_open("default", 1142, "abc") is None
+
+
+def test_begin_and_mark(journal):
+    intent = journal.begin("default", 1142, "abc", 5000, 12000)
+    assert intent.state == PurchaseState.PENDING
+    assert journal.find_open("default", 1142, "abc").id == intent.id
+
+    journal.mark(intent, PurchaseState.UNKNOWN)
+    assert journal.find_open("default", 1142, "abc").state == PurchaseState.UNKNOWN
+
+    journal.mark(intent, PurchaseState.CONFIRMED)
+    assert journal.find_open("default", 1142, "abc") is None
+    [saved] = journal.find_intents("default")
+    assert (saved.round_no, saved.amount, saved.baseline, saved.state) == (1142, 5000, 12000, PurchaseState.CONFIRMED)
+
+
+def test_allows_one_open_intent_per_purchase(journal):
+    first = journal.begin("default", 1142, "abc", 5000, 12000)
+
+    assert journal.begin("default", 1142, "abc", 5000, 12000) is None
+    # 다른 프로필, 회차, 티켓 묶음은 서로 막지 않음
+    assert journal.begin("other", 1142, "abc", 5000, 12000) is not None
+    assert journal.begin("default", 1143, "abc", 5000, 12000) is not None
+    assert journal.begin("default", 1142, "def", 5000, 12000) is not None
+
+    # 결과가 정해진 뒤에는 같은 티켓 묶음을 다시 구매할 수 있음
+    journal.mark(first, PurchaseState.CONFIRMED)
+    assert journal.begin("default", 1142, "abc", 5000, 17000) is not None
+
+
+def test_profile_journal(journal):
+    profile_journal = journal.for_profile("team-a")
+    intent = profile_journal.begin(1142, "abc", 1000, None)
+    profile_journal.mark(intent, PurchaseState.FAILED)
+
+    assert [(i.profile_name, i.baseline, i.state) for i in journal.find_intents()] == [("team-a", None, PurchaseState.FAILED)]
+    assert profile_journal.find_open(1142, "abc") is None
+
+
+def test_find_open_intents(journal):
+    journal.mark(journal.begin("default", 1142, "abc", 1000, None), PurchaseState.CONFIRMED)
+    journal.mark(journal.begin("default", 1142, "def", 1000, None), PurchaseState.UNKNOWN)
+    journal.begin("other", 1142, "abc", 1000, None)
+
+    assert [(i.profile_name, i.state) for i in journal.find_intents(open_only=True)] == [("default", PurchaseState.UNKNOWN), ("other", PurchaseState.PENDING)]
+    assert [i.tickets_hash for i in journal.find_intents("default", open_only=True)] == ["def"]
+    assert all(i.created_at is not None for i in journal.find_intents())
+
+
+def test_resolve_unblocks_same_purchase(journal):
+    intent = journal.begin("default", 1142, "abc", 1000, None)
+    journal.mark(intent, PurchaseState.UNKNOWN)
+
+    resolved = journal.resolve(intent.id, purchased=False)
+    assert (resolved.id, resolved.state) == (intent.id, PurchaseState.FAILED)
+    assert journal.find_open("default", 1142, "abc") is None
+    assert journal.begin("default", 1142, "abc", 1000, None) is not None
+
+    with pytest.raises(ValueError, match="이미 FAILED"):
+        journal.resolve(intent.id, purchased=True)
+    with pytest.raises(ValueError, match="찾지 못했습니다"):
+        journal.resolve(999, purchased=True)
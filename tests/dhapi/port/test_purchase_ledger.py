@@ -0,0 +1,82 @@
+import datetime
+import sqlite3
+import threading
+
+import pytest
+
+from dhapi.domain.lotto645_purchase import Lotto645Purchase
+from dhapi.port.purchase_ledger import PurchaseLedger
+
+SLOTS = [
+    {"mode": "자동", "slot": "A", "numbers": ["01", "02", "04", "27", "39", "44"]},
+    {"mode": "수동", "slot": "B", "numbers": ["11", "23", "25", "27", "28", "45"]},
+]
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return PurchaseLedger(str(tmp_path / "ledger.sqlite3"))
+
+
+def test_empty_ledger(ledger):
+    assert ledger.find_lotto645_purchases() == []
+    assert ledger.count_lotto645_tickets("default", 1141) == 0
+
+
+def test_recorder_appends_slots(ledger):
+    ledger.recorder("default").record_lotto645_purchase(1141, SLOTS)
+    ledger.recorder("other").record_lotto645_purchase(1142, SLOTS[:1])
+
+    purchases = ledger.find_lotto645_purchases()
+    assert [(p.profile_name, p.round_no, p.slot, p.mode, p.numbers) for p in purchases] == [
+        ("default", 1141, "A", "자동", [1, 2, 4, 27, 39, 44]),
+        ("default", 1141, "B", "수동", [11, 23, 25, 27, 28, 45]),
+        ("other", 1142, "A", "자동", [1, 2, 4, 27, 39, 44]),
+    ]
+    assert purchases[0].purchased_at.tzinfo is not None
+
+
+def test_find_by_round_and_profile(ledger):
+    ledger.recorder("default").record_lotto645_purchase(1141, SLOTS)
+    ledger.recorder("default").record_lotto645_purchase(1142, SLOTS)
+    ledger.recorder("other").record_lotto645_purchase(1141, SLOTS)
+
+    assert len(ledger.find_lotto645_purchases(round_no=1141)) == 4
+    assert len(ledger.find_lotto645_purchases(profile_name="default")) == 4
+    assert len(ledger.find_lotto645_purchases(round_no=1141, profile_name="other")) == 2
+    assert ledger.count_lotto645_tickets("default", 1142) == 2
+
+
+def test_round_trip_keeps_purchase_time(ledger):
+    purchased_at = datetime.datetime(2024, 10, 12, 19, 59, tzinfo=datetime.timezone(datetime.timedelta(hours=9)))
+    purchase = Lotto645Purchase("default", 1141, "A", "자동", [1, 2, 3, 4, 5, 6], purchased_at=purchased_at)
+
+    ledger.add([purchase])
+
+    assert ledger.find_lotto645_purchases() == [purchase]
+
+
+def test_ledger_is_append_only(ledger, tmp_path):
+    ledger.recorder("default").record_lotto645_purchase(1141, SLOTS)
+
+    with sqlite3.connect(str(tmp_path / "ledger.sqlite3")) as conn:
+        with pytest.raises(sqlite3.DatabaseError, match="append-only"):
+            conn.execute("DELETE FROM lotto645_purchases")
+        with pytest.raises(sqlite3.DatabaseError, match="append-only"):
+            conn.execute("UPDATE lotto645_purchases SET round = 1")
+
+
+def test_buffered_ledger_writes_on_flush(ledger):
+    buffered = ledger.buffered()
+
+    threads = [threading.Thread(target=buffered.recorder(f"p{i}").record_lotto645_purchase, args=(1141, SLOTS)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert ledger.find_lotto645_purchases() == []
+    buffered.flush()
+    assert len(ledger.find_lotto645_purchases(round_no=1141)) == 16
+    buffered.flush()
+    assert len(ledger.find_lotto645_purchases(round_no=1141)) == 16
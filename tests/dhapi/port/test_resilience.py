@@ -0,0 +1,136 @@
+import random
+
+import pytest
+
+from dhapi.port.lottery_errors import BusinessError, LotteryError, MaintenanceError, TransientError, reraise_with_context
+from dhapi.port.resilience import CircuitBreaker, RetryPolicy, reporting_to, wait_for_circuit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_errors_are_runtime_errors_with_context():
+    error = BusinessError("구매 한도 초과").with_context("❗ 로또6/45 구매에 실패했습니다.")
+
+    assert isinstance(error, BusinessError)
+    assert isinstance(error, RuntimeError)
+    assert str(error) == "❗ 로또6/45 구매에 실패했습니다. (사유: 구매 한도 초과)"
+    assert error.reason == "구매 한도 초과"
+    assert error.request_sent
+    assert not TransientError("연결 실패", request_sent=False).with_context("❗ 실패").request_sent
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(base_delay_seconds=0.5, max_delay_seconds=2, rng=random.Random(0))
+
+    for retry, cap in [(0, 0.5), (1, 1), (2, 2), (10, 2)]:
+        delays = [policy.backoff(retry) for _ in range(200)]
+        assert 0 <= min(delays) and max(delays) <= cap
+        assert max(delays) > cap / 2
+
+
+def test_retry_policy_rejects_non_positive_attempts():
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+def test_reraise_with_context_names_the_operation():
+    with pytest.raises(BusinessError, match=r"^❗ 구매 실패 \(사유: 한도 초과\)$"):
+        with reraise_with_context("❗ 구매 실패"):
+            raise BusinessError("한도 초과")
+    with pytest.raises(RuntimeError, match=r"^❗ 조회 실패$"):
+        with reraise_with_context("❗ 조회 실패"):
+            raise KeyError("x")
+    with pytest.raises(RuntimeError, match=r"^❗ 구매 실패 \(사유: 알 수 없는 오류\)$"):
+        with reraise_with_context("❗ 구매 실패", unknown_reason="알 수 없는 오류"):
+            raise KeyError("x")
+    # 사용자에게 보여줄 메시지를 이미 담은 RuntimeError 는 그대로 올라감
+    with pytest.raises(RuntimeError, match=r"^❗ 예치금 부족$"):
+        with reraise_with_context("❗ 구매 실패", unknown_reason="알 수 없는 오류"):
+            raise RuntimeError("❗ 예치금 부족")
+
+
+def test_retry_policy_retries_only_idempotent_requests():
+    policy = RetryPolicy(max_attempts=3)
+
+    assert policy.attempts_for("GET") == 3
+    assert policy.attempts_for("POST") == 1
+    assert policy.attempts_for("POST", idempotent=True) == 3
+    assert policy.attempts_for("GET", idempotent=False) == 1
+
+
+def test_reporting_to_tells_the_breaker_how_the_request_ended():
+    breaker = CircuitBreaker(failure_threshold=1, clock=FakeClock())
+
+    with reporting_to(breaker):
+        pass
+    assert not breaker.is_open
+
+    with pytest.raises(TransientError):
+        with reporting_to(breaker):
+            raise TransientError("x")
+    assert breaker.is_open
+
+
+def test_breaker_opens_after_consecutive_transient_failures():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, cooldown_seconds=10, clock=clock)
+
+    breaker.record_failure(TransientError("x"))
+    breaker.record_failure(TransientError("x"))
+    breaker.record_success()
+    breaker.record_failure(TransientError("x"))
+    breaker.record_failure(TransientError("x"))
+    assert not breaker.is_open
+
+    breaker.record_failure(TransientError("x"))
+    assert breaker.is_open
+    assert breaker.wait_time() == 10
+
+
+def test_breaker_lets_one_probe_through_after_cooldown():
+    clock = FakeClock()
+    breaker = CircuitBreaker(maintenance_cooldown_seconds=60, clock=clock)
+    breaker.record_failure(MaintenanceError("점검"))
+
+    clock.now = 60
+    assert breaker.wait_time() == 0
+    assert breaker.wait_time() > 0
+
+    # 먼저 보낸 요청이 실패하면 다시 열림
+    breaker.record_failure(TransientError("x"))
+    assert breaker.wait_time() == 10
+
+    clock.now = 70
+    assert breaker.wait_time() == 0
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.wait_time() == 0
+
+
+def test_wait_for_circuit_gives_up_with_open_reason():
+    clock = FakeClock()
+    breaker = CircuitBreaker(maintenance_cooldown_seconds=60, clock=clock)
+    breaker.record_failure(MaintenanceError("점검"))
+
+    with pytest.raises(MaintenanceError, match="시스템 점검중"):
+        wait_for_circuit(breaker, max_pause_seconds=30, sleep=clock.sleep)
+    assert clock.now == 0
+
+    wait_for_circuit(breaker, max_pause_seconds=60, sleep=clock.sleep)
+    assert clock.now == 60
+
+
+def test_shared_breaker_is_a_singleton():
+    assert CircuitBreaker.shared() is CircuitBreaker.shared()
+    assert isinstance(CircuitBreaker.shared().open_error(), LotteryError)
+    # 회로 차단기가 막은 요청은 보내지 않은 것이 확실함
+    assert not CircuitBreaker.shared().open_error().request_sent
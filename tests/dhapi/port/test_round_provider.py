@@ -0,0 +1,79 @@
+import datetime
+
+import pytest
+
+from dhapi.domain.lotto645_round import KST
+from dhapi.port.round_provider import RoundProvider
+
+# 수요일 낮 (1142회 판매 중)
+WEEKDAY = datetime.datetime(2024, 10, 16, 12, 0, tzinfo=KST)
+# 토요일 판매 마감 직후 (계산값은 1143회)
+AFTER_SALES_CLOSE = datetime.datetime(2024, 10, 19, 20, 30, tzinfo=KST)
+
+
+@pytest.fixture(autouse=True)
+def _home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(RoundProvider, "_now", lambda self: WEEKDAY)
+
+
+def test_get_round_returns_none_before_verification():
+    assert RoundProvider().get_round() is None
+
+
+def test_get_round_returns_computed_round_after_verification():
+    provider = RoundProvider()
+    computed = provider._compute_round()
+    provider.update(computed)
+
+    assert provider.get_round() == computed
+
+
+def test_get_round_applies_offset_from_site():
+    provider = RoundProvider()
+    computed = provider._compute_round()
+    provider.update(computed - 1)
+
+    assert provider.get_round() == computed - 1
+
+
+def test_get_round_returns_none_when_verification_is_due():
+    provider = RoundProvider(verify_interval_seconds=0)
+    provider.update(1)
+
+    assert provider.get_round() is None
+
+
+def test_invalidate_forces_verification():
+    provider = RoundProvider()
+    provider.update(1)
+    provider.invalidate()
+
+    assert provider.get_round() is None
+
+
+def test_estimate_round_applies_offset_even_when_verification_is_due():
+    provider = RoundProvider(verify_interval_seconds=0)
+    provider.update(provider._compute_round() + 1)
+
+    assert provider.get_round() is None
+    assert provider.estimate_round() == provider._compute_round() + 1
+
+
+def test_estimate_round_returns_computed_round_without_saved_offset():
+    provider = RoundProvider()
+
+    assert provider.estimate_round() == provider._compute_round()
+
+
+def test_offset_measured_after_sales_close_is_not_saved(monkeypatch):
+    provider = RoundProvider()
+    provider.update(1142)
+    monkeypatch.setattr(RoundProvider, "_now", lambda self: AFTER_SALES_CLOSE)
+
+    # 사이트가 아직 1142회를 보여주더라도 -1 을 저장하지 않음
+    provider.update(1142)
+    assert provider.get_round() == 1143
+
+    monkeypatch.setattr(RoundProvider, "_now", lambda self: WEEKDAY)
+    assert provider.get_round() == 1142
@@ -0,0 +1,61 @@
+import os
+import stat
+
+import pytest
+
+from dhapi.port.session_store import SessionStore
+
+
+@pytest.fixture(autouse=True)
+def _home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+
+def test_load_returns_saved_session():
+    store = SessionStore("default")
+    store.save("user", "abc")
+
+    assert store.load("user") == "abc"
+
+
+def test_load_returns_none_without_saved_session():
+    store = SessionStore("default")
+
+    assert store.load("user") is None
+
+
+def test_load_returns_none_for_another_user():
+    store = SessionStore("default")
+    store.save("user", "abc")
+
+    assert store.load("another_user") is None
+
+
+def test_load_returns_none_after_expiry():
+    store = SessionStore("default", ttl_seconds=0)
+    store.save("user", "abc")
+
+    assert store.load("user") is None
+
+
+def test_clear_removes_saved_session():
+    store = SessionStore("default")
+    store.save("user", "abc")
+    store.clear()
+
+    assert store.load("user") is None
+
+
+def test_profile_name_cannot_escape_sessions_directory(tmp_path):
+    store = SessionStore("../../escaped")
+    store.save("user", "abc")
+
+    assert store.load("user") == "abc"
+    assert os.listdir(tmp_path / ".dhapi" / "sessions") == ["..%2F..%2Fescaped.json"]
+    assert not (tmp_path / "escaped.json").exists()
+
+
+def test_saved_session_is_private(tmp_path):
+    SessionStore("default").save("user", "abc")
+
+    assert stat.S_IMODE(os.stat(tmp_path / ".dhapi" / "sessions" / "default.json").st_mode) == 0o600
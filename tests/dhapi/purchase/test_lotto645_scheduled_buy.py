@@ -0,0 +1,141 @@
+import datetime
+
+import pytest
+
+from tests.support.lottery_standin import ROUND_ON_SALE, LotteryStandinServer, StandinConfig
+from dhapi.batch.profile_batch_runner import ProfileBatchRunner
+from dhapi.domain.lotto645_round import KST
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+from dhapi.domain.user import User
+from dhapi.port.lottery_client import LotteryClient
+from dhapi.port.lottery_client_options import LotteryClientOptions
+from dhapi.purchase.lotto645_scheduled_buy import Lotto645ScheduledBuy
+
+# ROUND_ON_SALE 회차 판매 마감 5분 전
+AT = datetime.datetime(2024, 10, 19, 19, 55, tzinfo=KST)
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        assert seconds > 0
+        self.now += seconds
+
+
+class RecordingEndpoint:
+    def __init__(self):
+        self.calls = []
+
+    def print_result_of_buy_lotto645(self, slots):
+        self.calls.append(("buy_lotto645", slots))
+
+
+@pytest.fixture
+def server():
+    with LotteryStandinServer(StandinConfig(accounts={"a": "secret", "b": "secret"}, seed=0)) as s:
+        yield s
+
+
+def _scheduled_buy(clock):
+    return Lotto645ScheduledBuy(AT, ProfileBatchRunner(2), keepalive_seconds=300, prepare_lead_seconds=60, clock=clock, sleep=clock.sleep)
+
+
+def test_fires_one_request_per_profile_at_the_given_time(server):
+    clock = FakeClock(AT.timestamp() - 1000)
+    endpoint = RecordingEndpoint()
+    fired_at = []
+
+    def connect(profile_name):
+        client = LotteryClient(User(profile_name, "secret"), endpoint, LotteryClientOptions(urls=server.urls()))
+        execute = client.execute_lotto645
+        client.execute_lotto645 = lambda data: (fired_at.append(clock.now), execute(data))
+        return client
+
+    scheduled_buy = _scheduled_buy(clock)
+    results = scheduled_buy.run(["a", "b"], connect, [Lotto645Ticket()])
+
+    assert scheduled_buy.round_no == ROUND_ON_SALE
+    assert [r.ok for r in results] == [True, True]
+    assert fired_at == [AT.timestamp(), AT.timestamp()]
+    assert len(endpoint.calls) == 2
+    assert server.request_count("POST /olotto/game/execBuy.do") == 2
+    assert server.request_count("POST /olotto/game/egovUserReadySocket.json") == 2
+    # RoundProvider 가 없으면 준비할 때 사이트에서 회차를 확인함
+    assert server.request_count("GET /common.do?method=main") == 2
+
+
+class StaleRoundProvider:
+    """
+    확인해둔 offset 이 틀려 지난 회차를 계산하는 RoundProvider
+    """
+
+    def __init__(self):
+        self.updates = []
+
+    def get_round(self):
+        return ROUND_ON_SALE - 1
+
+    def update(self, site_round):
+        self.updates.append(site_round)
+
+
+def test_wrong_local_round_is_retried_with_site_round(server):
+    clock = FakeClock(AT.timestamp() - 10)
+    endpoint = RecordingEndpoint()
+    round_provider = StaleRoundProvider()
+
+    def connect(profile_name):
+        return LotteryClient(User(profile_name, "secret"), endpoint, LotteryClientOptions(urls=server.urls(), round_provider=round_provider))
+
+    results = _scheduled_buy(clock).run(["a"], connect, [Lotto645Ticket()])
+
+    assert results[0].ok
+    assert len(endpoint.calls) == 1
+    assert server.request_count("POST /olotto/game/execBuy.do") == 2
+    assert round_provider.updates == [ROUND_ON_SALE]
+
+
+def test_keeps_sessions_alive_and_logs_in_again_when_expired(server, monkeypatch):
+    clock = FakeClock(AT.timestamp() - 1000)
+    clients = []
+
+    def connect(profile_name):
+        client = LotteryClient(User(profile_name, "secret"), RecordingEndpoint(), LotteryClientOptions(urls=server.urls()))
+        clients.append(client)
+        return client
+
+    calls = []
+    original = LotteryClient.keep_alive
+
+    def keep_alive(self):
+        calls.append(clock.now)
+        if len(calls) == 1:
+            server._logged_in_sessions.clear()  # 서버 쪽에서 세션이 만료된 상황
+        return original(self)
+
+    monkeypatch.setattr(LotteryClient, "keep_alive", keep_alive)
+    results = _scheduled_buy(clock).run(["a"], connect, [Lotto645Ticket()])
+
+    assert results[0].ok
+    # 준비 시각(1분 전)까지 5분마다 보내고, 구매 직전에는 보내지 않음
+    start = AT.timestamp() - 1000
+    assert calls == [start + 300, start + 600, start + 900]
+    assert server.request_count("POST /userSsl.do?method=login") == 2
+
+
+def test_failed_profile_does_not_block_others(server):
+    clock = FakeClock(AT.timestamp() - 10)
+
+    def connect(profile_name):
+        return LotteryClient(User(profile_name, "secret" if profile_name != "b" else "wrong"), RecordingEndpoint(), LotteryClientOptions(urls=server.urls()))
+
+    results = _scheduled_buy(clock).run(["a", "b"], connect, [Lotto645Ticket()])
+
+    assert results[0].ok
+    assert "로그인에 실패했습니다" in str(results[1].error)
+    assert server.request_count("POST /olotto/game/execBuy.do") == 1
@@ -0,0 +1,89 @@
+import io
+
+from dhapi.domain.lotto645_ticket import Lotto645Mode
+from dhapi.purchase.lotto645_ticket_import import Lotto645TicketImport, RejectedRow, read_ticket_rows, validate_ticket_rows
+
+
+def _import(profile_names, remaining=None, **kwargs):
+    remaining = remaining or {}
+    return Lotto645TicketImport(profile_names, lambda name: remaining.get(name, 5), **kwargs)
+
+
+def test_read_ticket_rows_reads_csv_and_json_lines():
+    lines = io.StringIO('1,2,3,4,5,6\n\n# comment\n""\n{"numbers": [7, 8, 9], "profile": "b"}\n{"numbers": "10,11"}\n{}\n')
+
+    rows = list(read_ticket_rows(lines))
+
+    assert [(r.line_no, r.numbers, r.profile_name) for r in rows] == [(1, "1,2,3,4,5,6", None), (4, "", None), (5, "7,8,9", "b"), (6, "10,11", None), (7, None, None)]
+
+
+def test_read_ticket_rows_reports_broken_json():
+    rows = list(read_ticket_rows(['{"numbers": [1, 2', '{"numbers": 3}']))
+
+    assert [r.error for r in rows] == ["JSON 형식이 올바르지 않습니다.", "numbers 는 번호 목록이나 쉼표로 구분한 문자열이어야 합니다 (입력된 값: 3)."]
+
+
+def test_validate_ticket_rows_keeps_order_across_chunks():
+    rows = read_ticket_rows(["1,2,3", "1,1", "{", "4,5", "46"])
+
+    results = list(validate_ticket_rows(rows, chunk_size=2))
+
+    assert [r.line_no if isinstance(r, RejectedRow) else r[0].line_no for r in results] == [1, 2, 3, 4, 5]
+    assert [type(r) for r in results] == [tuple, RejectedRow, RejectedRow, tuple, RejectedRow]
+    assert results[1].reason == "중복되지 않도록 숫자들을 입력하세요 (입력된 값: 1,1)."
+    assert results[3][1].numbers == [4, 5]
+
+
+def test_orders_fill_profiles_in_order_up_to_weekly_limit():
+    ticket_import = _import(["a", "b"], chunk_size=3)
+
+    orders = list(ticket_import.orders([f"{n},{n + 1}" for n in range(1, 13)]))
+
+    assert [(o.profile_name, len(o.tickets)) for o in orders] == [("a", 5), ("b", 5)]
+    assert orders[1].line_nos == [6, 7, 8, 9, 10]
+    assert all(t.mode == Lotto645Mode.SEMIAUTO for o in orders for t in o.tickets)
+    assert ticket_import.row_count == 12
+    assert ticket_import.over_limit_count == 2
+
+
+def test_orders_subtract_tickets_already_bought_this_round():
+    ticket_import = _import(["a", "b"], remaining={"a": 2, "b": 0})
+
+    orders = list(ticket_import.orders(['""'] * 4))
+
+    assert [(o.profile_name, len(o.tickets)) for o in orders] == [("a", 2)]
+    assert ticket_import.over_limit_count == 2
+
+
+def test_orders_respect_profile_column():
+    ticket_import = _import(["a", "b"])
+
+    orders = list(ticket_import.orders(['{"profile": "b"}', '""', '{"profile": "c"}']))
+
+    assert [(o.profile_name, o.line_nos) for o in orders] == [("a", [2]), ("b", [1])]
+    assert ticket_import.rejected_count == 1
+    assert ticket_import.rejected_rows[0].reason == "구매 대상 프로필이 아닙니다 (입력된 값: c)."
+
+
+def test_orders_are_streamed_before_reading_whole_file():
+    ticket_import = _import(["a", "b"], chunk_size=1)
+    consumed = []
+
+    def lines():
+        for n in range(1, 100):
+            consumed.append(n)
+            yield str(n)
+
+    first = next(ticket_import.orders(lines()))
+
+    assert first.profile_name == "a"
+    assert len(consumed) < 10
+
+
+def test_remaining_tickets_is_asked_once_per_profile():
+    asked = []
+    ticket_import = Lotto645TicketImport(["a"], lambda name: asked.append(name) or 5)
+
+    list(ticket_import.orders(['""'] * 20))
+
+    assert asked == ["a"]
@@ -0,0 +1,20 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def _imported_modules(statement):
+    code = f"import sys; {statement}; print(' '.join(sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(proc.stdout.split())
+
+
+@pytest.mark.parametrize("module", ["requests", "bs4", "html5lib", "pytz", "httpx", "numpy"])
+def test_router_does_not_import_heavy_modules(module):
+    assert module not in _imported_modules("import dhapi.router.router")
+
+
+@pytest.mark.parametrize("module", ["typer", "rich", "requests"])
+def test_main_does_not_import_cli_modules(module):
+    assert module not in _imported_modules("import dhapi.main")
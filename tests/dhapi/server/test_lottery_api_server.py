@@ -0,0 +1,101 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from tests.support.lottery_standin import LotteryStandinServer, StandinConfig
+from dhapi.domain.user import User
+from dhapi.endpoint.lottery_json_endpoint import LotteryJsonEndpoint
+from dhapi.port.lottery_client import LotteryClient
+from dhapi.port.lottery_client_options import LotteryClientOptions
+from dhapi.server.lottery_api_server import LotteryApiServer
+from dhapi.server.lottery_client_pool import LotteryClientPool, ProfileNotFoundError
+
+ACCOUNTS = {"tester": "secret", "other": "wrong"}
+
+
+@pytest.fixture
+def standin():
+    with LotteryStandinServer(StandinConfig(accounts={"tester": "secret", "other": "secret"}, seed=0)) as s:
+        yield s
+
+
+@pytest.fixture
+def api(standin):
+    endpoint = LotteryJsonEndpoint()
+
+    def connect(profile_name):
+        if profile_name not in ACCOUNTS:
+            raise ProfileNotFoundError(f"'{profile_name}' 프로필을 찾지 못했습니다.")
+        return LotteryClient(User(profile_name, ACCOUNTS[profile_name]), endpoint, LotteryClientOptions(urls=standin.urls()))
+
+    with LotteryApiServer(LotteryClientPool(connect), endpoint, port=0) as server:
+        yield server
+
+
+def _call(api, method, path, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(api.url + path, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_balance_reuses_logged_in_session(api, standin):
+    status, body = _call(api, "GET", "/profiles/tester/balance")
+    assert status == 200
+    assert body["profile"] == "tester"
+    assert set(body["result"]) == {"total", "available", "reserved", "withdrawal_pending", "unavailable", "purchased_this_month", "cached", "fetched_at"}
+
+    assert _call(api, "GET", "/profiles/tester/balance")[0] == 200
+    assert standin.request_count("POST /userSsl.do?method=login") == 1
+    assert _call(api, "GET", "/health") == (200, {"status": "ok", "profiles": ["tester"]})
+
+
+def test_buy_lotto645(api):
+    status, body = _call(api, "POST", "/profiles/tester/lotto645", {"tickets": ["1,2,3,4,5,6", ""]})
+
+    assert status == 200
+    slots = body["result"]["slots"]
+    assert [slot["mode"] for slot in slots] == ["수동", "자동"]
+    assert slots[0]["numbers"] == [1, 2, 3, 4, 5, 6]
+
+
+def test_assign_virtual_account(api):
+    status, body = _call(api, "POST", "/profiles/tester/virtual-account", {"amount": 10000})
+
+    assert status == 200
+    assert set(body["result"]) == {"account", "amount"}
+
+
+@pytest.mark.parametrize(
+    "method, path, body, expected_status, expected_type",
+    [
+        ("POST", "/profiles/tester/lotto645", {"tickets": ["1,1,2"]}, 400, "ValueError"),
+        ("POST", "/profiles/tester/lotto645", {"tickets": [""] * 6}, 400, "ValueError"),
+        ("POST", "/profiles/tester/virtual-account", {"amount": 1234}, 400, "ValueError"),
+        ("GET", "/profiles/nobody/balance", None, 404, "ProfileNotFoundError"),
+        ("GET", "/profiles/other/balance", None, 401, "AuthError"),
+        ("POST", "/profiles/tester/balance", {}, 405, "MethodNotAllowed"),
+        ("GET", "/unknown", None, 404, "NotFound"),
+    ],
+)
+def test_errors_are_reported_as_json(api, method, path, body, expected_status, expected_type):
+    status, response = _call(api, method, path, body)
+
+    assert status == expected_status
+    assert response["error"]["type"] == expected_type
+    assert response["error"]["message"]
+
+
+def test_server_errors_are_reported_as_unavailable(api, standin):
+    assert _call(api, "GET", "/profiles/tester/balance")[0] == 200
+    standin.config.error_rate = 1
+
+    status, response = _call(api, "GET", "/profiles/tester/balance")
+
+    assert status == 503
+    assert response["error"]["type"] == "TransientError"
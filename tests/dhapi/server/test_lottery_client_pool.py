@@ -0,0 +1,107 @@
+import threading
+
+import pytest
+
+from dhapi.port.lottery_errors import AuthError, TransientError
+from dhapi.server.lottery_client_pool import LotteryClientPool
+
+
+class FakeClient:
+    def __init__(self, profile_name):
+        self.profile_name = profile_name
+        self.keep_alive_calls = 0
+        self.fail_keep_alive = False
+
+    def keep_alive(self):
+        self.keep_alive_calls += 1
+        if self.fail_keep_alive:
+            raise TransientError("x")
+        return False
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_reuses_one_client_per_profile():
+    connected = []
+    pool = LotteryClientPool(lambda name: connected.append(name) or FakeClient(name))
+
+    with pool.acquire("a") as first:
+        pass
+    with pool.acquire("a") as second:
+        pass
+    with pool.acquire("b"):
+        pass
+
+    assert first is second
+    assert connected == ["a", "b"]
+    assert pool.connected_profile_names == ["a", "b"]
+
+
+def test_revalidates_idle_session_before_use():
+    clock = FakeClock()
+    pool = LotteryClientPool(FakeClient, revalidate_seconds=300, clock=clock)
+
+    with pool.acquire("a") as client:
+        pass
+    clock.now = 200
+    with pool.acquire("a"):
+        pass
+    assert client.keep_alive_calls == 0
+
+    clock.now = 501
+    with pool.acquire("a"):
+        pass
+    assert client.keep_alive_calls == 1
+
+    # 확인에 실패하면 새로 로그인
+    client.fail_keep_alive = True
+    clock.now = 900
+    with pool.acquire("a") as renewed:
+        pass
+    assert renewed is not client
+
+
+def test_auth_error_discards_client():
+    pool = LotteryClientPool(FakeClient)
+
+    with pytest.raises(AuthError):
+        with pool.acquire("a") as client:
+            raise AuthError("로그인에 실패했습니다.")
+    with pool.acquire("a") as renewed:
+        pass
+
+    assert renewed is not client
+
+
+def test_caps_concurrency_per_profile():
+    pool = LotteryClientPool(FakeClient, max_concurrency_per_profile=1, acquire_timeout_seconds=0.05)
+    entered = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with pool.acquire("a"):
+            entered.set()
+            release.wait()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    entered.wait()
+    try:
+        with pytest.raises(TransientError, match="요청이 많아"):
+            with pool.acquire("a"):
+                pass
+        # 다른 프로필은 영향을 받지 않음
+        with pool.acquire("b"):
+            pass
+    finally:
+        release.set()
+        thread.join()
+
+    with pool.acquire("a"):
+        pass
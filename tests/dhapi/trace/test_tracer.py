@@ -0,0 +1,67 @@
+import io
+import json
+
+import pytest
+
+from dhapi.trace.tracer import NullTracer, Tracer
+
+
+def test_span_records_duration_and_attributes():
+    tracer = Tracer()
+
+    with tracer.span("http.login", host="www.dhlottery.co.kr") as span:
+        span.set(status=200, bytes=1024)
+
+    [span] = tracer.spans
+    assert span.name == "http.login"
+    assert span.duration_ms >= 0
+    assert span.attributes == {"host": "www.dhlottery.co.kr", "status": 200, "bytes": 1024}
+
+
+def test_span_records_error_and_reraises():
+    tracer = Tracer()
+
+    with pytest.raises(RuntimeError):
+        with tracer.span("op.show_balance"):
+            raise RuntimeError("boom")
+
+    assert tracer.spans[0].attributes == {"error": "RuntimeError"}
+
+
+def test_bound_tracer_shares_spans():
+    tracer = Tracer()
+
+    with tracer.bind(profile="a").span("op.login"):
+        pass
+    with tracer.bind(profile="b").span("op.login"):
+        pass
+
+    assert [s.attributes["profile"] for s in tracer.spans] == ["a", "b"]
+
+
+def test_export_jsonl():
+    tracer = Tracer()
+    with tracer.span("extract.parse_round", bytes=10):
+        pass
+    with tracer.span("http.round_info"):
+        pass
+
+    buf = io.StringIO()
+    tracer.export_jsonl(buf)
+
+    lines = [json.loads(line) for line in buf.getvalue().splitlines()]
+    assert [line["name"] for line in lines] == ["extract.parse_round", "http.round_info"]
+    assert lines[0]["bytes"] == 10
+    assert set(lines[1]) == {"name", "started_at", "duration_ms"}
+
+
+def test_null_tracer_records_nothing():
+    tracer = NullTracer()
+
+    with tracer.bind(profile="a").span("op.login") as span:
+        span.set(status=200)
+
+    buf = io.StringIO()
+    tracer.export_jsonl(buf)
+    assert tracer.spans == []
+    assert buf.getvalue() == ""
@@ -0,0 +1,330 @@
+"""
+LotteryClient 가 호출하는 동행복권 엔드포인트를 흉내 내는 로컬 HTTP 서버입니다.
+
+응답 본문은 tests/dhapi/port/fixtures/ 의 저장된 페이지를 그대로 사용하며, 요청마다 지연 시간과 오류를 주입할 수 있습니다.
+세 호스트(dhlottery.co.kr, www, ol)를 하나의 서버가 모두 처리하므로 `server.urls()` 를 클라이언트에 넘기면 됩니다.
+
+usage:
+    with LotteryStandinServer(StandinConfig(latency_seconds=0.05)) as server:
+        client = LotteryClient(user, endpoint, LotteryClientOptions(urls=server.urls()))
+"""
+
+import json
+import pathlib
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from dhapi.domain.lotto645_round import get_lotto645_draw_date
+from dhapi.port.lottery_site import LotteryUrls
+
+FIXTURES = pathlib.Path(__file__).resolve().parent.parent / "dhapi" / "port" / "fixtures"
+
+# fixtures/main.html 의 lottoDrwNo(1141) 다음 회차
+ROUND_ON_SALE = 1142
+
+
+class StandinConfig:
+    def __init__(
+        self,
+        latency_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        under_maintenance: bool = False,
+        accounts: Optional[Dict[str, str]] = None,
+        seed: Optional[int] = None,
+        dropped_exec_buys: int = 0,
+        process_dropped_exec_buys: bool = True,
+    ):
+        """
+        :param latency_seconds: 모든 응답 전에 기다릴 시간
+        :param error_rate: 세션 발급을 제외한 요청이 error_status 로 실패할 확률 (0 ~ 1)
+        :param under_maintenance: 세션 발급 요청을 시스템 점검 페이지로 리다이렉트할지 여부
+        :param accounts: {아이디: 비밀번호}. None 이면 어떤 계정이든 로그인에 성공
+        :param dropped_exec_buys: 응답 없이 연결을 끊을 처음 몇 번의 구매 요청 수 (타임아웃 흉내)
+        :param process_dropped_exec_buys: 응답 없이 끊는 구매 요청도 구매는 처리할지 여부
+        """
+        if not 0 <= error_rate <= 1:
+            raise ValueError(f"오류 비율은 0 이상 1 이하여야 합니다 (입력된 값: {error_rate}).")
+        self.latency_seconds = latency_seconds
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.under_maintenance = under_maintenance
+        self.accounts = accounts
+        self.seed = seed
+        self.dropped_exec_buys = dropped_exec_buys
+        self.process_dropped_exec_buys = process_dropped_exec_buys
+
+
+class LotteryStandinServer:
+    def __init__(self, config: Optional[StandinConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StandinConfig()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._logged_in_sessions = set()
+        self._session_users: Dict[str, str] = {}
+        self._purchased_amounts: Dict[str, int] = {}
+        self._dropped_exec_buys = 0
+        self._request_counts: Dict[str, int] = {}
+        self._pages = {path.name: path.read_text(encoding="utf-8") for path in FIXTURES.glob("*.html")}
+        self._httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def urls(self) -> LotteryUrls:
+        return LotteryUrls(base_url=self.base_url, www_base_url=self.base_url, ol_base_url=self.base_url)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="lottery-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def request_count(self, route: str) -> int:
+        with self._lock:
+            return self._request_counts.get(route, 0)
+
+    def _count(self, route: str):
+        with self._lock:
+            self._request_counts[route] = self._request_counts.get(route, 0) + 1
+
+    def _should_fail(self) -> bool:
+        if self.config.error_rate == 0:
+            return False
+        with self._lock:
+            return self._random.random() < self.config.error_rate
+
+    def _new_session(self) -> str:
+        return uuid.uuid4().hex.upper()
+
+    def _login(self, jsessionid: Optional[str], user_id: str, password: str) -> bool:
+        accounts = self.config.accounts
+        if jsessionid is None or (accounts is not None and accounts.get(user_id) != password):
+            return False
+        with self._lock:
+            self._logged_in_sessions.add(jsessionid)
+            self._session_users[jsessionid] = user_id
+        return True
+
+    def _is_logged_in(self, jsessionid: Optional[str]) -> bool:
+        with self._lock:
+            return jsessionid in self._logged_in_sessions
+
+    def purchased_amount(self, user_id: str) -> int:
+        """
+        :return: 이 서버에서 user_id 가 구매한 금액 (마이페이지의 이번달 누적 구매금액에 더해짐)
+        """
+        with self._lock:
+            return self._purchased_amounts.get(user_id, 0)
+
+    def _should_drop_exec_buy(self) -> bool:
+        with self._lock:
+            if self._dropped_exec_buys >= self.config.dropped_exec_buys:
+                return False
+            self._dropped_exec_buys += 1
+            return True
+
+    def _mypage(self, jsessionid: str) -> str:
+        with self._lock:
+            purchased = 12000 + self._purchased_amounts.get(self._session_users.get(jsessionid), 0)
+        return _mypage_with_purchased_amount(self._pages["mypage_with_bank_account.html"], purchased)
+
+    def _exec_buy(self, form: Dict[str, str], jsessionid: str) -> Dict:
+        if form.get("round") != str(ROUND_ON_SALE):
+            return {"loginYn": "Y", "result": {"resultCode": "-1", "resultMsg": "판매 회차가 아닙니다."}}
+
+        lines = []
+        for slot in json.loads(form["param"]):
+            chosen = [] if slot["arrGameChoiceNum"] is None else [int(n) for n in slot["arrGameChoiceNum"].split(",")]
+            with self._lock:
+                numbers = sorted(chosen + self._random.sample([n for n in range(1, 46) if n not in chosen], 6 - len(chosen)))
+            mode = {"0": "3", "1": "1", "2": "2"}[slot["genType"]]
+            lines.append(slot["alpabet"] + "|" + "|".join(f"{n:02d}" for n in numbers) + mode)
+
+        with self._lock:
+            user_id = self._session_users.get(jsessionid)
+            self._purchased_amounts[user_id] = self._purchased_amounts.get(user_id, 0) + int(form["nBuyAmount"])
+
+        return {
+            "loginYn": "Y",
+            "result": {
+                "resultCode": "100",
+                "resultMsg": "SUCCESS",
+                "buyRound": str(ROUND_ON_SALE),
+                "arrGameChoiceNum": lines,
+                "nBuyAmount": int(form["nBuyAmount"]),
+            },
+        }
+
+
+def _mypage_with_purchased_amount(page: str, purchased: int) -> str:
+    # fixtures/mypage_with_bank_account.html 의 이번달누적구매금액(12,000 원)을 바꿈
+    return page.replace('이번달누적구매금액</th><td class="ta_right">12,000 원', f'이번달누적구매금액</th><td class="ta_right">{purchased:,} 원')
+
+
+def draw_numbers(round_no: int):
+    """
+    stand-in 서버가 round_no 회차의 당첨번호로 내려주는 값 (번호 6개, 보너스)
+    """
+    picked = random.Random(round_no).sample(range(1, 46), 7)
+    return sorted(picked[:6]), picked[6]
+
+
+def _draw_result_response(round_no: int) -> Dict:
+    if not 1 <= round_no < ROUND_ON_SALE:
+        return {"returnValue": "fail"}
+    numbers, bonus = draw_numbers(round_no)
+    return {
+        "returnValue": "success",
+        "drwNo": round_no,
+        "drwNoDate": get_lotto645_draw_date(round_no).isoformat(),
+        **{f"drwtNo{i}": n for i, n in enumerate(numbers, start=1)},
+        "bnusNo": bonus,
+    }
+
+
+def _nicepay_init_response(form: Dict[str, str]) -> Dict[str, str]:
+    return {
+        "PayMethod": form.get("PayMethod", "VBANKFVB01"),
+        "GoodsName": form.get("goodsName", "복권예치금"),
+        "GoodsCnt": "1",
+        "BuyerTel": "01000000000",
+        "Moid": uuid.uuid4().hex,
+        "MID": "dhlottery0m",
+        "UserIP": "127.0.0.1",
+        "MallIP": "127.0.0.1",
+        "MallUserID": "standin",
+        "VbankExpDate": form.get("vExp", ""),
+        "BuyerEmail": "standin@example.com",
+        "SocketYN": "Y",
+        "GoodsCl": "0",
+        "EncodeParameters": "",
+        "EdiDate": time.strftime("%Y%m%d%H%M%S"),
+        "EncryptData": uuid.uuid4().hex,
+        "amt": form.get("price", "0"),
+        "BuyerName": "홍길동",
+        "VbankBankCode": form.get("VbankBankCode", "089"),
+        "FxVrAccountNo": "70012345678901",
+    }
+
+
+def _handler_for(server: LotteryStandinServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # 헤더와 본문을 따로 쓰므로, Nagle 알고리즘이 켜져 있으면 delayed ACK 때문에 응답마다 수십 ms 가 더해짐
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            pass
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def _dispatch(self, verb):
+            split = urlsplit(self.path)
+            query = parse_qs(split.query)
+            method = query.get("method", [""])[0]
+            route = f"{verb} {split.path}" + (f"?method={method}" if method else "")
+            form = self._read_form()
+            server._count(route)
+
+            if server.config.latency_seconds:
+                time.sleep(server.config.latency_seconds)
+
+            if route == "GET /gameResult.do?method=byWin":
+                if server.config.under_maintenance:
+                    return self._redirect("/index_check.html")
+                return self._send(200, "<html></html>", cookies={"JSESSIONID": server._new_session()})
+            if route == "GET /index_check.html":
+                return self._send(200, "<html>시스템 점검중</html>")
+
+            if server._should_fail():
+                return self._send(server.config.error_status, "")
+
+            jsessionid = self._jsessionid()
+            if route == "POST /userSsl.do?method=login":
+                ok = server._login(jsessionid, form.get("userId", ""), form.get("password", ""))
+                return self._send(200, server._pages["login_success.html" if ok else "login_failed.html"])
+            if route == "GET /common.do?method=main":
+                return self._send(200, server._pages["main.html"])
+            if route == "GET /common.do?method=getLottoNumber":
+                return self._send_json(_draw_result_response(int(query.get("drwNo", ["0"])[0])))
+            if route == "GET /user.do?method=login":
+                return self._send(200, server._pages["login_failed.html"])
+
+            if not server._is_logged_in(jsessionid):
+                return self._redirect("/user.do?method=login")
+
+            if route == "GET /userSsl.do?method=myPage":
+                return self._send(200, server._mypage(jsessionid))
+            if route == "POST /olotto/game/egovUserReadySocket.json":
+                return self._send_json({"ready_ip": "127.0.0.1"})
+            if route == "POST /olotto/game/execBuy.do":
+                if server._should_drop_exec_buy():
+                    if server.config.process_dropped_exec_buys:
+                        server._exec_buy(form, jsessionid)
+                    # 응답을 보내지 않고 연결을 끊음
+                    self.close_connection = True
+                    return None
+                return self._send_json(server._exec_buy(form, jsessionid))
+            if route == "POST /nicePay.do?method=nicePayInit":
+                return self._send_json(_nicepay_init_response(form))
+            if route == "POST /nicePay.do?method=nicePayProcess":
+                return self._send(200, server._pages["nicepay_process.html"])
+            return self._send(404, "")
+
+        def _read_form(self) -> Dict[str, str]:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length).decode("utf-8") if length else ""
+            return {k: v[0] for k, v in parse_qs(body).items()}
+
+        def _jsessionid(self) -> Optional[str]:
+            for pair in (self.headers.get("Cookie") or "").split(";"):
+                name, _, value = pair.strip().partition("=")
+                if name == "JSESSIONID":
+                    return value
+            return None
+
+        def _send_json(self, body):
+            self._send(200, json.dumps(body, ensure_ascii=False), content_type="application/json; charset=UTF-8")
+
+        def _redirect(self, location):
+            self.send_response(302)
+            self.send_header("Location", location)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def _send(self, status, body, content_type="text/html; charset=UTF-8", cookies=None):
+            payload = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (cookies or {}).items():
+                self.send_header("Set-Cookie", f"{name}={value}; Path=/")
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler